@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#   Benchmark : arbres de probabilités   #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare la génération et la lecture du code des arbres de probabilités
+(répétition d'expériences indépendantes) : ancienne génération (insertions
+successives dans une liste) et génération en parcours en profondeur.
+
+Compare aussi le calcul exact d'une probabilité sur l'arbre complet,
+et à l'aide des coefficients binomiaux."""
+
+import argparse
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.modules.probabilites.repetition import repetition_experiences
+from wxgeometrie.modules.probabilites.arbre import parse_text
+from wxgeometrie.modules.probabilites.calcul import probabilite
+
+
+def ancienne_repetition(profondeur, evts, probas):
+    lines = ['']
+    for niveau in range(1, profondeur + 1):
+        prefixe = niveau*'>'
+        suffixe = '_' + str(niveau)
+        for i in range(len(lines), 0, -1):
+            if lines[i - 1].startswith((niveau - 1)*'>'):
+                for evt, proba in reversed(list(zip(evts, probas))):
+                    lines.insert(i, prefixe + evt + suffixe + ':' + proba)
+    return '\n'.join(lines).strip()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, nargs='+', default=[8, 11, 13],
+                        help="nombre de niveaux de l'arbre")
+    args = parser.parse_args()
+
+    for n in args.n:
+        mesures = []
+        temps, ancien = chronometrer(ancienne_repetition, n, ['A', '&A'], ['1/3', '2/3'])
+        mesures.append(('insertions successives', temps))
+        temps, code = chronometrer(repetition_experiences, n, evts=['A'], probas=['1/3'])
+        mesures.append(('parcours en profondeur', temps))
+        assert code == ancien
+        temps, arbre = chronometrer(parse_text, code)
+        mesures.append(('lecture du code', temps))
+        temps, _ = chronometrer(arbre.segments)
+        mesures.append(('disposition des sommets', temps))
+        afficher('%s niveaux (%s lignes)' % (n, len(arbre)), mesures)
+
+        mesures = []
+        temps, p1 = chronometrer(probabilite, arbre, 'A >= 3')
+        mesures.append(('parcours des %s feuilles' % len(arbre.feuilles()), temps))
+        temps, p2 = chronometrer(probabilite, n*'>' + 'A:1/3\n' + n*'>' + '&A:2/3', 'A >= 3')
+        mesures.append(('coefficients binomiaux', temps))
+        assert p1 == p2
+        afficher('P(A >= 3), %s niveaux' % n, mesures)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#       Benchmark : arithmétique         #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare la division successive (ancienne implémentation de `n_premiers()`)
+et sympy avec le crible de `mathlib.arithmetique`."""
+
+import argparse
+import math
+import random
+
+import sympy
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.mathlib import arithmetique
+
+
+def ancien_n_premiers(n):
+    "Division successive par les nombres premiers déjà trouvés."
+    liste = [2, 3]
+    m = 5
+    while len(liste) < n:
+        r = math.sqrt(m)
+        for k in liste:
+            if k > r:
+                liste.append(m)
+                break
+            if not m%k:
+                break
+        m += 2
+    return liste
+
+
+def tester(fonction, nombres):
+    return [fonction(n) for n in nombres]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=50000,
+                        help="nombre de nombres premiers à générer")
+    args = parser.parse_args()
+
+    mesures = []
+    temps, reference = chronometrer(ancien_n_premiers, args.n)
+    mesures.append(('division successive', temps))
+    temps, resultat = chronometrer(arithmetique.n_premiers, args.n)
+    mesures.append(('crible (1er appel)', temps))
+    temps, resultat = chronometrer(arithmetique.n_premiers, args.n, repetitions=5)
+    mesures.append(('crible (table existante)', temps))
+    assert resultat == reference
+    afficher('%s premiers nombres premiers' % args.n, mesures)
+
+    mesures = []
+    temps, _ = chronometrer(arithmetique.n_premiers, 10**6)
+    mesures.append(('crible', temps))
+    afficher('10^6 premiers nombres premiers', mesures)
+
+    random.seed(0)
+    nombres = [random.randint(2, 10**7) for i in range(10000)]
+    for titre, sympy_f, f in (('Tests de primalité', sympy.isprime, arithmetique.est_premier),
+                              ('Décompositions', sympy.factorint, arithmetique.facteurs_premiers),
+                              ('Diviseurs', sympy.divisors, arithmetique.diviseurs)):
+        mesures = []
+        temps, reference = chronometrer(tester, sympy_f, nombres)
+        mesures.append(('sympy', temps))
+        temps, resultat = chronometrer(tester, f, nombres)
+        mesures.append(('crible', temps))
+        assert resultat == reference
+        afficher('%s (%s entiers inférieurs à 10^7)' % (titre, len(nombres)), mesures)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#   Benchmark : cryptographie            #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare le codage et le décodage du module Cryptographie : anciennes
+versions (caractère par caractère, avec des générateurs et des dictionnaires)
+et tables de correspondance numpy. Mesure aussi l'analyse fréquentielle
+et la recherche des clés (Vigenère et substitution mono-alphabétique)
+sur des textes de grande taille.
+
+Enfin, compare la coloration complète des mots du texte (comme avant chaque
+affichage dans l'ancienne version) et sa mise à jour après une modification."""
+
+import argparse
+from random import Random
+import re
+from string import ascii_uppercase as majuscules
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.modules.cryptographie import cryptanalyse
+from wxgeometrie.modules.cryptographie.cryptanalyse import dict_accents
+from wxgeometrie.modules.cryptographie.coloration import Coloration
+
+
+def texte_long(n):
+    "Texte français d'environ `n` caractères (répétition du texte de référence)."
+    with open(cryptanalyse.join(cryptanalyse.dirname(cryptanalyse.__file__),
+                                'francais.txt'), encoding='utf-8') as f:
+        # NB: l'ancien codage de Vigenère décalait aussi les lettres
+        # autres que A...Z (comme Œ), ce qui n'a pas de sens.
+        texte = f.read().replace('œ', 'oe')
+    return (texte*(n//len(texte) + 1))[:n]
+
+
+def ancien_coder(clair, cle, espaces=False):
+    clair = clair.upper()
+    for key, val in dict_accents.items():
+        clair = clair.replace(key, val)
+    d = dict(zip(majuscules, cle))
+    code = ''.join(d.get(s, ' ') for s in clair)
+    code = re.sub(' +', ' ', code)
+    if not espaces:
+        code = code.replace(' ', '')
+    return code
+
+
+def ancien_coder_vigenere(clair, cle):
+    def gen():
+        length = len(cle)
+        n = 0
+        for car in clair:
+            if car.isalpha():
+                yield chr((ord(cle[n%length]) + ord(car) - 130)%26 + 65)
+                n += 1
+            else:
+                yield car
+    clair = clair.upper()
+    for key, val in dict_accents.items():
+        clair = clair.replace(key, val)
+    return ''.join(gen())
+
+
+def ancien_decoder(code, correspondances, symbole='-'):
+    code = code.upper()
+    def f(s):
+        if s in majuscules:
+            return correspondances[s] or symbole
+        return s
+    return ''.join(f(s) for s in code)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, nargs='+', default=[100000, 1000000],
+                        help="nombre de caractères du texte")
+    args = parser.parse_args()
+
+    alea = Random(0)
+    cle = list(majuscules)
+    alea.shuffle(cle)
+    cle = ''.join(cle)
+    correspondances = dict((c, l) for l, c in zip(majuscules, cle))
+    correspondances['E'] = ''
+
+    for n in args.n:
+        texte = texte_long(n)
+
+        mesures = []
+        temps, c1 = chronometrer(ancien_coder, texte, cle, espaces=True)
+        mesures.append(('substitution (ancien)', temps))
+        temps, c2 = chronometrer(cryptanalyse.substituer, texte, cle, espaces=True)
+        mesures.append(('substitution (numpy)', temps))
+        assert c1 == c2
+        afficher('Codage par substitution (%s caractères)' % n, mesures)
+
+        mesures = []
+        temps, d1 = chronometrer(ancien_decoder, c1, correspondances)
+        mesures.append(('décodage (ancien)', temps))
+        temps, d2 = chronometrer(cryptanalyse.dechiffrer, c1, correspondances)
+        mesures.append(('décodage (numpy)', temps))
+        assert d1 == d2
+        afficher('Décodage partiel (%s caractères)' % n, mesures)
+
+        mesures = []
+        temps, v1 = chronometrer(ancien_coder_vigenere, texte, 'CRYPTOGRAPHIE')
+        mesures.append(('Vigenère (ancien)', temps))
+        temps, v2 = chronometrer(cryptanalyse.vigenere, texte, 'CRYPTOGRAPHIE')
+        mesures.append(('Vigenère (numpy)', temps))
+        assert v1 == v2
+        afficher('Codage de Vigenère (%s caractères)' % n, mesures)
+
+        mesures = []
+        temps, lettres = chronometrer(cryptanalyse.lettres, v2)
+        mesures.append(('conversion en tableau', temps))
+        temps, _ = chronometrer(cryptanalyse.frequences, lettres, 3)
+        mesures.append(('trigrammes', temps))
+        temps, _ = chronometrer(cryptanalyse.kasiski, lettres)
+        mesures.append(('test de Kasiski', temps))
+        temps, (cle_trouvee, _) = chronometrer(cryptanalyse.casser_vigenere, v2)
+        mesures.append(('clé de Vigenère', temps))
+        assert cle_trouvee == 'CRYPTOGRAPHIE'
+        temps, (cle_trouvee, _) = chronometrer(cryptanalyse.casser_substitution, c2)
+        mesures.append(('clé de substitution', temps))
+        afficher('Cryptanalyse (%s lettres)' % len(lettres), mesures)
+
+        mesures = []
+        coloration = Coloration()
+        temps, _ = chronometrer(coloration.initialiser, c2)
+        mesures.append(('coloration complète', temps))
+        milieu = len(c2)//2
+        # Lettre ajoutée au milieu d'un mot.
+        modifie = c2[:milieu] + 'A' + c2[milieu:]
+        temps, _ = chronometrer(coloration.modifier, modifie, milieu, 0, 1)
+        mesures.append(('lettre ajoutée', temps))
+        # Espace ajouté : les couleurs des mots suivants changent.
+        modifie = modifie[:milieu] + ' ' + modifie[milieu:]
+        temps, intervalles = chronometrer(coloration.modifier, modifie, milieu, 0, 1)
+        mesures.append(('espace ajouté', temps))
+        afficher('Coloration des mots (%s caractères)' % len(c2), mesures)
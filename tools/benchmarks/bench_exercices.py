@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#   Benchmark : exercices                #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare la génération d'un exercice de tableau de signes au moment
+où l'élève passe au niveau suivant (comme dans l'ancienne version)
+et sa lecture dans une réserve d'exercices générés à l'avance, ainsi
+que le temps de chargement de la réserve enregistrée sur le disque."""
+
+import argparse
+import os
+import tempfile
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.modules.exercice_tableau_signes.generation import NIVEAUX, generer
+from wxgeometrie.GUI.reserve_exercices import Reserve
+from wxgeometrie import param
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-r', '--repetitions', type=int, default=20,
+                        help="nombre d'exercices générés par niveau")
+    args = parser.parse_args()
+
+    # Pas de génération en arrière-plan : la réserve est remplie ci-dessous.
+    param.processus_exercices = 0
+    with tempfile.TemporaryDirectory() as dossier:
+        fichier = os.path.join(dossier, 'tableau_signes.json')
+        reserve = Reserve('tableau_signes', generer, taille=args.repetitions, fichier=fichier)
+        for niveau, format in sorted(NIVEAUX.items()):
+            exercices = [generer(format) for i in range(args.repetitions)]
+            reserve._exercices[format] = exercices[:]
+            mesures = []
+            temps, _ = chronometrer(generer, format, repetitions=args.repetitions)
+            mesures.append(('génération', temps))
+            temps, _ = chronometrer(reserve.prendre, format)
+            mesures.append(('réserve', temps))
+            afficher('Niveau %s (%s)' % (niveau, format), mesures)
+        reserve.enregistrer()
+        temps, reserve = chronometrer(Reserve, 'tableau_signes', generer, fichier=fichier)
+        afficher('Chargement de la réserve (%s exercices)' % len(reserve),
+                 [('lecture du fichier', temps)])
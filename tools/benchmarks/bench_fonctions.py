@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#   Benchmark : fonctions universelles   #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare les différentes manières d'évaluer les fonctions usuelles
+(sin, exp, sqrt...) lors du tracé de courbes :
+- tests `isinstance` successifs (ancienne implémentation) ;
+- table d'aiguillage de `mathlib.universal_functions` ;
+- fonctions compilées par `geolib.Fonction`, avec ou sans liaison directe
+  des implémentations numpy (cf. `Fonction._compiler()`).
+"""
+
+import argparse
+import math, cmath
+
+import numpy
+import sympy
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.mathlib import universal_functions
+from wxgeometrie.mathlib.parsers import traduire_formule
+from wxgeometrie.geolib import Feuille, Fonction
+
+
+# Expressions représentatives des courbes tracées en classe.
+EXPRESSIONS = ['2*x^2-3*x+1', '1/(x-2)', 'sqrt(x+3)', 'exp(-x^2)*sin(3x)',
+               'ln(x^2+1)-abs(x)', 'cos(x)/(1+sin(x)^2)', 'tan(x)',
+               'x*exp(x)-floor(x)', 'sqrt(abs(x))*cos(2x)+ln(abs(x)+1)']
+
+
+def ancienne_fonction(nom):
+    "Fonction universelle utilisant des tests `isinstance` successifs."
+    nom_math, nom_numpy, nom_sympy = universal_functions._fonctions_mathematiques[nom]
+    f_math = getattr(math, nom_math)
+    f_cmath = getattr(cmath, nom_math)
+    f_sympy = getattr(sympy, nom_sympy)
+    f_numpy = getattr(numpy, nom_numpy)
+    def fonction(*args, **kw):
+        arg0 = args[0]
+        if isinstance(arg0, (int, float)):
+            return f_math(*args, **kw)
+        elif isinstance(arg0, complex):
+            return f_cmath(*args, **kw)
+        elif isinstance(arg0, sympy.Basic):
+            return f_sympy(*args, **kw)
+        else:
+            return f_numpy(*args, **kw)
+    return fonction
+
+
+def compiler(feuille, expression, mode):
+    if mode in ('isinstance', 'aiguillage'):
+        dico = dict(feuille.objets)
+        if mode == 'isinstance':
+            dico.update((nom, ancienne_fonction(nom))
+                        for nom in universal_functions._fonctions_mathematiques)
+        expression = traduire_formule(expression, fonctions=dico)
+        return eval('lambda x:' + expression, dico)
+    feuille.objets.f = Fonction(expression)
+    fonction = feuille.objets.f
+    if mode == 'Fonction (numpy)':
+        return fonction._Fonction__fonctions_numpy[0]
+    return fonction._Fonction__fonctions[0]
+
+
+def evaluer(fonctions, x, repetitions):
+    for i in range(repetitions):
+        for f in fonctions:
+            f(x)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--points', type=int, default=800,
+                        help="nombre de points par courbe")
+    parser.add_argument('-r', '--redessins', type=int, default=2000,
+                        help="nombre d'évaluations de chaque courbe")
+    args = parser.parse_args()
+
+    feuille = Feuille()
+    x = numpy.linspace(-5, 5, args.points)
+    numpy.seterr(all='ignore')
+    for titre, valeur, repetitions in (('tableaux de %s points' % args.points, x, args.redessins),
+                                       ('nombres flottants', .7, 20*args.redessins)):
+        mesures = []
+        for mode in ('isinstance', 'aiguillage', 'Fonction', 'Fonction (numpy)'):
+            if mode == 'Fonction (numpy)' and not isinstance(valeur, numpy.ndarray):
+                continue
+            fonctions = [compiler(feuille, expr, mode) for expr in EXPRESSIONS]
+            temps, _ = chronometrer(evaluer, fonctions, valeur, repetitions, repetitions=3)
+            mesures.append((mode, temps))
+        afficher('Évaluation de %s courbes (%s)' % (len(EXPRESSIONS), titre), mesures)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#   Benchmark : graphes                  #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+"""Compare les algorithmes sur les graphes (graphes aléatoires non orientés) :
+ancienne recherche du plus court chemin (recherche du minimum parmi tous
+les sommets visités à chaque étape) et algorithme de Dijkstra avec un tas
+binaire sur les tableaux d'adjacence (CSR), ainsi que l'ancien test de
+connexité (recherche répétée des sommets adjacents) et le parcours en largeur.
+
+Mesure aussi la recherche d'une chaîne eulérienne (algorithme de Hierholzer),
+le coloriage (ancienne et nouvelle version de l'algorithme de Welsh & Powell,
+algorithme DSATUR), et le calcul du nombre de chemins (puissance de la matrice
+du graphe, avec sympy ou avec des matrices creuses).
+
+Enfin, compare le calcul des forces de répulsion lors de la disposition
+des sommets (calcul exact ou méthode de Barnes & Hut), et mesure la durée
+de la disposition complète (`--disposition` sommets).
+
+Les anciennes versions ne sont testées que jusqu'à `--max-ancien` sommets."""
+
+import argparse
+import random
+
+from sympy import oo, Matrix
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.mathlib.graphes import Graph
+from wxgeometrie.modules.graphes.disposition import (disposition, positions_initiales,
+                                                     repulsion_exacte, repulsion_barnes_hut)
+
+
+def graphe_aleatoire(n, degre_moyen=6, graine=0):
+    "Graphe non orienté aléatoire à `n` sommets, de poids entiers entre 1 et 10."
+    alea = random.Random(graine)
+    dico = dict(('S%s' % i, {}) for i in range(n))
+    for _ in range(n*degre_moyen//2):
+        a, b = 'S%s' % alea.randrange(n), 'S%s' % alea.randrange(n)
+        if a != b:
+            poids = alea.randint(1, 10)
+            dico[a].setdefault(b, []).append(poids)
+            dico[b].setdefault(a, []).append(poids)
+    return Graph(dico)
+
+
+def ancien_plus_court_chemin(graphe, start, end):
+    current = start
+    visited = {start: [0, [start]]}
+    archived = {}
+    while current != end and visited:
+        archived[current] = visited.pop(current)
+        for neighbor in graphe[current]:
+            if neighbor not in archived:
+                distance = visited.get(neighbor, [oo])[0]
+                new_distance = archived[current][0] + min(graphe[current][neighbor])
+                if new_distance < distance:
+                    visited[neighbor] = [new_distance, [current]]
+                elif new_distance == distance:
+                    visited[neighbor][1].append(current)
+        current = min(visited.items(), key = lambda x:x[1][0])[0]
+    return visited[current][0]
+
+
+def ancienne_connexite(graphe):
+    def adjacent(node, new_nodes):
+        return any(graphe.adjacents(node, new) for new in new_nodes)
+    remaining_nodes = set(graphe)
+    new_nodes = [remaining_nodes.pop()]
+    while new_nodes:
+        new_nodes = [node for node in remaining_nodes if adjacent(node, new_nodes)]
+        remaining_nodes.difference_update(new_nodes)
+    return not remaining_nodes
+
+
+def ancien_coloriage(graphe):
+    coloring = []
+    uncolored = graphe._nodes_sorted_by_degree()
+    while uncolored:
+        coloring.append([])
+        for node in uncolored:
+            if not any(graphe.adjacents(node, s) for s in coloring[-1]):
+                coloring[-1].append(node)
+        uncolored = [s for s in uncolored if s not in coloring[-1]]
+    return coloring
+
+
+def ancienne_matrice(graphe):
+    n = graphe.order
+    nodes = sorted(graphe)
+    def f(i, j):
+        k = (1 if graphe.oriented or i != j else 2)
+        return k*len(graphe[nodes[i]].get(nodes[j], ()))
+    return Matrix(n, n, f)
+
+
+def graphe_eulerien(n, graine=0):
+    "Graphe aléatoire dont tous les sommets sont de degré pair (réunion de cycles)."
+    alea = random.Random(graine)
+    dico = dict((i, {}) for i in range(n))
+    for _ in range(3):
+        cycle = list(range(n))
+        alea.shuffle(cycle)
+        for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+            dico[a].setdefault(b, []).append(1)
+            dico[b].setdefault(a, []).append(1)
+    return Graph(dico)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, nargs='+', default=[10000, 30000, 100000],
+                        help="nombre de sommets")
+    parser.add_argument('--max-ancien', type=int, default=10000,
+                        help="nombre maximal de sommets pour les anciennes versions")
+    parser.add_argument('--chemins', type=int, nargs=2, default=[60, 12],
+                        help="nombre de sommets et longueur des chemins comptés")
+    parser.add_argument('--disposition', type=int, nargs='+', default=[1000, 10000],
+                        help="nombre de sommets des graphes à disposer")
+    args = parser.parse_args()
+
+    for n in args.n:
+        temps, graphe = chronometrer(graphe_aleatoire, n)
+        afficher('Graphe de %s sommets' % n, [('construction', temps)])
+        # Sommet le plus éloigné (ou presque) du premier.
+        start, end = 'S0', 'S%s' % (n - 1)
+
+        mesures = []
+        if n <= args.max_ancien:
+            temps, d1 = chronometrer(ancien_plus_court_chemin, graphe, start, end)
+            mesures.append(('minimum des sommets visités', temps))
+        temps, adjacence = chronometrer(graphe.adjacency)
+        mesures.append(('tableaux d\'adjacence', temps))
+        temps, (d2, chemins) = chronometrer(graphe.shortest_path, start, end)
+        mesures.append(('tas binaire (avec tableaux)', temps))
+        if n <= args.max_ancien:
+            assert d1 == d2
+        afficher('Plus court chemin de %s à %s' % (start, end), mesures)
+
+        mesures = []
+        if n <= args.max_ancien:
+            temps, c1 = chronometrer(ancienne_connexite, graphe)
+            mesures.append(('ancienne connexité', temps))
+        temps, c2 = chronometrer(lambda: graphe.connected)
+        mesures.append(('parcours en largeur', temps))
+        if n <= args.max_ancien:
+            assert c1 == c2
+        afficher('Connexité', mesures)
+
+        mesures = []
+        if n <= args.max_ancien:
+            temps, c1 = chronometrer(ancien_coloriage, graphe)
+            mesures.append(('Welsh & Powell (ancien)', temps))
+        temps, c2 = chronometrer(graphe.coloring)
+        mesures.append(('Welsh & Powell', temps))
+        if n <= args.max_ancien:
+            assert c1 == c2
+        temps, c3 = chronometrer(graphe.coloring, algorithm='DSATUR')
+        mesures.append(('DSATUR', temps))
+        afficher('Coloriage (%s et %s couleurs)' % (len(c2), len(c3)), mesures)
+
+        eulerien = graphe_eulerien(n)
+        temps, chaine = chronometrer(eulerien.eulerian_trail)
+        afficher('Chaîne eulérienne (%s arêtes)' % (len(chaine) - 1),
+                 [('Hierholzer', temps)])
+
+    n, longueur = args.chemins
+    graphe = graphe_aleatoire(n, degre_moyen=4)
+    mesures = []
+    temps, M1 = chronometrer(lambda: ancienne_matrice(graphe)**longueur)
+    mesures.append(('puissance de la matrice sympy', temps))
+    temps, M2 = chronometrer(graphe.paths_matrix, longueur)
+    mesures.append(('matrices creuses', temps))
+    assert M1 == M2
+    afficher('Chemins de longueur %s (%s sommets)' % (longueur, n), mesures)
+
+    for n in args.disposition:
+        positions = positions_initiales(n)
+        mesures = []
+        if n <= args.max_ancien:
+            temps, f1 = chronometrer(repulsion_exacte, positions, 1/n)
+            mesures.append(('répulsion exacte', temps))
+        temps, f2 = chronometrer(repulsion_barnes_hut, positions, 1/n)
+        mesures.append(('répulsion (Barnes & Hut)', temps))
+        afficher('Répulsion entre %s sommets' % n, mesures)
+        temps, resultat = chronometrer(disposition, graphe_aleatoire(n, degre_moyen=3))
+        afficher('Disposition de %s sommets' % n, [('disposition complète', temps)])
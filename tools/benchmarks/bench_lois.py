@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#   Benchmark : lois de probabilité      #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare le calcul symbolique (sympy.stats) et le calcul numérique
+(mathlib.lois) des fonctions `binomial()` et `normal()`."""
+
+import argparse
+
+import numpy
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.mathlib.custom_functions import binomial, normal
+from wxgeometrie.mathlib import lois
+
+
+def binomiales(n, exact):
+    p = .37
+    esperance = int(n*p)
+    return [binomial(esperance - k, esperance + k, n, p, exact=exact).evalf()
+            if exact else binomial(esperance - k, esperance + k, n, p)
+            for k in range(0, 10)]
+
+
+def normales(nombre, exact):
+    return [(normal(-k/10, k/5, 3, 2, exact=exact).evalf() if exact
+             else normal(-k/10, k/5, 3, 2)) for k in range(nombre)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, nargs='+', default=[10, 50, 100],
+                        help="paramètres n testés pour la loi binomiale (mode symbolique)")
+    args = parser.parse_args()
+
+    for n in args.n:
+        mesures = []
+        temps, symbolique = chronometrer(binomiales, n, True)
+        mesures.append(('sympy.stats', temps))
+        lois._cache_binomiales.vider()
+        temps, numerique = chronometrer(binomiales, n, False)
+        mesures.append(('numérique (1er appel)', temps))
+        temps, numerique = chronometrer(binomiales, n, False, repetitions=5)
+        mesures.append(('numérique (tables en cache)', temps))
+        ecart = max(abs(float(a) - float(b)) for a, b in zip(symbolique, numerique))
+        afficher('10 appels à binomial(a, b, %s, 0.37) - écart max : %.1e' % (n, ecart), mesures)
+
+    for n in (10000, 10**6):
+        mesures = []
+        temps, numerique = chronometrer(binomiales, n, False)
+        mesures.append(('numérique', temps))
+        afficher('10 appels à binomial(a, b, %s, 0.37)' % n, mesures)
+
+    mesures = []
+    temps, symbolique = chronometrer(normales, 20, True)
+    mesures.append(('sympy.stats', temps))
+    temps, numerique = chronometrer(normales, 20, False, repetitions=5)
+    mesures.append(('numérique', temps))
+    ecart = max(abs(float(a) - float(b)) for a, b in zip(symbolique, numerique))
+    afficher('20 appels à normal(a, b, 3, 2) - écart max : %.1e' % ecart, mesures)
+
+    mesures = []
+    bornes = numpy.linspace(-5, 5, 10**5)
+    temps, _ = chronometrer(normal, bornes, bornes + 1, repetitions=3)
+    mesures.append(('normal()', temps))
+    temps, _ = chronometrer(binomial, bornes*100 + 3000, bornes*100 + 3100, 10000, .3, repetitions=3)
+    mesures.append(('binomial(..., 10000, 0.3)', temps))
+    afficher('Calcul vectorisé sur %s couples de bornes' % len(bornes), mesures)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#  Benchmark : simulation d'expériences  #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare l'évaluation expérience par expérience (ancienne implémentation
+de `Statistiques.experience()`) et la simulation par lots."""
+
+import argparse
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.modules.statistiques.simulation import DIC, simuler
+
+
+FORMULES = ['int(6*rand())+1', 'alea(2) + alea(2)', 'de(2)', 'sondage(40, 500)',
+            'sqrt(rand()) < .5']
+
+
+def ancienne_experience(formule, n):
+    effectifs = {}
+    for valeur in [eval(formule, DIC) for i in range(n)]:
+        effectifs[valeur] = effectifs.get(valeur, 0) + 1
+    return effectifs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=100000,
+                        help="nombre d'expériences")
+    args = parser.parse_args()
+
+    for formule in FORMULES:
+        mesures = []
+        temps, _ = chronometrer(ancienne_experience, formule, args.n)
+        mesures.append(('expérience par expérience', temps))
+        temps, _ = chronometrer(simuler, formule, args.n, repetitions=3)
+        mesures.append(('par lots', temps))
+        temps, _ = chronometrer(simuler, formule, 100*args.n)
+        mesures.append(('par lots (x100 expériences)', temps))
+        afficher('%s expériences : %s' % (args.n, formule), mesures)
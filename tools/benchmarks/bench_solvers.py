@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#     Benchmark : résolution d'inéquations
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Mesure le temps de résolution des inéquations proposées par les modules
+d'exercices (tableaux de signes, inéquations produits et quotients)."""
+
+import re
+import random
+import argparse
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie import param
+from wxgeometrie.mathlib.solvers import resoudre
+
+
+# Niveaux des modules `exercice_tableau_signes` et `exercice_inequations_produits`.
+NIVEAUX = ["n*x+z", "-n*x+q", "1|q*x+z", "z*x+z,z*x+z", "z*x+q|z*x+z",
+           "z*x+z,z*x+z|z*x+z", "z*x+z,z*x+z|z*x+z,z*x+z",
+           "-n,z*x+z|-x,(z*x+z)**2"]
+
+# Inéquations plus difficiles (cf. mathlib/tests/test_solvers.py).
+DIVERS = ['3*x^2-5*x-2<=0', 'sqrt(x+3)+x-5>=0', 'sqrt(x^2-3)<=5',
+          'exp(x^2)-x^2-1>=0', 'ln(x)<ln(-2*x+1)', 'sin(2*x)<1/2',
+          '(x-1)*(x+2)*exp(x)/((x-3)*sqrt(x+5))>=0']
+
+
+def _naturel(m):
+    return str(random.randint(2, 15))
+
+def _relatif(m):
+    return str((2*random.randint(0, 1) - 1)*random.randint(2, 15))
+
+def _rationnel(m):
+    while True:
+        p = random.randint(2, 7)
+        q = random.randint(2, 7)
+        if p%q:
+            break
+    return '(%s/%s)' % ((2*random.randint(0, 1) - 1)*p, q)
+
+
+def generer_inequation(pattern):
+    expression = re.sub('n', _naturel, pattern)
+    expression = re.sub('z', _relatif, expression)
+    expression = re.sub('q', _rationnel, expression)
+    expression = expression.replace('+-', '-').replace('-+', '-')
+    num, den = (expression.split('|') if '|' in expression else (expression, '1'))
+    num = '*'.join('(%s)' % facteur for facteur in num.split(','))
+    den = '*'.join('(%s)' % facteur for facteur in den.split(','))
+    return '(%s)/(%s)%s0' % (num, den, random.choice(('>', '>=', '<', '<=')))
+
+
+def inequations(nombre, graine=0):
+    random.seed(graine)
+    liste = []
+    for pattern in NIVEAUX:
+        liste.extend(generer_inequation(pattern) for i in range(nombre))
+    return liste + DIVERS
+
+
+def tout_resoudre(liste):
+    return [str(resoudre(inequation)) for inequation in liste]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--nombre', type=int, default=5,
+                        help="nombre d'inéquations générées par niveau")
+    parser.add_argument('-p', '--processus', type=int, default=4,
+                        help="nombre de processus pour le mode parallèle")
+    args = parser.parse_args()
+
+    liste = inequations(args.nombre)
+    param.debug = False
+    mesures = []
+    param.processus_solveurs = 0
+    temps, reference = chronometrer(tout_resoudre, liste)
+    mesures.append(('séquentiel', temps))
+    param.processus_solveurs = args.processus
+    # Premier passage pour démarrer les processus.
+    resoudre(liste[-1])
+    temps, resultats = chronometrer(tout_resoudre, liste)
+    assert resultats == reference
+    mesures.append(('%s processus' % args.processus, temps))
+    afficher('Résolution de %s inéquations' % len(liste), mesures)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#  Benchmark : indicateurs statistiques  #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare le calcul des indicateurs affichés par le module Statistiques
+(moyenne, variance, médiane, quartiles, déciles) : ancienne implémentation
+(un tri et un parcours par indicateur) et index de la série (`Serie`).
+
+Compare également le calcul des effectifs des classes d'un histogramme."""
+
+import argparse
+
+import numpy
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.modules.statistiques.serie import Serie
+
+
+def tile(donnees, k, i):
+    somme = 0
+    objectif = i/k*sum(donnees.values())
+    for val, effectif in sorted(donnees.items()):
+        somme += effectif
+        if somme >= objectif:
+            return val
+
+
+def anciens_indicateurs(donnees):
+    total = sum(donnees.values())
+    moyenne = sum(eff*val for val, eff in donnees.items())/total
+    variance = sum(eff*val**2 for val, eff in donnees.items())/total - moyenne**2
+    return ([moyenne, variance, tile(donnees, 2, 1)]
+            + [tile(donnees, k, i) for k, i in ((10, 1), (4, 1), (4, 3), (10, 9))])
+
+
+def anciens_effectifs(donnees, classes):
+    return [sum(effectif for valeur, effectif in donnees.items() if a <= valeur < b)
+            for a, b in classes]
+
+
+def indicateurs(serie):
+    return ([serie.moyenne(), serie.variance(), serie.mediane()]
+            + [serie.tile(k, i) for k, i in ((10, 1), (4, 1), (4, 3), (10, 9))])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, nargs='+', default=[10**4, 10**6],
+                        help="nombre de valeurs distinctes")
+    args = parser.parse_args()
+
+    for n in args.n:
+        valeurs = numpy.random.rand(n)*1000
+        effectifs = numpy.random.randint(1, 10, n)
+        donnees = dict(zip(valeurs.tolist(), effectifs.tolist()))
+        mesures = []
+        temps, _ = chronometrer(anciens_indicateurs, donnees)
+        mesures.append(('un parcours par indicateur', temps))
+        temps, serie = chronometrer(Serie, donnees)
+        mesures.append(('construction de l\'index', temps))
+        temps, _ = chronometrer(indicateurs, serie, repetitions=5)
+        mesures.append(('indicateurs (index existant)', temps))
+        afficher('%s valeurs distinctes' % n, mesures)
+
+        classes = [(a, a + 20) for a in range(0, 1000, 20)]
+        mesures = []
+        temps, _ = chronometrer(anciens_effectifs, donnees, classes)
+        mesures.append(('un parcours par classe', temps))
+        temps, _ = chronometrer(serie.effectifs_classes, classes, repetitions=5)
+        mesures.append(('recherche dichotomique (index existant)', temps))
+        afficher('%s classes, %s valeurs distinctes' % (len(classes), n), mesures)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#   Benchmark : surfaces                 #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare le calcul de la grille du module Surfaces : évaluation directe
+sur toute la grille (ancienne implémentation), évaluation par blocs,
+et lecture du cache. Mesure aussi la mémoire utilisée au maximum."""
+
+import argparse
+import tracemalloc
+
+from numpy import meshgrid
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.pylib import fullrange
+from wxgeometrie.pylib.securite import dictionnaire_builtins
+from wxgeometrie.mathlib import end_user_functions
+from wxgeometrie.mathlib.parsers import traduire_formule
+from wxgeometrie.modules.surfaces.maillage import surface, pas_decimation, CalculSurface
+
+EQUATION = 'sin(x)*cos(y) + exp(-(x^2 + y^2)/10) - x*y/25'
+
+
+def ancienne_surface(pas):
+    X, Y = meshgrid(fullrange(-5, 5, pas), fullrange(-5, 5, pas))
+    dico = vars(end_user_functions).copy()
+    dico.update({'x': X, 'X': X, 'Y': Y, 'y': Y})
+    dico.update(dictionnaire_builtins)
+    formule = traduire_formule(EQUATION, dico)
+    return X, Y, eval(formule, dico) + 0*X
+
+
+def memoire(f, *args):
+    "Exécute f(*args), et retourne la mémoire maximale utilisée (en Mo)."
+    tracemalloc.start()
+    f(*args)
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pic/2**20
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-p', type=float, nargs='+', default=[.02, .005],
+                        help="pas de la grille (entre -5 et 5)")
+    args = parser.parse_args()
+
+    for pas in args.p:
+        mesures = []
+        temps, _ = chronometrer(ancienne_surface, pas)
+        mesures.append(('évaluation directe', temps))
+        temps, (X, Y, Z) = chronometrer(surface, EQUATION, -5, 5, pas, -5, 5, pas)
+        mesures.append(('évaluation par blocs', temps))
+        temps, _ = chronometrer(surface, EQUATION, -5, 5, pas, -5, 5, pas, repetitions=5)
+        mesures.append(('cache', temps))
+        # Calcul en arrière-plan : délai avant le premier affichage (aperçu 40x40).
+        calcul = CalculSurface(EQUATION, -5, 5, pas*1.0002, -5, 5, pas*1.0002, apercu=(.25, .25))
+        calcul.executer()
+        mesures.append(('aperçu (arrière-plan)', calcul.durees[0]))
+        afficher('Grille %sx%s' % Z.shape, mesures)
+        print('Mémoire maximale : %.0f Mo (directe), %.0f Mo (par blocs)'
+              % (memoire(ancienne_surface, pas), memoire(surface, EQUATION, -5, 5, pas, -5, 5, pas*1.0001)))
+        rstride, cstride = pas_decimation(Z.shape, 2500)
+        print('Polygones affichés pendant la rotation : %s au lieu de %s\n'
+              % (((Z.shape[0] - 1)//rstride + 1)*((Z.shape[1] - 1)//cstride + 1),
+                 (Z.shape[0] - 1)*(Z.shape[1] - 1)))
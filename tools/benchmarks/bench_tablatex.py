@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#   Benchmark : tableaux par lots        #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compare la génération d'une série de tableaux (variations, signes),
+un par un, et par lots : plusieurs processus, puis lecture du cache.
+
+Compare aussi le tri des racines à l'aide de valeurs approchées à 200 chiffres,
+et à l'aide d'encadrements affinés à la demande (module `racines`),
+sur quelques polynômes puis sur les tests de tabvar et tabsign.
+
+Mesure enfin le temps de génération d'un tableau de variations lorsque
+seules les options d'affichage changent (l'étude de la fonction est réutilisée),
+et celui d'un long tableau de valeurs (images calculées par numpy, ou une par une)."""
+
+import argparse
+import os
+import sys
+import tempfile
+import unittest
+
+from sympy import Symbol
+from sympy.core.cache import clear_cache
+
+from benchlib import chronometrer, afficher
+
+from wxgeometrie.mathlib.sympy_functions import solve
+from wxgeometrie.mathlib.memoisation import vider_caches
+from wxgeometrie.modules.tablatex import racines, analyse
+from wxgeometrie.modules.tablatex.tabvar import tabvar
+from wxgeometrie.modules.tablatex.tabval import tabval, _image
+from wxgeometrie.modules.tablatex.lot import generer, generer_lot, CacheDisque
+
+x = Symbol('x')
+
+POLYNOMES = [x**3 - 3*x + 1, x**3 - 7*x + 3, x**4 - 10*x**2 + 1, 8*x**3 - 6*x - 1]
+
+
+def specifications(n):
+    "`n` tableaux différents, chacun demandé deux fois."
+    tableaux = []
+    for k in range(1, n + 1):
+        tableaux.append(('tabvar', 'f(x)=x^3-%sx+1' % (3*k)))
+        tableaux.append(('tabsign', '(x-%s)(2x+%s)/(x+%s)' % (k, k + 1, 2*k + 1)))
+    return 2*tableaux[:n]
+
+
+def un_par_un(tableaux):
+    return [generer(*tableau) for tableau in tableaux]
+
+
+def ancien_tri(liste_racines):
+    ordre = sorted(liste_racines, key=(lambda r: r.evalf(200)))
+    return [(r.evalf(200) > 0) for r in ordre]
+
+
+def nouveau_tri(liste_racines):
+    racines._cache.vider()
+    ordre = racines.trier(liste_racines)
+    return [(racines.signe(r) > 0) for r in ordre]
+
+
+def tests_tablatex(precision):
+    "Exécute les tests de tabvar et tabsign, avec la précision initiale `precision`."
+    clear_cache()
+    vider_caches()
+    racines._cache.vider()
+    racines.PRECISION_INITIALE = precision
+    dossier = os.path.join(os.path.dirname(racines.__file__), 'tests')
+    tests = unittest.defaultTestLoader.discover(dossier, pattern='test_tab[sv][ia]*.py')
+    resultat = unittest.TextTestRunner(stream=open(os.devnull, 'w')).run(tests)
+    assert resultat.wasSuccessful()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, nargs='+', default=[20],
+                        help="nombre de tableaux différents")
+    parser.add_argument('-j', type=int, default=None, help="nombre de processus")
+    args = parser.parse_args()
+
+    for n in args.n:
+        tableaux = specifications(n)
+        with tempfile.TemporaryDirectory() as dossier:
+            cache = CacheDisque(dossier)
+            mesures = []
+            temps, attendus = chronometrer(un_par_un, tableaux)
+            mesures.append(('un par un', temps))
+            temps, (codes, erreurs) = chronometrer(generer_lot, tableaux, processus=args.j, cache=cache)
+            assert codes == attendus and not erreurs
+            mesures.append(('par lots', temps))
+            temps, (codes, erreurs) = chronometrer(generer_lot, tableaux, cache=cache)
+            assert codes == attendus and not erreurs
+            mesures.append(('par lots (cache)', temps))
+            afficher('%s tableaux (%s différents)' % (len(tableaux), n), mesures)
+
+    liste = [solve(polynome, x) for polynome in POLYNOMES]
+    mesures = []
+    temps, attendu = chronometrer(lambda: [ancien_tri(r) for r in liste])
+    mesures.append(('evalf(200)', temps))
+    temps, resultat = chronometrer(lambda: [nouveau_tri(r) for r in liste])
+    assert resultat == attendu
+    mesures.append(('encadrements', temps))
+    afficher('Tri et signe des racines de %s polynômes' % len(POLYNOMES), mesures)
+
+    mesures = []
+    for precision in (200, 15):
+        temps, _ = chronometrer(tests_tablatex, precision)
+        mesures.append(('précision initiale : %s' % precision, temps))
+    afficher('Tests de tabvar et tabsign', mesures)
+
+    fonction = r"f(x) = 0,5x + \text{e}^{-0,5x + 0,4}"
+    analyse._cache.vider()
+    mesures = []
+    temps, _ = chronometrer(tabvar, fonction, decimales=2, approche=True)
+    mesures.append(('1re génération', temps))
+    temps, _ = chronometrer(tabvar, fonction, decimales=3, approche=True, derivee=False)
+    mesures.append(('options modifiées', temps))
+    afficher('Tableau de variations de %s' % fonction, mesures)
+
+    fonction = 'f(x)=sin(x)*exp(-x/10): 0.001: 0,0.001..20'
+    # NB: le module tabval est masqué par la fonction du même nom.
+    module_tabval = sys.modules['wxgeometrie.modules.tablatex.tabval']
+    evaluer = module_tabval._evaluer
+    mesures = []
+    module_tabval._evaluer = lambda code, variable, valeurs: [_image(code, variable, val) for val in valeurs]
+    temps, attendu = chronometrer(tabval, fonction, colonnes_max=50)
+    mesures.append(('une par une', temps))
+    module_tabval._evaluer = evaluer
+    temps, resultat = chronometrer(tabval, fonction, colonnes_max=50)
+    assert resultat == attendu
+    mesures.append(('numpy', temps))
+    afficher('Tableau de valeurs (20001 colonnes)', mesures)
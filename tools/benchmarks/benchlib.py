@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------##
+#              WxGeometrie               #
+#          Benchmarks utilities          #
+##--------------------------------------##
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Outils communs aux scripts de mesure de performances.
+
+Chaque script de ce dossier se lance directement, depuis n'importe quel
+répertoire :
+
+    $ python3 tools/benchmarks/bench_solvers.py
+"""
+
+from os.path import split, realpath, abspath
+from timeit import default_timer as clock
+import sys
+
+_module_path = split(realpath(sys._getframe().f_code.co_filename))[0]
+ROOTDIR = abspath(_module_path + '/../..') # /.../nom_du_projet/
+if ROOTDIR not in sys.path:
+    sys.path.insert(0, ROOTDIR)
+
+
+def chronometrer(fonction, *args, repetitions=1, **kw):
+    """Exécute `repetitions` fois `fonction(*args, **kw)`.
+
+    Retourne le couple (meilleur temps en secondes, dernier résultat)."""
+    meilleur = float('inf')
+    for i in range(repetitions):
+        t0 = clock()
+        resultat = fonction(*args, **kw)
+        meilleur = min(meilleur, clock() - t0)
+    return meilleur, resultat
+
+
+def afficher(titre, mesures):
+    """Affiche un tableau de mesures.
+
+    `mesures` est une liste de couples (libellé, temps en secondes).
+    Le premier temps sert de référence pour calculer les rapports."""
+    print('\n' + titre)
+    print('-'*len(titre))
+    reference = mesures[0][1] if mesures else None
+    largeur = max(len(libelle) for libelle, temps in mesures)
+    for libelle, temps in mesures:
+        rapport = (reference/temps if temps else float('inf'))
+        print('%s  %10.4f s   x%.2f' % (libelle.ljust(largeur), temps, rapport))
@@ -220,9 +220,15 @@ class Canvas(FigureCanvasAgg):
     def dessiner_ligne(self, *args, **kw):
         return self.graph.ajouter_ligne(*args, **kw)
 
+    def dessiner_lignes(self, *args, **kw):
+        return self.graph.ajouter_lignes(*args, **kw)
+
     def dessiner_polygone(self, *args, **kw):
         return self.graph.ajouter_polygone(*args, **kw)
 
+    def dessiner_polygones(self, *args, **kw):
+        return self.graph.ajouter_polygones(*args, **kw)
+
     def dessiner_texte(self, *args, **kw):
         return self.graph.ajouter_texte(*args, **kw)
 
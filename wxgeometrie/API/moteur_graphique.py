@@ -27,7 +27,7 @@ from matplotlib.colors import colorConverter
 from matplotlib.transforms import Bbox
 from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.lines import Line2D
-from matplotlib.collections import LineCollection
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.patches import Polygon, Circle, FancyArrowPatch, FancyBboxPatch
 from matplotlib.text import Text
 from matplotlib.axes import Axes
@@ -768,6 +768,20 @@ class Moteur_graphique(object):
         return self._ajouter_objet(self.polygone(x, y, pixel, facecolor=facecolor, **kw))
 
 
+    def polygones(self, polygones=(), **kw):
+        """Collection de polygones, plus rapide à créer et à afficher
+        qu'une série de polygones indépendants.
+
+        `polygones` est une liste de listes de sommets [(x0, y0), (x1, y1), ...].
+        Les couleurs peuvent être précisées pour chaque polygone (`facecolors`)."""
+        # Comme pour `polygone()`, pas de bordure par défaut.
+        kw.setdefault('edgecolors', 'none')
+        return PolyCollection(polygones, **kw)
+
+    def ajouter_polygones(self, polygones=(), **kw):
+        return self._ajouter_objet(self.polygones(polygones, **kw))
+
+
     def texte(self, x=0, y=0, txt='hello !', pixel=False, **kw):
         if pixel:
             x, y = self.canvas.pix2coo(x, y)
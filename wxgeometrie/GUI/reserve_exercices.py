@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#          Réserve d'exercices                #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Exercices générés à l'avance, pour les modules d'exercices.
+
+Générer un exercice (tirage aléatoire, puis résolution avec sympy pour
+obtenir les réponses attendues) peut prendre un temps non négligeable.
+Une `Reserve` conserve donc, pour chaque niveau (ou plus généralement
+pour chaque clé), quelques exercices déjà générés : passer au niveau
+suivant consiste simplement à en prendre un.
+
+Les exercices sont générés dans un processus distinct (voir
+`param.processus_exercices`), et la réserve est complétée au fur
+et à mesure qu'elle est utilisée. Elle est enregistrée sur le disque
+(dans le dossier 'exercices' de `param.emplacements['cache']`), afin
+d'être disponible dès le lancement suivant.
+
+Un exercice est décrit par des objets simples (chaînes, nombres, listes,
+dictionnaires) : ils doivent pouvoir être transmis entre les processus,
+et enregistrés au format JSON.
+
+Les exercices générés sont reçus dans un thread secondaire : ce module
+ne doit donc manipuler aucun objet de l'interface graphique.
+"""
+
+import json
+import os
+import threading
+
+from ..pylib import path2, print_error
+from .. import param
+
+
+_pool = None
+
+
+def _pool_processus():
+    global _pool
+    if _pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+        # Pas de `fork()` : le processus fils hériterait de l'état de Qt et
+        # des verrous des autres threads (leur état y serait indéterminé).
+        _pool = ProcessPoolExecutor(param.processus_exercices,
+                                    mp_context=get_context('spawn'))
+    return _pool
+
+
+class Reserve(object):
+    """Exercices déjà générés, classés par clé.
+
+    `generer` est la fonction qui génère un exercice à partir d'une clé
+    (par exemple, le format de l'expression d'un niveau) ; elle doit être
+    définie au niveau d'un module, pour pouvoir être exécutée dans
+    un autre processus.
+    Par défaut, la réserve est enregistrée dans le fichier `nom`.json
+    du dossier 'exercices' de `param.emplacements['cache']`.
+    """
+
+    def __init__(self, nom, generer, taille=None, fichier=None):
+        if taille is None:
+            taille = param.taille_reserve_exercices
+        if fichier is None:
+            fichier = path2(param.emplacements['cache'] + '/exercices/%s.json' % nom)
+        self.nom = nom
+        self.generer = generer
+        self.taille = taille
+        self.fichier = fichier
+        self._exercices = {}
+        # Nombre d'exercices en cours de génération, pour chaque clé.
+        self._en_cours = {}
+        self._verrou = threading.RLock()
+        self.charger()
+
+    def __len__(self):
+        with self._verrou:
+            return sum(len(exercices) for exercices in self._exercices.values())
+
+    def disponibles(self, cle):
+        "Nombre d'exercices disponibles pour la clé `cle`."
+        with self._verrou:
+            return len(self._exercices.get(cle, ()))
+
+    def charger(self):
+        """Charge la réserve enregistrée sur le disque.
+
+        Une réserve enregistrée par une autre version du logiciel est ignorée."""
+        try:
+            with open(self.fichier, encoding='utf-8') as f:
+                contenu = json.load(f)
+        except (OSError, ValueError):
+            return
+        if contenu.get('version') != param.version:
+            return
+        with self._verrou:
+            for cle, exercices in contenu.get('exercices', {}).items():
+                self._exercices.setdefault(cle, []).extend(exercices)
+
+    def enregistrer(self):
+        with self._verrou:
+            contenu = {'version': param.version, 'exercices': self._exercices}
+            texte = json.dumps(contenu, ensure_ascii=False)
+        try:
+            os.makedirs(os.path.dirname(self.fichier), exist_ok=True)
+            # Écriture dans un fichier temporaire, puis renommage (cf. `tablatex.lot.CacheDisque`).
+            temporaire = '%s.%s' % (self.fichier, os.getpid())
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                f.write(texte)
+            os.replace(temporaire, self.fichier)
+        except OSError:
+            print_error()
+
+    def prendre(self, cle):
+        """Retourne un exercice correspondant à la clé `cle`.
+
+        S'il n'y en a pas en réserve, l'exercice est généré immédiatement.
+        Dans tous les cas, la réserve est ensuite complétée en arrière-plan."""
+        with self._verrou:
+            exercices = self._exercices.get(cle)
+            exercice = (exercices.pop(0) if exercices else None)
+        if exercice is None:
+            exercice = self.generer(cle)
+        else:
+            # L'exercice ne doit pas être proposé à nouveau au prochain lancement.
+            self.enregistrer()
+        self.completer(cle)
+        return exercice
+
+    def completer(self, *cles):
+        "Lance la génération des exercices manquants pour chacune des clés `cles`."
+        if param.processus_exercices < 1:
+            return
+        for cle in cles:
+            with self._verrou:
+                manquants = (self.taille - len(self._exercices.get(cle, ()))
+                             - self._en_cours.get(cle, 0))
+                if manquants <= 0:
+                    continue
+                self._en_cours[cle] = self._en_cours.get(cle, 0) + manquants
+            for i in range(manquants):
+                future = _pool_processus().submit(self.generer, cle)
+                future.add_done_callback(lambda future, cle=cle: self._recevoir(cle, future))
+
+    def _recevoir(self, cle, future):
+        # Appelée dans un thread secondaire, lorsque la génération d'un exercice est terminée.
+        try:
+            exercice = future.result()
+        except Exception:
+            exercice = None
+            print_error()
+        with self._verrou:
+            self._en_cours[cle] -= 1
+            if exercice is not None:
+                self._exercices.setdefault(cle, []).append(exercice)
+            if not any(self._en_cours.values()):
+                self.enregistrer()
@@ -22,7 +22,7 @@
 #    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
 from itertools import chain
-from numpy import isnan, isinf, sign, arange, inf, append
+from numpy import isnan, isinf, sign, arange, inf, empty, copyto
 
 from sympy import oo
 
@@ -32,6 +32,7 @@ from .contexte import contexte
 from .routines import distance_segment
 from .. import param
 from ..pylib import print_error
+from ..mathlib.intervalles import Grille
 
 
 def inf_or_nan(x):
@@ -93,87 +94,110 @@ class Courbe(Courbe_generique):
 
     def __init__(self, fonction, **styles):
         self.__fonction = fonction = Ref(fonction)
+        # Grille d'échantillonnage, conservée tant que la fenêtre et le pas
+        # ne changent pas (cf. `_preparer_grille()`).
+        self.__grille = None
         Courbe_generique.__init__(self, **styles)
 
+    def _preparer_grille(self, fenetre, pas):
+        """Retourne la grille d'échantillonnage de la fonction.
+
+        Les tableaux `_xarray` et `_yarray` sont alloués une seule fois par grille,
+        puis réutilisés d'un tracé à l'autre."""
+        fonction = self.__fonction
+        # Comme pour zip(), on ignore les morceaux incomplètement définis.
+        n = min(len(fonction._Fonction__fonctions_numpy), len(fonction.style('extremites_cachees')))
+        unions = fonction._Fonction__unions[:n]
+        grille = self.__grille
+        if grille is None or not grille.compatible(unions, fenetre[0], fenetre[1], pas):
+            grille = self.__grille = Grille(unions, fenetre[0], fenetre[1], pas)
+            self._xarray = empty(len(grille))
+            self._yarray = empty(len(grille))
+        # Les abscisses aux bornes peuvent avoir été modifiées lors du tracé précédent
+        # (cf. `supprimer_valeurs_extremes()`).
+        copyto(self._xarray, grille.valeurs)
+        return grille
+
     def _creer_figure(self):
 ##        self.__canvas__.graph.supprimer(self._representation)
         self._representation = []
         fenetre = self.feuille.fenetre_reellement_affichee()
         pas = self.canvas.pas()
-        self._xarray = ()
-        self._yarray = ()
+        grille = self._preparer_grille(fenetre, pas)
         ancien_intervalle = None
 #        derniere_valeur = None
 #        derniere_fonction = None
 #        ancien_x = None
 #        ancien_y = None
-        for fonction, union, e_cach in zip(self.__fonction._Fonction__fonctions,
-                                                       self.__fonction._Fonction__unions,
-                                                       self.__fonction.style('extremites_cachees')):
-            for intervalle in union.intervalles:
-                x = intervalle.asarray(fenetre[0], fenetre[1], pas)[0]
-                if len(x):
+        # Les morceaux de courbe ne sont évalués que sur des tableaux numpy.
+        fonctions_numpy = self.__fonction._Fonction__fonctions_numpy
+        fonctions = self.__fonction._Fonction__fonctions
+        extremites_cachees = self.__fonction.style('extremites_cachees')
+        # _xarray et _yarray ne servent pas pour la représentation graphique,
+        # mais pour ._distance_inf() uniquement.
+        # Chaque morceau de courbe en est une vue (pas de copie).
+        for (k, intervalle, _, _), x, y in zip(grille.morceaux,
+                                                 grille.vues(self._xarray),
+                                                 grille.vues(self._yarray)):
+            fonction = fonctions_numpy[k]
+            e_cach = extremites_cachees[k]
+            if len(x):
 #TODO: cas où len(x) == 1 (et donc, x[1] n'existe pas)
-                    y = fonction(x)
-
-                    x0 = x[0]
-                    xN = x[-1]
-                    y0 = y[0]
-                    yN = y[-1]
-
-                    # Bug de wxAgg pour des valeurs trop importantes, ou pour NaN
-                    x, y = self.supprimer_valeurs_extremes(x, y, fonction)
-
-                    self._representation.append(self.rendu.ligne(x, y,
-                        color = self.style("couleur"),
-                        linestyle = self.style("style"),
-                        linewidth = self.style("epaisseur"),
-                        zorder = self.style("niveau"),
-                        ))
-                    # _xarray et _yarray ne servent pas pour la représentation graphique,
-                    # mais pour ._distance_inf() uniquement
-                    self._xarray = append(self._xarray,  x)
-                    self._yarray = append(self._yarray,  y)
-
-                    if fenetre[0] < intervalle.inf < fenetre[1]:
-                        if ancien_intervalle is None:
-                            self._creer_debut_morceau(x, y, intervalle, e_cach)
-                        else:
-                            print(intervalle, y[0], abs(y[0] - ancien_y[-1]), abs(x[0] - ancien_x[-1]), contexte['tolerance'] , pas)
-                            fusion = abs(x0 - ancien_xN) < contexte['tolerance'] \
-                                    and (abs(y0 - ancien_yN) < contexte['tolerance']  or (isnan(y0) and isnan(ancien_yN)))
-                            if fusion:
-                                #Fusion
-                                print('Fusion', y0)
-                                if isnan(y0):
-                                    print('Fusion avancée')
-                                    for i in range(10, 70, 10):
-                                        try:
-                                            val1 = ancienne_fonction(ancien_xN - 8**(-i))
-                                            val2 = ancienne_fonction(x0 + 8**(-i))
-                                            if abs(val1 - val2) < contexte['tolerance']:
-                                                self._append_point(x0, val1, plein = False)
-                                                break
-                                        except (ZeroDivisionError, ValueError):
-                                            print_error()
-                                            fusion = False
+                y[...] = fonction(x)
+
+                x0 = x[0]
+                xN = x[-1]
+                y0 = y[0]
+                yN = y[-1]
+
+                # Bug de wxAgg pour des valeurs trop importantes, ou pour NaN
+                x, y = self.supprimer_valeurs_extremes(x, y, fonction)
+
+                self._representation.append(self.rendu.ligne(x, y,
+                    color = self.style("couleur"),
+                    linestyle = self.style("style"),
+                    linewidth = self.style("epaisseur"),
+                    zorder = self.style("niveau"),
+                    ))
+                if fenetre[0] < intervalle.inf < fenetre[1]:
+                    if ancien_intervalle is None:
+                        self._creer_debut_morceau(x, y, intervalle, e_cach)
+                    else:
+                        print(intervalle, y[0], abs(y[0] - ancien_y[-1]), abs(x[0] - ancien_x[-1]), contexte['tolerance'] , pas)
+                        fusion = abs(x0 - ancien_xN) < contexte['tolerance'] \
+                                and (abs(y0 - ancien_yN) < contexte['tolerance']  or (isnan(y0) and isnan(ancien_yN)))
+                        if fusion:
+                            #Fusion
+                            print('Fusion', y0)
+                            if isnan(y0):
+                                print('Fusion avancée')
+                                for i in range(10, 70, 10):
+                                    try:
+                                        val1 = ancienne_fonction(ancien_xN - 8**(-i))
+                                        val2 = ancienne_fonction(x0 + 8**(-i))
+                                        if abs(val1 - val2) < contexte['tolerance']:
+                                            self._append_point(x0, val1, plein = False)
                                             break
-                                    else:
+                                    except (ZeroDivisionError, ValueError):
+                                        print_error()
                                         fusion = False
-                                elif not(ancien_intervalle.sup_inclus or intervalle.inf_inclus):
-                                    print('Fusion classique')
-                                    self._append_point(x[0], y[0], plein = False)
-
-                            if not fusion:
-                                self._creer_fin_morceau(ancien_x, ancien_y, ancien_intervalle, e_cach)
-                                self._creer_debut_morceau(x, y, intervalle, e_cach)
-
-                    ancien_x = x
-                    ancien_y = y
-                    ancien_xN = xN
-                    ancien_yN = yN
-                    ancien_intervalle = intervalle
-                    ancienne_fonction = fonction
+                                        break
+                                else:
+                                    fusion = False
+                            elif not(ancien_intervalle.sup_inclus or intervalle.inf_inclus):
+                                print('Fusion classique')
+                                self._append_point(x[0], y[0], plein = False)
+
+                        if not fusion:
+                            self._creer_fin_morceau(ancien_x, ancien_y, ancien_intervalle, e_cach)
+                            self._creer_debut_morceau(x, y, intervalle, e_cach)
+
+                ancien_x = x
+                ancien_y = y
+                ancien_xN = xN
+                ancien_yN = yN
+                ancien_intervalle = intervalle
+                ancienne_fonction = fonctions[k]
         if ancien_intervalle is not None and fenetre[0] < ancien_intervalle.sup < fenetre[1]:
             self._creer_fin_morceau(ancien_x, ancien_y, ancien_intervalle, e_cach)
 
@@ -31,6 +31,7 @@ from .objet import Objet, contexte, ArgumentNonModifiable, \
 from ..pylib import is_in, property2
 from ..mathlib.intervalles import preformatage_geolib_ensemble, formatage_ensemble
 from ..mathlib.parsers import VAR_NOT_ATTR, traduire_formule
+from ..mathlib import universal_functions
 from .variables import Variable
 
 class Fonction(Objet):
@@ -123,6 +124,8 @@ class Fonction(Objet):
         # Une fonction peut être définie par morceaux
         # Liste des fonctions correspondant à chaque morceau
         self.__fonctions = None
+        # Idem, en version numpy (cf. `_compiler()`)
+        self.__fonctions_numpy = None
         # Liste des (unions d'intervalles correspondant à chaque morceau
         self.__unions = None
         # Les arguments non modifiables ne sont pas encapsulés dans des références (classe Ref)
@@ -182,6 +185,7 @@ class Fonction(Objet):
             self.__liste_expression = liste_expression
             self.__liste_ensemble = liste_ensemble
             self.__fonctions = []
+            self.__fonctions_numpy = []
             self.__unions = []
             expressions = self.__expression.split("|")
             ensembles = self.__ensemble.split("|")
@@ -194,7 +198,8 @@ class Fonction(Objet):
                 # l'image d'un tableau par la fonction doit être un tableau, et non la constante.
                 if self.__variable not in express:
                     express += "+0.*" + self.__variable
-                self.__fonctions.append(eval("lambda " + self.__variable + ":" + express, self.feuille.objets))
+                self.__fonctions.append(self._compiler(express))
+                self.__fonctions_numpy.append(self._compiler(express, numpy=True))
                 ensemb = formatage_ensemble(ensembles[i], preformatage = False)
                 self.__unions.append(eval(ensemb, self.feuille.objets))
 
@@ -213,9 +218,35 @@ class Fonction(Objet):
             self.__liste_expression = []
             self.__liste_ensemble = []
             self.__fonctions = None
+            self.__fonctions_numpy = None
             self.__unions = None
 
 
+    def _compiler(self, expression, numpy=False):
+        """Retourne une fonction python (lambda) correspondant à l'expression.
+
+        Les fonctions usuelles (sin, exp...) sont liées dès la compilation,
+        ce qui évite de les rechercher dans la feuille à chaque appel.
+
+        Si `numpy` vaut True, elles sont directement remplacées par leur
+        implémentation numpy : la fonction obtenue ne doit alors être appliquée
+        qu'à des tableaux numpy (cf. `Courbe`)."""
+        objets = self.feuille.objets
+        code = "lambda " + self.__variable + ":" + expression
+        # On vérifie que le nom n'a pas été redéfini sur la feuille.
+        noms = [nom for nom in set(re.findall(self.__re, expression))
+                if nom in universal_functions._fonctions_numpy
+                and objets.get(nom) is getattr(universal_functions, nom)]
+        if not noms:
+            return eval(code, objets)
+        if numpy:
+            fonctions = [universal_functions._fonctions_numpy[nom] for nom in noms]
+        else:
+            fonctions = [getattr(universal_functions, nom) for nom in noms]
+        # Les fonctions sont liées via une fermeture.
+        return eval("lambda " + ", ".join(noms) + ": " + code, objets)(*fonctions)
+
+
     def _set_feuille(self):
         self._compile(*self._test_dependance_circulaire(self.__expression, self.__ensemble))
         self.perime()
@@ -3,8 +3,12 @@ import os, sys
 TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../.."))
 sys.path.insert(0, TOPDIR)
 
+import math
+import numpy
+
 import tools.unittest, unittest
 from wxgeometrie.geolib import Fonction, Feuille
+from wxgeometrie.mathlib.universal_functions import sin
 
 _VAL0 = -5.156557933
 
@@ -50,3 +54,18 @@ class GeolibTest(tools.unittest.TestCase):
         self.assertEqual(g.style('extremites_cachees')[0][0].val, 5) # ([Variable(5)],)
         self.assertEqual(g.ensemble, ']0;5[')
 
+
+    def test_compilation_numpy(self):
+        f = Feuille()
+        o = f.objets
+        g = o.g = Fonction('sqrt(x)+exp(-x)*sin(x)|ln(x)', '[0;1]|]1;+oo[')
+        x = numpy.linspace(0, 5, 11)
+        for h, h_numpy in zip(g._Fonction__fonctions, g._Fonction__fonctions_numpy):
+            self.assertTrue(numpy.array_equal(h_numpy(x), h(x)))
+        # Les fonctions usuelles sont liées à la compilation.
+        fonctions = [c.cell_contents for c in g._Fonction__fonctions_numpy[0].__closure__]
+        self.assertIn(numpy.sin, fonctions)
+        fonctions = [c.cell_contents for c in g._Fonction__fonctions[0].__closure__]
+        self.assertIn(sin, fonctions)
+        self.assertRaises(ValueError, g, -1)
+        self.assertAlmostEqual(g(.5), math.sqrt(.5) + math.exp(-.5)*math.sin(.5))
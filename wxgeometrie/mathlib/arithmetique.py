@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#                Arithmétique                 #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Nombres premiers, décomposition en facteurs premiers, PGCD et PPCM.
+
+Les nombres premiers sont obtenus par un crible d'Ératosthène segmenté.
+La table (`TablePremiers`) est conservée et agrandie au besoin :
+un bit par entier impair indique s'il est premier.
+
+Pour les très grands entiers (au-delà de `LIMITE_CRIBLE` pour les tests
+de primalité, et de `LIMITE_CRIBLE`² pour la décomposition), on se rabat
+sur sympy.
+"""
+
+from functools import reduce
+import math
+import threading
+
+import numpy
+from sympy import Basic, Integer, isprime, factorint
+
+
+# Nombre d'entiers impairs traités à la fois par le crible (multiple de 8).
+TAILLE_SEGMENT = 2**18
+
+# La table est agrandie automatiquement jusqu'à cette valeur
+# (tests de primalité, décompositions).
+LIMITE_CRIBLE = 10**7
+
+
+def _isqrt(n):
+    "Partie entière de la racine carrée de n."
+    return math.isqrt(n) if hasattr(math, 'isqrt') else int(math.sqrt(n))
+
+
+class TablePremiers(object):
+    """Table des nombres premiers inférieurs à `limite`.
+
+    La table est agrandie (au moins doublée) lorsqu'on appelle `etendre()`
+    avec une valeur supérieure à `limite`."""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        # Tous les entiers strictement inférieurs à `limite` sont tabulés ;
+        # `limite` est un multiple de 16 (8 entiers impairs par octet).
+        self.limite = 0
+        # Le bit i (ordre 'little') vaut 1 si 2*i + 1 est premier.
+        self._bits = numpy.zeros(0, dtype=numpy.uint8)
+        self.premiers = numpy.zeros(0, dtype=numpy.int64)
+
+    def etendre(self, n):
+        "Agrandit la table de manière à ce qu'elle contienne tous les entiers <= n."
+        if n < self.limite:
+            return
+        with self._verrou:
+            if n < self.limite:
+                return
+            limite = max(n + 1, 2*self.limite, 2**16)
+            limite += (-limite)%16
+            base = self._premiers_impairs_jusqua(_isqrt(limite) + 1)
+            segments = []
+            nouveaux = []
+            debut = self.limite
+            while debut < limite:
+                fin = min(debut + 2*TAILLE_SEGMENT, limite)
+                # segment[i] correspond à l'entier debut + 2*i + 1
+                segment = numpy.ones((fin - debut)//2, dtype=bool)
+                for p in base:
+                    p2 = p*p
+                    if p2 >= fin:
+                        break
+                    # Plus petit multiple impair de p, supérieur à debut et à p².
+                    m = max(p2, -(-(debut + 1)//p)*p)
+                    if not m%2:
+                        m += p
+                    segment[(m - debut - 1)//2::p] = False
+                if debut == 0:
+                    segment[0] = False # 1 n'est pas premier
+                segments.append(segment)
+                nouveaux.append(2*numpy.flatnonzero(segment).astype(numpy.int64) + debut + 1)
+                debut = fin
+            if self.limite == 0:
+                nouveaux.insert(0, numpy.array([2], dtype=numpy.int64))
+            bits = numpy.packbits(numpy.concatenate(segments), bitorder='little')
+            self._bits = numpy.concatenate((self._bits, bits))
+            self.premiers = numpy.concatenate([self.premiers] + nouveaux)
+            self.limite = limite
+
+    def _premiers_impairs_jusqua(self, n):
+        "Liste des nombres premiers impairs inférieurs ou égaux à `n` (n petit)."
+        if n < self.limite:
+            premiers = self.premiers[1:numpy.searchsorted(self.premiers, n, 'right')]
+        else:
+            # Crible simple (n est de l'ordre de la racine carrée de la limite).
+            crible = numpy.ones(n + 1, dtype=bool)
+            crible[:2] = False
+            for p in range(2, _isqrt(n) + 1):
+                if crible[p]:
+                    crible[p*p::p] = False
+            premiers = numpy.flatnonzero(crible)[1:]
+        return premiers.tolist()
+
+    def __contains__(self, n):
+        "Teste si `n` est premier (`n` doit être inférieur à `limite`)."
+        if n < 3 or not n%2:
+            return n == 2
+        i = (n - 1)//2
+        return bool((self._bits[i >> 3] >> (i & 7)) & 1)
+
+    def jusqua(self, n):
+        "Tableau numpy des nombres premiers inférieurs ou égaux à `n`."
+        self.etendre(n)
+        return self.premiers[:numpy.searchsorted(self.premiers, n, 'right')]
+
+
+table = TablePremiers()
+
+
+def _entier(n):
+    "Convertit `n` en entier python, ou lève une `ValueError`."
+    entier = int(n)
+    if entier != n:
+        raise ValueError("%s n'est pas un entier." % n)
+    return entier
+
+
+def premiers_jusqua(n):
+    "Liste des nombres premiers inférieurs ou égaux à `n`."
+    return table.jusqua(_entier(n)).tolist()
+
+
+def n_premiers(n=100, maximum=None):
+    """Donne la liste des n premiers nombres premiers.
+
+    `maximum` permet éventuellement de limiter `n` (sécurité face aux erreurs de frappe)."""
+    n = _entier(n)
+    if n < 0:
+        raise ValueError("Le nombre de nombres premiers doit être positif.")
+    if maximum is not None and n > maximum:
+        raise OverflowError
+    # Majoration du n-ième nombre premier (Rosser, pour n >= 6).
+    borne = (int(n*(math.log(n) + math.log(math.log(n)))) + 1 if n >= 6 else 13)
+    table.etendre(borne)
+    return table.premiers[:n].tolist()
+
+
+def est_premier(n):
+    "Teste si l'entier `n` est premier (retourne False si `n` n'est pas entier)."
+    try:
+        n = _entier(n)
+    except ValueError:
+        return False
+    if n <= LIMITE_CRIBLE:
+        table.etendre(n)
+        return n in table
+    return isprime(n)
+
+
+def facteurs_premiers(n):
+    """Décomposition de l'entier `n` en facteurs premiers.
+
+    Retourne un dictionnaire {facteur premier: exposant}, comme `sympy.factorint`."""
+    n = _entier(n)
+    if n < 0:
+        facteurs = facteurs_premiers(-n)
+        facteurs[-1] = 1
+        return facteurs
+    if n < 2:
+        return {} if n == 1 else {0: 1}
+    racine = _isqrt(n)
+    table.etendre(min(racine, LIMITE_CRIBLE))
+    premiers = table.jusqua(min(racine, table.limite - 1))
+    facteurs = {}
+    if n < 2**63:
+        # Recherche vectorisée des diviseurs premiers.
+        candidats = premiers[n%premiers == 0].tolist()
+    else:
+        candidats = (int(p) for p in premiers if not n%int(p))
+    for p in candidats:
+        exposant = 0
+        while not n%p:
+            n //= p
+            exposant += 1
+        facteurs[p] = exposant
+    if n > 1:
+        if racine < table.limite or n < table.limite**2:
+            # Pas de diviseur premier inférieur à sa racine : n est premier.
+            facteurs[n] = 1
+        else:
+            for p, exposant in factorint(n).items():
+                facteurs[int(p)] = facteurs.get(int(p), 0) + exposant
+    return facteurs
+
+
+def diviseurs(n):
+    "Liste (triée) des diviseurs positifs de l'entier `n`."
+    n = abs(_entier(n))
+    if n == 0:
+        raise ValueError("0 admet une infinité de diviseurs.")
+    diviseurs = [1]
+    for p, exposant in facteurs_premiers(n).items():
+        puissances = [p**k for k in range(exposant + 1)]
+        diviseurs = [d*puissance for d in diviseurs for puissance in puissances]
+    diviseurs.sort()
+    return diviseurs
+
+
+def _termes(termes):
+    "Permet d'écrire aussi bien pgcd(12, 18, 30) que pgcd([12, 18, 30])."
+    if len(termes) == 1 and isinstance(termes[0], (list, tuple, set, numpy.ndarray)):
+        termes = termes[0]
+        if isinstance(termes, numpy.ndarray):
+            return [termes.ravel()]
+    return list(termes)
+
+
+def _est_entier(n):
+    return isinstance(n, (int, numpy.integer)) or isinstance(n, Basic) and n.is_Integer
+
+
+def gcd(a, b):
+    "pgcd de a et de b"
+    if _est_entier(a) and _est_entier(b):
+        resultat = math.gcd(int(a), int(b))
+        return (Integer(resultat) if isinstance(a, Basic) or isinstance(b, Basic) else resultat)
+    # algorithme d'Euclide
+    a, b = max(abs(a),abs(b)), min(abs(a),abs(b))
+    while b:
+        a, b = b, a%b
+    return a
+
+
+def lcm(a, b):
+    "ppcm de a et de b"
+    return a*b//gcd(a,b)
+
+
+def pgcd(*termes):
+    """Le plus grand diviseur commun à un nombre quelconque d'entiers.
+
+    Les termes peuvent aussi être donnés sous forme de liste.
+    Si ce sont des tableaux numpy, le calcul est fait terme à terme."""
+    termes = _termes(termes)
+    if any(isinstance(terme, numpy.ndarray) for terme in termes):
+        if len(termes) == 1:
+            return numpy.gcd.reduce(termes[0])
+        return reduce(numpy.gcd, termes)
+    return reduce(gcd, termes)
+
+
+def ppcm(*termes):
+    """Le plus petit multiple commun à un nombre quelconque d'entiers.
+
+    Les termes peuvent aussi être donnés sous forme de liste.
+    Si ce sont des tableaux numpy, le calcul est fait terme à terme."""
+    termes = _termes(termes)
+    if any(isinstance(terme, numpy.ndarray) for terme in termes):
+        if len(termes) == 1:
+            # Pas de numpy.lcm.reduce, qui risquerait de dépasser la capacité des entiers.
+            return reduce(lcm, (int(n) for n in termes[0]))
+        return reduce(numpy.lcm, termes)
+    return reduce(lcm, termes)
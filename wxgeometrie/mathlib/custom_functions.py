@@ -35,6 +35,8 @@ from sympy.stats import Normal, Binomial, P
 import sympy.stats
 from .custom_objects import Temps, Fonction, Decim
 from .printers import custom_str
+from .lois import LoiNormale, loi_binomiale, convertir
+from .arithmetique import gcd, lcm, pgcd, ppcm, n_premiers
 ##from .. import param
 
 
@@ -76,47 +78,6 @@ def prod(facteurs):
     return reduce(lambda x,y:x*y, facteurs, 1)
 
 
-def gcd(a, b):
-    "pgcd de a et de b"
-    # algorithme d'Euclide
-    a, b = max(abs(a),abs(b)), min(abs(a),abs(b))
-    while b:
-        a, b = b, a%b
-    return a
-
-def lcm(a, b):
-    "ppcm de a et de b"
-    return a*b//gcd(a,b)
-
-def pgcd(*termes):
-    "Le plus grand dénominateur commun à un nombre quelconque d'entiers."
-    return reduce(lambda x,y:gcd(x,y), termes)
-
-
-def ppcm(*termes):
-    "Le plus petit multiple commun à un nombre quelconque d'entiers."
-    return reduce(lambda x,y:lcm(x,y), termes)
-
-
-
-def n_premiers(n = 100, maximum = 50000): # securite face aux erreurs de frappe...!
-    "Donne la liste des n premiers nombres premiers."
-    liste = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
-    m = liste[-1] + 2
-    if n > maximum:
-        raise OverflowError
-    while len(liste) < n:
-        r = math.sqrt(m)
-        for k in liste:
-            if k > r: # pas de diviseurs inferieurs à sa racine, donc le nombre est premier
-                liste.append(m)
-                break
-            if not m%k:
-                break
-        m += 2
-    return liste
-
-
 # Approximation rationnelle par fractions continues
 # cf. http://fr.wikipedia.org/wiki/Fraction_continue
 def frac(valeur, n = 20, epsilon = 1e-15):
@@ -153,11 +114,7 @@ def frac(valeur, n = 20, epsilon = 1e-15):
 
 def bin(n):
     "Conversion en binaire."
-    s = ""
-    while n:
-        s = str(n%2) + s
-        n //= 2
-    return s
+    return format(int(n), 'b')
 
 
 def floats2rationals(expr):
@@ -473,20 +430,49 @@ def confiance(frequence, taille=1000, seuil=None):
     return frequence - delta, frequence + delta
 
 
-def normal(a, b, mu=0, sigma=1):
+def normal(a, b, mu=0, sigma=1, exact=False):
     """Retourne P(a < X < b), où X suit la loi normale N(mu, sigma²).
+
+    Si les paramètres sont numériques, le calcul est fait numériquement
+    (cf. `mathlib.lois`) ; `a` et `b` peuvent alors être des tableaux numpy.
+    Sinon, ou si `exact` vaut True, le calcul est confié à sympy.stats.
     """
+    if not exact:
+        try:
+            loi = LoiNormale(convertir(mu), convertir(sigma))
+            return _float_sympy(loi.proba(a, b))
+        except TypeError:
+            # Paramètres symboliques
+            pass
     X = Normal('X', mu, sigma)
-    return (proba(X <= b) - proba(X < a)).evalf()
+    resultat = proba(X <= b) - proba(X < a)
+    return resultat if exact else resultat.evalf()
 
 
-def binomial(a, b, n, p):
+def binomial(a, b, n, p, exact=False):
     """Retourne P(a <= X <= b), où X suit la loi binomiale B(n, p).
 
+    Si les paramètres sont numériques, le calcul est fait numériquement
+    (cf. `mathlib.lois`) ; `a` et `b` peuvent alors être des tableaux numpy.
+    Sinon, ou si `exact` vaut True, le calcul est confié à sympy.stats.
+
     ..note:: Taper binomial(a, a, n, p) pour calculer P(X = a).
     """
+    if not exact:
+        try:
+            loi = loi_binomiale(convertir(n), convertir(p))
+            return _float_sympy(loi.proba(a, b))
+        except TypeError:
+            # Paramètres symboliques
+            pass
     X = Binomial('X', n, p)
-    return (proba(X <= b) - proba(X < a)).evalf()
+    resultat = proba(X <= b) - proba(X < a)
+    return resultat if exact else resultat.evalf()
+
+
+def _float_sympy(valeur):
+    "Convertit les flottants en `sympy.Float` (mais pas les tableaux)."
+    return (Float(valeur) if isinstance(valeur, float) else valeur)
 
 
 def va(loi, *parametres):
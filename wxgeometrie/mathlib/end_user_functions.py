@@ -146,12 +146,11 @@ __classement__["Matrices"].append(("Valeurs propres", "vap", "Valeurs propres d'
 __classement__["Matrices"].append(("Vecteurs propres", "vep", "Base de vecteurs propres d'une matrice. ex: vep(M)"))
 
 
-from sympy import isprime
-premier = isprime
+from .arithmetique import est_premier
+premier = est_premier
 __classement__["Arithmétique"].append(("Premier ?", "premier", "Tester si un nombre est premier."))
 
-from .sympy_functions import divisors
-diviseurs = divisors
+from .arithmetique import diviseurs
 __classement__["Arithmétique"].append(("Diviseurs", "diviseurs", "Chercher les diviseurs d'un nombre."))
 
 # Alias
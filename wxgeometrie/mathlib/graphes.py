@@ -26,7 +26,17 @@
 # http://en.wikipedia.org/wiki/Glossary_of_graph_theory
 
 import collections, copy
-
+from heapq import heappush, heappop, heapify
+from math import log2
+
+import numpy
+try:
+    # wxgeometrie can be imported even if scipy is not found.
+    # Dense numpy arrays are then used instead of sparse matrices.
+    from scipy import sparse
+    scipy_found = True
+except ImportError:
+    scipy_found = False
 from sympy import oo, Matrix
 from ..pylib import OrderedDict, advanced_split
 
@@ -55,6 +65,52 @@ def colors():
 
 
 
+class Adjacency(object):
+    """Compressed (CSR) adjacency arrays of a graph.
+
+    Nodes are numbered according to the graph iteration order (see `nodes`
+    and `index`). The neighbors of node number i are
+    `indices[indptr[i]:indptr[i + 1]]`, in the same order as in the graph
+    dictionary. For each of these entries, `weights` contains the smallest
+    weight of the edges joining both nodes, and `multiplicities`
+    the number of those (parallel) edges.
+
+    This is a snapshot: later changes of the graph are not reflected.
+    """
+
+    def __init__(self, graph):
+        self.nodes = list(graph)
+        self.index = index = dict((node, i) for i, node in enumerate(self.nodes))
+        indptr = [0]
+        indices = []
+        # Weights are kept as python objects (int, float or exact values).
+        self.weights = weights = []
+        multiplicities = []
+        for node in self.nodes:
+            for neighbor, edges in graph[node].items():
+                indices.append(index[neighbor])
+                weights.append(min(edges))
+                multiplicities.append(len(edges))
+            indptr.append(len(indices))
+        self.indptr = numpy.array(indptr, dtype=numpy.int64)
+        self.indices = numpy.array(indices, dtype=numpy.int64)
+        self.multiplicities = numpy.array(multiplicities, dtype=numpy.int64)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def sources(self):
+        "Number of the starting node of each entry of `indices`."
+        return numpy.repeat(numpy.arange(len(self.nodes)), numpy.diff(self.indptr))
+
+
+def _dense(matrix):
+    "Convert a (possibly sparse) matrix to a numpy array."
+    return (matrix.toarray() if scipy_found else matrix)
+
+
+
 class Graph(dict):
     """A graph representation.
 
@@ -146,23 +202,80 @@ class Graph(dict):
 
     @property
     def matrix(self):
-        n = self.order
-        nodes = sorted(self)
-        def f(i, j):
-            # In an unoriented graph, loops are counted twice.
-            k = (1 if self.oriented or i != j else 2)
-            return k*len(self[nodes[i]].get(nodes[j], ()))
-        return Matrix(n, n, f)
+        return Matrix(_dense(self.sparse_matrix()))
 
     # Matrice avec coeffs=poids aretes
     def matrix2(self, default=0):
-        n = self.order
         nodes = sorted(self)
-        def f(i, j):
-            # In an unoriented graph, loops are counted twice.
-            k = (1 if self.oriented or i != j else 2)
-            return min(self[nodes[i]].get(nodes[j], [default]))
-        return Matrix(n, n, f)
+        position = dict((node, i) for i, node in enumerate(nodes))
+        M = [len(nodes)*[default] for node in nodes]
+        for node, endpoints in self.items():
+            row = M[position[node]]
+            for node2, edges in endpoints.items():
+                row[position[node2]] = min(edges)
+        return Matrix(M)
+
+    def sparse_matrix(self, weights=False):
+        """Adjacency matrix, as a scipy sparse matrix (CSR format).
+
+        Nodes are sorted, as for `matrix`. If `weights` is True, coefficients
+        are the smallest weights of the edges (0 if there is no edge), else
+        the numbers of edges.
+        If scipy is not installed, a (dense) numpy array is returned instead.
+        """
+        adjacency = self.adjacency()
+        n = len(adjacency)
+        # Position of each node once nodes are sorted.
+        position = numpy.empty(n, dtype=numpy.int64)
+        position[sorted(range(n), key=adjacency.nodes.__getitem__)] = numpy.arange(n)
+        rows = position[adjacency.sources]
+        columns = position[adjacency.indices]
+        if weights:
+            data = numpy.array(adjacency.weights, dtype=float)
+        else:
+            data = adjacency.multiplicities
+            if not self.oriented:
+                # In an unoriented graph, loops are counted twice.
+                data = data*numpy.where(rows == columns, 2, 1)
+        if scipy_found:
+            return sparse.csr_matrix((data, (rows, columns)), shape=(n, n))
+        M = numpy.zeros((n, n), dtype=data.dtype)
+        M[rows, columns] = data
+        return M
+
+    def paths_matrix(self, length):
+        """Matrix of the numbers of paths of length `length` between nodes
+        (nodes are sorted, as for `matrix`).
+
+        This is the power `length` of the adjacency matrix, computed
+        using sparse matrices products. Exact (python) integers are used
+        instead if coefficients may exceed the 64 bits integers capacity.
+        """
+        if length < 0:
+            raise ValueError("Length must be a nonnegative integer.")
+        A = self.sparse_matrix()
+        n = A.shape[0]
+        # The coefficients of A^k are bounded by the k-th power of the largest row sum.
+        bound = (int(A.sum(axis=1).max()) if n else 0)
+        if bound <= 1 or length*log2(bound) < 62:
+            if scipy_found:
+                result = sparse.identity(n, dtype=numpy.int64, format='csr')
+            else:
+                result = numpy.identity(n, dtype=numpy.int64)
+            A = A.astype(numpy.int64)
+        else:
+            result = numpy.identity(n, dtype=numpy.int64).astype(object)
+            A = _dense(A).astype(object)
+        # Exponentiation by squaring.
+        while length:
+            if length%2:
+                result = result @ A
+            length //= 2
+            if length:
+                A = A @ A
+        if not isinstance(result, numpy.ndarray):
+            result = result.toarray()
+        return Matrix(result)
 
     def degree(self, node):
         if self.oriented:
@@ -177,6 +290,10 @@ class Graph(dict):
     def degrees(self):
         return dict((node, self.degree(node)) for node in self.nodes)
 
+    def adjacency(self):
+        "Return the `Adjacency` arrays of the graph."
+        return Adjacency(self)
+
     @property
     def to_dict(self):
         return copy.deepcopy(dict(self))
@@ -184,22 +301,47 @@ class Graph(dict):
     def adjacents(self, node1, node2):
         return node2 in self[node1] or node1 in self[node2]
 
+    def _neighbors(self):
+        "Sets of the nodes adjacent to each node (the node itself excluded)."
+        neighbors = dict((node, set()) for node in self)
+        for node, endpoints in self.items():
+            for node2 in endpoints:
+                if node2 != node:
+                    neighbors[node].add(node2)
+                    neighbors[node2].add(node)
+        return neighbors
+
     @property
     def connected(self):
-        def adjacent(node, new_nodes):
-            return any(self.adjacents(node, new) for new in new_nodes)
-        remaining_nodes = set(self)
-        new_nodes = [remaining_nodes.pop()]
-        while new_nodes:
-            new_nodes = [node for node in remaining_nodes if adjacent(node, new_nodes)]
-            remaining_nodes.difference_update(new_nodes)
-        return not remaining_nodes
+        # Breadth-first search, whatever the edges orientation.
+        if not self:
+            return True
+        if self.oriented:
+            predecessors = dict((node, []) for node in self)
+            for node, endpoints in self.items():
+                for node2 in endpoints:
+                    predecessors[node2].append(node)
+        start = next(iter(self))
+        reached = set([start])
+        queue = collections.deque([start])
+        while queue:
+            node = queue.popleft()
+            neighbors = self[node]
+            if self.oriented:
+                neighbors = list(neighbors) + predecessors[node]
+            for neighbor in neighbors:
+                if neighbor not in reached:
+                    reached.add(neighbor)
+                    queue.append(neighbor)
+        return len(reached) == len(self)
 
 
     @property
     def symetric(self):
-        M = self.matrix
-        return M.transpose() == M
+        # Same number of edges from A to B as from B to A (ie. symetric matrix).
+        return all(len(edges) == len(self[node2].get(node, ()))
+                   for node, endpoints in self.items()
+                   for node2, edges in endpoints.items())
 
     @property
     def eulerian(self):
@@ -207,15 +349,19 @@ class Graph(dict):
         return odds in (0, 2)
 
     def _nodes_sorted_by_degree(self, *first_nodes):
+        # Nodes having the same degree are kept in the graph order.
+        first = set(first_nodes)
         return list(first_nodes) \
-            + sorted(set(self).difference(first_nodes), key = self.degree, reverse = True)
+            + sorted((node for node in self if node not in first), key = self.degree, reverse = True)
 
 
     def eulerian_trail(self, walk=None):
+        """Return an eulerian trail (as a list of nodes), or None if there is none.
+
+        If `walk` is given (ex: "A-B-C-A"), test instead if it is an eulerian trail.
+        """
         if walk is None:
-            #TODO: return an (arbitrary) eulerian trail if any, else None
-            raise NotImplementedError
-#            return trail
+            return self._hierholzer()
 
         # Convert input string to a list of nodes.
         for sep in ('-', ',', ';'):
@@ -230,21 +376,17 @@ class Graph(dict):
 #            if not walk_lst:
 #                raise SyntaxError, repr(walk) + " format is incorrect. Nodes should be separated by '-'."
 
-        graph = self.to_dict
+        # Number of edges not used yet between two nodes.
+        remaining = collections.OrderedDict(((node, node2), len(edges))
+                                            for node, endpoints in self.items()
+                                            for node2, edges in endpoints.items())
         previous = None # previous node
 
         def remove_edge(A, B):
             "Remove edge from graph"
-            endpoints = graph.get(A, {})
-            edges = endpoints.get(B, [])
-            if edges:
-                edges.pop()
-            else:
+            if not remaining.get((A, B)):
                 return False
-            if not edges:
-                endpoints.pop(B)
-            if not endpoints:
-                graph.pop(A)
+            remaining[(A, B)] -= 1
             return True
 
         # We remove edges one by one from graph.
@@ -256,42 +398,160 @@ class Graph(dict):
                             %(previous, node))
                     return False
                     # Edge did not exist, or was already removed.
-                if not self.oriented:
+                if not self.oriented and node != previous:
                     if not remove_edge(node, previous):
                         return False
             previous = node
 
-        if graph:
+        unused = [edge for edge, number in remaining.items() if number]
+        if unused:
             print("Following edges were never used:")
-            for node in graph:
-                for endpoint in graph[node]:
-                    print ('%s-%s' %(node, endpoint))
-        return not graph
-
-
-
-    def coloring(self, *first_nodes):
-        """Graph colorization using Welsh & Powell algorithm.
-
-        By default, nodes are sorted according to their degrees, but you can also
-        choose manually the first nodes to be visited.
+            for node, endpoint in unused:
+                print ('%s-%s' %(node, endpoint))
+        return not unused
+
+    def _hierholzer(self):
+        "Hierholzer's algorithm (linear time, without recursion)."
+        adjacency = self.adjacency()
+        n = len(adjacency)
+        indptr = adjacency.indptr.tolist()
+        indices = adjacency.indices.tolist()
+        multiplicities = adjacency.multiplicities.tolist()
+        # Edges starting from each node, as couples (other end, edge number).
+        incident = [[] for i in range(n)]
+        # Number of edges arriving to each node (oriented graph),
+        # or degree of each node (unoriented graph).
+        arriving = n*[0]
+        edges = 0
+        for i in range(n):
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if self.oriented or i <= j:
+                    for m in range(multiplicities[k]):
+                        incident[i].append((j, edges))
+                        arriving[j] += 1
+                        if not self.oriented:
+                            # The edge may also be followed from j to i
+                            # (and loops are counted twice in the degree).
+                            arriving[i] += 1
+                            if i != j:
+                                incident[j].append((i, edges))
+                        edges += 1
+        if not edges:
+            return []
+        if self.oriented:
+            unbalanced = [i for i in range(n) if len(incident[i]) != arriving[i]]
+            if unbalanced:
+                starts = [i for i in unbalanced if len(incident[i]) == arriving[i] + 1]
+                ends = [i for i in unbalanced if len(incident[i]) + 1 == arriving[i]]
+                if len(unbalanced) != 2 or len(starts) != 1 or len(ends) != 1:
+                    return None
+        else:
+            # In an unoriented graph, loops are counted twice.
+            unbalanced = starts = [i for i in range(n) if arriving[i]%2]
+            if len(unbalanced) not in (0, 2):
+                return None
+        start = (starts[0] if unbalanced else next(i for i in range(n) if incident[i]))
+
+        used = edges*[False]
+        # Number of edges already examined for each node.
+        examined = n*[0]
+        stack = [start]
+        trail = []
+        while stack:
+            node = stack[-1]
+            node_edges = incident[node]
+            k = examined[node]
+            while k < len(node_edges) and used[node_edges[k][1]]:
+                k += 1
+            if k == len(node_edges):
+                examined[node] = k
+                trail.append(stack.pop())
+            else:
+                neighbor, edge = node_edges[k]
+                used[edge] = True
+                examined[node] = k + 1
+                stack.append(neighbor)
+        if len(trail) != edges + 1:
+            # Some edges can't be reached: the graph is not connected.
+            return None
+        trail.reverse()
+        return [adjacency.nodes[i] for i in trail]
+
+
+    def coloring(self, *first_nodes, algorithm='WelshPowell'):
+        """Graph colorization using Welsh & Powell algorithm (default),
+        or DSATUR algorithm (`algorithm='DSATUR'`).
+
+        Return the list of the nodes sharing each color.
+
+        For Welsh & Powell algorithm, nodes are sorted according to their degrees
+        by default, but you can also choose manually the first nodes to be visited.
+        DSATUR algorithm colors first the node having the most different colors
+        among its neighbors (then the most neighbors).
         """
+        if algorithm == 'DSATUR':
+            if first_nodes:
+                raise ValueError("First nodes can't be chosen for DSATUR algorithm.")
+            order, numbers = self._dsatur()
+            coloring = []
+            for node in order:
+                if numbers[node] == len(coloring):
+                    coloring.append([])
+                coloring[numbers[node]].append(node)
+            return coloring
+        elif algorithm != 'WelshPowell':
+            raise ValueError("Unknown algorithm: %s." % repr(algorithm))
+        neighbors = self._neighbors()
         coloring = []
         uncolored = self._nodes_sorted_by_degree(*first_nodes)
         while uncolored:
             coloring.append([])
+            # Nodes adjacent to a node of the current color.
+            forbidden = set()
+            remaining = []
             for node in uncolored:
-                if not any(self.adjacents(node, s) for s in coloring[-1]):
+                if node in forbidden:
+                    remaining.append(node)
+                else:
                     coloring[-1].append(node)
-            assert coloring[-1]
-            uncolored = [s for s in uncolored if s not in coloring[-1]]
+                    forbidden.update(neighbors[node])
+            uncolored = remaining
         return coloring
 
-
-    def latex_WelshPowell(self, *first_nodes):
-        ordered_nodes = self._nodes_sorted_by_degree(*first_nodes)
+    def _dsatur(self):
+        """DSATUR algorithm.
+
+        Return the list of the nodes, in the order they were colored,
+        and the dictionary of their colors (numbered from 0)."""
+        neighbors = self._neighbors()
+        ranks = dict((node, i) for i, node in enumerate(self))
+        # Colors of the neighbors of each node.
+        saturation = dict((node, set()) for node in self)
+        numbers = {}
+        order = []
+        heap = [(0, -len(neighbors[node]), ranks[node], node) for node in self]
+        heapify(heap)
+        while heap:
+            sat, degree, rank, node = heappop(heap)
+            if node in numbers or -sat != len(saturation[node]):
+                # Obsolete entry (the node saturation increased since).
+                continue
+            color = 0
+            while color in saturation[node]:
+                color += 1
+            numbers[node] = color
+            order.append(node)
+            for neighbor in neighbors[node]:
+                if neighbor not in numbers and color not in saturation[neighbor]:
+                    saturation[neighbor].add(color)
+                    heappush(heap, (-len(saturation[neighbor]), -len(neighbors[neighbor]),
+                                    ranks[neighbor], neighbor))
+        return order, numbers
+
+    def _latex_coloring(self, ordered_nodes, coloring):
         dico = {}
-        for nodes, color in zip(self.coloring(*ordered_nodes), colors()):
+        for nodes, color in zip(coloring, colors()):
             for node in nodes:
                 dico[node] = color
         # Génération du code LaTeX
@@ -310,46 +570,99 @@ class Graph(dict):
         code += '\\end{tabular}\n'
         return code
 
+    def latex_WelshPowell(self, *first_nodes):
+        ordered_nodes = self._nodes_sorted_by_degree(*first_nodes)
+        return self._latex_coloring(ordered_nodes, self.coloring(*ordered_nodes))
+
+    def latex_DSATUR(self):
+        order = self._dsatur()[0]
+        return self._latex_coloring(order, self.coloring(algorithm='DSATUR'))
+
+    def _dijkstra(self, adjacency, start, end):
+        """Implementation of Dijkstra-Moore algorithm, using a binary heap.
+
+        Nodes are given by their numbers in `adjacency`.
+        Generate the successive selected nodes, just before they are archived
+        (the last one is `end`, if it may be reached from `start`), along with
+        the lists `distances`, `previous` and `archived`, updated in place.
+        For each node, `distances` contains the smallest distance from start
+        found until now (None if the node was not visited yet), and `previous`
+        the list of the corresponding previous nodes.
+
+        When several nodes are at the same distance, the first visited one
+        is selected first.
+        """
+        indptr = adjacency.indptr.tolist()
+        indices = adjacency.indices.tolist()
+        weights = adjacency.weights
+        n = len(adjacency)
+        distances = n*[None]
+        previous = n*[None]
+        archived = n*[False]
+        # Order of the first visit of each node (used to break ties).
+        ranks = n*[None]
+        distances[start] = 0
+        previous[start] = [start]
+        ranks[start] = 0
+        visited = 1
+        heap = [(0, 0, start)]
+        while heap:
+            distance, rank, current = heappop(heap)
+            if archived[current]:
+                # Obsolete entry (a shorter path was found later).
+                continue
+            yield current, distances, previous, archived
+            if current == end:
+                return
+            archived[current] = True
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if archived[neighbor]:
+                    continue
+                # best distance found until now between neighbor and start
+                old_distance = distances[neighbor]
+                # new distance found using current node:
+                # distance(start, current) + distance(current, neighbor)
+                new_distance = distance + weights[k]
+                if old_distance is None or new_distance < old_distance:
+                    # replace with new distance only if better
+                    if old_distance is None:
+                        ranks[neighbor] = visited
+                        visited += 1
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = [current]
+                    heappush(heap, (new_distance, ranks[neighbor], neighbor))
+                elif new_distance == old_distance:
+                    previous[neighbor].append(current)
+
+    @staticmethod
+    def _paths(adjacency, previous, start, end):
+        "All the shortest paths from start to end, as tuples of nodes."
+        nodes = adjacency.nodes
+        paths = set()
+        in_progress = [(end,)]
+        while in_progress:
+            path = in_progress.pop()
+            for node in previous[path[0]]:
+                if node == start:
+                    paths.add(tuple(nodes[i] for i in (node,) + path))
+                else:
+                    in_progress.append((node,) + path)
+        return paths
+
     def shortest_path(self, start, end):
-        "Implementation of Dijkstra-Moore algorithm."
-        # current node
-        current = start
-        # Nodes which have been already visited, but still not archived:
-        visited = {start: [0, [start]]}
-        # format: {node: [distance from start, [previous node, alternative previous node, ...]]}
-
-        # Nodes which will not change anymore:
-        archived = {}
-
-        while current != end and visited:
-            archived[current] = visited.pop(current)
-            # We select the node having the smallest distance
-            for neighbor in self[current]:
-                if neighbor not in archived:
-                    distance = visited.get(neighbor, [oo])[0]
-                    new_distance = archived[current][0] + min(self[current][neighbor])
-                    if new_distance < distance:
-                        visited[neighbor] = [new_distance, [current]]
-                    elif new_distance == distance:
-                        visited[neighbor][1].append(current)
-            current = min(visited.items(), key = lambda x:x[1][0])[0]
-        if current in visited:
-            archived[current] = visited.pop(current)
-            in_progress = set([(current,)])
-            final_paths = set()
-            while in_progress:
-                for path in set(in_progress):
-#                    print path, in_progress, final_paths
-                    in_progress.remove(path)
-                    node1 = path[0]
-                    for previous in archived[node1][1]:
-                        if previous == start:
-                            final_paths.add((previous,) + path)
-                        else:
-                            in_progress.add((previous,) + path)
-            return archived[current][0], final_paths
-        else:
+        """Implementation of Dijkstra-Moore algorithm.
+
+        Return the minimal distance between `start` and `end`, and the set
+        of the corresponding paths (or `oo` and an empty list if `end`
+        can't be reached)."""
+        adjacency = self.adjacency()
+        start, end = adjacency.index[start], adjacency.index[end]
+        for current, distances, previous, archived in self._dijkstra(adjacency, start, end):
+            pass
+        if current != end:
             return oo, []
+        return distances[end], self._paths(adjacency, previous, start, end)
 
 
     def latex_Dijkstra(self, start, end, nodes=None):
@@ -358,72 +671,44 @@ class Graph(dict):
         else:
             if set(nodes) != set(self):
                 raise ValueError("Nodes do not match.")
+        adjacency = self.adjacency()
+        columns = [adjacency.index[node] for node in nodes]
+        names = adjacency.nodes
         code = "On applique l'algorithme de Moore-Dijkstra~:\n\n"
         code += r'\begin{tabular}{|*{%s}{c|}}\hline' %len(self)
         code += '\n' + '&'.join(('$%s$' %node) for node in nodes) + r'\\\hline\hline' + '\n'
-        # current node
-        current = start
-        # Nodes which have been already visited, but still not archived:
-        visited = {start: [0, [start]]}
-        # format: {node: [distance from start, [previous node, alternative previous node, ...]]}
-
-        # Nodes which will not change anymore (shorter path from start has been found):
-        archived = {}
-
-        while current != end and visited:
-            def str2(val):
-                # 2.0 -> "2" ; 2.3 -> "2,3"
-                val = str(val)
-                if '.' in val:
-                    val = val.rstrip('0').rstrip('.').replace('.', ',')
-                return val
-
-            def format(node):
-                def _format(node):
-                    previous_nodes = ','.join(str(prev) for prev in visited[node][1])
-                    return str2(visited[node][0]) + ' $(%s)$' %previous_nodes
-                if node == current:
-                    return r'\textbf{%s}' %_format(node)
-                elif node in archived:
-                    return ''
-                elif node in visited:
-                    return _format(node)
-                else:
-                    return r'$+\infty$'
-            code += '&'.join(format(node) for node in nodes) + r'\\\hline' + '\n'
-            archived[current] = visited.pop(current)
-            # We select the node having the smallest distance
-            for neighbor in self[current]:
-                if neighbor not in archived:
-                    # best distance found until now between neighbor and start
-                    distance = visited.get(neighbor, [oo])[0]
-                    # new distance found using current node:
-                    # distance(start, current) + distance(current, neighbor)
-                    new_distance = archived[current][0] + min(self[current][neighbor])
-                    # replace with new distance only if better
-                    if new_distance < distance:
-                        visited[neighbor] = [new_distance, [current]]
-                    elif new_distance == distance:
-                        visited[neighbor][1].append(current)
-            current = min(visited.items(), key = lambda x:x[1][0])[0]
 
-        code += '&'.join(format(node) for node in nodes) + r'\\\hline' + '\n'
+        def str2(val):
+            # 2.0 -> "2" ; 2.3 -> "2,3"
+            val = str(val)
+            if '.' in val:
+                val = val.rstrip('0').rstrip('.').replace('.', ',')
+            return val
+
+        def format(node):
+            def _format(node):
+                previous_nodes = ','.join(str(names[prev]) for prev in previous[node])
+                return str2(distances[node]) + ' $(%s)$' %previous_nodes
+            if node == current:
+                return r'\textbf{%s}' %_format(node)
+            elif archived[node]:
+                return ''
+            elif distances[node] is not None:
+                return _format(node)
+            else:
+                return r'$+\infty$'
+
+        i, j = adjacency.index[start], adjacency.index[end]
+        for current, distances, previous, archived in self._dijkstra(adjacency, i, j):
+            code += '&'.join(format(node) for node in columns) + r'\\\hline' + '\n'
         code += '\\end{tabular}\n'
-        if current in visited:
-            archived[current] = visited.pop(current)
-            in_progress = set([(current,)])
-            final_paths = set()
-            while in_progress:
-                for path in set(in_progress):
-#                    print path, in_progress, final_paths
-                    in_progress.remove(path)
-                    node1 = path[0]
-                    for previous in archived[node1][1]:
-                        if previous == start:
-                            final_paths.add((previous,) + path)
-                        else:
-                            in_progress.add((previous,) + path)
-        distance = str2(archived[current][0])
+        if current != j:
+            code += """
+Il n'existe aucun chemin entre le sommet $%(start)s$ et le sommet $%(end)s$.
+""" %locals()
+            return code
+        final_paths = self._paths(adjacency, previous, i, j)
+        distance = str2(distances[j])
         paths = ', '.join('$' + '-'.join(path) + '$' for path in final_paths)
         plur1 = ('x' if len(final_paths) > 1 else '')
         plur2 = ('s' if len(final_paths) > 1 else '')
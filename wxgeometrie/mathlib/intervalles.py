@@ -23,6 +23,9 @@
 
 import re, math
 from functools import reduce
+from fractions import Fraction
+from bisect import bisect_left
+from heapq import merge
 import numpy
 
 from sympy import oo, sympify, S, Symbol
@@ -35,6 +38,208 @@ from .parsers import _convertir_latex_frac
 from .printers import custom_str as str_
 
 
+# Voie rapide
+# -----------
+# Lorsque toutes les bornes sont numériques (entiers, rationnels, flottants
+# ou infinis), les opérations sur les unions d'intervalles se font en comparant
+# des nombres Python (`int`, `Fraction` ou `float`), et non des objets sympy :
+# - fusion en O(n+m) des listes (déjà triées) pour l'union et l'intersection ;
+# - recherche dichotomique pour l'appartenance.
+# Les bornes symboliques (sqrt(2), pi...) imposent de repasser par sympy.
+# Les bornes d'origine sont conservées (l'affichage n'est donc pas modifié).
+# Passer `VOIE_RAPIDE` à False permet de comparer les deux implémentations.
+VOIE_RAPIDE = True
+
+_INF = float('inf')
+
+
+def _cle(val):
+    """Convertit une borne numérique en nombre Python exactement comparable.
+
+    Retourne None si la borne est symbolique."""
+    if isinstance(val, (int, float)):
+        # NB: NaN n'est pas comparable.
+        return (val if val == val else None)
+    if isinstance(val, numpy.integer):
+        return int(val)
+    if val is S.Infinity:
+        return _INF
+    if val is S.NegativeInfinity:
+        return -_INF
+    if isinstance(val, sympy.Integer):
+        return int(val)
+    if isinstance(val, sympy.Rational):
+        return Fraction(val.p, val.q)
+    if isinstance(val, sympy.Float) and val._prec <= 53:
+        # Un flottant sympy de plus grande précision perdrait des chiffres.
+        return float(val)
+    return None
+
+
+def _cles(intervalles):
+    """Retourne la liste des couples [inf, sup] convertis par `_cle()`, ou None
+    si l'une des bornes est symbolique."""
+    cles = []
+    for intervalle in intervalles:
+        inf = _cle(intervalle.inf)
+        sup = _cle(intervalle.sup)
+        if inf is None or sup is None:
+            return None
+        cles.append([inf, sup])
+    return cles
+
+
+def _est_vide(intervalle, cle):
+    inf, sup = cle
+    return sup < inf or (sup == inf and not (intervalle.inf_inclus and intervalle.sup_inclus))
+
+
+def _fusionner(ints, cles):
+    """Fusionne les intervalles qui se chevauchent ou se touchent.
+
+    `ints` est une liste d'intervalles non vides triés suivant `cles`
+    (bornes inférieures, puis supérieures). Les intervalles sont modifiés
+    sur place (il doit donc s'agir de copies).
+
+    Le traitement est identique à celui de `Union.simplifier()`, les
+    comparaisons se faisant sur les clés.
+    """
+    ints = list(ints)
+    for i in range(len(ints) - 1):
+        cle, cle_suiv = cles[i], cles[i + 1]
+        if cle[1] > cle_suiv[0]: # les intervalles se coupent
+            if cle_suiv[0] == cle[0]:
+                ints[i + 1]._inf_inclus = ints[i + 1].inf_inclus or ints[i].inf_inclus
+            else:
+                ints[i + 1]._inf_inclus = ints[i].inf_inclus
+
+            if cle_suiv[1] == cle[1]:
+                ints[i + 1]._sup_inclus = ints[i + 1].sup_inclus or ints[i].sup_inclus
+            elif cle_suiv[1] < cle[1]:
+                ints[i + 1].sup = ints[i].sup
+                ints[i + 1]._sup_inclus = ints[i].sup_inclus
+                cle_suiv[1] = cle[1]
+
+            ints[i + 1].inf = ints[i].inf
+            cle_suiv[0] = cle[0]
+            ints[i] = None
+
+        elif cle[1] == cle_suiv[0] and (ints[i].sup_inclus or ints[i + 1].inf_inclus):
+            ints[i + 1].inf = ints[i].inf
+            ints[i + 1]._inf_inclus = ints[i].inf_inclus
+            cle_suiv[0] = cle[0]
+            ints[i] = None
+    return ([intervalle for intervalle in ints if intervalle is not None],
+            [cle for intervalle, cle in zip(ints, cles) if intervalle is not None])
+
+
+def _intersection(i, j, ci, cj):
+    """Intersection des intervalles non vides `i` et `j` (de clés `ci` et `cj`).
+
+    Reprend le traitement de `Intervalle.__mul__()`, les comparaisons se
+    faisant sur les clés. Retourne None si l'intersection est vide."""
+    if ci[1] < cj[0] or cj[1] < ci[0]:
+        return None
+    elif ci[1] == cj[0] and i.sup_inclus and j.inf_inclus:
+        return Intervalle(i.sup, i.sup), [ci[1], ci[1]]
+    elif ci[0] == cj[1] and i.inf_inclus and j.sup_inclus:
+        return Intervalle(i.inf, i.inf), [ci[0], ci[0]]
+    if ci[0] < cj[0]:
+        inf, inf_inclus, cle_inf = j.inf, j.inf_inclus, cj[0]
+    elif ci[0] > cj[0]:
+        inf, inf_inclus, cle_inf = i.inf, i.inf_inclus, ci[0]
+    else:
+        inf, inf_inclus, cle_inf = i.inf, i.inf_inclus and j.inf_inclus, ci[0]
+    if cj[1] < ci[1]:
+        sup, sup_inclus, cle_sup = j.sup, j.sup_inclus, cj[1]
+    elif cj[1] > ci[1]:
+        sup, sup_inclus, cle_sup = i.sup, i.sup_inclus, ci[1]
+    else:
+        sup, sup_inclus, cle_sup = i.sup, i.sup_inclus and j.sup_inclus, ci[1]
+    intervalle = Intervalle(inf, sup, inf_inclus, sup_inclus)
+    cle = [cle_inf, cle_sup]
+    if _est_vide(intervalle, cle):
+        return None
+    return intervalle, cle
+
+
+class Grille(object):
+    """Grille d'échantillonnage d'une liste d'unions d'intervalles.
+
+    Toutes les valeurs sont calculées dans un seul tableau `valeurs`,
+    préalloué ; chaque intervalle correspond à la tranche `debut:fin`
+    de ce tableau (cf. `morceaux`).
+
+    Une grille peut être réutilisée tant que la fenêtre, le pas et les
+    intervalles n'ont pas changé (cf. `compatible()`).
+    """
+
+    # Tableau [0., 1., 2., ...], agrandi au besoin, et partagé par les grilles.
+    _indices = numpy.arange(0.)
+
+    def __init__(self, unions, _min, _max, pas):
+        self.min = _min
+        self.max = _max
+        self.pas = pas
+        self.signature = self._signature(unions)
+        # Liste de tuples (numéro de l'union, intervalle, debut, fin).
+        self.morceaux = []
+        a_remplir = []
+        taille = 0
+        for k, union in enumerate(unions):
+            for intervalle in union.intervalles:
+                inf = max(intervalle.inf, _min)
+                sup = min(intervalle.sup, _max)
+                # Il faut convertir inf et sup en float du fait de bugs de sympy.
+                # En particulier, 1/0 == +oo (au lieu de NaN ou zoo) provoque des bugs
+                # dans l'affichage de courbes style 1/x sur ]-oo;0[.
+                debut, fin = float(inf), float(sup)
+                # Même nombre de valeurs que numpy.arange(debut, fin, pas).
+                n = max(int(math.ceil((fin - debut)/pas)), 0)
+                ajouter_sup = int(bool(inf < sup or (intervalle.inf_inclus and intervalle.sup_inclus)))
+                a_remplir.append((taille, n, debut, fin, ajouter_sup))
+                self.morceaux.append((k, intervalle, taille, taille + n + ajouter_sup))
+                taille += n + ajouter_sup
+        self.valeurs = numpy.empty(taille)
+        indices = self._tableau_indices(max([n for _, n, _, _, _ in a_remplir] or [0]))
+        for position, n, debut, fin, ajouter_sup in a_remplir:
+            vue = self.valeurs[position:position + n]
+            # Comme numpy.arange, on calcule debut + i*delta.
+            numpy.multiply(indices[:n], (debut + pas) - debut, out=vue)
+            vue += debut
+            if ajouter_sup:
+                self.valeurs[position + n] = fin
+
+    @classmethod
+    def _tableau_indices(cls, n):
+        if len(cls._indices) < n:
+            cls._indices = numpy.arange(float(n))
+        return cls._indices
+
+    @staticmethod
+    def _signature(unions):
+        return tuple(tuple((i.inf, i.sup, i.inf_inclus, i.sup_inclus)
+                           for i in union.intervalles) for union in unions)
+
+    def __len__(self):
+        return len(self.valeurs)
+
+    def compatible(self, unions, _min, _max, pas):
+        """Indique si la grille peut être réutilisée pour ces paramètres."""
+        return (_min, _max, pas) == (self.min, self.max, self.pas) \
+                and self._signature(unions) == self.signature
+
+    def vues(self, tableau=None):
+        """Liste des tranches de `tableau` (par défaut, `valeurs`) correspondant
+        à chaque intervalle.
+
+        `tableau` doit avoir la même longueur que la grille."""
+        if tableau is None:
+            tableau = self.valeurs
+        return [tableau[debut:fin] for _, _, debut, fin in self.morceaux]
+
+
+
 class Ensemble(object):
     def __new__(cls, *args, **kw):
         if len(args) == 1 and isinstance(args[0], str):
@@ -73,6 +278,14 @@ class Union(Ensemble):
                 else:
                     self.intervalles.append(Intervalle(val, val))
             self.simplifier()
+        self._finaliser(bool(intervalles))
+
+    def _finaliser(self, arguments=True):
+        """Convertit l'union en `Intervalle` si elle ne comporte qu'un seul intervalle.
+
+        Si l'union a été construite sans arguments (`Union()`), il s'agit de
+        l'ensemble vide, qui est aussi converti en `Intervalle`."""
+        if arguments:
             if len(self.intervalles) == 1:
                 self.inf = self.intervalles[0].inf
                 self.sup = self.intervalles[0].sup
@@ -88,10 +301,35 @@ class Union(Ensemble):
             self._sup_inclus = False
             self.__class__ = Intervalle
 
+    @classmethod
+    def _depuis_intervalles(cls, intervalles, cles, arguments=True):
+        """Construit une union à partir d'intervalles déjà disjoints et ordonnés.
+
+        L'étape de simplification est ainsi évitée (cf. `VOIE_RAPIDE`).
+        `arguments` a la même signification que pour `_finaliser()`."""
+        instance = object.__new__(Union)
+        instance.intervalles = intervalles
+        instance._cles_ = cles
+        instance._finaliser(arguments)
+        return instance
+
+    def _cles(self):
+        """Retourne les bornes de chaque intervalle sous forme de couples
+        [inf, sup] de nombres Python, ou None si une borne est symbolique.
+
+        Les intervalles étant disjoints et ordonnés, les bornes le sont aussi."""
+        if '_cles_' not in self.__dict__:
+            self._cles_ = _cles(self.intervalles)
+        return self._cles_
+
     @property
     def vide(self):
         return len(self.intervalles) == 0
 
+    def __reduce__(self):
+        # Nécessaire pour échanger des ensembles entre processus (cf. `pickle`).
+        return (Union, tuple(self.intervalles))
+
     def __iter__(self):
         return iter(self.intervalles)
 
@@ -99,6 +337,16 @@ class Union(Ensemble):
         "union"
         if not isinstance(y, Union):
             y = Union(y)
+        if VOIE_RAPIDE:
+            cles_x = self._cles()
+            cles_y = y._cles()
+            if cles_x is not None and cles_y is not None:
+                # Les deux listes sont déjà triées : il suffit de les fusionner.
+                couples = list(merge(zip(self.intervalles, cles_x), zip(y.intervalles, cles_y),
+                                     key=(lambda couple: couple[1])))
+                ints, cles = _fusionner([intervalle.__copy__() for intervalle, cle in couples],
+                                        [list(cle) for intervalle, cle in couples])
+                return Union._depuis_intervalles(ints, cles, arguments=bool(couples))
         return Union(*(self.intervalles + y.intervalles))
 
     def __radd__(self, y):
@@ -114,8 +362,41 @@ class Union(Ensemble):
         if y.vide:
             return y
         else:
+            resultat = self._intersection_rapide(y, arguments=bool(self.intervalles))
+            if resultat is not None:
+                return resultat
             return Union(*[i*j for i in self.intervalles for j in y.intervalles])
 
+    def _intersection_rapide(self, y, arguments=True):
+        """Intersection en O(n+m), ou None si une borne est symbolique.
+
+        `y` doit être une union non vide.
+        `arguments` a la même signification que pour `_finaliser()`."""
+        if not VOIE_RAPIDE:
+            return None
+        cles_x = self._cles()
+        cles_y = y._cles()
+        if cles_x is None or cles_y is None:
+            return None
+        ints_x = self.intervalles
+        ints_y = y.intervalles
+        ints = []
+        cles = []
+        a = b = 0
+        while a < len(ints_x) and b < len(ints_y):
+            ci = cles_x[a]
+            cj = cles_y[b]
+            intersection = _intersection(ints_x[a], ints_y[b], ci, cj)
+            if intersection is not None:
+                ints.append(intersection[0])
+                cles.append(intersection[1])
+            if ci[1] <= cj[1]:
+                a += 1
+            if cj[1] <= ci[1]:
+                b += 1
+        ints, cles = _fusionner(ints, cles)
+        return Union._depuis_intervalles(ints, cles, arguments)
+
     def __rmul__(self, y):
         self.__mul__(y)
 
@@ -129,6 +410,16 @@ class Union(Ensemble):
         ##self.__radd__(y)
 
     def simplifier(self):
+        self.__dict__.pop('_cles_', None)
+        self.__dict__.pop('_sups_', None)
+        if VOIE_RAPIDE:
+            cles = _cles(self.intervalles)
+            if cles is not None:
+                couples = sorted(((intervalle, cle) for intervalle, cle in zip(self.intervalles, cles)
+                                  if not _est_vide(intervalle, cle)), key=(lambda couple: couple[1]))
+                self.intervalles, self._cles_ = _fusionner([intervalle for intervalle, cle in couples],
+                                                           [cle for intervalle, cle in couples])
+                return
         # On classe les intervalles par borne inférieure (puis supérieure si besoin pour départager).
         ints = sorted((intervalle for intervalle in self.intervalles if not intervalle.vide),
                key=(lambda i: (i.inf, i.sup)))
@@ -170,6 +461,23 @@ class Union(Ensemble):
 
     def __neg__(self):
         "complémentaire"
+        cles = (self._cles() if VOIE_RAPIDE and self.intervalles else None)
+        if cles is not None:
+            # Les intervalles étant ordonnés, le complémentaire est formé des « trous ».
+            bornes = [(-oo, -_INF, False)]
+            for intervalle, (inf, sup) in zip(self.intervalles, cles):
+                bornes.append((intervalle.inf, inf, not intervalle.inf_inclus))
+                bornes.append((intervalle.sup, sup, not intervalle.sup_inclus))
+            bornes.append((oo, _INF, False))
+            ints = []
+            cles = []
+            for (inf, cle_inf, inf_inclus), (sup, cle_sup, sup_inclus) in zip(bornes[::2], bornes[1::2]):
+                intervalle = Intervalle(inf, sup, inf_inclus, sup_inclus)
+                cle = [cle_inf, cle_sup]
+                if not _est_vide(intervalle, cle):
+                    ints.append(intervalle)
+                    cles.append(cle)
+            return Union._depuis_intervalles(ints, cles)
         return reduce(lambda x, y: x*y, [-intervalle for intervalle in self.intervalles], Intervalle())
 
     def __pos__(self):
@@ -203,6 +511,22 @@ class Union(Ensemble):
     def __contains__(self, y):
         if isinstance(y, self.__class__) and not isinstance(y, Intervalle):
             return reduce(lambda x, y: x and y, ((intervalle in self) for intervalle in y.intervalles), True)
+        if VOIE_RAPIDE and not isinstance(y, Union):
+            cles = self._cles()
+            cle = _cle(y)
+            if cles is not None and cle is not None:
+                sups = self.__dict__.get('_sups_')
+                if sups is None:
+                    sups = self._sups_ = [sup for inf, sup in cles]
+                # Recherche dichotomique du premier intervalle dont la borne
+                # supérieure est supérieure ou égale à y.
+                k = bisect_left(sups, cle)
+                if k == len(cles):
+                    return False
+                intervalle = self.intervalles[k]
+                inf, sup = cles[k]
+                return ((inf < cle or (cle == inf and intervalle.inf_inclus))
+                        and (cle < sup or (cle == sup and intervalle.sup_inclus)))
         return reduce(lambda x, y: x or y, ((y in intervalle) for intervalle in self.intervalles))
 
 
@@ -238,19 +562,10 @@ class Union(Ensemble):
     def asarray(self, _min, _max, pas):
         """Génère une liste d'objets 'array', correspondant à chaque intervalle.
 
-        On se limite à des valeurs comprises entre '_min' et '_max', avec le pas 'pas'."""
-        arrays = []
-        for intervalle in self.intervalles:
-            inf = max(intervalle.inf, _min)
-            sup = min(intervalle.sup, _max)
-            a = numpy.arange(float(inf), float(sup), pas)
-            # Il faut convertir inf et sup en float du fait de bugs de sympy.
-            # En particulier, 1/0 == +oo (au lieu de NaN ou zoo) provoque des bugs
-            # dans l'affichage de courbes style 1/x sur ]-oo;0[.
-            if inf < sup or (intervalle.inf_inclus and intervalle.sup_inclus):
-                a = numpy.append(a, float(sup))
-            arrays.append(a)
-        return arrays
+        On se limite à des valeurs comprises entre '_min' et '_max', avec le pas 'pas'.
+
+        Les tableaux retournés sont des vues d'un même tableau (cf. `Grille`)."""
+        return Grille([self], _min, _max, pas).vues()
 
 
     def evalf(self, n = 15, round_=None, **options):
@@ -307,6 +622,9 @@ class Intervalle(Union):
             return False
         return self._sup_inclus
 
+    def _cles(self):
+        return _cles(self.intervalles)
+
     @property
     def singleton(self):
         return self.sup == self.inf  and self.inf_inclus and self.sup_inclus
@@ -369,6 +687,9 @@ class Intervalle(Union):
                 return Intervalle(inf, sup, inf_inclus, sup_inclus)
 
         else:
+            resultat = self._intersection_rapide(y)
+            if resultat is not None:
+                return resultat
             return Union(*[self*i for i in y.intervalles])
 
 
@@ -389,6 +710,9 @@ class Intervalle(Union):
     def __copy__(self):
         return Intervalle(self.inf, self.sup, self._inf_inclus, self._sup_inclus)
 
+    def __reduce__(self):
+        return (Intervalle, (self.inf, self.sup, self._inf_inclus, self._sup_inclus))
+
     def __contains__(self, y):
         if self.vide:
             return isinstance(y, Union) and y.vide
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#           Lois de probabilité               #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Calcul numérique des probabilités pour les lois binomiale et normale.
+
+Contrairement à `sympy.stats`, les calculs sont faits en flottants :
+- loi binomiale : les probabilités P(X = k) sont calculées en échelle
+  logarithmique (pas de dépassement de capacité pour n grand), puis cumulées
+  dans des tables conservées en cache pour chaque couple (n, p) ;
+  au-delà de `TAILLE_MAX_TABLES`, on utilise la fonction bêta incomplète ;
+- loi normale : la fonction de répartition est calculée à partir de `erfc`.
+
+Dans les deux cas, les probabilités proches de 1 sont calculées à partir
+des queues de distribution, pour ne pas perdre en précision.
+
+Les bornes peuvent être des nombres ou des tableaux numpy.
+"""
+
+import math
+
+import numpy
+
+from .memoisation import Cache
+from .. import param
+
+
+# Au-delà, les probabilités cumulées de la loi binomiale ne sont plus tabulées.
+TAILLE_MAX_TABLES = 10**5
+
+_cache_binomiales = Cache('lois_binomiales', taille_max=16)
+
+_erfc = numpy.frompyfunc(math.erfc, 1, 1)
+
+
+def convertir(valeur):
+    """Convertit `valeur` en flottant (ou en tableau de flottants).
+
+    Lève une `TypeError` si la valeur n'est pas numérique (ex: symbole sympy)."""
+    if isinstance(valeur, (numpy.ndarray, list, tuple)):
+        return numpy.asarray(valeur, dtype=float)
+    return float(valeur)
+
+
+def _resultat(tableau, *bornes):
+    "Retourne un flottant si les bornes ne sont pas des tableaux."
+    if all(numpy.ndim(borne) == 0 for borne in bornes):
+        return float(tableau)
+    return tableau
+
+
+class LoiBinomiale(object):
+    """Loi binomiale B(n, p).
+
+    Utiliser de préférence `loi_binomiale(n, p)`, qui conserve les tables
+    de probabilités cumulées en cache."""
+
+    def __init__(self, n, p):
+        if n < 0 or n != int(n):
+            raise ValueError("n doit être un entier naturel.")
+        if not 0 <= p <= 1:
+            raise ValueError("p doit être compris entre 0 et 1.")
+        self.n = n = int(n)
+        self.p = p
+        self.esperance = n*p
+        self.tabulee = (n <= TAILLE_MAX_TABLES)
+        if self.tabulee:
+            probabilites = self.probabilites = self._probabilites()
+            # cumul[k] = P(X <= k - 1) ; queue[k] = P(X >= k) (pour 0 <= k <= n + 1).
+            self.cumul = numpy.concatenate(([0.], numpy.cumsum(probabilites)))
+            self.queue = numpy.concatenate((numpy.cumsum(probabilites[::-1])[::-1], [0.]))
+
+    def _probabilites(self):
+        "Tableau des P(X = k), pour k allant de 0 à n."
+        n, p = self.n, self.p
+        if p in (0, 1):
+            probabilites = numpy.zeros(n + 1)
+            probabilites[n if p == 1 else 0] = 1
+            return probabilites
+        return _densite_binomiale(numpy.arange(n + 1.), n, p)
+
+    def _inferieur(self, k):
+        "P(X <= k), sans table."
+        n, p = self.n, self.p
+        if k < 0:
+            return 0.
+        if k >= n:
+            return 1.
+        return beta_incomplete(n - k, k + 1, 1 - p)
+
+    def _superieur(self, k):
+        "P(X >= k), sans table."
+        n, p = self.n, self.p
+        if k <= 0:
+            return 1.
+        if k > n:
+            return 0.
+        return beta_incomplete(k, n - k + 1, p)
+
+    def proba(self, a, b):
+        """Retourne P(a <= X <= b).
+
+        Plus exactement, retourne P(X <= b) - P(X < a) (valeur négative si b < a)."""
+        a, b = convertir(a), convertir(b)
+        n = self.n
+        # X prend des valeurs entières : a <= X <= b <=> ka <= X <= kb
+        ka = numpy.clip(numpy.ceil(a), 0, n + 1).astype(int)
+        kb = numpy.clip(numpy.floor(b), -1, n).astype(int)
+        # Les bornes supérieures à l'espérance sont traitées via P(X >= k).
+        queue = (ka > self.esperance)
+        if self.tabulee:
+            resultat = numpy.where(queue, self.queue[ka] - self.queue[kb + 1],
+                                          self.cumul[kb + 1] - self.cumul[ka])
+        else:
+            def proba(ka, kb, queue):
+                if queue:
+                    return self._superieur(ka) - self._superieur(kb + 1)
+                return self._inferieur(kb) - self._inferieur(ka - 1)
+            resultat = numpy.asarray(numpy.frompyfunc(proba, 3, 1)(ka, kb, queue), dtype=float)
+        return _resultat(resultat, a, b)
+
+    def repartition(self, x):
+        "Retourne P(X <= x)."
+        return self.proba(-numpy.inf, x)
+
+
+def _stirlerr(n):
+    """Retourne ln(n!) - ln(sqrt(2*pi*n)*(n/e)^n).
+
+    `n` est un entier ou un tableau d'entiers."""
+    n = numpy.asarray(n, dtype=float)
+    petits = (n <= 15)
+    resultat = numpy.empty(n.shape)
+    if petits.any():
+        # Pas de compensation problématique pour n petit.
+        m = n[petits]
+        resultat[petits] = (numpy.array([math.lgamma(i + 1) for i in m.flat]).reshape(m.shape)
+                            - (m + .5)*numpy.log(m) + m - math.log(math.sqrt(2*math.pi)))
+    m = n[~petits]
+    m2 = m*m
+    # Développement asymptotique (série de Stirling).
+    resultat[~petits] = (1/12 - (1/360 - (1/1260 - (1/1680 - 1/(1188*m2))/m2)/m2)/m2)/m
+    return resultat if resultat.ndim else float(resultat)
+
+
+def _bd0(x, np_):
+    """Retourne x*ln(x/np_) + np_ - x, calculé sans perte de précision
+    lorsque x est proche de np_."""
+    x = numpy.asarray(x, dtype=float)
+    np_ = numpy.asarray(np_, dtype=float)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        resultat = x*numpy.log(x/np_) + np_ - x
+        proches = numpy.abs(x - np_) < .1*(x + np_)
+        if proches.any():
+            x, np_ = numpy.broadcast_arrays(x, np_)
+            x = x[proches]
+            np_ = np_[proches]
+            v = (x - np_)/(x + np_)
+            somme = (x - np_)*v
+            terme = 2*x*v
+            v2 = v*v
+            # |v| < 0.1 : la série converge rapidement.
+            for j in range(1, 20):
+                terme = terme*v2
+                somme = somme + terme/(2*j + 1)
+            resultat = numpy.array(resultat, dtype=float)
+            resultat[proches] = somme
+    return resultat
+
+
+def _densite_binomiale(k, n, p):
+    """Retourne C(n, k)*p^k*(1-p)^(n-k) (`k` et `n` pouvant ne pas être entiers).
+
+    On utilise l'algorithme de C. Loader ("Fast and accurate computation of
+    binomial probabilities", 2000), qui évite de soustraire des ln(k!) très grands.
+    """
+    k = numpy.asarray(k, dtype=float)
+    resultat = numpy.empty(k.shape)
+    q = 1 - p
+    extremites = (k == 0) | (k == n)
+    resultat[k == 0] = math.exp(n*math.log1p(-p))
+    resultat[k == n] = math.exp(n*math.log(p))
+    k = k[~extremites]
+    if k.size:
+        ln_c = (_stirlerr(n) - _stirlerr(k) - _stirlerr(n - k)
+                - _bd0(k, n*p) - _bd0(n - k, n*q))
+        ln_f = math.log(2*math.pi) + numpy.log(k) + numpy.log1p(-k/n)
+        resultat[~extremites] = numpy.exp(ln_c - ln_f/2)
+    return resultat if resultat.ndim else float(resultat)
+
+
+def loi_binomiale(n, p):
+    """Retourne la loi binomiale B(n, p).
+
+    Les lois (et donc leurs tables) sont conservées en cache."""
+    cle = (int(n), float(p))
+    if param.memoisation:
+        try:
+            return _cache_binomiales.lire(cle)
+        except KeyError:
+            pass
+    loi = LoiBinomiale(n, p)
+    if param.memoisation:
+        _cache_binomiales.ecrire(cle, loi)
+    return loi
+
+
+class LoiNormale(object):
+    "Loi normale N(mu, sigma²)."
+
+    def __init__(self, mu=0, sigma=1):
+        if not sigma > 0:
+            raise ValueError("sigma doit être strictement positif.")
+        self.mu = mu
+        self.sigma = sigma
+
+    def _centrer(self, x):
+        return (x - self.mu)/(self.sigma*math.sqrt(2))
+
+    def proba(self, a, b):
+        """Retourne P(a < X < b).
+
+        Plus exactement, retourne P(X < b) - P(X < a) (valeur négative si b < a)."""
+        a, b = convertir(a), convertir(b)
+        za = self._centrer(a)
+        zb = self._centrer(b)
+        # P(X < x) = erfc(-z)/2 et P(X > x) = erfc(z)/2
+        resultat = numpy.where(za > 0, (_erfc(za) - _erfc(zb))/2,
+                                       (_erfc(-zb) - _erfc(-za))/2).astype(float)
+        return _resultat(resultat, a, b)
+
+    def repartition(self, x):
+        "Retourne P(X < x)."
+        return self.proba(-numpy.inf, x)
+
+
+def _fraction_continue(a, b, x, iterations=100000, epsilon=1e-16):
+    "Fraction continue de la fonction bêta incomplète (méthode de Lentz)."
+    minimum = 1e-300
+    c = 1.
+    d = 1 - (a + b)*x/(a + 1)
+    if abs(d) < minimum:
+        d = minimum
+    d = 1/d
+    h = d
+    for m in range(1, iterations):
+        m2 = 2*m
+        for coeff in (m*(b - m)*x/((a - 1 + m2)*(a + m2)),
+                      -(a + m)*(a + b + m)*x/((a + m2)*(a + 1 + m2))):
+            d = 1 + coeff*d
+            if abs(d) < minimum:
+                d = minimum
+            c = 1 + coeff/c
+            if abs(c) < minimum:
+                c = minimum
+            d = 1/d
+            delta = d*c
+            h *= delta
+        if abs(delta - 1) < epsilon:
+            break
+    return h
+
+
+def beta_incomplete(a, b, x):
+    """Fonction bêta incomplète régularisée I_x(a, b).
+
+    Pour la loi binomiale : P(X <= k) = I_{1-p}(n - k, k + 1)."""
+    if x <= 0:
+        return 0.
+    if x >= 1:
+        return 1.
+    # x^a*(1-x)^b/B(a, b), à un facteur près.
+    facteur = _densite_binomiale(a, a + b, x)/(a + b)
+    if x < (a + 1)/(a + b + 2):
+        return facteur*b*_fraction_continue(a, b, x)
+    return 1 - facteur*a*_fraction_continue(b, a, 1 - x)
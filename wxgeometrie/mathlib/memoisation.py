@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#                Mémoïsation                  #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Caches utilisés par les solveurs.
+
+Les expressions sympy servent directement de clés : leur hash et leur test
+d'égalité sont structurels, deux expressions identiques partagent donc la même
+entrée, même si elles ont été construites séparément.
+
+Deux sortes de caches sont disponibles :
+- `Cache` : cache partagé, de taille bornée (les entrées les moins récemment
+  utilisées sont éliminées en premier) ;
+- `CacheResolution` : cache propre à chaque thread, vidé à la fin de la
+  résolution en cours (cf. `CacheResolution.portee()`).
+
+La mémoïsation peut être désactivée (utile pour le débogage) via
+`param.memoisation`.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from inspect import signature
+import threading
+
+from sympy import Dummy
+
+from .internal_functions import extract_var
+from .. import param
+
+
+# Variable utilisée pour normaliser les clés : f(x**2 - 1, x) et f(t**2 - 1, t)
+# correspondent ainsi à la même entrée du cache.
+VAR = Dummy('x', real=True)
+
+# Liste de tous les caches créés (cf. `statistiques()`).
+_caches = []
+
+
+class Cache(object):
+    """Cache de taille bornée, partagé entre les threads.
+
+    Si `taille_max` vaut None, la taille maximale est lue dans
+    `param.taille_cache_solveurs`.
+    """
+
+    def __init__(self, nom, taille_max=None):
+        self.nom = nom
+        self._taille_max = taille_max
+        self._verrou = threading.RLock()
+        self._donnees = OrderedDict()
+        self.reinitialiser_statistiques()
+        _caches.append(self)
+
+    @property
+    def taille_max(self):
+        if self._taille_max is None:
+            return param.taille_cache_solveurs
+        return self._taille_max
+
+    @property
+    def donnees(self):
+        return self._donnees
+
+    def __len__(self):
+        return len(self.donnees)
+
+    def __contains__(self, cle):
+        return cle in self.donnees
+
+    def lire(self, cle):
+        """Retourne la valeur associée à `cle`, ou lève une `KeyError`."""
+        with self._verrou:
+            donnees = self.donnees
+            try:
+                valeur = donnees[cle]
+            except KeyError:
+                self.echecs += 1
+                raise
+            donnees.move_to_end(cle)
+            self.succes += 1
+            return valeur
+
+    def ecrire(self, cle, valeur):
+        with self._verrou:
+            donnees = self.donnees
+            donnees[cle] = valeur
+            donnees.move_to_end(cle)
+            taille_max = self.taille_max
+            if taille_max is not None:
+                while len(donnees) > taille_max:
+                    donnees.popitem(last=False)
+                    self.eliminations += 1
+
+    def vider(self):
+        with self._verrou:
+            self.donnees.clear()
+
+    def reinitialiser_statistiques(self):
+        self.succes = 0
+        self.echecs = 0
+        self.eliminations = 0
+
+    def statistiques(self):
+        """Retourne un dictionnaire décrivant l'utilisation du cache."""
+        total = self.succes + self.echecs
+        return {'nom': self.nom,
+                'taille': len(self),
+                'taille_max': self.taille_max,
+                'succes': self.succes,
+                'echecs': self.echecs,
+                'eliminations': self.eliminations,
+                'taux': (self.succes/total if total else 0.),
+                }
+
+
+class _DonneesLocales(threading.local):
+    def __init__(self):
+        # Nombre de résolutions imbriquées en cours (dans ce thread).
+        self.profondeur = 0
+        self.donnees = OrderedDict()
+
+
+class CacheResolution(Cache):
+    """Cache propre à chaque thread, valable le temps d'une résolution.
+
+    Les valeurs ne sont conservées qu'à l'intérieur d'un bloc `portee()` ;
+    le cache est vidé en sortie du bloc le plus externe."""
+
+    def __init__(self, nom):
+        self._locales = _DonneesLocales()
+        Cache.__init__(self, nom, taille_max=None)
+
+    @property
+    def taille_max(self):
+        return None
+
+    @property
+    def donnees(self):
+        return self._locales.donnees
+
+    @contextmanager
+    def portee(self):
+        locales = self._locales
+        locales.profondeur += 1
+        try:
+            yield
+        finally:
+            locales.profondeur -= 1
+            if not locales.profondeur:
+                locales.donnees.clear()
+
+
+def memoiser(cache, parametres=()):
+    """Décorateur mémoïsant une fonction de la forme `f(expression, variable, ...)`.
+
+    La clé est formée de l'expression (où la variable est remplacée par `VAR`),
+    des autres arguments, et de la valeur des paramètres listés dans
+    `parametres` (noms d'attributs de `param`, comme 'calcul_approche').
+    Les appels utilisant des arguments internes (ceux commençant par `_`,
+    comme `_niveau`) ne sont pas mémoïsés.
+
+    Si `cache` est un `CacheResolution`, chaque appel ouvre une portée :
+    les appels effectués pendant son exécution partagent le même cache.
+    """
+    def decorateur(fonction):
+        sig = signature(fonction)
+        internes = tuple(nom for nom in sig.parameters if nom.startswith('_'))
+        defauts = {nom: sig.parameters[nom].default for nom in internes}
+        portee = getattr(cache, 'portee', None)
+
+        @wraps(fonction)
+        def memoisee(expression, variable=None, *args, **kw):
+            if not param.memoisation:
+                return fonction(expression, variable, *args, **kw)
+            if variable is None:
+                variable = extract_var(expression)
+            arguments = sig.bind(expression, variable, *args, **kw)
+            if any(arguments.arguments.get(nom, defauts[nom]) != defauts[nom]
+                   for nom in internes):
+                return fonction(expression, variable, *args, **kw)
+            arguments.apply_defaults()
+            cle = (fonction.__name__, normaliser(expression, variable))
+            cle += tuple(val for nom, val in list(arguments.arguments.items())[2:]
+                         if nom not in internes)
+            cle += tuple(getattr(param, nom, None) for nom in parametres)
+            try:
+                return cache.lire(cle)
+            except KeyError:
+                pass
+            except TypeError:
+                # Expression non hashable.
+                return fonction(expression, variable, *args, **kw)
+            if portee is None:
+                resultat = fonction(expression, variable, *args, **kw)
+                cache.ecrire(cle, resultat)
+            else:
+                with portee():
+                    resultat = fonction(expression, variable, *args, **kw)
+                    cache.ecrire(cle, resultat)
+            return resultat
+
+        memoisee.cache = cache
+        return memoisee
+    return decorateur
+
+
+def normaliser(expression, variable):
+    """Remplace `variable` par `VAR` dans l'expression."""
+    if hasattr(expression, 'xreplace'):
+        return expression.xreplace({variable: VAR})
+    return expression
+
+
+def statistiques():
+    """Retourne les statistiques de tous les caches."""
+    return [cache.statistiques() for cache in _caches]
+
+
+def vider_caches():
+    """Vide tous les caches, et réinitialise leurs statistiques."""
+    for cache in _caches:
+        cache.vider()
+        cache.reinitialiser_statistiques()
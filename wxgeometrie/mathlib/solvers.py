@@ -33,10 +33,91 @@ from .internal_functions import extract_var, is_pos, is_var, is_neg
 from .custom_functions import floats2rationals
 from ..pylib import split_around_parenthesis
 from .sympy_functions import factor, solve as solve_
+from .memoisation import Cache, CacheResolution, memoiser, normaliser
 from .. import param
 
 
 
+# Mémoïsation
+# -----------
+# Lors d'une résolution, positif() est appelée de nombreuses fois sur les mêmes
+# sous-expressions (par exemple, positif(facteur, strict=True) puis
+# positif(facteur, strict=False)) : ses résultats sont conservés le temps de
+# la résolution en cours.
+# ensemble_definition() et periode() sont en outre appelées sur les mêmes
+# expressions par resoudre(), tabvar(), tabsign()... : leurs résultats sont
+# conservés dans un cache partagé (de taille bornée).
+
+_cache_positif = CacheResolution('positif')
+_cache_ensemble_definition = Cache('ensemble_definition')
+_cache_periode = Cache('periode')
+
+
+def memoisation():
+    """Partage les résultats intermédiaires entre tous les appels à positif()
+    effectués dans le bloc `with memoisation(): ...`.
+
+    Le cache est vidé en sortie du bloc le plus externe."""
+    return _cache_positif.portee()
+
+
+
+# Étude en parallèle du signe des facteurs
+# ----------------------------------------
+# Si `param.processus_solveurs` vaut au moins 2, le signe des différents
+# facteurs d'un produit est étudié dans des processus distincts.
+
+_pool = None
+_taille_pool = 0
+# Vaut True dans les processus fils (pas de parallélisation imbriquée).
+_processus_fils = False
+
+
+def _initialiser_processus_fils():
+    global _processus_fils
+    _processus_fils = True
+
+
+def _pool_processus(taille):
+    global _pool, _taille_pool
+    if _pool is None or _taille_pool != taille:
+        from concurrent.futures import ProcessPoolExecutor
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(taille, initializer=_initialiser_processus_fils)
+        _taille_pool = taille
+    return _pool
+
+
+def _signes_facteur(facteur, variable):
+    """Retourne les ensembles sur lesquels `facteur` est strictement positif,
+    et positif ou nul."""
+    return (positif(facteur, variable, strict=True),
+            positif(facteur, variable, strict=False))
+
+
+def _signes_facteurs(facteurs, variable):
+    """Applique `_signes_facteur()` à chaque facteur, éventuellement en parallèle."""
+    taille = param.processus_solveurs
+    a_calculer = [facteur for facteur in facteurs if is_var(facteur, variable)]
+    if _processus_fils or taille < 2 or len(a_calculer) < 2:
+        return [_signes_facteur(facteur, variable) for facteur in facteurs]
+    futures = {facteur: _pool_processus(taille).submit(_signes_facteur, facteur, variable)
+               for facteur in a_calculer}
+    signes = []
+    for facteur in facteurs:
+        if facteur in futures:
+            pos, pos_nul = futures[facteur].result()
+            if param.memoisation:
+                # On alimente le cache, comme si le calcul avait eu lieu ici.
+                cle = ('positif', normaliser(facteur, variable))
+                _cache_positif.ecrire(cle + (True,), pos)
+                _cache_positif.ecrire(cle + (False,), pos_nul)
+            signes.append((pos, pos_nul))
+        else:
+            signes.append(_signes_facteur(facteur, variable))
+    return signes
+
 
 
 
@@ -77,6 +158,7 @@ def nul(expression, variable=None, intervalle=True, ensemble='R'):
     return solutions
 
 
+@memoiser(_cache_ensemble_definition, parametres=('calcul_approche',))
 def ensemble_definition(expression, variable = None):
 ##    print expression, variable
     if variable is None:
@@ -132,6 +214,7 @@ def ensemble_definition(expression, variable = None):
     return ens_def
 
 
+@memoiser(_cache_periode)
 def periode(expression, variable=None):
     """Retourne la période minimale de la fonction.
 
@@ -190,6 +273,7 @@ def periode(expression, variable=None):
 
 
 
+@memoiser(_cache_positif)
 def positif(expression, variable=None, strict=False, _niveau=0, _changement_variable=None):
     """Retourne l'ensemble sur lequel une expression à variable réelle est positive (resp. strictement positive)."""
     from .sympy_functions import factor
@@ -243,11 +327,9 @@ def positif(expression, variable=None, strict=False, _niveau=0, _changement_vari
     if expression.is_Mul:
         posit = R
         posit_nul = R
-        for facteur in expression.args:
-            # pos : ensemble des valeurs pour lequelles l'expression est positive
-            # pos_nul : ensemble des valeurs pour lequelles l'expression est positive ou nulle
-            pos = positif(facteur, variable, strict = True)
-            pos_nul = positif(facteur, variable, strict = False)
+        # pos : ensemble des valeurs pour lequelles l'expression est positive
+        # pos_nul : ensemble des valeurs pour lequelles l'expression est positive ou nulle
+        for pos, pos_nul in _signes_facteurs(expression.args, variable):
             # posit : les deux sont strictements positifs, ou les deux sont strictements négatifs
             # posit_nul : les deux sont positifs ou nuls, ou les deux sont négatifs ou nuls
             posit, posit_nul = ((posit & pos) + (-posit_nul & -pos_nul) & ens_def,
@@ -598,6 +680,7 @@ def positif(expression, variable=None, strict=False, _niveau=0, _changement_vari
 
 
 
+@memoisation()
 def resoudre(chaine, variables=(), local_dict=None, ensemble='R'):
     """Résout une équation ou inéquation, rentrée sous forme de chaîne.
 
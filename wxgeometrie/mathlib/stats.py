@@ -26,9 +26,12 @@
 import math
 
 from sympy import Rational, sqrt, S
-from sympy.stats import Normal, Binomial, P
+from sympy.stats import P
 import sympy.stats
 
+# Calcul numérique si possible (cf. `mathlib.lois`).
+from .custom_functions import normal, binomial
+
 
 
 
@@ -187,22 +190,6 @@ def confiance(frequence, taille=1000, seuil=None):
     return frequence - delta, frequence + delta
 
 
-def normal(a, b, mu=0, sigma=1):
-    """Retourne P(a < X < b), où X suit la loi normale N(mu, sigma²).
-    """
-    X = Normal('X', mu, sigma)
-    return (proba(X <= b) - proba(X < a)).evalf()
-
-
-def binomial(a, b, n, p):
-    """Retourne P(a <= X <= b), où X suit la loi binomiale B(n, p).
-
-    ..note:: Taper binomial(a, a, n, p) pour calculer P(X = a).
-    """
-    X = Binomial('X', n, p)
-    return (proba(X <= b) - proba(X < a)).evalf()
-
-
 def va(loi, *parametres):
     # [key for key, val in sympy.stats.__dict__.items()
     #                if isinstance(val, types.FunctionType)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../.."))
+sys.path.insert(0, TOPDIR)
+
+import numpy
+from sympy import Integer, isprime, factorint, divisors, primerange
+
+from wxgeometrie.mathlib import arithmetique
+from wxgeometrie.mathlib.arithmetique import (TablePremiers, premiers_jusqua, n_premiers,
+                    est_premier, facteurs_premiers, diviseurs, pgcd, ppcm)
+from wxgeometrie.mathlib.custom_functions import bin
+
+import tools.unittest
+
+
+class MathlibTest(tools.unittest.TestCase):
+    def test_crible(self):
+        table = TablePremiers()
+        table.etendre(100)
+        self.assertEqual(table.premiers[:10].tolist(), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        limite = table.limite
+        # Extension de la table (plusieurs segments).
+        table.etendre(3*arithmetique.TAILLE_SEGMENT + 17)
+        self.assertGreater(table.limite, limite)
+        self.assertEqual(table.premiers.tolist(), list(primerange(0, table.limite)))
+        for n in (0, 1, 2, 4, 9, 97, 561, 65537, 65539, 786433):
+            self.assertEqual(n in table, isprime(n))
+
+    def test_premiers(self):
+        self.assertEqual(premiers_jusqua(30), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertEqual(n_premiers(5), [2, 3, 5, 7, 11])
+        self.assertEqual(n_premiers(1), [2])
+        premiers = n_premiers(100000)
+        self.assertEqual(len(premiers), 100000)
+        self.assertEqual(premiers[-1], 1299709)
+        self.assertRaises(OverflowError, n_premiers, 100, maximum=50)
+        self.assertEqual(n_premiers(0), [])
+        self.assertRaises(ValueError, n_premiers, -1)
+        self.assertTrue(est_premier(1299709))
+        self.assertFalse(est_premier(Integer(1299711)))
+        self.assertTrue(est_premier(2**61 - 1))
+        self.assertFalse(est_premier(2.5))
+        self.assertTrue(est_premier(7.))
+
+    def test_facteurs_premiers(self):
+        for n in (1, 2, 360, 1001, 2**20, 999983*999979, 2**61 - 1, 10**20 + 1, -12):
+            self.assertEqual(facteurs_premiers(n), factorint(n))
+        self.assertEqual(diviseurs(360), divisors(360))
+        self.assertEqual(diviseurs(-97), [1, 97])
+        self.assertRaises(ValueError, diviseurs, 0)
+
+    def test_pgcd_ppcm(self):
+        self.assertEqual(pgcd(12, 18, 30), 6)
+        self.assertEqual(pgcd([12, 18, 30]), 6)
+        self.assertEqual(ppcm(4, 6, 10), 60)
+        self.assertEqual(ppcm((4, 6, 10)), 60)
+        self.assertIsInstance(pgcd(Integer(12), 18), Integer)
+        self.assertEqual(pgcd(1.5, 2.5), .5)
+        tableau = numpy.array([12, 18, 30])
+        self.assertEqual(pgcd(tableau), 6)
+        self.assertEqual(ppcm(tableau), 180)
+        self.assertEqual(pgcd(tableau, 8).tolist(), [4, 2, 2])
+        self.assertEqual(ppcm(tableau, 8).tolist(), [24, 72, 120])
+        # Pas de dépassement de capacité.
+        self.assertEqual(ppcm(numpy.array(n_premiers(20))), numpy.prod(n_premiers(20), dtype=object))
+
+    def test_bin(self):
+        self.assertEqual(bin(10), '1010')
+        self.assertEqual(bin(Integer(255)), '11111111')
+        self.assertEqual(bin(0), '0')
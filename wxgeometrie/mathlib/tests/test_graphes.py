@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../.."))
+sys.path.insert(0, TOPDIR)
+
+from sympy import oo, Matrix
+
+from wxgeometrie.mathlib.graphes import Graph
+
+import tools.unittest
+
+
+class MathlibTest(tools.unittest.TestCase):
+    def test_adjacency(self):
+        g = Graph("A>(B:1,C:2), B>(A:4,C:2,C:5), C, D", oriented=True)
+        adjacency = g.adjacency()
+        self.assertEqual(adjacency.nodes, ['A', 'B', 'C', 'D'])
+        self.assertEqual(adjacency.indptr.tolist(), [0, 2, 4, 4, 4])
+        self.assertEqual(adjacency.indices.tolist(), [1, 2, 0, 2])
+        self.assertEqual(adjacency.weights, [1, 2, 4, 2])
+        self.assertEqual(adjacency.multiplicities.tolist(), [1, 1, 1, 2])
+
+    def test_degrees(self):
+        g = Graph("A>(B,C,A), B>(A), C>(A), D")
+        self.assertEqual(g.degrees, {'A': 4, 'B': 1, 'C': 1, 'D': 0})
+        self.assertEqual(g.degrees, dict((node, g.degree(node)) for node in g))
+        g = Graph("A>(B,C,A), B>(A,C,C), C, D", oriented=True)
+        self.assertEqual(g.degrees, {'A': 3, 'B': 3, 'C': 0, 'D': 0})
+
+    def test_connected(self):
+        self.assertTrue(Graph("A>(B), B>(A,C), C>(B)").connected)
+        self.assertFalse(Graph("A>(B), B>(A), C").connected)
+        # L'orientation des arêtes n'est pas prise en compte.
+        self.assertTrue(Graph("A>(B), B, C>(B)", oriented=True).connected)
+
+    def test_symetric(self):
+        self.assertTrue(Graph("A>(B,B), B>(A,A)", oriented=True).symetric)
+        self.assertFalse(Graph("A>(B,B), B>(A)", oriented=True).symetric)
+
+    def test_shortest_path(self):
+        g = Graph("A>(B:1,C:4), B>(A:1,C:2,D:5), C>(A:4,B:2,D:1), D>(B:5,C:1), E")
+        self.assertEqual(g.shortest_path('A', 'D'), (4, set([('A', 'B', 'C', 'D')])))
+        g = Graph("A>(B:1,C:1), B>(A:1,D:1), C>(A:1,D:1), D>(B:1,C:1)")
+        self.assertEqual(g.shortest_path('A', 'D'),
+                         (2, set([('A', 'B', 'D'), ('A', 'C', 'D')])))
+        g = Graph("A>(B:1), B, C>(A:1)", oriented=True)
+        self.assertEqual(g.shortest_path('A', 'C'), (oo, []))
+
+    def test_latex_Dijkstra(self):
+        g = Graph("A>(B:1,C:4), B>(A:1,C:2,D:5), C>(A:4,B:2,D:1), D>(B:5,C:1)")
+        self.assertEqual(g.latex_Dijkstra('A', 'D'), r"""On applique l'algorithme de Moore-Dijkstra~:
+
+\begin{tabular}{|*{4}{c|}}\hline
+$A$&$B$&$C$&$D$\\\hline\hline
+\textbf{0 $(A)$}&$+\infty$&$+\infty$&$+\infty$\\\hline
+&\textbf{1 $(A)$}&4 $(A)$&$+\infty$\\\hline
+&&\textbf{3 $(B)$}&6 $(B)$\\\hline
+&&&\textbf{4 $(C)$}\\\hline
+\end{tabular}
+
+La distance minimale entre le sommet $A$ et le sommet $D$ est de $4$.
+Cela correspond au chemin $A-B-C-D$.
+""")
+
+    def test_eulerian_trail(self):
+        g = Graph("A>(B,C), B>(A,C,D,D), C>(A,B), D>(B,B)")
+        chaine = g.eulerian_trail()
+        # Tous les degrés sont pairs : la chaîne est fermée.
+        self.assertEqual(len(chaine), 6)
+        self.assertEqual(chaine[0], chaine[-1])
+        self.assertTrue(g.eulerian_trail('-'.join(chaine)))
+        self.assertFalse(g.eulerian_trail('B-A-C-B-D'))
+        # Boucle : comptée deux fois dans le degré.
+        self.assertEqual(Graph("A>(A,B), B>(A)").eulerian_trail(), ['A', 'A', 'B'])
+        # Graphe orienté.
+        g = Graph("A>(B), B>(C), C>(A,D), D", oriented=True)
+        self.assertEqual(g.eulerian_trail(), ['C', 'A', 'B', 'C', 'D'])
+        self.assertTrue(g.eulerian_trail('C-A-B-C-D'))
+        # Pas de chaîne eulérienne.
+        self.assertIs(Graph("A>(B,C,D), B>(A), C>(A), D>(A)").eulerian_trail(), None)
+        self.assertIs(Graph("A>(B), B>(A), C>(D), D>(C)").eulerian_trail(), None)
+        self.assertIs(Graph("A>(B,C), B, C", oriented=True).eulerian_trail(), None)
+
+    def test_eulerian_trail_grand_graphe(self):
+        # Cycle de 100000 sommets : pas de récursion.
+        n = 100000
+        g = Graph(dict((i, [(i - 1)%n, (i + 1)%n]) for i in range(n)))
+        chaine = g.eulerian_trail()
+        self.assertEqual(len(chaine), n + 1)
+        self.assertEqual(chaine[0], chaine[-1])
+
+    def test_coloring(self):
+        g = Graph("A>(B,C,D), B>(A,C), C>(A,B), D>(A,E), E>(D)")
+        self.assertEqual(g.coloring(), [['A', 'E'], ['B', 'D'], ['C']])
+        self.assertEqual(g.coloring('E'), [['E', 'A'], ['B', 'D'], ['C']])
+        self.assertEqual(g.coloring(algorithm='DSATUR'), [['A', 'E'], ['B', 'D'], ['C']])
+        self.assertRaises(ValueError, g.coloring, 'A', algorithm='DSATUR')
+        self.assertRaises(ValueError, g.coloring, algorithm='glouton')
+
+    def test_coloring_DSATUR(self):
+        # Welsh & Powell utilise 3 couleurs sur ce graphe biparti, DSATUR 2.
+        g = Graph("A>(D,F), B>(E,F), C>(D,E,F), D>(A,C), E>(B,C), F>(A,B,C)")
+        coloring = g.coloring(algorithm='DSATUR')
+        self.assertEqual(len(coloring), 2)
+        self.assertEqual(sorted(map(sorted, coloring)), [['A', 'B', 'C'], ['D', 'E', 'F']])
+
+    def test_matrix(self):
+        g = Graph("A>(B:2,C:3,C:1), B>(A:2), C>(A:3,A:1,C:5)")
+        self.assertEqual(g.matrix, Matrix([[0, 1, 2], [1, 0, 0], [2, 0, 2]]))
+        self.assertEqual(g.matrix2(), Matrix([[0, 2, 1], [2, 0, 0], [1, 0, 5]]))
+        self.assertEqual(g.matrix2(default=oo)[1, 2], oo)
+        self.assertEqual(g.sparse_matrix(weights=True)[0, 2], 1)
+        self.assertEqual(g.paths_matrix(0), Matrix.eye(3))
+        self.assertEqual(g.paths_matrix(5), g.matrix**5)
+
+    def test_paths_matrix_entiers_longs(self):
+        # Les coefficients dépassent la capacité des entiers 64 bits.
+        g = Graph(dict((i, [j for j in range(10) if j != i]) for i in range(10)))
+        M = g.paths_matrix(30)
+        self.assertEqual(M, g.matrix**30)
+        self.assertGreater(M[0, 0], 2**64)
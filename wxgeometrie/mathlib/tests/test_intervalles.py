@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 import os, sys
+import pickle
+import random
+import numpy
 TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../.."))
 sys.path.insert(0, TOPDIR)
 
-from sympy import sqrt, pi
+from sympy import sqrt, pi, oo, Rational, Float
 
 import wxgeometrie.mathlib.intervalles as intervalles
 from wxgeometrie.mathlib.intervalles import Intervalle, Ensemble, \
@@ -11,6 +14,28 @@ from wxgeometrie.mathlib.intervalles import Intervalle, Ensemble, \
 
 import tools.unittest
 
+
+def _borne(symbolique=False):
+    choix = random.randint(0, 9)
+    if choix == 0:
+        return random.choice((-oo, oo))
+    elif choix < 5:
+        return random.randint(-5, 5)
+    elif choix < 8:
+        return Rational(random.randint(-10, 10), 2)
+    elif symbolique:
+        return random.randint(-2, 2)*sqrt(2)
+    else:
+        return Float(random.choice((-2.5, -.5, .75, 1.5, 3.25)))
+
+def _union_aleatoire(symbolique=False):
+    intervalles = []
+    for i in range(random.randint(0, 4)):
+        a, b = sorted((_borne(symbolique), _borne(symbolique)))
+        intervalles.append(Intervalle(a, b, random.random() < .5, random.random() < .5))
+    return intervalles
+
+
 class MathlibTest(tools.unittest.TestCase):
 
     def assert_intervalle_preformater(self, x, y):
@@ -65,6 +90,28 @@ class MathlibTest(tools.unittest.TestCase):
     def test_asarray(self):
         i = intervalles.Ensemble('{2}')
         self.assertEqual(tuple(i.asarray(-10,10,.1)[0]), (2,))
+        i = Ensemble(']-oo;-1[U[0;1/3]U[2;5[')
+        for a, intervalle in zip(i.asarray(-3, 4.5, .1), i.intervalles):
+            inf = float(max(intervalle.inf, -3))
+            sup = float(min(intervalle.sup, 4.5))
+            attendu = numpy.append(numpy.arange(inf, sup, .1), sup)
+            self.assertTrue(numpy.array_equal(a, attendu))
+
+    def test_grille(self):
+        unions = [Ensemble(']-oo;0['), Ensemble('[0;2]U{3}')]
+        grille = intervalles.Grille(unions, -1, 5, .5)
+        self.assertEqual(len(grille), 3 + 5 + 1)
+        self.assertEqual([(k, str(i), debut, fin) for k, i, debut, fin in grille.morceaux],
+                         [(0, ']-oo;0[', 0, 3), (1, '[0;2]', 3, 8), (1, '{3}', 8, 9)])
+        self.assertEqual([list(v) for v in grille.vues()],
+                         [[-1, -.5, 0], [0, .5, 1, 1.5, 2], [3]])
+        # Les vues partagent le même tableau.
+        tableau = numpy.zeros(len(grille))
+        grille.vues(tableau)[1][:] = 7
+        self.assertEqual(list(tableau), [0]*3 + [7]*5 + [0])
+        self.assertTrue(grille.compatible([Ensemble(']-oo;0['), Ensemble('[0;2]U{3}')], -1, 5, .5))
+        self.assertFalse(grille.compatible(unions, -1, 5, .1))
+        self.assertFalse(grille.compatible([Ensemble(']-oo;0['), Ensemble('[0;2]')], -1, 5, .5))
 
     def test_conversion_chaine_ensemble(self):
         chaine = '{-(-216*2^(2/3)+4*(-3616+64*sqrt(8113))^(1/3)+2^(1/3)' \
@@ -86,3 +133,35 @@ class MathlibTest(tools.unittest.TestCase):
         self.assertEqual(J - I, Ensemble(']4;5['))
         self.assertEqual(-I, Ensemble(']-oo;2[U]4;+oo['))
         self.assertEqual(-J, Ensemble(']-oo;3[U[5;+oo['))
+
+    def test_pickle(self):
+        for chaine in (']-oo;3[U]3;4]U]5;+oo[', '[2;5[', '{1;2}', 'R'):
+            E = Ensemble(chaine)
+            self.assertEqual(pickle.loads(pickle.dumps(E)), E)
+        self.assertTrue(pickle.loads(pickle.dumps(Ensemble('[2;1]'))).vide)
+
+    def test_voie_rapide(self):
+        # La voie rapide doit donner exactement les mêmes résultats
+        # que l'implémentation générale.
+        random.seed(1)
+        def calculer(A, B, valeurs):
+            U = intervalles.Union(*A)
+            V = intervalles.Union(*B)
+            resultats = [U, V, U + V, U*V, V*U, U - V, -U, U & Intervalle(-1, 2)]
+            resultats = [(type(E).__name__, str(E)) for E in resultats]
+            if not U.vide:
+                resultats.append([val in U for val in valeurs])
+            return resultats
+        valeurs = [-oo, oo, -3, Rational(-1, 2), 0, 1, Float(.75), Rational(5, 2), 4]
+        try:
+            for symbolique in (False, True):
+                for i in range(300):
+                    A = _union_aleatoire(symbolique)
+                    B = _union_aleatoire(symbolique)
+                    intervalles.VOIE_RAPIDE = True
+                    rapide = calculer(A, B, valeurs)
+                    intervalles.VOIE_RAPIDE = False
+                    lent = calculer(A, B, valeurs)
+                    self.assertEqual(rapide, lent, (A, B))
+        finally:
+            intervalles.VOIE_RAPIDE = True
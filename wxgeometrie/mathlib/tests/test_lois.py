@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../.."))
+sys.path.insert(0, TOPDIR)
+
+import math
+
+import numpy
+from sympy import Rational, Symbol, binomial as C, oo
+
+from wxgeometrie.mathlib import lois
+from wxgeometrie.mathlib.lois import LoiBinomiale, LoiNormale, loi_binomiale, beta_incomplete
+from wxgeometrie.mathlib.custom_functions import binomial, normal
+
+import tools.unittest
+
+
+class MathlibTest(tools.unittest.TestCase):
+    def test_binomiale(self):
+        n, p = 20, Rational(1, 3)
+        loi = LoiBinomiale(n, float(p))
+        for a, b in ((0, 20), (3, 7), (5, 5), (12, 20), (-oo, 4), (15.5, oo)):
+            ka = max(0, math.ceil(a))
+            kb = min(20, math.floor(b))
+            exact = sum(C(n, k)*p**k*(1 - p)**(n - k) for k in range(ka, kb + 1))
+            self.assertAlmostEqual(loi.proba(a, b)/float(exact), 1, places=13)
+        self.assertAlmostEqual(loi.proba(7, 3), -loi.proba(4, 6), places=15)
+        self.assertEqual(LoiBinomiale(5, 1).proba(5, 5), 1)
+        self.assertEqual(LoiBinomiale(5, 0).proba(1, 5), 0)
+        # Vectorisation
+        resultat = loi.proba(numpy.array([0, 3, 5]), numpy.array([20, 7, 5]))
+        self.assertEqual(list(resultat), [loi.proba(0, 20), loi.proba(3, 7), loi.proba(5, 5)])
+        self.assertRaises(ValueError, LoiBinomiale, 10, 1.5)
+        self.assertRaises(ValueError, LoiBinomiale, 2.5, .5)
+
+    def test_binomiale_grand_n(self):
+        loi = loi_binomiale(10000, .37)
+        self.assertIs(loi_binomiale(10000, .37), loi)
+        self.assertAlmostEqual(float(loi.probabilites.sum()), 1, places=13)
+        # Tables et fonction bêta incomplète doivent concorder.
+        for k in (3500, 3700, 3800):
+            self.assertAlmostEqual(loi.repartition(k)/loi._inferieur(k), 1, places=11)
+        tables = lois.TAILLE_MAX_TABLES
+        try:
+            lois.TAILLE_MAX_TABLES = 100
+            sans_table = LoiBinomiale(10000, .37)
+        finally:
+            lois.TAILLE_MAX_TABLES = tables
+        self.assertFalse(sans_table.tabulee)
+        self.assertAlmostEqual(sans_table.proba(3650, 3750)/loi.proba(3650, 3750), 1, places=11)
+        # Valeur de référence : 1 - P(X <= 3999) (calculée avec scipy).
+        self.assertAlmostEqual(loi.proba(4000, oo)/3.370675271291e-10, 1, places=9)
+
+    def test_beta_incomplete(self):
+        self.assertAlmostEqual(beta_incomplete(2, 3, .4), 0.5248, places=15)
+        self.assertAlmostEqual(beta_incomplete(.5, .5, .5), .5, places=15)
+        self.assertEqual(beta_incomplete(2, 3, 0), 0)
+        self.assertEqual(beta_incomplete(2, 3, 1), 1)
+
+    def test_normale(self):
+        loi = LoiNormale(7, 4)
+        self.assertAlmostEqual(loi.proba(-1, 5), 0.285787406777808, places=15)
+        self.assertEqual(loi.proba(7, oo), .5)
+        self.assertEqual(loi.proba(-oo, oo), 1)
+        # Queue de distribution (cf. issue 259)
+        self.assertAlmostEqual(LoiNormale(100, 5).proba(140.1, 150.3)/5.287258229932e-16, 1, places=11)
+        resultat = LoiNormale().proba(numpy.array([-1, -2]), numpy.array([1, 2]))
+        self.assertAlmostEqual(resultat[0], 0.682689492137086, places=15)
+        self.assertAlmostEqual(resultat[1], 0.954499736103642, places=15)
+        self.assertRaises(ValueError, LoiNormale, 0, 0)
+
+    def test_fonctions_utilisateur(self):
+        self.assertEqual(str(binomial(2, 5, 7, 0.3)), '0.666792000000000')
+        self.assertEqual(binomial(2, 5, 7, Rational(3, 10), exact=True), Rational(83349, 125000))
+        self.assertAlmostEqual(normal(-1.96, 1.96), 0.950004209703559, places=15)
+        # Paramètres symboliques : calcul confié à sympy.stats.
+        self.assertTrue(normal(-1, 1, Symbol('m')).has(Symbol('m')))
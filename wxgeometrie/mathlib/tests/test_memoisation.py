@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../.."))
+sys.path.insert(0, TOPDIR)
+
+from sympy import Symbol
+
+from wxgeometrie.mathlib.memoisation import Cache, CacheResolution, memoiser
+from wxgeometrie.mathlib import solvers
+from wxgeometrie import param
+
+import tools.unittest
+
+
+class MathlibTest(tools.unittest.TestCase):
+    def test_cache_borne(self):
+        cache = Cache('test', taille_max=2)
+        cache.ecrire('a', 1)
+        cache.ecrire('b', 2)
+        self.assertEqual(cache.lire('a'), 1)
+        # 'b' est l'entrée la moins récemment utilisée.
+        cache.ecrire('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertRaises(KeyError, cache.lire, 'b')
+        stats = cache.statistiques()
+        self.assertEqual((stats['succes'], stats['echecs'], stats['eliminations']), (1, 1, 1))
+
+    def test_cache_resolution(self):
+        cache = CacheResolution('test')
+        appels = []
+        @memoiser(cache)
+        def f(expression, variable=None, _niveau=0):
+            appels.append(expression)
+            return expression + 1
+        x = Symbol('x')
+        t = Symbol('t')
+        with cache.portee():
+            f(x**2)
+            f(t**2, t)
+            # Les arguments internes ne sont pas mémoïsés.
+            f(x**2, x, _niveau=1)
+            self.assertEqual(len(appels), 2)
+        self.assertEqual(len(cache), 0)
+        f(x**2)
+        self.assertEqual(len(appels), 3)
+
+    def test_ensemble_definition(self):
+        x = Symbol('x')
+        cache = solvers._cache_ensemble_definition
+        cache.vider()
+        cache.reinitialiser_statistiques()
+        expr = (x - 2)/(x**2 - 9)
+        self.assert_ens_def(expr, ']-oo;-3[U]-3;3[U]3;+oo[')
+        echecs = cache.echecs
+        self.assert_ens_def(expr, ']-oo;-3[U]-3;3[U]3;+oo[')
+        self.assertEqual(cache.echecs, echecs)
+        self.assertTrue(cache.succes)
+
+    def test_desactivation(self):
+        x = Symbol('x')
+        cache = solvers._cache_ensemble_definition
+        cache.vider()
+        memoisation = param.memoisation
+        try:
+            param.memoisation = False
+            self.assert_ens_def(1/(x - 1), ']-oo;1[U]1;+oo[')
+            self.assertEqual(len(cache), 0)
+        finally:
+            param.memoisation = memoisation
@@ -6,6 +6,8 @@ sys.path.insert(0, TOPDIR)
 from sympy import exp, sqrt, Symbol
 
 from wxgeometrie.mathlib.solvers import resoudre, positif, ensemble_definition
+from wxgeometrie.mathlib import solvers
+from wxgeometrie import param
 
 import tools.unittest
 
@@ -88,3 +90,28 @@ class MathlibTest(tools.unittest.TestCase):
         sols = resoudre('5 + 1500/x**2 - 2*(1500*x + 100)/x**3=0', ensemble='R')
         # 3 solutions
         self.assertEqual(len(sols.intervalles), 3)
+
+    def test_memoisation(self):
+        x = Symbol("x")
+        t = Symbol("t")
+        cache = solvers._cache_positif
+        with solvers.memoisation():
+            self.assert_positif((x - 1)/(x + 1), ']-oo;-1[U[1;+oo[')
+            self.assertTrue(len(cache))
+            # La clé ne dépend pas du nom de la variable.
+            n = len(cache)
+            self.assert_positif((t - 1)/(t + 1), ']-oo;-1[U[1;+oo[')
+            self.assertEqual(len(cache), n)
+        # Le cache est vidé à la fin de la résolution.
+        self.assertFalse(len(cache))
+        self.assert_resoudre('(x-1)*(x+2)/(x-3)>=0', '[-2;1]U]3;+oo[')
+        self.assertFalse(len(cache))
+
+    def test_processus_solveurs(self):
+        processus_solveurs = param.processus_solveurs
+        try:
+            param.processus_solveurs = 2
+            self.assert_resoudre('(2*x+1)*(3*x-4)/((x+5)*(x**2-2))>=0',
+                                 ']-5;-sqrt(2)[U[-1/2;4/3]U]sqrt(2);+oo[')
+        finally:
+            param.processus_solveurs = processus_solveurs
@@ -6,7 +6,7 @@ sys.path.insert(0, TOPDIR)
 import math
 import numpy
 import sympy
-from wxgeometrie.mathlib.universal_functions import asin, acos, atan
+from wxgeometrie.mathlib.universal_functions import asin, acos, atan, ceil, sqrt
 
 import tools.unittest
 
@@ -41,3 +41,51 @@ class MathlibTest(tools.unittest.TestCase):
         self.assertAlmostEqual(b, e)
         self.assertAlmostEqual(c, f)
         self.assertEqual(atan(x + 1), sympy.atan(x + 1))
+
+    def test_aiguillage(self):
+        self.assertIs(type(sqrt(4)), float)
+        # numpy.float64 hérite de float
+        self.assertRaises(ValueError, sqrt, numpy.float64(-1))
+        self.assertEqual(sqrt(-4 + 0j), 2j)
+        self.assertEqual(sqrt(x**2), sympy.sqrt(x**2))
+        self.assertEqual(list(sqrt(numpy.array([4., 9.]))), [2, 3])
+        self.assertEqual(ceil(2.5), 3)
+        self.assertEqual(ceil(x + sympy.Rational(1, 2)), sympy.ceiling(x + sympy.Rational(1, 2)))
+        self.assertEqual(list(ceil(numpy.array([.5, 1.5]))), [1, 2])
+        self.assertRaises(TypeError, ceil, 1j)
+        self.assertIs(sqrt.numpy, numpy.sqrt)
+
+    def test_enregistrer(self):
+        class Reel(float):
+            pass
+        self.assertIs(type(sqrt(Reel(4))), float)
+        try:
+            sqrt.enregistrer(Reel, lambda r: 'racine')
+            self.assertEqual(sqrt(Reel(4)), 'racine')
+            self.assertEqual(sqrt(4.), 2)
+        finally:
+            del sqrt.aiguillage[Reel]
+            del sqrt.enregistrements[Reel]
+
+    def test_enregistrer_type_derive(self):
+        class Reel(float):
+            pass
+        class Positif(Reel):
+            pass
+        class Entier(Positif):
+            pass
+        self.assertEqual(sqrt(Positif(4)), 2)
+        try:
+            sqrt.enregistrer(Reel, lambda r: 'racine')
+            # Type dérivé déjà rencontré, ou rencontré après l'enregistrement.
+            self.assertEqual(sqrt(Positif(4)), 'racine')
+            self.assertEqual(sqrt(Entier(4)), 'racine')
+            # Le type enregistré le plus proche est prioritaire.
+            sqrt.enregistrer(Positif, lambda r: 'racine positive')
+            self.assertEqual(sqrt(Entier(4)), 'racine positive')
+            self.assertEqual(sqrt(Reel(4)), 'racine')
+            self.assertEqual(sqrt(4.), 2)
+        finally:
+            for type_ in (Reel, Positif, Entier):
+                sqrt.aiguillage.pop(type_, None)
+                sqrt.enregistrements.pop(type_, None)
@@ -30,68 +30,22 @@ qu'à des variables formelles ou encore des listes...
 Le dictionnaire fonctions_mathematiques contient les infos suivantes :
 {<nom de la fonction>: [<nom dans math>, <nom dans numpy>, <nom dans sympy>]}
 
-Il est générée via le code suivant::
-
-    import math
-    liste = math.__dict__.items()
-    dico = {}
-    ignore_liste = ("ldexp", "frexp", "pow", "degrees", "radians", "atan2", "hypot", "modf", "fmod", "fabs")
-    dico.update([(nom,[nom,nom,nom]) for nom, objet in liste if not nom.startswith("_") and hasattr(objet, "__call__") and not nom in ignore_liste])
-    # fonctions ayant un nom différent dans numpy :
-    dico["asin"][1] = "arcsin"; dico["acos"][1] = "arccos"; dico["atan"][1] = "arctan"
-    # fonctions ayant un nom différent dans sympy :
-    dico["ceil"][2] = "ceiling"
-    # fonctions à renommer :
-    dico["ln"] = dico.pop("log")
-    dico["log"] = dico.pop("log10")
-    liste = dico.items()
-    liste.sort()
-    s = "_fonctions_mathematiques = " + repr(liste).replace("[(", "{\n").replace(")]", "}").replace(", [", ": [").replace("), (", ",\n")
-    print s
-    exec(s)
-
-    # Vérification du contenu du dictionnaire :
-    import math, sympy, numpy
-    sympy.log10 = lambda x: sympy.log(x, 10)
-    for elt in _fonctions_mathematiques.items():
-    m, n, s = elt[1]
-    getattr(math, m)
-    getattr(numpy, n)
-    getattr(sympy, s)
-
-    # Génération du code :
-
-    # Nom de la fonction dans les modules math, numpy et sympy respectivement.
-    _fonctions_mathematiques = {
-        'acos': ['acos', 'arccos', 'acos'],
-        'asin': ['asin', 'arcsin', 'asin'],
-        'atan': ['atan', 'arctan', 'atan'],
-        'ceil': ['ceil', 'ceil', 'ceiling'],
-        'cos': ['cos', 'cos', 'cos'],
-        'cosh': ['cosh', 'cosh', 'cosh'],
-        'exp': ['exp', 'exp', 'exp'],
-        'floor': ['floor', 'floor', 'floor'],
-        'ln': ['log', 'log', 'log'],
-        'log': ['log10', 'log10', 'log10'],
-        'sin': ['sin', 'sin', 'sin'],
-        'sinh': ['sinh', 'sinh', 'sinh'],
-        'sqrt': ['sqrt', 'sqrt', 'sqrt'],
-        'tan': ['tan', 'tan', 'tan'],
-        'tanh': ['tanh', 'tanh', 'tanh']}
-
-    for _nom, _noms in _fonctions_mathematiques.items():
-        _nom_math, _nom_numpy, _nom_sympy = _noms
-        print  '''\n\ndef %s(*args, **kw):
-        arg0 = args[0]
-        if isinstance(arg0, (int, float)):
-            return _math.%s(*args,**kw)
-        elif isinstance(arg0, complex):
-            return _cmath.%s(*args,**kw)
-        elif isinstance(arg0, _sympy.Basic):
-            return _sympy.%s(*args,**kw)
-        else:
-            return _numpy.%s(*args,**kw)''' %(_nom, _nom_math, _nom_math, _nom_sympy, _nom_numpy)
-
+L'implémentation utilisée (math, cmath, sympy ou numpy) dépend du type du
+premier argument. Elle est recherchée dans une table indexée par le type
+exact de l'argument (`fonction.aiguillage`), complétée au fur et à mesure :
+seul le premier appel pour un type donné nécessite des tests `isinstance`.
+
+Les règles sont les suivantes, dans cet ordre :
+- entiers et réels (int, float et leurs sous-classes) : module math ;
+- complexes : module cmath ;
+- objets sympy : module sympy ;
+- tout le reste (tableaux, listes...) : module numpy.
+
+D'autres types peuvent être ajoutés via `fonction.enregistrer(type, implementation)`.
+
+Enfin, `fonction.numpy` donne directement l'implémentation numpy, ce qui évite
+tout aiguillage lorsque la fonction n'est appliquée qu'à des tableaux
+(tracé de courbes, surfaces...).
 """
 
 
@@ -117,203 +71,88 @@ _fonctions_mathematiques = {
 import numpy as _numpy, sympy as _sympy, math as _math, cmath as _cmath
 _sympy.log10 = lambda x: _sympy.log(x, 10)
 
-_cmath.floor = _math.floor # afin de renvoyer une erreur si floor est appelé avec un complexe
+# afin de renvoyer une erreur si floor ou ceil est appelé avec un complexe
+_cmath.floor = _math.floor
+_cmath.ceil = _math.ceil
 
 _math.abs = _cmath.abs = _sympy.abs = abs
 
-# Le code suivant est généré automatiquement (voir plus haut)
-
-
-def sinh(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.sinh(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.sinh(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.sinh(*args,**kw)
-    else:
-        return _numpy.sinh(*args,**kw)
-
-
-def asin(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.asin(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.asin(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.asin(*args,**kw)
-    else:
-        return _numpy.arcsin(*args,**kw)
-
-
-def cos(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.cos(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.cos(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.cos(*args,**kw)
-    else:
-        return _numpy.cos(*args,**kw)
-
-
-def log(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.log10(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.log10(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.log10(*args,**kw)
-    else:
-        return _numpy.log10(*args,**kw)
-
-
-def atan(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.atan(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.atan(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.atan(*args,**kw)
-    else:
-        return _numpy.arctan(*args,**kw)
-
-
-def floor(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.floor(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.floor(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.floor(*args,**kw)
-    else:
-        return _numpy.floor(*args,**kw)
-
-
-def ln(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.log(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.log(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.log(*args,**kw)
-    else:
-        return _numpy.log(*args,**kw)
-
-
-def tanh(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.tanh(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.tanh(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.tanh(*args,**kw)
-    else:
-        return _numpy.tanh(*args,**kw)
-
-
-def sqrt(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.sqrt(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.sqrt(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.sqrt(*args,**kw)
-    else:
-        return _numpy.sqrt(*args,**kw)
-
-
-def cosh(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.cosh(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.cosh(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.cosh(*args,**kw)
-    else:
-        return _numpy.cosh(*args,**kw)
-
-
-def exp(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.exp(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.exp(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.exp(*args,**kw)
-    else:
-        return _numpy.exp(*args,**kw)
-
-
-def acos(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.acos(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.acos(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.acos(*args,**kw)
-    else:
-        return _numpy.arccos(*args,**kw)
-
-
-def ceil(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.ceil(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.ceil(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.ceil(*args,**kw)
-    else:
-        return _numpy.ceiling(*args,**kw)
-
-
-def sin(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.sin(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.sin(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.sin(*args,**kw)
-    else:
-        return _numpy.sin(*args,**kw)
-
-
-def tan(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.tan(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.tan(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.tan(*args,**kw)
-    else:
-        return _numpy.tan(*args,**kw)
-
-
-def abs(*args, **kw):
-    arg0 = args[0]
-    if isinstance(arg0, (int, float)):
-        return _math.abs(*args,**kw)
-    elif isinstance(arg0, complex):
-        return _cmath.abs(*args,**kw)
-    elif isinstance(arg0, _sympy.Basic):
-        return _sympy.abs(*args,**kw)
-    else:
-        return _numpy.abs(*args,**kw)
+# Implémentations numpy de chaque fonction (cf. `fonction.numpy`).
+_fonctions_numpy = {}
+
+
+def _fonction_universelle(nom):
+    "Génère la fonction `nom`, qui choisit son implémentation suivant le type de son argument."
+    nom_math, nom_numpy, nom_sympy = _fonctions_mathematiques[nom]
+    f_math = getattr(_math, nom_math)
+    f_cmath = getattr(_cmath, nom_math)
+    f_sympy = getattr(_sympy, nom_sympy)
+    f_numpy = getattr(_numpy, nom_numpy)
+    # Table {type: implémentation}, complétée au fur et à mesure des appels.
+    aiguillage = {_numpy.ndarray: f_numpy, int: f_math, float: f_math, complex: f_cmath}
+    # Implémentations ajoutées via `enregistrer()`.
+    enregistrements = {}
+
+    def implementation(type_):
+        # Le type enregistré le plus proche (dans l'ordre de résolution des méthodes)
+        # est prioritaire.
+        for ancetre in type_.__mro__:
+            if ancetre in enregistrements:
+                f = enregistrements[ancetre]
+                break
+        else:
+            if issubclass(type_, (int, float)):
+                f = f_math
+            elif issubclass(type_, complex):
+                f = f_cmath
+            elif issubclass(type_, _sympy.Basic):
+                f = f_sympy
+            else:
+                f = f_numpy
+        aiguillage[type_] = f
+        return f
+
+    def fonction(*args, **kw):
+        try:
+            f = aiguillage[type(args[0])]
+        except KeyError:
+            f = implementation(type(args[0]))
+        return f(*args, **kw)
+
+    def enregistrer(type_, f):
+        "Utiliser `f` lorsque le premier argument est de type `type_` (ou d'un type dérivé)."
+        enregistrements[type_] = f
+        # Les types dérivés déjà rencontrés ont pu être associés à une autre
+        # implémentation : elle sera recherchée à nouveau lors du prochain appel.
+        for type_connu in list(aiguillage):
+            if issubclass(type_connu, type_):
+                del aiguillage[type_connu]
+        aiguillage[type_] = f
+
+    fonction.__name__ = fonction.__qualname__ = nom
+    fonction.aiguillage = aiguillage
+    fonction.enregistrer = enregistrer
+    fonction.enregistrements = enregistrements
+    fonction.numpy = _fonctions_numpy[nom] = f_numpy
+    return fonction
+
+
+abs = _fonction_universelle('abs')
+acos = _fonction_universelle('acos')
+asin = _fonction_universelle('asin')
+atan = _fonction_universelle('atan')
+ceil = _fonction_universelle('ceil')
+cos = _fonction_universelle('cos')
+cosh = _fonction_universelle('cosh')
+exp = _fonction_universelle('exp')
+floor = _fonction_universelle('floor')
+ln = _fonction_universelle('ln')
+log = _fonction_universelle('log')
+sin = _fonction_universelle('sin')
+sinh = _fonction_universelle('sinh')
+sqrt = _fonction_universelle('sqrt')
+tan = _fonction_universelle('tan')
+tanh = _fonction_universelle('tanh')
 
 
 # Code écrit à la main (ne pas effacer donc !)
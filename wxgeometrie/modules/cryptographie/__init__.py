@@ -25,40 +25,18 @@
 from string import ascii_uppercase as majuscules
 from functools import partial
 from random import shuffle
-import re
 
 from PyQt5.QtWidgets import QVBoxLayout, QInputDialog, QPushButton,\
-    QTextEdit, QGridLayout, QLabel, QLineEdit, QSpacerItem
+    QTextEdit, QGridLayout, QLabel, QLineEdit, QSpacerItem, QMessageBox
+from PyQt5.QtGui import QTextCursor, QTextCharFormat, QColor
 from PyQt5.QtCore import Qt, QTimer
 
 from ...GUI.menu import MenuBar
 from ...GUI.panel import Panel_simple
 from ...pylib import print_error
 #~ from ... import param
-
-
-dict_accents = {
-"é": "E",
-"É": "E",
-"ê": "E",
-"Ê": "E",
-"è": "E",
-"È": "E",
-"à": "A",
-"À": "A",
-"â": "A",
-"Â": "A",
-"ô": "O",
-"Ô": "O",
-"î": "I",
-"Î": "I",
-"ù": "U",
-"Ù": "U",
-"û": "U",
-"Û": "U",
-"ç": "C",
-"Ç": "C",
-}
+from . import cryptanalyse
+from .coloration import Coloration, fusionner, est_dans_un_mot
 
 
 class CaseLettre(QLineEdit):
@@ -98,6 +76,13 @@ class CryptographieMenuBar(MenuBar):
                         ["Coder avec Vigenère", "Codage par la méthode de Vigenère (substitution poly-alphabétique).",
                                 None, partial(panel.coder_vigenere, ask=True)],
                         None,
+                        ["Analyse fréquentielle", "Fréquences des lettres et indice de coïncidence du texte codé.",
+                                None, panel.analyser],
+                        ["Casser le code (substitution)", "Rechercher la clé d'une substitution mono-alphabétique.",
+                                None, panel.casser_substitution],
+                        ["Casser le code (Vigenère)", "Rechercher la longueur, puis les lettres de la clé de Vigenère.",
+                                None, panel.casser_vigenere],
+                        None,
                         ["options"])
         self.ajouter("avance2")
         self.ajouter("?")
@@ -111,8 +96,18 @@ class Cryptographie(Panel_simple):
     def __init__(self, *args, **kw):
         Panel_simple.__init__(self, *args, **kw)
 
-        self._freeze = False
-        self.widget_modifie = None
+        # Mise en forme des textes : modifications en attente pour chaque texte,
+        # traitées (toutes à la fois) après un court délai.
+        self._colorations = {}
+        self._modifications = {}
+        self._longueurs = {}
+        self._formatage = False
+        # Remplacement de lettres par d'autres lettres (les couleurs ne changent pas).
+        self._substitution = False
+        # Lettres en clair associées aux lettres codées, et positions
+        # des lettres dans le texte codé (calculées à la demande).
+        self._correspondances = dict((lettre, '') for lettre in majuscules)
+        self._positions = None
 
         # La clé est la permutation de l'alphabet actuellement utilisée
         # pour le codage par substitution mono-alphabétique.
@@ -134,17 +129,14 @@ class Cryptographie(Panel_simple):
         txt_clair = QLabel("<b>Texte en clair</b>")
         self.clair = QTextEdit()
         self.clair.setMinimumSize(*size)
-        formater_clair = partial(self.formater, widget=self.clair)
-        self.clair.textChanged.connect(formater_clair)
-        self.clair.cursorPositionChanged.connect(formater_clair)
+        self.clair.cursorPositionChanged.connect(partial(self.surligner, widget=self.clair))
         self.copier_clair = QPushButton('Copier le texte en clair')
         self.copier_clair.clicked.connect(partial(self.copier, widget=self.clair))
 
         txt_code = QLabel("<b>Texte codé</b>")
         self.code = QTextEdit()
         self.code.setMinimumSize(*size)
-        self.code.textChanged.connect(self.code_modifie)
-        self.code.cursorPositionChanged.connect(partial(self.formater, widget=self.code))
+        self.code.cursorPositionChanged.connect(partial(self.surligner, widget=self.code))
         self.copier_code = QPushButton('Copier le texte codé')
         self.copier_code.clicked.connect(partial(self.copier, widget=self.code))
 
@@ -173,7 +165,7 @@ class Cryptographie(Panel_simple):
             c = self.cases[l] = CaseLettre(self)
             c.setMaxLength(1)
             self.table.addWidget(c, 1, i + 1)
-            c.textChanged.connect(self.decoder)
+            c.textChanged.connect(partial(self.case_modifiee, l))
         self.sizer.addLayout(self.textes)
         self.sizer.addLayout(self.table)
         self.setLayout(self.sizer)
@@ -182,22 +174,16 @@ class Cryptographie(Panel_simple):
         self.couleur1 = "5A28BE" # sky blue
         self.couleur2 = "C86400" # Lime Green
         self.couleur_position = "FFCDB3"
-        self.reg = re.compile("([-A-Za-z]|<##>|</##>)+")
-        ##couleur_position = wx.Color(255, 205, 179) # FFCDB3
-        ##couleur1 = wx.Color(90, 40, 190) # 5A28BE
-        ##couleur2 = wx.Color(200, 100, 0) # C86400
-        ##black = wx.Color(0, 0, 0) # 000000
-        ##white = wx.Color(255, 255, 255) # FFFFFF
-        ##self.special = wx.TextAttr(wx.NullColour, couleur_position)
-        ##self.fond = wx.TextAttr(couleur1, wx.NullColour) #"sky blue"
-        ##self.fond2 = wx.TextAttr(couleur2, wx.NullColour) # "Lime Green"
-        ##self.defaut = wx.TextAttr(black, white)
-##
-        ##self.Bind(wx.EVT_IDLE, self.OnIdle)
-        timer = QTimer(self)
-        timer.timeout.connect(self.OnIdle)
-        timer.start(100)
 
+        for widget in (self.clair, self.code):
+            # NB: les changements de couleur ne doivent pas pouvoir être annulés.
+            widget.setUndoRedoEnabled(False)
+            self._colorations[widget] = Coloration()
+            self._longueurs[widget] = 0
+            widget.document().contentsChange.connect(partial(self._contenu_modifie, widget))
+        self._minuteur = QTimer(self)
+        self._minuteur.setSingleShot(True)
+        self._minuteur.timeout.connect(self._formater)
 
         # DEBUG:
         ##self.code.setPlainText('WR IRAMXPZRHRDZ IK HRYYOVR AL IRYYBKY RYZ NOALWLZR POM WR NOLZ FKR W BD O VOMIR WRY YLVDRY IR PBDAZKOZLBD RZ WRY RYPOARY RDZMR WRY HBZY OWBMY FKR I QOELZKIR BD VMBKPR WRY WRZZMRY ALDF POM ALDF')
@@ -239,47 +225,19 @@ class Cryptographie(Panel_simple):
 
     def coder(self, evt=None, cle=None, espaces=False):
         cle = (self.cle if cle is None else cle)
-        clair = self.clair.toPlainText().upper()
-        for key, val in dict_accents.items():
-            clair = clair.replace(key, val)
-        d = dict(zip(majuscules, cle))
-        code = ''.join(d.get(s, ' ') for s in clair)
-        code = re.sub(' +', ' ', code)
-        if not espaces:
-            code = code.replace(' ', '')
+        code = cryptanalyse.substituer(self.clair.toPlainText(), cle, espaces)
         self.code.setPlainText(code)
         return code
 
 
-    @staticmethod
-    def _vigenere(l1, l2):
-        return chr((ord(l1) + ord(l2) - 130)%26 + 65)
-
     def coder_vigenere(self, evt=None, msg=None, cle=None, ask=False):
-        def gen():
-            length = len(cle)
-            n = 0
-            for car in clair:
-                if car.isalpha():
-                    yield self._vigenere(cle[n%length], car)
-                    n += 1
-                else:
-                    yield car
         if ask:
             self.DlgModifierCleVigenere()
         if cle is None:
             cle = self.cle_vigenere
         if msg is None:
             msg = self.clair.toPlainText()
-        msg = msg.upper()
-        if cle is None:
-            pass
-        # Pour l'instant, les espaces ne sont pas supportés
-        clair = msg.replace(' ', '')
-        clair = self.clair.toPlainText().upper()
-        for key, val in dict_accents.items():
-            clair = clair.replace(key, val)
-        code = ''.join(gen())
+        code = cryptanalyse.vigenere(msg, cle)
         self.code.setPlainText(code)
         return code
 
@@ -297,62 +255,173 @@ class Cryptographie(Panel_simple):
 
 
     def decoder(self, txt=None):
-        code = self.code.toPlainText().upper()
-        def f(s):
-            if s in majuscules:
-                return self.cases[s].text() or self.symbole
-            return s
-
-        clair = ''.join(f(s) for s in code)
+        self._correspondances = dict((lettre, case.text()) for lettre, case in self.cases.items())
+        clair = cryptanalyse.dechiffrer(self.code.toPlainText(), self._correspondances, self.symbole)
         self.clair.setPlainText(clair)
 
 
-    def code_modifie(self, txt=None):
-        self.decoder(txt)
-        self.formater(txt, widget=self.code)
-
-    def formater(self, evt=None, widget=None):
-        ##evt.Skip()
-        if self._freeze:
-            return
-        self.widget_modifie = widget
+    def _longueur(self, widget):
+        return widget.document().characterCount() - 1
 
 
+    def case_modifiee(self, lettre, txt=None):
+        """Met à jour le texte en clair après la modification de la lettre
+        associée à la lettre codée `lettre`.
 
-    def _formater(self, widget_modifie):
-        # Impossible de formater les 2 textes de la même manière s'ils
-        # ne sont pas de la même longueur.
-        # Cela ne devrait se produire que temporairement (par ex.,
-        # l'utilisateur copie un nouveau texte)
-        if len(self.code.toPlainText()) != len(self.clair.toPlainText()):
-            if self.code.toPlainText() and self.clair.toPlainText():
-                print('Warning: le message codé et le message en clair ne sont '
-                      'pas de même longueur.')
+        Seuls les caractères correspondant à cette lettre sont remplacés."""
+        self._correspondances[lettre] = self.cases[lettre].text()
+        if self._longueur(self.clair) != self._longueur(self.code):
+            self.decoder()
+            return
+        if self._positions is None:
+            self._positions = cryptanalyse.positions(self.code.toPlainText())
+        nouvelle = self._correspondances[lettre] or self.symbole
+        curseur = QTextCursor(self.clair.document())
+        self._substitution = est_dans_un_mot(nouvelle)
+        try:
+            # Une seule mise à jour de l'affichage pour tous les remplacements.
+            curseur.beginEditBlock()
+            for position in self._positions[ord(lettre) - 65].tolist():
+                curseur.setPosition(position)
+                curseur.setPosition(position + 1, QTextCursor.KeepAnchor)
+                # Le caractère remplacé conserve sa mise en forme.
+                curseur.insertText(nouvelle, curseur.charFormat())
+            curseur.endEditBlock()
+        finally:
+            self._substitution = False
+
+
+    def _contenu_modifie(self, widget, position, supprimes, ajoutes):
+        "Enregistre une modification du texte de `widget` (signal `contentsChange`)."
+        if self._formatage:
             return
+        ancienne, longueur = self._longueurs[widget], self._longueur(widget)
+        self._longueurs[widget] = longueur
+        # NB: les nombres de caractères transmis par Qt peuvent inclure
+        # le caractère final du document.
+        ajoutes = min(ajoutes, longueur - position)
+        supprimes = ajoutes - (longueur - ancienne)
+        if supprimes < 0 or position + supprimes > ancienne:
+            position, supprimes, ajoutes = 0, ancienne, longueur
+        if widget is self.code:
+            self._positions = None
+            self._decoder_modification(position, supprimes, ajoutes)
+        elif self._substitution:
+            return
+        modification = (position, supprimes, ajoutes)
+        if widget in self._modifications:
+            modification = fusionner(self._modifications[widget], modification)
+        self._modifications[widget] = modification
+        self._minuteur.start(self.param('delai_coloration'))
+
+
+    def _decoder_modification(self, position, supprimes, ajoutes):
+        "Met à jour la partie du texte en clair correspondant à la partie modifiée du texte codé."
+        if self._longueur(self.clair) != self._longueurs[self.code] - ajoutes + supprimes:
+            # Les deux textes ne se correspondent pas (le texte en clair
+            # a été modifié par l'utilisateur par exemple).
+            self.decoder()
+            return
+        curseur = QTextCursor(self.code.document())
+        curseur.setPosition(position)
+        curseur.setPosition(position + ajoutes, QTextCursor.KeepAnchor)
+        # NB: `selectedText()` retourne le caractère U+2029 pour les fins de paragraphe.
+        code = curseur.selectedText().replace('\u2029', '\n')
+        curseur = QTextCursor(self.clair.document())
+        curseur.setPosition(position)
+        curseur.setPosition(position + supprimes, QTextCursor.KeepAnchor)
+        curseur.insertText(cryptanalyse.dechiffrer(code, self._correspondances, self.symbole))
+
+
+    def analyser(self, evt=None):
+        "Affiche les fréquences des lettres du texte codé, et l'indice de coïncidence."
+        lettres = cryptanalyse.lettres(self.code.toPlainText())
+        if not len(lettres):
+            self.message("Le texte codé ne contient aucune lettre.")
+            return
+        effectifs = cryptanalyse.frequences(lettres)
+        ordre = sorted(range(26), key=lambda i: -effectifs[i])
+        lignes = ["Fréquences des lettres :",
+                  ', '.join('%s : %.1f %%' % (majuscules[i], 100*effectifs[i]/len(lettres))
+                            for i in ordre if effectifs[i]),
+                  '',
+                  "Indice de coïncidence : %.4f" % cryptanalyse.indice_coincidence(lettres),
+                  "(français : %.4f ; lettres équiprobables : %.4f)"
+                        % (cryptanalyse.francais().indice_coincidence, cryptanalyse.IC_ALEATOIRE),
+                  '',
+                  "Longueur probable de la clé de Vigenère : %s"
+                        % cryptanalyse.longueur_cle(lettres)]
+        rapport = '\n'.join(lignes)
+        QMessageBox.information(self, "Analyse fréquentielle", rapport)
+        return rapport
+
+
+    def casser_substitution(self, evt=None):
+        "Recherche la clé (substitution mono-alphabétique), et complète la table de décodage."
+        lettres = cryptanalyse.lettres(self.code.toPlainText())
+        if not len(lettres):
+            self.message("Le texte codé ne contient aucune lettre.")
+            return
+        cle = cryptanalyse.casser_substitution(lettres)[0]
+        presentes = cryptanalyse.frequences(lettres)
+        for lettre, lettre_codee in zip(majuscules, cle):
+            case = self.cases[lettre_codee]
+            # Un seul décodage, une fois toutes les cases remplies.
+            case.blockSignals(True)
+            case.setText(lettre if presentes[ord(lettre_codee) - 65] else '')
+            case.blockSignals(False)
+        self.decoder()
+        return cle
+
+
+    def casser_vigenere(self, evt=None):
+        "Recherche la clé de Vigenère, et affiche le texte déchiffré."
+        try:
+            cle, clair = cryptanalyse.casser_vigenere(self.code.toPlainText())
+        except ValueError as e:
+            self.message(str(e))
+            return
+        self.cle_vigenere = cle
+        self.clair.setPlainText(clair)
+        self.message("Clé de Vigenère probable : %s" % cle)
+        return cle
 
-        def colorier(m, col1=[self.couleur1], col2=[self.couleur2]):
-            s = m.group(0)
-            s = "<font color='#%s'>%s</font>" % (col1[0], s)
-            col1[0], col2[0] = col2[0], col1[0]
-            return s
-        self._freeze = True
-        pos = widget_modifie.textCursor().position()
+
+    def _formater(self):
+        "Met à jour les couleurs des mots modifiés depuis la dernière mise en forme."
+        if self.parent.parent.closing:
+            return
+        modifications, self._modifications = self._modifications, {}
+        formats = [QTextCharFormat() for i in range(3)]
+        formats[0].setForeground(QColor('#' + self.couleur1))
+        formats[1].setForeground(QColor('#' + self.couleur2))
+        for widget, modification in modifications.items():
+            intervalles = self._colorations[widget].modifier(widget.toPlainText(), *modification)
+            curseur = QTextCursor(widget.document())
+            self._formatage = True
+            try:
+                curseur.beginEditBlock()
+                for debut, fin, couleur in intervalles:
+                    curseur.setPosition(debut)
+                    curseur.setPosition(fin, QTextCursor.KeepAnchor)
+                    curseur.setCharFormat(formats[2 if couleur is None else couleur])
+                curseur.endEditBlock()
+            finally:
+                self._formatage = False
+
+
+    def surligner(self, evt=None, widget=None):
+        "Surligne, dans les deux textes, le caractère situé à la position du curseur."
+        position = widget.textCursor().position()
+        fond = QTextCharFormat()
+        fond.setBackground(QColor('#' + self.couleur_position))
         for w in (self.code, self.clair):
-            txt = w.toPlainText()
-            if pos != len(txt):
-                txt = txt[:pos] + '<##>' + txt[pos] + '</##>' + txt[pos + 1:]
-            new_txt = re.sub(self.reg, colorier, txt)
-            new_txt = new_txt.replace("<##>",
-                        "<font style='background-color: #%s;'>" % self.couleur_position)
-            new_txt = new_txt.replace("</##>", "</font>")
-            w.setHtml(new_txt)
-        cursor = widget_modifie.textCursor()
-        cursor.setPosition(pos)
-        widget_modifie.setTextCursor(cursor)
-        self._freeze = False
-        self.widget_modifie = None
-
-
-    def OnIdle(self, evt=None):
-        if self.widget_modifie is not None and not self.parent.parent.closing:
-            self._formater(self.widget_modifie)
+            selections = []
+            if position < self._longueur(w):
+                selection = QTextEdit.ExtraSelection()
+                selection.cursor = QTextCursor(w.document())
+                selection.cursor.setPosition(position)
+                selection.cursor.setPosition(position + 1, QTextCursor.KeepAnchor)
+                selection.format = fond
+                selections.append(selection)
+            w.setExtraSelections(selections)
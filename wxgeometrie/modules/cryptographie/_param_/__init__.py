@@ -2,3 +2,5 @@
 
 
 
+# Dlai (en millisecondes) avant la mise en forme des textes modifis.
+delai_coloration = 50
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#         Coloration des mots des textes      #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Couleurs alternées des mots du texte codé et du texte en clair.
+
+Un mot est une suite de lettres ou de tirets (le tiret représente une lettre
+non encore déchiffrée). Dans chaque paragraphe, les mots sont alternativement
+de couleur 0 et de couleur 1.
+
+Après une modification du texte, `Coloration.modifier()` ne réexamine que
+les mots touchés par la modification ; les mots suivants du paragraphe
+ne changent de couleur que si le nombre de mots modifiés change de parité.
+Seuls les intervalles dont la couleur doit effectivement changer sont
+retournés, pour être mis en forme par l'interface graphique.
+"""
+
+import re
+
+import numpy
+
+
+_mot = re.compile("[-A-Za-z]+")
+
+
+def fusionner(modification1, modification2):
+    """Fusionne deux modifications successives d'un texte.
+
+    Une modification (position, supprimes, ajoutes) remplace les `supprimes`
+    caractères situés à partir de `position` par `ajoutes` nouveaux caractères
+    (cf. le signal `contentsChange` de `QTextDocument`).
+    Retourne une modification unique, équivalente aux deux modifications
+    effectuées l'une après l'autre."""
+    p1, r1, a1 = modification1
+    p2, r2, a2 = modification2
+    debut = min(p1, p2)
+    # Fin de la zone modifiée, dans le texte obtenu après la 1re modification.
+    fin = max(p1 + a1, p2 + r2)
+    return debut, fin - (a1 - r1) - debut, fin + (a2 - r2) - debut
+
+
+def est_dans_un_mot(caractere):
+    "Indique si le caractère peut faire partie d'un mot (lettre ou tiret)."
+    return _mot.fullmatch(caractere) is not None
+
+
+def _mots(texte, debut=0, fin=None):
+    "Positions de début et de fin des mots de `texte[debut:fin]`."
+    if fin is None:
+        fin = len(texte)
+    bornes = [m.span() for m in _mot.finditer(texte, debut, fin)]
+    if not bornes:
+        return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+    debuts, fins = numpy.array(bornes, dtype=numpy.int64).T
+    return debuts, fins
+
+
+def _soustraire(intervalle, intervalles):
+    "Parties de `intervalle` qui ne sont couvertes par aucun des `intervalles` (triés)."
+    debut, fin = intervalle
+    for d, f in intervalles:
+        if f <= debut or d >= fin:
+            continue
+        if d > debut:
+            yield debut, d
+        debut = max(debut, f)
+    if debut < fin:
+        yield debut, fin
+
+
+class Coloration(object):
+    """Couleurs des mots d'un texte, mises à jour à chaque modification.
+
+    Les intervalles à mettre en forme sont retournés sous la forme
+    d'une liste de triplets (début, fin, couleur), où couleur vaut 0, 1,
+    ou None (caractères n'appartenant à aucun mot)."""
+
+    def __init__(self):
+        self.initialiser('')
+
+    def initialiser(self, texte):
+        "Colorie tout le texte."
+        self.debuts, self.fins = _mots(texte)
+        self.couleurs = self._alterner(texte, self.debuts, None)
+        intervalles = [(0, len(texte), None)]
+        intervalles.extend(zip(self.debuts.tolist(), self.fins.tolist(),
+                               self.couleurs.tolist()))
+        return intervalles
+
+    @staticmethod
+    def _alterner(texte, debuts, precedent):
+        """Couleurs alternées des mots commençant aux positions `debuts`.
+
+        `precedent` est le couple (fin, couleur) du mot qui précède
+        (ou None) : l'alternance se poursuit s'il est dans le même paragraphe."""
+        couleurs = numpy.zeros(len(debuts), dtype=numpy.int8)
+        if not len(debuts):
+            return couleurs
+        fin_precedent = (precedent[0] if precedent is not None else 0)
+        # Couleur du premier mot à colorier, s'il est dans le paragraphe du mot précédent.
+        couleur = (1 - precedent[1] if precedent is not None else 0)
+        # Fins de paragraphe situées entre le mot précédent et le dernier mot.
+        retours = [m.start() for m in re.finditer('\n', texte[fin_precedent:debuts[-1]])]
+        retours = numpy.array(retours, dtype=numpy.int64) + fin_precedent
+        # Numéro de paragraphe de chaque mot (0 pour le paragraphe du mot précédent).
+        paragraphes = numpy.searchsorted(retours, debuts)
+        nouveaux = numpy.flatnonzero(numpy.diff(paragraphes, prepend=0))
+        rangs = numpy.arange(len(debuts))
+        # Rang du premier mot du paragraphe de chaque mot.
+        premiers = numpy.zeros(len(debuts), dtype=numpy.int64)
+        premiers[nouveaux] = nouveaux
+        premiers = numpy.maximum.accumulate(premiers)
+        couleurs[:] = (rangs - premiers + numpy.where(paragraphes == 0, couleur, 0)) % 2
+        return couleurs
+
+    def modifier(self, texte, position, supprimes, ajoutes):
+        """Met à jour les couleurs après une modification (cf. `fusionner()`).
+
+        `texte` est le texte obtenu après la modification.
+        Retourne les intervalles à mettre en forme."""
+        debuts, fins, couleurs = self.debuts, self.fins, self.couleurs
+        decalage = ajoutes - supprimes
+        # Mots touchés par la modification (y compris les mots contigus,
+        # qui peuvent être prolongés ou fusionnés).
+        i = int(numpy.searchsorted(fins, position, 'left'))
+        j = int(numpy.searchsorted(debuts, position + supprimes, 'right'))
+        debut_zone = min(position, int(debuts[i])) if i < j else position
+        fin_zone = max(position + ajoutes, int(fins[j - 1]) + decalage) if i < j else position + ajoutes
+        nouveaux_debuts, nouvelles_fins = _mots(texte, debut_zone, fin_zone)
+        precedent = ((int(fins[i - 1]), int(couleurs[i - 1])) if i > 0 else None)
+        nouvelles_couleurs = self._alterner(texte, nouveaux_debuts, precedent)
+        intervalles = []
+        # Caractères insérés : ceux qui ne font partie d'aucun mot
+        # ne doivent pas garder la couleur du mot voisin.
+        if ajoutes:
+            intervalles.append((position, position + ajoutes, None))
+        # Parties des anciens mots conservées (positions dans le nouveau texte) :
+        # elles n'ont pas à être mises en forme si leur couleur n'a pas changé.
+        conservees = ([], [])
+        for k in range(i, j):
+            d, f, c = int(debuts[k]), int(fins[k]), int(couleurs[k])
+            if d < position:
+                conservees[c].append((d, min(f, position)))
+            if f > position + supprimes:
+                conservees[c].append((max(d, position + supprimes) + decalage, f + decalage))
+        for d, f, c in zip(nouveaux_debuts.tolist(), nouvelles_fins.tolist(),
+                           nouvelles_couleurs.tolist()):
+            intervalles.extend((d, f, c) for d, f in _soustraire((d, f), conservees[c]))
+
+        suivants_debuts = debuts[j:] + decalage
+        suivants_fins = fins[j:] + decalage
+        suivantes = couleurs[j:].copy()
+        if len(suivantes):
+            if len(nouveaux_debuts):
+                dernier = (int(nouvelles_fins[-1]), int(nouvelles_couleurs[-1]))
+            else:
+                dernier = precedent
+            attendue = self._alterner(texte, suivants_debuts[:1], dernier)[0]
+            if attendue != suivantes[0]:
+                # La parité a changé : les couleurs des mots suivants
+                # sont inversées, jusqu'à la fin du paragraphe.
+                retour = texte.find('\n', int(suivants_debuts[0]))
+                k = (len(suivantes) if retour == -1
+                     else int(numpy.searchsorted(suivants_debuts, retour)))
+                suivantes[:k] = 1 - suivantes[:k]
+                intervalles.extend(zip(suivants_debuts[:k].tolist(), suivants_fins[:k].tolist(),
+                                       suivantes[:k].tolist()))
+
+        self.debuts = numpy.concatenate((debuts[:i], nouveaux_debuts, suivants_debuts))
+        self.fins = numpy.concatenate((fins[:i], nouvelles_fins, suivants_fins))
+        self.couleurs = numpy.concatenate((couleurs[:i], nouvelles_couleurs, suivantes))
+        return intervalles
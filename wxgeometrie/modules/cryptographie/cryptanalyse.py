@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#                Cryptanalyse                 #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Chiffrement et cryptanalyse (substitution mono-alphabétique, Vigenère).
+
+Le texte est converti une seule fois en tableau numpy : `lettres()` retourne
+les numéros (de 0 pour A à 25 pour Z) des lettres du texte, sous forme
+d'un tableau d'entiers de type uint8. Le chiffrement et le déchiffrement
+se font par indexation d'une table de correspondance, pour tout le texte
+à la fois.
+
+Les fonctions d'analyse (fréquences des lettres et des groupes de lettres,
+indice de coïncidence, recherche de la longueur de la clé de Vigenère par
+les méthodes de Friedman et de Kasiski) acceptent indifféremment un texte
+ou le tableau retourné par `lettres()`.
+
+`casser_substitution()` recherche la clé d'une substitution mono-alphabétique
+par une méthode d'ascension (échanges de lettres dans la clé) : la
+vraisemblance d'une clé est calculée à partir du tableau des fréquences
+des bigrammes du texte codé, sans relire le texte, ce qui permet
+de traiter des textes très longs.
+
+Les statistiques de la langue française sont estimées sur le texte
+'francais.txt' (voir `francais()`).
+"""
+
+from os.path import dirname, join
+from string import ascii_uppercase as majuscules
+
+import numpy
+
+
+dict_accents = {
+"é": "E",
+"É": "E",
+"ê": "E",
+"Ê": "E",
+"è": "E",
+"È": "E",
+"à": "A",
+"À": "A",
+"â": "A",
+"Â": "A",
+"ô": "O",
+"Ô": "O",
+"î": "I",
+"Î": "I",
+"ù": "U",
+"Ù": "U",
+"û": "U",
+"Û": "U",
+"ç": "C",
+"Ç": "C",
+}
+
+# Table de correspondance des caractères latin-1 (suppression des accents).
+_accents = numpy.arange(256, dtype=numpy.uint32)
+for _lettre, _sans_accent in dict_accents.items():
+    _accents[ord(_lettre)] = ord(_sans_accent)
+
+# Indice de coïncidence d'un texte aléatoire (lettres équiprobables).
+IC_ALEATOIRE = 1/26
+
+# Nombre maximal de lettres de la clé de Vigenère testé par défaut.
+LONGUEUR_MAX = 20
+
+# Nombre de perturbations aléatoires de la meilleure clé trouvée,
+# lors de la recherche d'une clé de substitution.
+REDEMARRAGES = 30
+
+
+def _codes(texte):
+    "Tableau des points de code (unicode) des caractères du texte."
+    return numpy.frombuffer(texte.encode('utf-32-le'), dtype=numpy.uint32).copy()
+
+
+def _texte(codes):
+    return codes.astype(numpy.uint32).tobytes().decode('utf-32-le')
+
+
+def _codes_normalises(texte):
+    "Points de code des caractères du texte, en majuscules et sans accents."
+    codes = _codes(texte.upper())
+    latin1 = (codes < 256)
+    codes[latin1] = _accents[codes[latin1]]
+    return codes
+
+
+def normaliser(texte):
+    "Texte en majuscules, sans accents."
+    return _texte(_codes_normalises(texte))
+
+
+def lettres(texte):
+    """Numéros (de 0 pour A à 25 pour Z) des lettres du texte, dans l'ordre.
+
+    Le texte est normalisé (cf. `normaliser()`), et les autres caractères
+    (espaces, ponctuation...) sont ignorés.
+    Retourne un tableau numpy d'entiers de type uint8."""
+    codes = _codes_normalises(texte)
+    return (codes[(codes >= 65) & (codes <= 90)] - 65).astype(numpy.uint8)
+
+
+def _lettres(texte):
+    return (lettres(texte) if isinstance(texte, str) else texte)
+
+
+def _numeros(cle):
+    "Numéros des lettres de la clé (ValueError si la clé ne contient aucune lettre)."
+    numeros = lettres(cle).astype(numpy.int64)
+    if not len(numeros):
+        raise ValueError("La clé doit contenir au moins une lettre.")
+    return numeros
+
+
+def substituer(texte, cle, espaces=False):
+    """Code le texte par substitution mono-alphabétique.
+
+    `cle` est une permutation de l'alphabet : la lettre A est remplacée
+    par la première lettre de la clé, B par la seconde, etc.
+    Les autres caractères sont remplacés par des espaces, sans jamais
+    laisser plus d'un espace entre deux mots ; si `espaces` vaut False,
+    les espaces sont supprimés."""
+    table = numpy.frombuffer(cle.encode('ascii'), dtype=numpy.uint8)
+    if len(table) != 26:
+        raise ValueError("La clé doit être une permutation de l'alphabet.")
+    codes = _codes_normalises(texte)
+    est_lettre = (codes >= 65) & (codes <= 90)
+    code = numpy.full(len(codes), ord(' '), dtype=numpy.uint8)
+    code[est_lettre] = table[codes[est_lettre] - 65]
+    if espaces:
+        # On conserve uniquement les espaces précédés d'une lettre.
+        code = code[est_lettre | numpy.concatenate(([True], est_lettre[:-1]))]
+    else:
+        code = code[est_lettre]
+    return code.tobytes().decode('ascii')
+
+
+def vigenere(texte, cle, dechiffrer=False):
+    """Code le texte par la méthode de Vigenère (substitution poly-alphabétique).
+
+    La n-ième lettre du texte est décalée selon la n-ième lettre de la clé
+    (la clé étant répétée autant que nécessaire) : de 0 rang pour A,
+    de 1 rang pour B, etc. Les autres caractères sont conservés.
+    Si `dechiffrer` vaut True, les décalages se font dans l'autre sens."""
+    decalages = _numeros(cle)
+    codes = _codes_normalises(texte)
+    est_lettre = (codes >= 65) & (codes <= 90)
+    decalages = decalages[numpy.arange(numpy.count_nonzero(est_lettre)) % len(decalages)]
+    if dechiffrer:
+        decalages = -decalages
+    codes[est_lettre] = (codes[est_lettre].astype(numpy.int64) - 65 + decalages) % 26 + 65
+    return _texte(codes)
+
+
+def dechiffrer(texte, correspondances, symbole='-'):
+    """Déchiffre (éventuellement partiellement) un texte codé par substitution.
+
+    `correspondances` associe à chaque lettre codée la lettre en clair
+    correspondante (ou une chaîne vide si elle n'est pas encore connue).
+    Les lettres inconnues sont remplacées par `symbole`, les autres
+    caractères sont conservés : le texte obtenu a ainsi la même longueur
+    que le texte codé (mis en majuscules)."""
+    table = numpy.array([ord(correspondances.get(lettre) or symbole)
+                         for lettre in majuscules], dtype=numpy.uint32)
+    codes = _codes(texte.upper())
+    est_lettre = (codes >= 65) & (codes <= 90)
+    codes[est_lettre] = table[codes[est_lettre] - 65]
+    return _texte(codes)
+
+
+def positions(texte):
+    """Positions des lettres dans le texte (mis en majuscules, non normalisé).
+
+    Retourne une liste de 26 tableaux : le premier contient les positions
+    des lettres A, le second celles des lettres B, etc."""
+    codes = _codes(texte.upper())
+    rangs = numpy.flatnonzero((codes >= 65) & (codes <= 90))
+    numeros = codes[rangs] - 65
+    ordre = numpy.argsort(numeros, kind='stable')
+    bornes = numpy.searchsorted(numeros[ordre], numpy.arange(27))
+    return [rangs[ordre[bornes[i]:bornes[i + 1]]] for i in range(26)]
+
+
+def frequences(texte, n=1):
+    """Nombre d'apparitions de chaque groupe de `n` lettres consécutives.
+
+    Retourne un tableau de dimensions (26, 26, ..., 26) (`n` fois) :
+    par exemple, avec n=2, `frequences(texte, 2)[0, 1]` est le nombre
+    de groupes 'AB'. Les caractères autres que les lettres sont ignorés
+    (les groupes peuvent ainsi être à cheval sur deux mots)."""
+    numeros = _lettres(texte).astype(numpy.int64)
+    nombre = max(len(numeros) - n + 1, 0)
+    groupes = numpy.zeros(nombre, dtype=numpy.int64)
+    for i in range(n):
+        groupes = 26*groupes + numeros[i:i + nombre]
+    return numpy.bincount(groupes, minlength=26**n).reshape(n*(26,))
+
+
+def indice_coincidence(texte):
+    """Indice de coïncidence : probabilité que deux lettres du texte,
+    choisies au hasard, soient identiques."""
+    effectifs = frequences(texte)
+    total = effectifs.sum()
+    if total < 2:
+        return 0.
+    return float((effectifs*(effectifs - 1)).sum()/(total*(total - 1)))
+
+
+def indices_coincidence(texte, longueur_max=None):
+    """Indices de coïncidence moyens pour chaque longueur de clé possible.
+
+    Pour une longueur de clé L, le texte est découpé en L colonnes
+    (lettres de rang 0, L, 2L... puis 1, L + 1, 2L + 1... etc.),
+    et on calcule la moyenne des indices de coïncidence des colonnes.
+    Retourne un tableau dont le terme de rang i correspond à L = i + 1."""
+    if longueur_max is None:
+        longueur_max = LONGUEUR_MAX
+    numeros = _lettres(texte).astype(numpy.int64)
+    rangs = numpy.arange(len(numeros))
+    indices = numpy.zeros(longueur_max)
+    for longueur in range(1, longueur_max + 1):
+        effectifs = numpy.bincount(26*(rangs % longueur) + numeros,
+                                   minlength=26*longueur).reshape(longueur, 26)
+        totaux = effectifs.sum(axis=1)
+        paires = numpy.maximum(totaux*(totaux - 1), 1)
+        indices[longueur - 1] = ((effectifs*(effectifs - 1)).sum(axis=1)/paires).mean()
+    return indices
+
+
+def kasiski(texte, longueur_max=None, taille=3):
+    """Test de Kasiski.
+
+    On repère les groupes de `taille` lettres qui se répètent dans le texte,
+    et on calcule la distance entre deux apparitions successives.
+    Retourne un tableau dont le terme de rang L est le nombre de distances
+    divisibles par L (pour L de 2 à `longueur_max`)."""
+    if longueur_max is None:
+        longueur_max = LONGUEUR_MAX
+    numeros = _lettres(texte).astype(numpy.int64)
+    nombre = max(len(numeros) - taille + 1, 0)
+    groupes = numpy.zeros(nombre, dtype=numpy.int64)
+    for i in range(taille):
+        groupes = 26*groupes + numeros[i:i + nombre]
+    # Tri stable : les positions d'un même groupe restent dans l'ordre croissant.
+    positions = numpy.argsort(groupes, kind='stable')
+    tries = groupes[positions]
+    repetes = (tries[1:] == tries[:-1])
+    distances = positions[1:][repetes] - positions[:-1][repetes]
+    resultat = numpy.zeros(longueur_max + 1, dtype=numpy.int64)
+    for longueur in range(2, longueur_max + 1):
+        resultat[longueur] = numpy.count_nonzero(distances % longueur == 0)
+    return resultat
+
+
+def longueur_cle(texte, longueur_max=None):
+    """Longueur probable de la clé de Vigenère utilisée pour coder le texte.
+
+    Les multiples de la longueur de la clé ont aussi un indice de coïncidence
+    élevé : on retient la plus petite longueur dont l'indice de coïncidence
+    moyen est proche du maximum (cf. `indices_coincidence()`)."""
+    indices = indices_coincidence(texte, longueur_max)
+    seuil = IC_ALEATOIRE + .8*(indices.max() - IC_ALEATOIRE)
+    return int(numpy.argmax(indices >= seuil)) + 1
+
+
+class Reference(object):
+    """Statistiques d'une langue, estimées sur un texte de référence.
+
+    `unigrammes` et `bigrammes` sont les logarithmes des fréquences
+    (lissées) des lettres et des groupes de deux lettres."""
+
+    def __init__(self, texte):
+        numeros = lettres(texte)
+        unigrammes = frequences(numeros) + .5
+        bigrammes = frequences(numeros, 2) + .5
+        self.unigrammes = numpy.log(unigrammes/unigrammes.sum())
+        self.bigrammes = numpy.log(bigrammes/bigrammes.sum())
+        self.indice_coincidence = indice_coincidence(numeros)
+
+
+_reference = None
+
+def francais():
+    "Statistiques de la langue française (calculées une seule fois)."
+    global _reference
+    if _reference is None:
+        with open(join(dirname(__file__), 'francais.txt'), encoding='utf-8') as f:
+            _reference = Reference(f.read())
+    return _reference
+
+
+def cle_vigenere(texte, longueur, reference=None):
+    """Clé de Vigenère la plus probable, de longueur `longueur`.
+
+    Chaque colonne du texte (cf. `indices_coincidence()`) est codée
+    par un décalage : on retient celui pour lequel les fréquences
+    des lettres décodées sont les plus vraisemblables."""
+    if reference is None:
+        reference = francais()
+    numeros = _lettres(texte).astype(numpy.int64)
+    effectifs = numpy.bincount(26*(numpy.arange(len(numeros)) % longueur) + numeros,
+                               minlength=26*longueur).reshape(longueur, 26)
+    # vraisemblances[d, c] : log-fréquence de la lettre c, décalée de d rangs.
+    alphabet = numpy.arange(26)
+    vraisemblances = reference.unigrammes[(alphabet[None, :] - alphabet[:, None]) % 26]
+    decalages = (effectifs @ vraisemblances.T).argmax(axis=1)
+    return ''.join(majuscules[d] for d in decalages)
+
+
+def casser_vigenere(texte, longueur_max=None, reference=None):
+    """Recherche la clé de Vigenère utilisée pour coder le texte.
+
+    Retourne la clé et le texte déchiffré."""
+    numeros = lettres(texte)
+    if not len(numeros):
+        raise ValueError("Le texte ne contient aucune lettre.")
+    cle = cle_vigenere(numeros, longueur_cle(numeros, longueur_max), reference)
+    return cle, vigenere(texte, cle, dechiffrer=True)
+
+
+def _echanges():
+    "Toutes les permutations de l'alphabet obtenues en échangeant deux lettres."
+    i, j = numpy.triu_indices(26, 1)
+    permutations = numpy.tile(numpy.arange(26), (len(i), 1))
+    lignes = numpy.arange(len(i))
+    permutations[lignes, i] = j
+    permutations[lignes, j] = i
+    return permutations
+
+
+def casser_substitution(texte, redemarrages=None, graine=0, reference=None):
+    """Recherche la clé d'un texte codé par substitution mono-alphabétique.
+
+    On part de la clé obtenue en associant les lettres par ordre
+    de fréquence, puis on effectue à chaque étape le meilleur échange
+    de deux lettres de la clé, tant que la vraisemblance du texte
+    décodé augmente. La meilleure clé obtenue est ensuite perturbée
+    (échanges aléatoires) `redemarrages` fois, pour sortir des maxima locaux.
+
+    Retourne la clé (au même format que pour `substituer()`) et le texte
+    déchiffré (réduit à ses lettres si `texte` est un tableau de lettres)."""
+    if redemarrages is None:
+        redemarrages = REDEMARRAGES
+    if reference is None:
+        reference = francais()
+    numeros = _lettres(texte)
+    if not len(numeros):
+        raise ValueError("Le texte ne contient aucune lettre.")
+    alea = numpy.random.RandomState(graine)
+    # Seul le tableau des bigrammes du texte codé est utilisé.
+    bigrammes = frequences(numeros, 2).astype(float)
+    echanges = _echanges()
+    vraisemblances = reference.bigrammes
+
+    def vraisemblance(clair):
+        # `clair[c]` est la lettre en clair correspondant à la lettre codée c.
+        return (bigrammes*vraisemblances[clair[:, None], clair[None, :]]).sum()
+
+    def ascension(clair):
+        score = vraisemblance(clair)
+        while True:
+            candidats = clair[echanges]
+            scores = (bigrammes[None]*vraisemblances[candidats[:, :, None],
+                                                    candidats[:, None, :]]).sum(axis=(1, 2))
+            meilleur = scores.argmax()
+            if scores[meilleur] <= score + 1e-9:
+                return clair, score
+            clair, score = candidats[meilleur], scores[meilleur]
+
+    # Lettres codées et lettres de la langue, par ordre de fréquence décroissante.
+    ordre_code = numpy.argsort(-frequences(numeros), kind='stable')
+    ordre_langue = numpy.argsort(-reference.unigrammes, kind='stable')
+    clair = numpy.empty(26, dtype=numpy.int64)
+    clair[ordre_code] = ordre_langue
+    meilleur, meilleur_score = ascension(clair)
+    for _ in range(redemarrages):
+        clair = meilleur.copy()
+        for _ in range(3):
+            i, j = alea.choice(26, 2, replace=False)
+            clair[i], clair[j] = clair[j], clair[i]
+        clair, score = ascension(clair)
+        if score > meilleur_score + 1e-9:
+            meilleur, meilleur_score = clair, score
+
+    cle = numpy.empty(26, dtype=numpy.uint8)
+    cle[meilleur] = numpy.arange(26) + 65
+    cle = cle.tobytes().decode('ascii')
+    if not isinstance(texte, str):
+        return cle, _texte(meilleur[numeros] + 65)
+    correspondances = dict((majuscules[c], majuscules[l]) for c, l in enumerate(meilleur))
+    return cle, dechiffrer(texte, correspondances)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+from random import Random
+
+from wxgeometrie.modules.cryptographie.coloration import (Coloration, fusionner,
+                                                          est_dans_un_mot)
+
+import tools.unittest
+
+
+def appliquer(formats, intervalles):
+    for debut, fin, couleur in intervalles:
+        formats[debut:fin] = (fin - debut)*[couleur]
+
+
+def colorier(texte):
+    formats = len(texte)*[None]
+    appliquer(formats, Coloration().initialiser(texte))
+    return formats
+
+
+class ModulesCryptographieTest(tools.unittest.TestCase):
+    def test_initialiser(self):
+        self.assertEqual(colorier("AB C-D, E\nF G"),
+                         [0, 0, None, 1, 1, 1, None, None, 0, None, 0, None, 1])
+        self.assertEqual(colorier(""), [])
+        self.assertTrue(est_dans_un_mot('-'))
+        self.assertFalse(est_dans_un_mot('.'))
+
+    def test_fusionner(self):
+        texte = "ABCDEFGH"
+        # "ABCDEFGH" -> "ABxyzEFGH" -> "ABxyzEFuH"
+        self.assertEqual(fusionner((2, 2, 3), (7, 1, 1)), (2, 5, 6))
+        # "ABCDEFGH" -> "ABCDEFxH" -> "AtDEFxH"
+        self.assertEqual(fusionner((6, 1, 1), (1, 2, 1)), (1, 6, 5))
+        self.assertEqual(texte[:1] + "tDEFx" + texte[7:], "AtDEFxH")
+
+    def test_modifier(self):
+        # Insertion d'un espace : les mots suivants du paragraphe changent de couleur.
+        coloration = Coloration()
+        texte = "AB CD EF\nGH IJ"
+        coloration.initialiser(texte)
+        intervalles = coloration.modifier("A B CD EF\nGH IJ", 1, 0, 1)
+        self.assertEqual(intervalles, [(1, 2, None), (2, 3, 1), (4, 6, 0), (7, 9, 1)])
+        # Modification à l'intérieur d'un mot : rien d'autre à mettre en forme.
+        intervalles = coloration.modifier("A X CD EF\nGH IJ", 2, 1, 1)
+        self.assertEqual(intervalles, [(2, 3, None), (2, 3, 1)])
+
+    def test_modifier_aleatoire(self):
+        # Simule l'édition d'un texte (les caractères insérés prennent
+        # la mise en forme du caractère précédent, comme avec Qt).
+        alea = Random(0)
+        caracteres = 'AB-  .\n'
+        for essai in range(300):
+            texte = ''.join(alea.choice(caracteres) for i in range(alea.randrange(30)))
+            coloration = Coloration()
+            formats = len(texte)*[None]
+            appliquer(formats, coloration.initialiser(texte))
+            for i in range(10):
+                modifications = []
+                for j in range(alea.randrange(1, 4)):
+                    position = alea.randrange(len(texte) + 1)
+                    supprimes = alea.randrange(min(4, len(texte) - position) + 1)
+                    ajout = ''.join(alea.choice(caracteres) for k in range(alea.randrange(4)))
+                    herite = (formats[position - 1] if position else None)
+                    texte = texte[:position] + ajout + texte[position + supprimes:]
+                    formats[position:position + supprimes] = len(ajout)*[herite]
+                    modifications.append((position, supprimes, len(ajout)))
+                modification = modifications[0]
+                for autre in modifications[1:]:
+                    modification = fusionner(modification, autre)
+                appliquer(formats, coloration.modifier(texte, *modification))
+                self.assertEqual(formats, colorier(texte))
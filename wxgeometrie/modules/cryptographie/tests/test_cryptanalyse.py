@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+from string import ascii_uppercase as majuscules
+
+import numpy
+
+from wxgeometrie.modules.cryptographie.cryptanalyse import (lettres, normaliser,
+                    substituer, vigenere, dechiffrer, frequences, indice_coincidence,
+                    indices_coincidence, kasiski, longueur_cle, cle_vigenere, positions,
+                    casser_vigenere, casser_substitution, francais, IC_ALEATOIRE)
+
+import tools.unittest
+
+
+TEXTE = """\
+La mer était calme ce matin-là, et le petit port de pêche s'éveillait
+doucement. Les marins réparaient leurs filets sur le quai, tandis que les
+mouettes tournaient au-dessus des bateaux en poussant des cris perçants. Une
+vieille femme vendait des crevettes et des huîtres devant la halle, en
+plaisantant avec les clients qui passaient. Plus loin, sur la jetée, deux
+garçons lançaient des cailloux dans l'eau en essayant de les faire ricocher
+le plus loin possible. Le capitaine du plus grand navire consultait le ciel
+avec inquiétude : le vent allait tourner dans l'après-midi, et il fallait
+partir avant que la tempête n'arrive. Il donna ses ordres d'une voix forte,
+et l'équipage se mit au travail sans discuter. On chargea les caisses de
+vivres, les tonneaux d'eau douce et les cordages de rechange, puis on largua
+les amarres. Le bateau quitta lentement le port, salué par les familles
+restées à terre. Pendant plusieurs heures, la navigation fut facile. Les
+hommes chantaient en travaillant, et le cuisinier préparait une soupe de
+poissons dont l'odeur faisait oublier la fatigue. Mais vers le soir, les
+nuages devinrent noirs, la pluie se mit à tomber et les vagues grossirent
+rapidement. Le capitaine fit réduire la voilure et ordonna à chacun de
+s'attacher. Toute la nuit, le navire lutta contre la mer déchaînée. Au
+matin, le vent se calma enfin, et les marins épuisés aperçurent au loin la
+côte d'une île qu'aucun d'entre eux ne connaissait. Ils décidèrent de s'en
+approcher pour réparer le mât, qui avait été sérieusement endommagé pendant
+la tempête. L'île semblait déserte : une longue plage de sable blanc, bordée
+de palmiers, s'étendait au pied d'une montagne couverte de forêts. Le
+capitaine choisit trois hommes pour l'accompagner à terre, avec des outils,
+des armes et quelques provisions. Ils explorèrent prudemment les environs,
+découvrirent une source d'eau fraîche et des arbres chargés de fruits
+inconnus, puis ils remarquèrent, gravés sur un rocher, d'étranges symboles
+qui ressemblaient à une écriture très ancienne."""
+
+CLE = 'QWERTYUIOPASDFGHJKLZXCVBNM'
+
+
+class ModulesCryptographieTest(tools.unittest.TestCase):
+    def test_lettres(self):
+        numeros = lettres("Où ça, Zoé ?")
+        self.assertEqual(numeros.dtype, numpy.uint8)
+        self.assertEqual(numeros.tolist(), [14, 20, 2, 0, 25, 14, 4])
+        self.assertEqual(normaliser("Où ça, Zoé ?"), "OU CA, ZOE ?")
+
+    def test_substituer(self):
+        self.assertEqual(substituer("Le zèbre, à l'école !", CLE), 'STMTWKTQSTEGST')
+        self.assertEqual(substituer("Le zèbre, à l'école !", CLE, espaces=True),
+                         'ST MTWKT Q S TEGST ')
+        correspondances = dict(zip(CLE, majuscules))
+        del correspondances['T']
+        self.assertEqual(dechiffrer('St mtwkt, 2 !', correspondances), 'L- Z-BR-, 2 !')
+        self.assertRaises(ValueError, substituer, "abc", "ABC")
+
+    def test_vigenere(self):
+        self.assertEqual(vigenere("Attaque à l'aube !", 'LEMON'), "LXFODFI M Z'NFFQ !")
+        self.assertEqual(vigenere("LXFODFI M Z'NFFQ !", 'lemon', dechiffrer=True),
+                         "ATTAQUE A L'AUBE !")
+        self.assertRaises(ValueError, vigenere, "abc", "1 2")
+
+    def test_positions(self):
+        resultat = positions("Abc, ab !")
+        self.assertEqual(len(resultat), 26)
+        self.assertEqual([resultat[i].tolist() for i in range(4)], [[0, 5], [1, 6], [2], []])
+
+    def test_frequences(self):
+        self.assertEqual(frequences("abca")[:4].tolist(), [2, 1, 1, 0])
+        bigrammes = frequences("ab ab", 2)
+        self.assertEqual(bigrammes.shape, (26, 26))
+        self.assertEqual((bigrammes[0, 1], bigrammes[1, 0], bigrammes.sum()), (2, 1, 3))
+        self.assertEqual(frequences("ab", 3).sum(), 0)
+        self.assertEqual(indice_coincidence("aab"), 1/3)
+        self.assertEqual(indice_coincidence("a"), 0)
+        # Le français est loin d'avoir des lettres équiprobables.
+        self.assertGreater(francais().indice_coincidence, .07)
+        self.assertGreater(indice_coincidence(TEXTE), .07)
+
+    def test_casser_vigenere(self):
+        for cle in ('CLE', 'EXEMPLE', 'CRYPTOGRAPHIE'):
+            code = vigenere(TEXTE, cle)
+            self.assertEqual(longueur_cle(code), len(cle))
+            self.assertEqual(cle_vigenere(code, len(cle)), cle)
+            self.assertEqual(casser_vigenere(code), (cle, normaliser(TEXTE)))
+            # Les distances entre répétitions sont souvent multiples de la longueur de la clé.
+            self.assertEqual(kasiski(code)[len(cle)], max(kasiski(code)[len(cle):]))
+        self.assertAlmostEqual(indices_coincidence(TEXTE, 5)[0], indice_coincidence(TEXTE))
+        # Texte non codé : la clé est 'A' (aucun décalage).
+        self.assertEqual(casser_vigenere(TEXTE)[0], 'A')
+        self.assertRaises(ValueError, casser_vigenere, '123')
+
+    def test_casser_substitution(self):
+        code = substituer(TEXTE, CLE, espaces=True)
+        cle, clair = casser_substitution(code)
+        self.assertEqual(sorted(cle), list(majuscules))
+        # Lettres présentes dans le texte, et correctement déchiffrées.
+        attendu = substituer(TEXTE, majuscules, espaces=True)
+        self.assertEqual(len(clair), len(attendu))
+        justes = sum(a == b for a, b in zip(clair, attendu))
+        self.assertGreater(justes/len(attendu), .95)
+        # Même résultat à partir du tableau des lettres.
+        cle2, clair2 = casser_substitution(lettres(code))
+        self.assertEqual(cle2, cle)
+        self.assertEqual(clair2, clair.replace(' ', ''))
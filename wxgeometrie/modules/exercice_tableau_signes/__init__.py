@@ -23,17 +23,18 @@
 
 import re
 
-from sympy import S, solve, gcd
+from sympy import S
 from sympy.core.sympify import SympifyError
 
 from ...GUI.panel import Panel_API_graphique
 from ...GUI.exercice import ExerciceMenuBar, Exercice
 from ...GUI.qtlib import BusyCursor
+from ...GUI.reserve_exercices import Reserve
 from ...geolib import Champ
-from ...geolib.routines import nice_str
-from ...pylib import OrderedDict, print_error
-from ...mathlib.parsers import convertir_en_latex, NBR, NBR_SIGNE
+from ...pylib import print_error
+from ...mathlib.parsers import NBR_SIGNE
 from ... import param
+from .generation import NIVEAUX, generer, analyser
 
 
 # TODO:
@@ -53,30 +54,36 @@ class ExercicesTableauxSignes(Exercice):
 
     titre = "Tableaux de signes" # Donner un titre a chaque module
 
+    def __init__(self, *args, **kw):
+        # Exercices générés à l'avance (voir `GUI.reserve_exercices`).
+        self.reserve = Reserve('tableau_signes', generer)
+        Exercice.__init__(self, *args, **kw)
+        self.reserve.completer(*NIVEAUX.values())
+
 
     def niveau1(self):
-        self.generer_expression("n*x+z")
+        self.generer_expression(NIVEAUX[1])
 
     def niveau2(self):
-        self.generer_expression("-n*x+q")
+        self.generer_expression(NIVEAUX[2])
 
     def niveau3(self):
-        self.generer_expression("1|q*x+z")
+        self.generer_expression(NIVEAUX[3])
 
     def niveau4(self):
-        self.generer_expression("z*x+z,z*x+z")
+        self.generer_expression(NIVEAUX[4])
 
     def niveau5(self):
-        self.generer_expression("z*x+q|z*x+z")
+        self.generer_expression(NIVEAUX[5])
 
     def niveau6(self):
-        self.generer_expression("z*x+z,z*x+z|z*x+z")
+        self.generer_expression(NIVEAUX[6])
 
     def niveau7(self):
-        self.generer_expression("z*x+z,z*x+z|z*x+z,z*x+z")
+        self.generer_expression(NIVEAUX[7])
 
     def niveau8(self):
-        self.generer_expression("-n,z*x+z|-x,(z*x+z)**2")
+        self.generer_expression(NIVEAUX[8])
 
 
     def _sauvegarder(self, fgeo, feuille = None):
@@ -92,7 +99,7 @@ class ExercicesTableauxSignes(Exercice):
         self.fermer_feuilles()
         Panel_API_graphique._ouvrir(self, fgeo)
         if "expression" in fgeo.contenu:
-            self.generer_expression(expr=fgeo.contenu["expression"][0])
+            self.charger_exercice(analyser(fgeo.contenu["expression"][0]))
             ##self.dessiner_tableau()
         if "niveau" in fgeo.contenu:
             self.niveau = int(fgeo.contenu["niveau"][0])
@@ -107,104 +114,23 @@ class ExercicesTableauxSignes(Exercice):
         with BusyCursor():
             self.dessiner_tableau()
 
-    def _formater(self, expression):
-        expression = expression.replace('**', '^').replace('*', '').replace(' ', '')
-        if not re.match('-?(%s)?x?(\(.+\)(\^%s)?)?$' % (NBR, NBR), expression):
-            expression = '(' + expression + ')'
-        return expression
-
-    def str_naturel(self, m):
-        return str(self.naturel())
-
-    def str_relatif(self, m):
-        return str(self.relatif())
-
-    def str_decimal(self, m):
-        return str(self.decimal())
-
-    def str_rationnel(self, m):
-        return str(self.rationnel())
-
     def generer_expression(self, pattern):
-        """Génère une expression aléatoire en fonction respectant le format
-        en cours.
-
-        Si `pattern` est déjà une expression, l'expression retournée
-        est identique à la valeur entrée.
-        """
-        # Génération de l'expression:
-        x = S('x')
-        k = 0
-        while True:
-            k += 1
-            # 10000 essais au maximum
-            assert k < 10000
-            expression = re.sub('n', self.str_naturel, pattern)
-            expression = re.sub('z', self.str_relatif, expression)
-            expression = re.sub('d', self.str_decimal, expression)
-            expression = re.sub('q', self.str_rationnel, expression)
-            self.raw_expression = expression
-            expression = expression.replace('+-', '-').replace('-+', '-')
-            if '|' in expression:
-                num, den = expression.split('|')
-            else:
-                num = expression
-                den = ''
-            num = num.strip()
-            den = den.strip()
-            if not num or num == '1':
-                self.numerateur = []
-            else:
-                self.numerateur = num.split(',')
-            if not den or den == '1':
-                self.denominateur = []
-            else:
-                self.denominateur = den.split(',')
-            # On évite les racines multiples
-            racines = []
-            for facteur in self.numerateur + self.denominateur:
-                racines.extend(solve(facteur))
-            if len(racines) == len(set(racines)):
-                # Pas de racine multiple
-                break
-
-        # Génération de l'expression:
-        if len(self.numerateur) > 1:
-            num = ''.join(self._formater(facteur) for facteur in self.numerateur)
-        else:
-            num = self.numerateur[0] if self.numerateur else '1'
-        if len(self.denominateur) > 1:
-            den = ''.join(self._formater(facteur) for facteur in self.denominateur)
-        else:
-            den = self.denominateur[0] if self.denominateur else '1'
-        if den == '1':
-            self.expression = num
-        else:
-            self.expression = '(%s)/(%s)' %(num, den)
-
-        # On génère tous les dictionnaires utiles à la construction du tableau
-        self.expression_latex = convertir_en_latex(self.expression, mode=None)
-        num = '*'.join('(' + s + ')' for s in self.numerateur)
-        den = '*'.join('(' + s + ')' for s in self.denominateur)
-        if den and num:
-            self.expression_sympy = S('(%s)/(%s)' %(num, den))
-        elif num:
-            self.expression_sympy = S('(%s)' %num)
-        else:
-            assert den
-            self.expression_sympy = S('1/(%s)' %den)
-
-        self.facteurs_latex = fact_latex = OrderedDict((expr, convertir_en_latex(expr, mode=None))
-                                for expr in self.numerateur + self.denominateur)
-        self.facteurs_sympy = fact_sympy = OrderedDict((expr, S(expr)) for expr in fact_latex)
-        self.facteurs_sols = OrderedDict((expr, solve(fact_sympy[expr])) for expr in fact_latex)
-        self.facteurs_diff = OrderedDict((expr, fact_sympy[expr].diff(S('x'))) for expr in fact_latex)
-
+        """Génère une expression aléatoire respectant le format `pattern`
+        (voir `generation.py`), avec toutes les réponses attendues.
+
+        L'exercice est pris dans la réserve d'exercices générés à l'avance,
+        si possible."""
+        self.charger_exercice(self.reserve.prendre(pattern))
+
+    def charger_exercice(self, exercice):
+        "Charge un exercice généré par `generation.analyser()`."
+        self.exercice = exercice
+        self.raw_expression = exercice['raw_expression']
+        self.numerateur = exercice['numerateur']
+        self.denominateur = exercice['denominateur']
+        self.expression = exercice['expression']
         # valeurs remarquables de x
-        self.sols = []
-        for sols in list(self.facteurs_sols.values()):
-            self.sols.extend(sols)
-        self.sols.sort()
+        self.sols = exercice['sols']
         if param.debug:
             print('(Exercice tableau de signes) Liste des solutions: ' + str(self.sols))
 
@@ -213,12 +139,11 @@ class ExercicesTableauxSignes(Exercice):
     def dessiner_tableau(self):
         ##self.fermer_feuille()
         can = self.canvas
-        expression_latex = self.expression_latex
-        expression_sympy = self.expression_sympy
-        facteurs_latex = self.facteurs_latex
-        facteurs_sympy = self.facteurs_sympy
-        facteurs_sols = self.facteurs_sols
-        facteurs_diff = self.facteurs_diff
+        # Les réponses attendues ont toutes été calculées lors de la génération
+        # de l'exercice (voir `generation.analyser()`).
+        expression_latex = self.exercice['expression_latex']
+        facteurs = self.exercice['facteurs']
+        signes = self.exercice['signes']
         sols = self.sols
 
 
@@ -288,39 +213,39 @@ class ExercicesTableauxSignes(Exercice):
         choix = ['décroissante', 'croissante']
 
         # On écrit au dessus du tableau les équations à résoudre :
-        for expression, latex in list(facteurs_latex.items()):
+        for facteur in facteurs:
+            latex = facteur['latex']
+            nature = facteur['nature']
             # S'il y a des solutions:
-            if facteurs_sols[expression]:
-                assert len(facteurs_sols[expression]) == 1, \
-                    ("%s a plusieurs solution (non pris en charge pour l'instant)." % expression)
-                if facteurs_diff[expression] == 0:
+            if facteur['racines']:
+                assert len(facteur['racines']) == 1, \
+                    ("%s a plusieurs solution (non pris en charge pour l'instant)." % facteur['code'])
+                if nature == 'constante':
                     continue # Fonction constante
 
                 txt = dessiner_texte(10, h, r'$\bullet\,' + latex +
                                         r'\,=\,0\,\,\Longleftrightarrow\,\,x\,=\,$')
                 box = can.txt_box(txt)
-                resultat = nice_str(facteurs_sols[expression][0])
+                resultat = facteur['racines'][0]
                 ##print resultat
                 dessiner_champ(18 + box.width, h, ha='left', resultat=resultat)
                 ##dessiner_texte(220, height - h, u'\u2713', color='g') # 263A  00D8
                 ##dessiner_texte(240, height - h, u'\u2639', color='r') #u'\u26A0'
                 h += box.height + 2*marge
 
-                if facteurs_sympy[expression].has('x'):
-                    if not facteurs_diff[expression].has('x'):
-                        # C'est une fonction affine.
-                        txt = dessiner_texte(30, h, 'Sur $\u211D$, la fonction affine'
-                                               ' $x\\mapsto %s$ est strictement' %latex)
-                        box = can.txt_box(txt)
-                        sens = ('décroissante' if facteurs_diff[expression] < 0 else 'croissante')
-                        dessiner_champ(35 + box.width, h, ha='left', choix=choix, resultat=sens)
-                        h += box.height + 3*marge
-                    elif facteurs_sympy[expression].as_base_exp()[1] == 2:
-                        # C'est un carré.
-                        txt = dessiner_texte(30, h, 'Sur $\u211D$, un carré est toujours')
-                        box = can.txt_box(txt)
-                        dessiner_champ(35 + box.width, h, ha='left', resultat='positif')
-                        h += box.height + 3*marge
+                if nature in ('croissante', 'décroissante'):
+                    # C'est une fonction affine.
+                    txt = dessiner_texte(30, h, 'Sur $\u211D$, la fonction affine'
+                                           ' $x\\mapsto %s$ est strictement' %latex)
+                    box = can.txt_box(txt)
+                    dessiner_champ(35 + box.width, h, ha='left', choix=choix, resultat=nature)
+                    h += box.height + 3*marge
+                elif nature == 'carré':
+                    # C'est un carré.
+                    txt = dessiner_texte(30, h, 'Sur $\u211D$, un carré est toujours')
+                    box = can.txt_box(txt)
+                    dessiner_champ(35 + box.width, h, ha='left', resultat='positif')
+                    h += box.height + 3*marge
 
 
 
@@ -355,7 +280,7 @@ class ExercicesTableauxSignes(Exercice):
         # "facteur". Par ex, si l'expression est juste 2*x+3.
         print_last_line = self.denominateur or len(self.numerateur) > 1
 
-        textes = ['x'] + list(facteurs_latex.values())
+        textes = ['x'] + [facteur['latex'] for facteur in facteurs]
         if print_last_line:
             textes.append(expression_latex)
 
@@ -405,13 +330,12 @@ class ExercicesTableauxSignes(Exercice):
             x = col1 + (i + 1)*largeur_case
             dessiner_ligne_v(x, alpha=.15)
             colonnes.append(x)
-            resultat = nice_str(sol)
-            dessiner_champ(x, .5*(hauteurs[0] + hauteurs[1]), resultat=resultat)
+            dessiner_champ(x, .5*(hauteurs[0] + hauteurs[1]), resultat=sol)
             resultat_final = '0'
-            for k, expr in enumerate(facteurs_sols):
-                if sol in facteurs_sols[expr]:
+            for k, facteur in enumerate(facteurs):
+                if sol in facteur['racines']:
                     resultat = '0'
-                    if expr in self.denominateur:
+                    if facteur['code'] in self.denominateur:
                         resultat_final = '\u2551'
                 else:
                     resultat = ' '
@@ -429,30 +353,16 @@ class ExercicesTableauxSignes(Exercice):
         dessiner_texte(col1 + marge, h, '$-\\infty$')
         dessiner_texte(width - 30 - marge, h, '$+\\infty$', ha='right')
 
-        # Pour remplir le tableau de signes, le plus simple est encore
-        # de tester le signe dans chaque case, par exemple avec la valeur
-        # centrale de la case.
-        xmin = sols[0] - 10   # pour remplacer -oo
-        xmax = sols[-1] + 10  # pour remplacer +oo
-        valeurs = [xmin] + sols + [xmax]
-
-        var_x = S('x')
         choix = ['-', '+']
-        for i, val in enumerate(valeurs[:-1]):
-            m = .5*(val + valeurs[i + 1])
-            for k, expr in enumerate(facteurs_sols):
-                img = facteurs_sympy[expr].subs(var_x, m)
-                assert img != 0
-                signe = ('+' if img > 0 else '-')
+        for i, signes_case in enumerate(signes):
+            x = .5*(colonnes[i + 1] + colonnes[i + 2])
+            for k, signe in enumerate(signes_case[:-1]):
                 h = .5*(hauteurs[k + 1] + hauteurs[k + 2])
-                x = .5*(colonnes[i + 1] + colonnes[i + 2])
                 dessiner_champ(x, h, resultat=signe, choix=choix)
 
             if print_last_line:
-                img = expression_sympy.subs(var_x, m)
-                signe = ('+' if img > 0 else '-')
                 h = .5*(hauteurs[-2] + hauteurs[-1])
-                dessiner_champ(x, h, resultat=signe, choix=choix)
+                dessiner_champ(x, h, resultat=signes_case[-1], choix=choix)
 
         ##self.feuille_actuelle.interprete.commande_executee()
         ##self.feuille_actuelle.objets._.encadrer('r')
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+#    .-------------------------------------.
+#    |    Exercices : tableaux de signes   |
+#    '-------------------------------------'
+#    Géophar
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Génération des expressions et des réponses attendues des tableaux de signes.
+
+Le format d'une expression est de la forme
+"facteur1,facteur2,...|facteur1,facteur2,..." (numérateur|dénominateur),
+où les lettres n, z, d et q sont remplacées par des nombres tirés au hasard
+(n : entier naturel, z : entier relatif, d : décimal, q : rationnel).
+Exemple : "z*x+z,z*x+z|z*x+z".
+
+Toutes les réponses attendues sont calculées ici, avec sympy : l'exercice
+obtenu ne contient que des chaînes de caractères (cf. `GUI.reserve_exercices`),
+et l'affichage du tableau ne nécessite plus aucun calcul.
+
+`generer()` est exécutée dans un autre processus : ce module ne doit donc
+pas faire appel à l'interface graphique.
+"""
+
+import re
+from random import randint
+
+from sympy import S, solve
+
+from ...geolib.routines import nice_str
+from ...mathlib.parsers import convertir_en_latex, NBR
+
+
+# Format de l'expression de chaque niveau.
+NIVEAUX = {1: "n*x+z",
+           2: "-n*x+q",
+           3: "1|q*x+z",
+           4: "z*x+z,z*x+z",
+           5: "z*x+q|z*x+z",
+           6: "z*x+z,z*x+z|z*x+z",
+           7: "z*x+z,z*x+z|z*x+z,z*x+z",
+           8: "-n,z*x+z|-x,(z*x+z)**2",
+           }
+
+
+def naturel(n=15):
+    "Retourne un entier entre 2 et `n`."
+    return randint(2, n)
+
+def relatif(n=15):
+    "Retourne un entier entre -`n` et -2, ou entre 2 et `n`."
+    return (2*randint(0, 1) - 1)*naturel(n)
+
+def decimal():
+    "Retourne un nombre décimal."
+    return S("%s.%s" % (relatif(), naturel()))
+
+def rationnel(n=7):
+    "Retourne un quotient d'entiers."
+    while True:
+        p = naturel(n)
+        q = naturel(n)
+        if p % q:
+            break
+    return (2*randint(0, 1) - 1)*S(p)/S(q)
+
+
+def tirer_expression(format):
+    "Remplace les lettres n, z, d et q de `format` par des nombres tirés au hasard."
+    expression = re.sub('n', lambda m: str(naturel()), format)
+    expression = re.sub('z', lambda m: str(relatif()), expression)
+    expression = re.sub('d', lambda m: str(decimal()), expression)
+    return re.sub('q', lambda m: str(rationnel()), expression)
+
+
+def facteurs(expression):
+    "Retourne les listes des facteurs du numérateur et du dénominateur."
+    expression = expression.replace('+-', '-').replace('-+', '-')
+    num, _, den = expression.partition('|')
+    num = num.strip()
+    den = den.strip()
+    numerateur = ([] if not num or num == '1' else num.split(','))
+    denominateur = ([] if not den or den == '1' else den.split(','))
+    return numerateur, denominateur
+
+
+def _formater(expression):
+    expression = expression.replace('**', '^').replace('*', '').replace(' ', '')
+    if not re.match(r'-?(%s)?x?(\(.+\)(\^%s)?)?$' % (NBR, NBR), expression):
+        expression = '(' + expression + ')'
+    return expression
+
+
+def analyser(raw_expression):
+    """Calcule toutes les données du tableau de signes de `raw_expression`
+    (expression dont les nombres ont déjà été tirés, ex: "2*x-3|-5*x+1").
+
+    Retourne un dictionnaire, dont les valeurs sont des chaînes de caractères
+    ou des listes : `facteurs` décrit chaque facteur (code, code LaTeX, racines,
+    et nature : 'constante', 'croissante', 'décroissante', 'carré' ou None),
+    `sols` contient les valeurs remarquables de x (dans l'ordre croissant),
+    et `signes` les signes ('+' ou '-') de chaque facteur, puis de l'expression,
+    entre deux valeurs remarquables successives.
+    """
+    x = S('x')
+    numerateur, denominateur = facteurs(raw_expression)
+
+    # Expression affichée
+    if len(numerateur) > 1:
+        num = ''.join(_formater(facteur) for facteur in numerateur)
+    else:
+        num = numerateur[0] if numerateur else '1'
+    if len(denominateur) > 1:
+        den = ''.join(_formater(facteur) for facteur in denominateur)
+    else:
+        den = denominateur[0] if denominateur else '1'
+    expression = (num if den == '1' else '(%s)/(%s)' % (num, den))
+
+    num = '*'.join('(' + s + ')' for s in numerateur)
+    den = '*'.join('(' + s + ')' for s in denominateur)
+    if den and num:
+        expression_sympy = S('(%s)/(%s)' % (num, den))
+    elif num:
+        expression_sympy = S('(%s)' % num)
+    else:
+        assert den
+        expression_sympy = S('1/(%s)' % den)
+
+    descriptions = []
+    facteurs_sympy = []
+    sols = []
+    for code in numerateur + denominateur:
+        facteur = S(code)
+        racines = solve(facteur)
+        derivee = facteur.diff(x)
+        if derivee == 0:
+            nature = 'constante'
+        elif not facteur.has(x):
+            nature = None
+        elif not derivee.has(x):
+            # C'est une fonction affine.
+            nature = ('décroissante' if derivee < 0 else 'croissante')
+        elif facteur.as_base_exp()[1] == 2:
+            nature = 'carré'
+        else:
+            nature = None
+        descriptions.append({'code': code,
+                             'latex': convertir_en_latex(code, mode=None),
+                             'racines': [nice_str(racine) for racine in racines],
+                             'nature': nature})
+        facteurs_sympy.append(facteur)
+        sols.extend(racines)
+    sols.sort()
+
+    # Pour remplir le tableau de signes, le plus simple est encore
+    # de tester le signe dans chaque case, par exemple avec la valeur
+    # centrale de la case.
+    if sols:
+        valeurs = [sols[0] - 10] + sols + [sols[-1] + 10]
+    else:
+        valeurs = [-1, 1]
+    signes = []
+    for a, b in zip(valeurs[:-1], valeurs[1:]):
+        m = (a + b)/2
+        images = [facteur.subs(x, m) for facteur in facteurs_sympy]
+        images.append(expression_sympy.subs(x, m))
+        assert all(image != 0 for image in images)
+        signes.append([('+' if image > 0 else '-') for image in images])
+
+    return {'raw_expression': raw_expression,
+            'expression': expression,
+            'expression_latex': convertir_en_latex(expression, mode=None),
+            'numerateur': numerateur,
+            'denominateur': denominateur,
+            'facteurs': descriptions,
+            'sols': [nice_str(sol) for sol in sols],
+            'signes': signes,
+            }
+
+
+def generer(format):
+    """Génère un exercice (voir `analyser()`) dont l'expression respecte `format`.
+
+    Les racines des facteurs doivent être distinctes : le tableau de signes
+    ne comporte ainsi qu'une valeur remarquable par racine (et, en particulier,
+    un même facteur n'apparaît jamais à la fois au numérateur et au dénominateur)."""
+    # 10000 essais au maximum
+    for k in range(10000):
+        raw_expression = tirer_expression(format)
+        numerateur, denominateur = facteurs(raw_expression)
+        racines = []
+        for facteur in numerateur + denominateur:
+            racines.extend(solve(facteur))
+        if len(racines) == len(set(racines)):
+            # Pas de racine multiple
+            return analyser(raw_expression)
+    raise RuntimeError("Impossible de générer une expression de la forme %s." % format)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+import json
+import tempfile
+import time
+
+from wxgeometrie.modules.exercice_tableau_signes import generation
+from wxgeometrie.modules.exercice_tableau_signes.generation import (NIVEAUX,
+                        generer, analyser, tirer_expression, facteurs)
+from wxgeometrie.GUI.reserve_exercices import Reserve
+from wxgeometrie import param
+
+import tools.unittest
+
+class ModuleExerciceTableauSignesTest(tools.unittest.TestCase):
+
+    def test_tirer_expression(self):
+        expression = tirer_expression("n*x+z,z*x+q|d")
+        self.assertNotRegex(expression, '[nzdq]')
+        numerateur, denominateur = facteurs(expression)
+        self.assertEqual(len(numerateur), 2)
+        self.assertEqual(len(denominateur), 1)
+        self.assertEqual(facteurs("1|2*x+-3"), ([], ['2*x-3']))
+
+    def test_analyser(self):
+        exercice = analyser("-3,2*x+4|-x,(5*x-1)**2")
+        self.assertEqual(exercice['raw_expression'], "-3,2*x+4|-x,(5*x-1)**2")
+        self.assertEqual(exercice['expression_latex'], r'\frac{-3(2x+4)}{-x(5x-1)^{2}}')
+        self.assertEqual(exercice['sols'], ['-2', '0', '1/5'])
+        self.assertEqual([(facteur['racines'], facteur['nature']) for facteur in exercice['facteurs']],
+                         [([], 'constante'), (['-2'], 'croissante'),
+                          (['0'], 'décroissante'), (['1/5'], 'carré')])
+        # Signes de chaque facteur, puis de l'expression, sur chaque intervalle.
+        self.assertEqual(exercice['signes'], [['-', '-', '+', '+', '+'],
+                                              ['-', '+', '+', '+', '-'],
+                                              ['-', '+', '-', '+', '+'],
+                                              ['-', '+', '-', '+', '+']])
+        # L'exercice peut être enregistré au format JSON.
+        self.assertEqual(json.loads(json.dumps(exercice)), exercice)
+
+    def test_generer(self):
+        for format in NIVEAUX.values():
+            exercice = generer(format)
+            racines = sum((facteur['racines'] for facteur in exercice['facteurs']), [])
+            self.assertEqual(len(racines), len(set(racines)))
+            self.assertEqual(len(exercice['signes']), len(exercice['sols']) + 1)
+
+    def test_generer_racines_communes(self):
+        # Deux facteurs du numérateur (ou du dénominateur) ayant la même racine :
+        # le tirage doit être rejeté.
+        tirages = iter(["2*x+4,3*x+6", "x-1|2*x-2,x+5", "2*x+4,x-1"])
+        tirer = generation.tirer_expression
+        generation.tirer_expression = lambda format: next(tirages)
+        try:
+            exercice = generer(NIVEAUX[4])
+        finally:
+            generation.tirer_expression = tirer
+        self.assertEqual(exercice['raw_expression'], "2*x+4,x-1")
+        self.assertEqual(exercice['sols'], ['-2', '1'])
+
+    def test_reserve(self):
+        processus = param.processus_exercices
+        param.processus_exercices = 0
+        try:
+            with tempfile.TemporaryDirectory() as dossier:
+                fichier = os.path.join(dossier, 'exercices', 'test.json')
+                reserve = Reserve('test', generer, taille=3, fichier=fichier)
+                # Réserve vide : l'exercice est généré immédiatement.
+                exercice = reserve.prendre(NIVEAUX[4])
+                self.assertEqual(len(exercice['sols']), 2)
+                self.assertEqual(len(reserve), 0)
+                self.assertFalse(os.path.exists(fichier))
+                reserve._exercices[NIVEAUX[4]] = [analyser("2*x+1,x-3"), analyser("x+1,x-5")]
+                reserve.enregistrer()
+                # Nouveau lancement : la réserve est lue sur le disque.
+                reserve = Reserve('test', generer, taille=3, fichier=fichier)
+                self.assertEqual(reserve.disponibles(NIVEAUX[4]), 2)
+                self.assertEqual(reserve.prendre(NIVEAUX[4])['raw_expression'], "2*x+1,x-3")
+                reserve = Reserve('test', generer, taille=3, fichier=fichier)
+                self.assertEqual(reserve.disponibles(NIVEAUX[4]), 1)
+                # Une réserve enregistrée par une autre version est ignorée.
+                version = param.version
+                param.version = version + '-test'
+                try:
+                    self.assertEqual(len(Reserve('test', generer, fichier=fichier)), 0)
+                finally:
+                    param.version = version
+        finally:
+            param.processus_exercices = processus
+
+    def test_reserve_processus(self):
+        processus = param.processus_exercices
+        param.processus_exercices = 1
+        try:
+            with tempfile.TemporaryDirectory() as dossier:
+                fichier = os.path.join(dossier, 'test.json')
+                reserve = Reserve('test', generer, taille=2, fichier=fichier)
+                reserve.completer(NIVEAUX[1], NIVEAUX[3])
+                debut = time.time()
+                while len(reserve) < 4 and time.time() - debut < 60:
+                    time.sleep(.05)
+                self.assertEqual(reserve.disponibles(NIVEAUX[1]), 2)
+                self.assertEqual(reserve.disponibles(NIVEAUX[3]), 2)
+                self.assertEqual(len(Reserve('test', generer, fichier=fichier)), 4)
+                # La réserve est complétée au fur et à mesure.
+                reserve.prendre(NIVEAUX[1])
+                while reserve.disponibles(NIVEAUX[1]) < 2 and time.time() - debut < 60:
+                    time.sleep(.05)
+                self.assertEqual(reserve.disponibles(NIVEAUX[1]), 2)
+        finally:
+            param.processus_exercices = processus
@@ -26,15 +26,18 @@ from collections import defaultdict
 from random import randint
 from itertools import count
 
-from PyQt5.QtWidgets import QInputDialog, QLineEdit
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QInputDialog, QLineEdit, QMessageBox
 
+import numpy
 from sympy import latex
 
 from ...GUI.menu import MenuBar
 from ...GUI.panel import Panel_API_graphique
-from ...mathlib.graphes import Graph, colors, colors_dict
+from ...mathlib.graphes import Graph, GraphError, colors, colors_dict
 from .barre_outils_graphes import BarreOutilsGraphes
-from ...geolib import Arc_oriente
+from .disposition import CalculDisposition
+from ...geolib import Arc_oriente, Point, Segment, Vecteur
 
 
 class GraphesMenuBar(MenuBar):
@@ -52,12 +55,19 @@ class GraphesMenuBar(MenuBar):
         self.ajouter("autres")
         self.ajouter("Outils",
 #                        [u"Créer le graphe", u"(Entrée à supprimer).", "Ctrl+E", self.panel.creer_graphe],
+                        ["Représenter un graphe", "Disposer automatiquement les sommets d'un graphe décrit par son code.", None, self.panel.representer_graphe],
+                        ["Créer les objets", "Créer les sommets et les arêtes du graphe représenté (objets géométriques).", None, self.panel.creer_objets],
+                        None,
                         ["Colorier le graphe", "Coloriage par l'algorithme de Welsh & Powell.", None, self.panel.colorier],
+                        ["Colorier (DSATUR)", "Coloriage par l'algorithme DSATUR.", None, self.panel.colorier_DSATUR],
+                        ["Chaîne eulérienne", "Recherche d'une chaîne eulérienne.", None, self.panel.afficher_chaine_eulerienne],
                         ["Latex -> Presse-papier",
                             ["Dijkstra", "Recherche d'un trajet minimal entre deux points.", None, self.panel.latex_Dijkstra],
                             ["Welsh & Powell", "Coloriage par l'algorithme de Welsh & Powell.", None, self.panel.latex_WelshPowell],
+                            ["DSATUR", "Coloriage par l'algorithme DSATUR.", None, self.panel.latex_DSATUR],
                             ["Matrice", "Matrice du graphe.", None, self.panel.latex_matrix],
                             ["Matrice (poids)", "Matrice de graphe pondéré.", None, self.panel.latex_matrix_poids],
+                            ["Nombre de chemins", "Nombre de chemins d'une longueur donnée (puissance de la matrice).", None, self.panel.latex_chemins],
                             ],
                         ["options"],
                         )
@@ -75,10 +85,29 @@ class Graphes(Panel_API_graphique):
 
     def __init__(self, *args, **kw):
         Panel_API_graphique.__init__(self, *args, BarreOutils = BarreOutilsGraphes, **kw)
+        # Graphe représenté sans objets géométriques (cf. `representer_graphe()`) :
+        # feuille, calcul de la disposition, et couleurs éventuelles des sommets.
+        self._graphe_simplifie = None
+        self._couleurs_sommets = None
+        self._minuteur = QTimer(self)
+        self._minuteur.timeout.connect(self._suivre_disposition)
         self.finaliser()
 
 
+    def _graphe_represente(self):
+        "Calcul de la disposition du graphe représenté sur la feuille actuelle (ou None)."
+        if self._graphe_simplifie is not None:
+            feuille, calcul = self._graphe_simplifie
+            if feuille is self.feuille_actuelle:
+                return calcul
+        return None
+
     def creer_graphe(self, event=None):
+        calcul = self._graphe_represente()
+        if calcul is not None:
+            # Graphe représenté sans objets géométriques.
+            self.graph = calcul.graphe
+            return
         aretes = list(self.feuille_actuelle.objets.segments)
         aretes_orientees = list(self.feuille_actuelle.objets.vecteurs)
         for arc in self.feuille_actuelle.objets.arcs:
@@ -126,7 +155,17 @@ class Graphes(Panel_API_graphique):
         self.creer_graphe()
         return self.graph.eulerian_trail(chaine)
 
-    def colorier(self, event=None):
+    def afficher_chaine_eulerienne(self, event=None):
+        chaine = self.chaine_eulerienne()
+        if chaine is None:
+            self.canvas.message("Le graphe ne possède pas de chaîne eulérienne.")
+        else:
+            self.canvas.message("Chaîne eulérienne : %s" % '-'.join(chaine))
+
+    def colorier_DSATUR(self, event=None):
+        self.colorier(algorithme='DSATUR')
+
+    def colorier(self, event=None, algorithme='WelshPowell'):
         def rnd():
             return randint(5, 250)
             # Range is (5, 250) so as to avoid pure colors (most are already used).
@@ -136,14 +175,27 @@ class Graphes(Panel_API_graphique):
         symbs = ('o', 'D', '*', 's', '<', '>', 'H', '^', 'd', 'h', 'p', 'v')
 
         self.creer_graphe()
+        simplifie = (self._graphe_represente() is not None)
+        if simplifie:
+            self._couleurs_sommets = {}
 
-        for sommets, colorname, i in zip(self.graph.coloring(), colors(), count()):
+        for sommets, colorname, i in zip(self.graph.coloring(algorithm=algorithme),
+                                         colors(), count()):
             couleur = colors_dict.get(colorname, (rnd(), rnd(), rnd()))
             for sommet in sommets:
-                self.feuille_actuelle.objets[sommet].style(couleur=rgb(*couleur),
-                                                           style=symbs[i%len(symbs)])
-        self.feuille_actuelle.interprete.commande_executee()
-        self.latex_WelshPowell(creer=False)
+                if simplifie:
+                    self._couleurs_sommets[sommet] = rgb(*couleur)
+                else:
+                    self.feuille_actuelle.objets[sommet].style(couleur=rgb(*couleur),
+                                                               style=symbs[i%len(symbs)])
+        if simplifie:
+            self.canvas.rafraichir_affichage(rafraichir_axes=True)
+        else:
+            self.feuille_actuelle.interprete.commande_executee()
+        if algorithme == 'DSATUR':
+            self.latex_DSATUR(creer=False)
+        else:
+            self.latex_WelshPowell(creer=False)
 
     def latex_Dijkstra(self, event=None, creer=True, start=None, end=None):
         ask = not (start and end)
@@ -177,6 +229,12 @@ class Graphes(Panel_API_graphique):
         self.vers_presse_papier(latex_)
         self.code_copie()
 
+    def latex_DSATUR(self, event=None, creer=True):
+        if creer:
+            self.creer_graphe()
+        self.vers_presse_papier(self.graph.latex_DSATUR())
+        self.code_copie()
+
     def latex_matrix(self, event=None, creer=True):
         self.vers_presse_papier(latex(self.matrice(creer=creer)))
         self.code_copie()
@@ -185,6 +243,138 @@ class Graphes(Panel_API_graphique):
         self.vers_presse_papier(latex(self.matrice(creer=creer, poids=True)))
         self.code_copie()
 
+    def latex_chemins(self, event=None, creer=True, longueur=None):
+        if longueur is None:
+            longueur, ok = QInputDialog.getInt(self, "Nombre de chemins",
+                    "Longueur des chemins :", 2, 0)
+            if not ok:
+                return
+        if creer:
+            self.creer_graphe()
+        self.vers_presse_papier(latex(self.graph.paths_matrix(longueur)))
+        self.code_copie()
+
+    def representer_graphe(self, event=None, code=None):
+        """Représente le graphe décrit par `code` (ex: "A>(B:1,C:2), B>(A:1), C>(A:2)"),
+        en disposant automatiquement ses sommets.
+
+        La disposition est calculée en arrière-plan, et le graphe est affiché
+        au fur et à mesure. Au-delà de `nbr_max_sommets` sommets, le graphe
+        est dessiné sans créer d'objets géométriques (cf. `creer_objets()`).
+        Si le code ne décrit pas un graphe symétrique, le graphe est orienté."""
+        if code is None:
+            code, ok = QInputDialog.getMultiLineText(self, "Représenter un graphe",
+                    "Sommets et arêtes (ex: A>(B:1,C:2), B>(A:1), C>(A:2)) :")
+            if not ok or not code.strip():
+                return
+        code = code.replace('\n', ',')
+        try:
+            try:
+                graphe = Graph(code)
+            except GraphError:
+                graphe = Graph(code, oriented=True)
+        except Exception as e:
+            QMessageBox.warning(self, "Code incorrect", str(e))
+            return
+        self.interrompre_disposition()
+        self.creer_feuille()
+        self.canvas.fenetre = -.1, 1.1, -.1, 1.1
+        calcul = CalculDisposition(graphe)
+        self._graphe_simplifie = (self.feuille_actuelle, calcul)
+        self._couleurs_sommets = None
+        calcul.lancer()
+        self._minuteur.start(100)
+
+    def interrompre_disposition(self, event=None):
+        "Interrompt le calcul de la disposition en cours éventuel."
+        if self._graphe_simplifie is not None:
+            self._graphe_simplifie[1].annuler()
+            self._graphe_simplifie = None
+            self._minuteur.stop()
+
+    def _suivre_disposition(self):
+        "Affiche le graphe au fur et à mesure du calcul de la disposition."
+        if self._graphe_simplifie is None:
+            self._minuteur.stop()
+            return
+        feuille, calcul = self._graphe_simplifie
+        if calcul.erreur is not None:
+            self._minuteur.stop()
+            self._graphe_simplifie = None
+            self.canvas.message("Erreur : %s" % calcul.erreur)
+            return
+        if calcul.terminee:
+            self._minuteur.stop()
+            if (feuille is self.feuille_actuelle
+                    and len(calcul.sommets) <= self.param('nbr_max_sommets')):
+                self.creer_objets()
+                return
+            self.canvas.message("Disposition du graphe terminée.")
+        else:
+            self.canvas.message("Disposition du graphe : %s %%" % int(100*calcul.progression))
+        self.canvas.rafraichir_affichage(rafraichir_axes=True)
+
+    def _affiche(self):
+        calcul = self._graphe_represente()
+        if calcul is None:
+            return
+        positions = calcul.positions
+        # Toutes les arêtes sont dessinées en une seule fois.
+        segments = numpy.stack((positions[calcul.sources], positions[calcul.cibles]), axis=1)
+        self.canvas.dessiner_lignes(segments, colors='k', linewidths=.5, zorder=1)
+        # Une seule ligne (sans trait) par couleur de sommets.
+        groupes = {}
+        for i, sommet in enumerate(calcul.sommets):
+            couleur = (self._couleurs_sommets or {}).get(sommet, 'k')
+            groupes.setdefault(couleur, []).append(i)
+        for couleur, indices in groupes.items():
+            self.canvas.dessiner_ligne(positions[indices, 0], positions[indices, 1],
+                                       color=couleur, linestyle='none', marker='o',
+                                       markersize=4, zorder=2)
+        if len(calcul.sommets) <= self.param('nbr_max_etiquettes'):
+            for (x, y), sommet in zip(positions, calcul.sommets):
+                self.canvas.dessiner_texte(x, y, ' %s' % sommet, size=8,
+                                           verticalalignment='bottom')
+
+    def creer_objets(self, event=None):
+        "Crée les sommets et les arêtes (objets géométriques) du graphe représenté."
+        calcul = self._graphe_represente()
+        if calcul is None:
+            self.canvas.message("Aucun graphe représenté sur cette feuille.")
+            return
+        if not calcul.terminee:
+            self.canvas.message("Disposition du graphe en cours...")
+            return
+        graphe = calcul.graphe
+        objets = self.feuille_actuelle.objets
+        with self.canvas.geler_affichage(actualiser=True, sablier=True):
+            self._graphe_simplifie = None
+            points = {}
+            for (x, y), sommet in zip(calcul.positions, calcul.sommets):
+                M = Point(float(x), float(y))
+                try:
+                    objets.add(M, nom_suggere=str(sommet))
+                except Exception:
+                    # Nom incorrect : le nom du sommet est affiché en étiquette.
+                    objets.add(M)
+                    M.label(str(sommet))
+                points[sommet] = M
+            rangs = dict((sommet, i) for i, sommet in enumerate(calcul.sommets))
+            Arete = (Vecteur if graphe.oriented else Segment)
+            for sommet, extremites in graphe.items():
+                for sommet2, poids in extremites.items():
+                    # Les boucles ne sont pas représentées, et les arêtes
+                    # d'un graphe non orienté ne sont créées qu'une fois.
+                    if sommet2 == sommet or (not graphe.oriented
+                                             and rangs[sommet2] < rangs[sommet]):
+                        continue
+                    for p in poids:
+                        arete = Arete(points[sommet], points[sommet2])
+                        objets.add(arete)
+                        if p != 1:
+                            arete.label(str(p))
+            self.feuille_actuelle.interprete.commande_executee()
+
     def code_copie(self):
         self.canvas.message("Code LaTeX copié dans le presse-papier.")
 
@@ -35,3 +35,9 @@ arcs_orientes = {
     "position": .5,
     "couleur": "k",
     }
+
+# Au-del, un graphe reprsent automatiquement est dessin
+# sans crer d'objets gomtriques (menu  Crer les objets ).
+nbr_max_sommets = 50
+# Au-del, le nom des sommets n'est pas affich.
+nbr_max_etiquettes = 200
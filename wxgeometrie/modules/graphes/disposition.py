@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#         Disposition des graphes             #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Disposition automatique des sommets d'un graphe (algorithme de Fruchterman & Reingold).
+
+Les sommets se repoussent deux à deux, tandis que les arêtes se comportent
+comme des ressorts. Les forces sont calculées pour tous les sommets à la fois
+(numpy). Pour les grands graphes, les forces de répulsion sont approchées
+par la méthode de Barnes & Hut : les sommets éloignés sont regroupés par cellules
+d'une grille hiérarchique (quadtree), représentées par leur centre de gravité.
+
+`CalculDisposition` effectue le calcul en arrière-plan (thread).
+"""
+
+from math import ceil, log, sqrt
+import time
+
+import numpy
+
+from ...pylib.calcul import CalculArrierePlan
+
+
+# Nombre d'itérations par défaut.
+ITERATIONS = 100
+
+# Au-delà de ce nombre de sommets, la méthode de Barnes & Hut est utilisée.
+SEUIL_BARNES_HUT = 200
+
+# Précision de la méthode de Barnes & Hut : une cellule de côté c, à une
+# distance d du sommet, est assimilée à son centre de gravité si c < THETA*d.
+THETA = .8
+
+# Nombre (approximatif) de couples de sommets traités à la fois
+# lors du calcul exact des forces de répulsion.
+TAILLE_BLOC = 2**20
+
+# Attraction vers le centre, pour éviter que les composantes connexes
+# ne s'éloignent les unes des autres.
+GRAVITE = .05
+
+
+def aretes(graphe):
+    """Sommets et arêtes du graphe (`mathlib.graphes.Graph`).
+
+    Retourne la liste des sommets, et les tableaux des numéros des extrémités
+    des arêtes. Les arêtes multiples ne sont retournées qu'une fois,
+    les boucles sont ignorées."""
+    adjacence = graphe.adjacency()
+    sources, cibles = adjacence.sources, adjacence.indices
+    # Une seule arête entre deux sommets, quel que soit le sens.
+    debuts, fins = numpy.minimum(sources, cibles), numpy.maximum(sources, cibles)
+    couples = numpy.unique(numpy.stack((debuts, fins), axis=1)[debuts != fins], axis=0)
+    return adjacence.nodes, couples[:, 0].copy(), couples[:, 1].copy()
+
+
+def repulsion_exacte(positions, k2, taille_bloc=None):
+    "Forces de répulsion (k²/d) entre tous les couples de sommets."
+    if taille_bloc is None:
+        taille_bloc = TAILLE_BLOC
+    n = len(positions)
+    forces = numpy.zeros_like(positions)
+    lignes = max(1, taille_bloc//max(n, 1))
+    for debut in range(0, n, lignes):
+        ecarts = positions[debut:debut + lignes, None, :] - positions[None, :, :]
+        distances2 = numpy.maximum((ecarts**2).sum(axis=2), 1e-12)
+        # NB: l'écart d'un sommet avec lui-même est nul (pas de force).
+        forces[debut:debut + lignes] = k2*(ecarts/distances2[:, :, None]).sum(axis=1)
+    return forces
+
+
+def repulsion_barnes_hut(positions, k2, theta=None):
+    """Forces de répulsion approchées par la méthode de Barnes & Hut.
+
+    Les couples (sommet, cellule) à examiner sont traités niveau par niveau
+    de la grille, pour tous les sommets à la fois : une cellule est soit
+    assimilée à son centre de gravité, soit remplacée par ses quatre sous-cellules.
+    Au dernier niveau, les forces exercées par les sommets des cellules
+    restantes sont calculées exactement."""
+    if theta is None:
+        theta = THETA
+    n = len(positions)
+    forces = numpy.zeros_like(positions)
+    if n < 2:
+        return forces
+    xs, ys = positions[:, 0], positions[:, 1]
+    origine = positions.min(axis=0)
+    cote = max(float((positions.max(axis=0) - origine).max()), 1e-12)
+    # Environ un sommet par cellule au dernier niveau.
+    profondeur = min(max(1, int(ceil(log(n, 4)))), 12)
+    cases = numpy.floor((positions - origine)/cote*2**profondeur).astype(numpy.int64)
+    cases = numpy.clip(cases, 0, 2**profondeur - 1)
+    # Pour chaque niveau : numéro de la cellule de chaque sommet,
+    # masse (nombre de sommets) et centre de gravité de chaque cellule.
+    cellules, masses, centres = [], [], []
+    for niveau in range(profondeur + 1):
+        ix, iy = cases[:, 0] >> (profondeur - niveau), cases[:, 1] >> (profondeur - niveau)
+        numeros = ix*2**niveau + iy
+        masse = numpy.bincount(numeros, minlength=4**niveau)
+        non_vides = numpy.maximum(masse, 1)
+        centre = numpy.stack((numpy.bincount(numeros, weights=xs, minlength=4**niveau)/non_vides,
+                              numpy.bincount(numeros, weights=ys, minlength=4**niveau)/non_vides),
+                             axis=1)
+        cellules.append(numeros)
+        masses.append(masse)
+        centres.append(centre)
+
+    fx = numpy.zeros(n)
+    fy = numpy.zeros(n)
+
+    def ajouter_forces(sommets, ecarts, masses):
+        coefficients = k2*masses/numpy.maximum((ecarts**2).sum(axis=1), 1e-12)
+        fx[:] += numpy.bincount(sommets, weights=coefficients*ecarts[:, 0], minlength=n)
+        fy[:] += numpy.bincount(sommets, weights=coefficients*ecarts[:, 1], minlength=n)
+
+    sommets = numpy.arange(n)
+    numeros = numpy.zeros(n, dtype=numpy.int64)
+    for niveau in range(profondeur):
+        centre = centres[niveau][numeros]
+        ecarts = positions[sommets] - centre
+        largeur = cote/2**niveau
+        acceptes = ((cellules[niveau][sommets] != numeros)
+                    & (largeur**2 < theta**2*(ecarts**2).sum(axis=1)))
+        ajouter_forces(sommets[acceptes], ecarts[acceptes], masses[niveau][numeros[acceptes]])
+        # Les cellules trop proches sont remplacées par leurs sous-cellules non vides.
+        sommets, numeros = sommets[~acceptes], numeros[~acceptes]
+        ix, iy = numeros//2**niveau, numeros%2**niveau
+        largeur = 2**(niveau + 1)
+        sous_cellules = numpy.concatenate([(2*ix + a)*largeur + 2*iy + b
+                                           for a in (0, 1) for b in (0, 1)])
+        sommets = numpy.tile(sommets, 4)
+        non_vides = masses[niveau + 1][sous_cellules] > 0
+        sommets, numeros = sommets[non_vides], sous_cellules[non_vides]
+
+    # Dernier niveau : chaque couple (sommet, cellule) est remplacé par
+    # les couples (sommet, autre sommet de la cellule).
+    masse = masses[profondeur]
+    ordre = numpy.argsort(cellules[profondeur], kind='stable')
+    debuts = numpy.concatenate(([0], numpy.cumsum(masse)[:-1]))
+    nombres = masse[numeros]
+    rangs = numpy.arange(nombres.sum()) - numpy.repeat(numpy.cumsum(nombres) - nombres, nombres)
+    autres = ordre[numpy.repeat(debuts[numeros], nombres) + rangs]
+    sommets = numpy.repeat(sommets, nombres)
+    distincts = (autres != sommets)
+    sommets, autres = sommets[distincts], autres[distincts]
+    ajouter_forces(sommets, positions[sommets] - positions[autres], 1.)
+    forces[:, 0] = fx
+    forces[:, 1] = fy
+    return forces
+
+
+def iterer(positions, sources, cibles, iterations=None, barnes_hut=None):
+    """Applique l'algorithme de Fruchterman & Reingold.
+
+    Le tableau `positions` (de dimensions (nombre de sommets, 2)) est
+    modifié sur place. Après chaque itération, la proportion d'itérations
+    effectuées est générée (ce qui permet de suivre, voire d'interrompre,
+    le calcul)."""
+    if iterations is None:
+        iterations = ITERATIONS
+    n = len(positions)
+    if barnes_hut is None:
+        barnes_hut = (n > SEUIL_BARNES_HUT)
+    repulsion = (repulsion_barnes_hut if barnes_hut else repulsion_exacte)
+    # Distance idéale entre deux sommets (positions initiales dans le carré unité).
+    k = 1/sqrt(max(n, 1))
+    temperature = .1
+    for i in range(iterations):
+        forces = repulsion(positions, k**2)
+        # Attraction des extrémités de chaque arête (d²/k).
+        ecarts = positions[sources] - positions[cibles]
+        attraction = ecarts*numpy.sqrt((ecarts**2).sum(axis=1))[:, None]/k
+        for j in (0, 1):
+            forces[:, j] -= numpy.bincount(sources, weights=attraction[:, j], minlength=n)
+            forces[:, j] += numpy.bincount(cibles, weights=attraction[:, j], minlength=n)
+        forces -= GRAVITE*(positions - positions.mean(axis=0))/k
+        # Le déplacement de chaque sommet est limité par la "température".
+        normes = numpy.maximum(numpy.sqrt((forces**2).sum(axis=1)), 1e-12)
+        positions += forces*(numpy.minimum(normes, temperature)/normes)[:, None]
+        temperature *= .95
+        yield (i + 1)/iterations
+
+
+def normaliser(positions):
+    "Ramène les positions dans le carré [0;1]x[0;1] (en conservant les proportions)."
+    if not len(positions):
+        return positions
+    origine = positions.min(axis=0)
+    etendue = float((positions.max(axis=0) - origine).max()) or 1.
+    # Le dessin est centré dans le carré.
+    return (positions - origine + (etendue - (positions.max(axis=0) - origine))/2)/etendue
+
+
+def positions_initiales(n, graine=0):
+    return numpy.random.RandomState(graine).random_sample((n, 2))
+
+
+def disposition(graphe, iterations=None, graine=0, barnes_hut=None):
+    """Calcule la disposition des sommets du graphe.
+
+    Retourne la liste des sommets, et le tableau de leurs positions
+    (dans le carré [0;1]x[0;1])."""
+    sommets, sources, cibles = aretes(graphe)
+    positions = positions_initiales(len(sommets), graine)
+    for progression in iterer(positions, sources, cibles, iterations, barnes_hut):
+        pass
+    return sommets, normaliser(positions)
+
+
+class CalculDisposition(CalculArrierePlan):
+    """Calcule en arrière-plan la disposition des sommets d'un graphe.
+
+    Les positions (normalisées, cf. `normaliser()`) sont mises à jour
+    régulièrement dans l'attribut `positions`, ce qui permet d'afficher
+    le graphe au fur et à mesure du calcul.
+    """
+
+    # Délai minimal (en secondes) entre deux mises à jour des positions.
+    delai = .1
+
+    def __init__(self, graphe, iterations=None, graine=0, barnes_hut=None):
+        CalculArrierePlan.__init__(self)
+        self.graphe = graphe
+        self.sommets, self.sources, self.cibles = aretes(graphe)
+        self.iterations = iterations
+        self.barnes_hut = barnes_hut
+        self._positions = positions_initiales(len(self.sommets), graine)
+        self.positions = normaliser(self._positions)
+        self.duree = None
+
+    def calculer(self):
+        "Calcule les positions, et les retourne (ou None si le calcul a été annulé)."
+        debut = derniere = time.time()
+        for progression in iterer(self._positions, self.sources, self.cibles,
+                                  self.iterations, self.barnes_hut):
+            if self.annulee:
+                return None
+            self.progression = progression
+            if time.time() - derniere > self.delai:
+                # Nouveau tableau : le thread principal peut lire `positions` à tout moment.
+                self.positions = normaliser(self._positions)
+                derniere = time.time()
+        self.positions = normaliser(self._positions)
+        self.duree = time.time() - debut
+        return self.positions
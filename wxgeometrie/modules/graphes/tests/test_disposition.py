@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+import numpy
+
+from wxgeometrie.mathlib.graphes import Graph
+from wxgeometrie.modules.graphes.disposition import (aretes, repulsion_exacte,
+                        repulsion_barnes_hut, disposition, positions_initiales,
+                        CalculDisposition)
+
+import tools.unittest
+
+class ModulesGraphesTest(tools.unittest.TestCase):
+    def test_aretes(self):
+        g = Graph("A>(A,B,B,C), B>(A,A,C), C>(A,B), D")
+        sommets, sources, cibles = aretes(g)
+        self.assertEqual(sommets, ['A', 'B', 'C', 'D'])
+        # Arêtes multiples et boucles ignorées.
+        self.assertEqual(sorted(zip(sources.tolist(), cibles.tolist())),
+                         [(0, 1), (0, 2), (1, 2)])
+
+    def test_repulsion_barnes_hut(self):
+        positions = positions_initiales(2000, graine=3)
+        k2 = 1/2000
+        exactes = repulsion_exacte(positions, k2, taille_bloc=10000)
+        approchees = repulsion_barnes_hut(positions, k2)
+        erreurs = (numpy.sqrt(((approchees - exactes)**2).sum(axis=1))
+                   /numpy.sqrt((exactes**2).sum(axis=1)))
+        self.assertLess(numpy.median(erreurs), .02)
+        # Sans approximation, on retrouve les forces exactes.
+        self.assertTrue(numpy.allclose(repulsion_barnes_hut(positions, k2, theta=0), exactes))
+        self.assertEqual(repulsion_barnes_hut(positions[:1], k2).tolist(), [[0, 0]])
+
+    def test_disposition(self):
+        # Deux triangles reliés par une arête.
+        g = Graph("A>(B,C), B>(A,C), C>(A,B,D), D>(C,E,F), E>(D,F), F>(D,E)")
+        sommets, positions = disposition(g)
+        self.assertEqual(sommets, list('ABCDEF'))
+        self.assertEqual(positions.shape, (6, 2))
+        self.assertTrue(((positions >= -1e-12) & (positions <= 1 + 1e-12)).all())
+        distance = dict((s, p) for s, p in zip(sommets, positions))
+        def d(s, t):
+            return numpy.hypot(*(distance[s] - distance[t]))
+        # Les sommets voisins sont plus proches.
+        self.assertLess(d('A', 'B'), d('A', 'F'))
+        self.assertLess(d('E', 'F'), d('B', 'E'))
+        # Le calcul est reproductible.
+        self.assertTrue(numpy.array_equal(disposition(g)[1], positions))
+        # Même résultat avec Barnes & Hut (peu de sommets).
+        self.assertEqual(disposition(g, barnes_hut=True)[1].shape, (6, 2))
+
+    def test_CalculDisposition(self):
+        g = Graph("A>(B), B>(A,C), C>(B)")
+        calcul = CalculDisposition(g, iterations=20)
+        self.assertFalse(calcul.terminee)
+        positions = calcul.executer()
+        self.assertTrue(calcul.terminee)
+        self.assertEqual(calcul.progression, 1)
+        self.assertIs(positions, calcul.positions)
+        self.assertTrue(numpy.array_equal(positions, disposition(g, iterations=20)[1]))
+        calcul = CalculDisposition(g)
+        calcul.annuler()
+        self.assertIs(calcul.executer(), None)
+        self.assertTrue(calcul.terminee)
+        calcul = CalculDisposition(g)
+        calcul.lancer().join()
+        self.assertTrue(calcul.terminee)
+        self.assertIs(calcul.erreur, None)
+        # En cas d'erreur, celle-ci est renseignée avant que le calcul
+        # ne soit signalé comme terminé.
+        calcul = CalculDisposition(g)
+        calcul._positions = None
+        self.assertRaises(Exception, calcul.executer)
+        self.assertIsNotNone(calcul.erreur)
+        self.assertTrue(calcul.terminee)
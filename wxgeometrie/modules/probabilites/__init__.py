@@ -24,17 +24,39 @@
 import re
 
 from PyQt5.QtWidgets import QVBoxLayout, QLabel, QPushButton, QHBoxLayout,\
-    QMessageBox, QTextEdit
+    QMessageBox, QTextEdit, QDialog, QInputDialog, QLineEdit
 
 from wxgeometrie.GUI.menu import MenuBar
 from wxgeometrie.GUI.panel import Panel_API_graphique
 from wxgeometrie.GUI.proprietes_objets import Proprietes
 from wxgeometrie.geolib import Segment, Texte, Point
 from wxgeometrie import param
-from .repetition import DialogRepetition, repetition_experiences
+from .repetition import repetition_experiences
+from .repetition_ui import Ui_DialogRepetition
+from .arbre import parse_text
+from .calcul import probabilite
 from wxgeometrie.mathlib.parsers import VAR
 
 
+class DialogRepetition(QDialog, Ui_DialogRepetition):
+    def __init__(self, parent):
+        QDialog.__init__(self, parent)
+
+        # Set up the user interface from Designer.
+        self.setupUi(self)
+
+    def accept(self):
+        n = self.niveaux.value()
+        num = self.numeroter.isChecked()
+        evts = [evt.strip() for evt in self.evenements.text().split(';')]
+        probas = [proba.strip() for proba in self.probas.text().split(';')]
+
+        code = repetition_experiences(n, num, evts, probas)
+        self.parent().instructions.setPlainText(code)
+        self.parent().appliquer.click()
+
+
+
 class ProbaMenuBar(MenuBar):
     def __init__(self, panel):
         MenuBar.__init__(self, panel)
@@ -55,7 +77,10 @@ class ProbaMenuBar(MenuBar):
         self.ajouter("Autres actions", ["detecter"],
                                    ["Répétition d'expériences indépendantes",
                                     "Construire un arbre correspondant à la répétition d'expériences aléatoires indépendantes.",
-                                    None, self.panel.repeter_experiences_independantes])
+                                    None, self.panel.repeter_experiences_independantes],
+                                   ["Calculer une probabilité",
+                                    "Calculer la probabilité d'un évènement à partir de l'arbre. Ex: A_2, A inter B, A >= 2",
+                                    None, self.panel.calculer_probabilite])
         self.ajouter("Outils", ["Style des sommets", "Modifier le style des sommets de l'arbre.",
                                  None, self.panel.proprietes_sommets],
                                 ["Style des arêtes", "Modifier le style des arêtes de l'arbre.",
@@ -103,6 +128,9 @@ omega
         self.sizer = QHBoxLayout()
         self.sizer.addWidget(self.canvas, 1)
         self.sizer.addLayout(self.entrees, 0)
+        # Feuille et arêtes d'un arbre trop grand pour être construit
+        # avec des objets géométriques (voir `Appliquer()`).
+        self._arbre_simplifie = None
         self.finaliser(contenu=self.sizer)
 
 
@@ -115,183 +143,100 @@ omega
         Panel_API_graphique._ouvrir(self, fgeo)
         if "Instructions" in fgeo.contenu:
             self.instructions.setPlainText(fgeo.contenu["Instructions"][0])
+            try:
+                arbre = parse_text(fgeo.contenu["Instructions"][0])
+            except ValueError:
+                return
+            if len(arbre) > self.param('nbr_max_sommets'):
+                # Les arêtes des grands arbres ne sont pas enregistrées.
+                self._arbre_simplifie = (self.feuille_actuelle, arbre.segments())
 
 
-    def Appliquer(self, event):
+    def Appliquer(self, event=None):
         with self.canvas.geler_affichage(actualiser=True, sablier=True):
             self.creer_feuille()
-            instructions = [instruction for instruction in self.instructions.toPlainText().split("\n") if instruction.strip()]
-            nbr_colonnes = 0
-            if instructions[0].startswith("|"):
-                legende = instructions[0]
-                instructions = instructions[1:]
+            self._arbre_simplifie = None
+            try:
+                arbre = parse_text(self.instructions.toPlainText())
+            except ValueError as e:
+                QMessageBox.warning(self, "Code incorrect", str(e))
+                return
+            if arbre.legende is not None:
                 self.canvas.fenetre = -.1, 1.1, -.1, 1.2
             else:
-                legende = None
                 self.canvas.fenetre = -.1, 1.1, -.1, 1.1
-
-            # Répétition d'expériences aléatoires indépendantes
-            #
-            # Ex:
-            # >> A:  1/3
-            # >> &A: 2/3
-            #
-            # équivaut à:
-            #
-            # > A_1:   1/3
-            # >> A_2:  1/3
-            # >> &A_2: 2/3
-            # > &A_1:  2/3
-            # >> A_2:  1/3
-            # >> &A_2: 2/3
-            if instructions[0].startswith('>>'):
-                profondeur = len(instructions[0]) - len(instructions[0].lstrip('>'))
-                evenements = {}
-                for instruction in instructions:
-                    assert instruction.startswith(profondeur*'>')
-                    nom, proba = instruction[profondeur:].split(':')
-                    evenements[nom.strip()] = proba.strip()
-                instructions = repetition_experiences(_profondeur=profondeur, _numeroter=True, **evenements).split('\n')
-
-            for instruction in instructions:
-                if instruction.startswith(">"):
-                    nbr_colonnes = max(nbr_colonnes, len(instruction) - len(instruction.lstrip(">")))
-            if instructions[0].startswith(">"):
-                instructions = [""] + instructions
-            nbr_colonnes += 1
-            nbr_lignes = []
-            for i in range(nbr_colonnes):
-                nbr_lignes.append(len([instruction for instruction in instructions if instruction.startswith(i*">") and not instruction.startswith((i+1)*">")]))
-
-            #intersection, union : \cap \cup
-
-            # Interprétation des instructions sous forme de listes de listes
-            # >A
-            # >>B
-            # >>C
-            # >D
-            # >>E
-            # >>>F
-            # >>>G
-            # >>H
-            # >E
-            # devient :
-            # [{'liste': [{'liste': [{'liste': [], 'texte': u'B'}, {'liste': [], 'texte': u'C'}], 'texte': u'A'}, {'liste': [{'liste': [{'liste': [], 'texte': u'F'}, {'liste': [], 'texte': u'G'}], 'texte': u'E'}, {'liste': [], 'texte': u'H'}], 'texte': u'D'}, {'liste': [], 'texte': u'E'}], 'texte': ''}]
-
-            arbre = []
-            ligne_precedente = [-1 for i in range(nbr_colonnes)] # numéro de ligne atteint pour chaque colonne
-            for instruction in instructions:
-                colonne = len(instruction) - len(instruction.lstrip(">"))
-                branche = arbre
-                for i in range(colonne): # on se déplace de branche en branche ;)
-                    branche = branche[ligne_precedente[i]]["liste"]
-                branche.append({"texte": instruction.lstrip(">"), "liste": []})
-                ligne_precedente[colonne] += 1
-                for i in range(colonne + 1, nbr_colonnes):
-                    ligne_precedente[i] = -1
-            print(arbre)
-
-            # on parcourt l'arbre pour compter le nombre de ramifications
-
-            def compter_ramifications(branche):
-                if len(branche["liste"]) > 0:
-                    return sum(compter_ramifications(tige) for tige in branche["liste"])
-                else:
-                    return 1
-
-            ramifications = sum(compter_ramifications(branche) for branche in arbre)
             if param.debug:
-                print("Nombre de ramifications: " + str(ramifications))
-
-            def formater_texte(texte):
-                if texte:
-                    if texte.startswith("&"):
-                        texte = r"\overline{" + texte[1:] + "}"
-                    texte = texte.replace("&", r"\overline ")
-                    # P(\overline A) -> P(\overline{A})
-                    texte = re.sub("(\\\\overline)[ ]+(%s)" % VAR, lambda m:'%s{%s}' % (m.group(1), m.group(2)), texte)
-                    texte = "$" + texte + "$" if texte[0] != '$' else texte
-                    if param.latex:
-                        texte = "$" + texte + "$" # passage en mode "display" de LaTeX
-                    texte = texte.replace(" inter ", r"\  \cap \ ").replace(" union ", r"\  \cup \ ").replace("Omega", r"\Omega").replace("omega", r"\Omega")
-                    if param.latex: # on remplace les fractions. Ex: "1/15" -> "\frac{1}{15}"
-                        texte = re.sub("[0-9]+/[0-9]+",lambda s:"\\frac{" + s.group().replace("/", "}{") + "}", texte)
-                return texte
-
-
-            def creer_point(x, y, texte):
-                texte = formater_texte(texte)
-                M = Point(x, y, style = "o", couleur = "w", taille = 0)
-                M.label(texte)
-                M.etiquette.style(_rayon_=0, niveau=15, alignement_vertical="center",
-                                  alignement_horizontal="center", fond=True,
-                                  couleur_fond="w")
-                return M
-
-
-            def creer_segment(point1, point2, texte):
-                texte = formater_texte(texte)
-                s = Segment(point1, point2)
-                s.label(texte)
-                style = {'_rayon_': 0, 'niveau': 15}
-                placement = self.param('placement_probabilites')
-                if placement == 'dessus':
-                    style.update(alignement_vertical='center', couleur_fond='w',
-                                 fond=True, alignement_horizontal='center',
-                                 angle=0)
-                elif placement == 'longe':
-                    style.update(alignement_vertical='auto', fond=False,
-                                 alignement_horizontal='center', angle='auto')
-                elif placement == 'decale':
-                    style.update(alignement_vertical='auto', fond=False,
-                                 alignement_horizontal='right', angle=0)
-                else:
-                    print("Placement: mode '%s' non reconnu." % placement)
-                s.etiquette.style(**style)
-                return s
-
-            ramification = [0] # astuce pour avoir un "objet modifiable" (a mutable object)
-            def parcourir_branche(branche, n, ramification = ramification):
-                txt = branche["texte"].rsplit(":", 1)
-                if len(txt) == 2:
-                    txt_pt, txt_segm = txt
-                else:
-                    txt_pt = txt[0]
-                    txt_segm = ""
-                if len(branche["liste"]) > 0:
-                    l = []
-                    for tige in branche["liste"]:
-                        l.append(parcourir_branche(tige, n + 1))
-
-                    M = creer_point(n/(nbr_colonnes - 1), .5*(l[0][0].ordonnee+l[-1][0].ordonnee), txt_pt)
-                    self.feuille_actuelle.objets.add(M)
-                    for point, txt_s in l:
-                        s = creer_segment(M, point, txt_s)
-                        self.feuille_actuelle.objets.add(s)
-                    return M, txt_segm
-                else:
-                    if ramifications > 1:
-                        y = 1 - ramification[0]/(ramifications - 1)
+                print("Nombre de ramifications: " + str(len(arbre.feuilles())))
+                print("Somme des probabilités des feuilles: " + str(arbre.probabilite_feuilles()))
+
+            xs, ys = arbre.disposition()
+
+            if len(arbre) > self.param('nbr_max_sommets'):
+                # Arbre de grande taille : les arêtes sont dessinées en une seule
+                # fois (cf. `_affiche()`), sans créer d'objets géométriques.
+                self._arbre_simplifie = (self.feuille_actuelle, arbre.segments(xs, ys))
+            else:
+                #intersection, union : \cap \cup
+                def formater_texte(texte):
+                    if texte:
+                        if texte.startswith("&"):
+                            texte = r"\overline{" + texte[1:] + "}"
+                        texte = texte.replace("&", r"\overline ")
+                        # P(\overline A) -> P(\overline{A})
+                        texte = re.sub("(\\\\overline)[ ]+(%s)" % VAR, lambda m:'%s{%s}' % (m.group(1), m.group(2)), texte)
+                        texte = "$" + texte + "$" if texte[0] != '$' else texte
+                        if param.latex:
+                            texte = "$" + texte + "$" # passage en mode "display" de LaTeX
+                        texte = texte.replace(" inter ", r"\  \cap \ ").replace(" union ", r"\  \cup \ ").replace("Omega", r"\Omega").replace("omega", r"\Omega")
+                        if param.latex: # on remplace les fractions. Ex: "1/15" -> "\frac{1}{15}"
+                            texte = re.sub("[0-9]+/[0-9]+",lambda s:"\\frac{" + s.group().replace("/", "}{") + "}", texte)
+                    return texte
+
+
+                def creer_point(x, y, texte):
+                    texte = formater_texte(texte)
+                    M = Point(x, y, style = "o", couleur = "w", taille = 0)
+                    M.label(texte)
+                    M.etiquette.style(_rayon_=0, niveau=15, alignement_vertical="center",
+                                      alignement_horizontal="center", fond=True,
+                                      couleur_fond="w")
+                    return M
+
+
+                def creer_segment(point1, point2, texte):
+                    texte = formater_texte(texte)
+                    s = Segment(point1, point2)
+                    s.label(texte)
+                    style = {'_rayon_': 0, 'niveau': 15}
+                    placement = self.param('placement_probabilites')
+                    if placement == 'dessus':
+                        style.update(alignement_vertical='center', couleur_fond='w',
+                                     fond=True, alignement_horizontal='center',
+                                     angle=0)
+                    elif placement == 'longe':
+                        style.update(alignement_vertical='auto', fond=False,
+                                     alignement_horizontal='center', angle='auto')
+                    elif placement == 'decale':
+                        style.update(alignement_vertical='auto', fond=False,
+                                     alignement_horizontal='right', angle=0)
                     else:
-                        y = .5
-                    M = creer_point(n/(nbr_colonnes - 1), y, txt_pt)
-                    ramification[0] += 1
+                        print("Placement: mode '%s' non reconnu." % placement)
+                    s.etiquette.style(**style)
+                    return s
+
+                # Les sommets sont créés dans l'ordre du parcours en profondeur,
+                # chaque parent étant créé avant ses enfants.
+                points = []
+                for x, y, nom, proba, parent in zip(xs, ys, arbre.noms, arbre.probas, arbre.parents):
+                    M = creer_point(x, y, nom)
                     self.feuille_actuelle.objets.add(M)
-                    return M, txt_segm
-
-            for branche in arbre:
-                parcourir_branche(branche, 0)
-
-            if legende is not None:
-                decalage = -0.5
-                for i in legende:
-                    if i != "|":
-                        break
-                    decalage += .5
-                legende = legende.strip("|").split("|")
-                for n in range(len(legende)):
-                    t = Texte(legende[n], (n + decalage)/(nbr_colonnes - 1), 1.1)
-                    self.feuille_actuelle.objets.add(t)
+                    points.append(M)
+                    if parent >= 0:
+                        self.feuille_actuelle.objets.add(creer_segment(points[parent], M, proba))
+
+            for titre, x in arbre.titres():
+                t = Texte(titre, x, 1.1)
+                self.feuille_actuelle.objets.add(t)
 
             self.feuille_actuelle.interprete.commande_executee()
 
@@ -330,8 +275,34 @@ omega
         dlg = DialogRepetition(self)
         dlg.show()
 
+    def probabilite(self, evenement, exact=True):
+        """Probabilité d'un évènement, d'après l'arbre décrit dans les instructions.
+
+        Exemples : self.probabilite("A_2"), self.probabilite("A inter B"),
+        self.probabilite("A >= 2") (nombre de réalisations de A le long du chemin).
+        Voir le module `calcul` pour plus de détails."""
+        return probabilite(self.instructions.toPlainText(), evenement, exact=exact)
+
+    def calculer_probabilite(self, event=None):
+        evenement, ok = QInputDialog.getText(self, "Calculer une probabilité",
+                    "Évènement (ex: A_2, A inter B, A >= 2) :", QLineEdit.Normal, "")
+        if not ok or not evenement.strip():
+            return
+        try:
+            resultat = self.probabilite(evenement)
+        except (ValueError, TypeError) as e:
+            QMessageBox.warning(self, "Calcul impossible", str(e))
+            return
+        message = "P(%s) = %s" % (evenement.strip(), resultat)
+        if resultat.is_number and not resultat.is_Integer:
+            message += " ≈ " + format(float(resultat), '.6g')
+        QMessageBox.information(self, "Probabilité", message)
+
     def _affiche(self):
-        pass
+        if self._arbre_simplifie is not None:
+            feuille, segments = self._arbre_simplifie
+            if feuille is self.feuille_actuelle:
+                self.canvas.dessiner_lignes(segments, colors='k', linewidths=.5)
 
     def assistant(self, event = None, liste = None):
         """Crée un arbre en supposant les évènements de la liste tous indépendants entre eux.
@@ -3,3 +3,5 @@
 afficher_axes = False
 afficher_quadrillage = False
 placement_probabilites = ['dessus', 'longe', 'decale'][1]
+# Au-delà, l'arbre est dessiné sans étiquettes ni objets géométriques.
+nbr_max_sommets = 500
@@ -1,200 +1,236 @@
 # -*- coding: utf-8 -*-
-from .repetition import repetition_experiences
 
-# TODO: sortir DialogRepetition de repetition_experiences.py -> __init__.py
-# pour que repetition_experiences.py n'importe plus pyQt (risque de ralentir l'import pour ptyx !)
-
-def parse_text(text):
-    """Describe drawing.
-
-    Coordinates are expressed as percentages of picture dimensions.
-    Return a dict containing 2 lists:
-     * one for points: [(text, x, y), ...]
-     * one for lines: [(text, xy1, xy2), ...]
+##--------------------------------------#######
+#           Arbres de probabilités            #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Lecture et disposition des arbres de probabilités.
+
+Les sommets de l'arbre sont stockés dans l'ordre du parcours en profondeur,
+sous forme de listes parallèles (nom, probabilité de l'arête menant
+au sommet, niveau, parent...).
+La lecture du code, la disposition des sommets et le calcul
+des probabilités des chemins se font ainsi en temps linéaire.
+"""
+
+from itertools import chain
+
+from .repetition import lignes_repetition
+
+
+def _evaluer(texte):
+    """Valeur approchée d'une probabilité saisie (ex: "0,3", "1/6").
+
+    Retourne `nan` si la probabilité n'est pas précisée ou pas numérique."""
+    texte = texte.strip().replace(',', '.')
+    try:
+        if '/' in texte:
+            numerateur, denominateur = texte.split('/')
+            return float(numerateur)/float(denominateur)
+        return float(texte)
+    except (ValueError, ZeroDivisionError):
+        return float('nan')
+
+
+def _niveau(ligne):
+    return len(ligne) - len(ligne.lstrip('>'))
+
+
+class Arbre(object):
+    """Arbre de probabilités.
+
+    Le sommet n°i a pour nom `noms[i]`, et est relié à son parent `parents[i]`
+    (-1 pour une racine) par une arête de probabilité `probas[i]` (texte).
+    `poids[i]` est la probabilité (approchée) du chemin menant au sommet,
+    calculée au fur et à mesure de la construction (`nan` si elle est inconnue).
     """
-    lines = [l for l in text.split("\n") if l.strip()]
 
-    if not lines:
-        return {'points': [], 'lines': []}
+    def __init__(self, legende=None):
+        self.legende = legende
+        self.noms = []
+        self.probas = []
+        self.niveaux = []
+        self.parents = []
+        self.nbr_enfants = []
+        self.poids = []
+
+    def __len__(self):
+        return len(self.noms)
+
+    def ajouter(self, nom, proba='', parent=-1):
+        "Ajoute un sommet (après tous ses prédécesseurs), et retourne son numéro."
+        if parent >= 0:
+            self.niveaux.append(self.niveaux[parent] + 1)
+            self.nbr_enfants[parent] += 1
+            self.poids.append(self.poids[parent]*_evaluer(proba))
+        else:
+            self.niveaux.append(0)
+            self.poids.append(1.)
+        self.noms.append(nom)
+        self.probas.append(proba)
+        self.parents.append(parent)
+        self.nbr_enfants.append(0)
+        return len(self.noms) - 1
+
+    @property
+    def nbr_colonnes(self):
+        return 1 + max(self.niveaux, default=0)
+
+    def feuilles(self):
+        "Numéros des feuilles, de haut en bas."
+        return [i for i, n in enumerate(self.nbr_enfants) if not n]
+
+    def probabilite_feuilles(self):
+        "Somme des probabilités des feuilles (1 pour un arbre complet)."
+        return sum(self.poids[i] for i in self.feuilles())
+
+    def disposition(self):
+        """Coordonnées des sommets, exprimées en proportion de la taille du dessin.
+
+        Les feuilles sont réparties régulièrement de haut en bas, et chaque
+        sommet est placé à mi-hauteur entre son premier et son dernier enfant.
+        Retourne la liste des abscisses et celle des ordonnées."""
+        n = len(self)
+        colonnes = (self.nbr_colonnes - 1) or 1
+        xs = [niveau/colonnes for niveau in self.niveaux]
+        ys = n*[None]
+        ramifications = self.nbr_enfants.count(0)
+        k = 0
+        for i, enfants in enumerate(self.nbr_enfants):
+            if not enfants:
+                ys[i] = (1 - k/(ramifications - 1) if ramifications > 1 else .5)
+                k += 1
+        # Les enfants suivant toujours leur parent, un parcours à rebours
+        # permet de placer chaque sommet après tous ses enfants.
+        premier = n*[None]
+        dernier = n*[None]
+        for i in range(n - 1, -1, -1):
+            if ys[i] is None:
+                ys[i] = .5*(premier[i] + dernier[i])
+            parent = self.parents[i]
+            if parent >= 0:
+                if dernier[parent] is None:
+                    dernier[parent] = ys[i]
+                premier[parent] = ys[i]
+        return xs, ys
+
+    def segments(self, xs=None, ys=None):
+        "Liste des arêtes, sous la forme [(x0, y0), (x1, y1)]."
+        if xs is None:
+            xs, ys = self.disposition()
+        return [[(xs[parent], ys[parent]), (xs[i], ys[i])]
+                for i, parent in enumerate(self.parents) if parent >= 0]
+
+    def titres(self):
+        "Titres de la légende, et leurs abscisses : [(titre, x), ...]."
+        if self.legende is None:
+            return []
+        decalage = -0.5
+        for caractere in self.legende:
+            if caractere != "|":
+                break
+            decalage += .5
+        colonnes = (self.nbr_colonnes - 1) or 1
+        return [(titre, (n + decalage)/colonnes)
+                for n, titre in enumerate(self.legende.strip("|").split("|"))]
+
+
+def lire_repetition(lignes):
+    """Lit le code abrégé d'une répétition d'expériences indépendantes
+    (la légende éventuelle ayant été retirée).
+
+    Retourne (nombre de répétitions, évènements, probabilités), ou None
+    si la 1re ligne ne commence pas par '>>'."""
+    if not lignes or not lignes[0].startswith('>>'):
+        return None
+    profondeur = _niveau(lignes[0])
+    evts = []
+    probas = []
+    for ligne in lignes:
+        if _niveau(ligne) != profondeur:
+            raise ValueError("Ligne '%s' : %s chevrons attendus." % (ligne, profondeur))
+        nom, _, proba = ligne[profondeur:].partition(':')
+        evts.append(nom.strip())
+        probas.append(proba.strip())
+    return profondeur, evts, probas
 
-    if lines[0].startswith("|"):
-        legende = lines.pop(0)
-        # On réserve de la place pour la légence
-        ymax = 90
-    else:
-        legende = None
-        ymax = 100
 
-    if not lines:
-        return {'points': [], 'lines': []}
+def parse_text(text):
+    """Lit le code décrivant un arbre de probabilités, et retourne un `Arbre`.
+
+    Exemple :
+    ||Tirage 1|Tirage 2
+    omega
+    >A:0,7
+    >>B:0,2
+    >>C:0,8
+    >&A:0,3
+
+    La 1re ligne (facultative) est la légende.
+    Si la 1re ligne commence par '>>', il s'agit de la répétition
+    d'expériences aléatoires indépendantes. Ex:
+    >> A:  1/3
+    >> &A: 2/3
+    équivaut à:
+    > A_1:   1/3
+    >> A_2:  1/3
+    >> &A_2: 2/3
+    > &A_1:  2/3
+    >> A_2:  1/3
+    >> &A_2: 2/3
+
+    Lève une `ValueError` si le code est incorrect.
+    """
+    lignes = [ligne for ligne in text.split("\n") if ligne.strip()]
+    arbre = Arbre()
+    if lignes and lignes[0].startswith("|"):
+        arbre.legende = lignes.pop(0)
+    if not lignes:
+        return arbre
 
     # Répétition d'expériences aléatoires indépendantes
-    #
-    # Ex:
-    # >> A:  1/3
-    # >> &A: 2/3
-    #
-    # équivaut à:
-    #
-    # > A_1:   1/3
-    # >> A_2:  1/3
-    # >> &A_2: 2/3
-    # > &A_1:  2/3
-    # >> A_2:  1/3
-    # >> &A_2: 2/3
-
-    if lines[0].startswith('>>'):
-        profondeur = len(lines[0]) - len(lines[0].lstrip('>'))
-        evenements = {}
-        for line in lines:
-            assert line.startswith(profondeur*'>')
-            nom, proba = line[profondeur:].split(':')
-            evenements[nom.strip()] = proba.strip()
-        lines = repetition_experiences(_profondeur=profondeur, _numeroter=True, **evenements).split('\n')
+    repetition = lire_repetition(lignes)
+    if repetition is not None:
+        lignes = lignes_repetition(repetition[0], True, *repetition[1:])
 
     # La 1re ligne doit correspondre au 1er embranchement, c'est-à-dire à l'univers (Omega en général).
     # À défaut, on met un ligne vide (pas de nom au 1er embranchement donc).
-    if lines[0].startswith(">"):
-        lines = [""] + lines
-
-    depths = [len(line) - len(line.lstrip(">")) for line in lines]
-
-    nbr_colonnes = 1 + max(depths, default=0)
-
-    # Nbr de lignes pour chaque colonne.
-    nbr_lignes = []
-
-    for i in xrange(nbr_colonnes):
-        nbr_lignes.append(depths.count(i))
-
-    #intersection, union : \cap \cup
-
-    # Interprétation des lines sous forme de listes de listes
-    # >A
-    # >>B
-    # >>C
-    # >D
-    # >>E
-    # >>>F
-    # >>>G
-    # >>H
-    # >E
-    # devient :
-    # [{'liste': [{'liste': [{'liste': [], 'texte': u'B'}, {'liste': [], 'texte': u'C'}], 'texte': u'A'}, {'liste': [{'liste': [{'liste': [], 'texte': u'F'}, {'liste': [], 'texte': u'G'}], 'texte': u'E'}, {'liste': [], 'texte': u'H'}], 'texte': u'D'}, {'liste': [], 'texte': u'E'}], 'texte': ''}]
-
-    arbre = []
-    ligne_precedente = [-1 for i in xrange(nbr_colonnes)] # numéro de ligne atteint pour chaque colonne
-    for line in lines:
-        colonne = len(line) - len(line.lstrip(">"))
-        branche = arbre
-        for i in xrange(colonne): # on se déplace de branche en branche ;)
-            branche = branche[ligne_precedente[i]]["liste"]
-        branche.append({"texte": line.lstrip(">"), "liste": []})
-        ligne_precedente[colonne] += 1
-        for i in xrange(colonne + 1, nbr_colonnes):
-            ligne_precedente[i] = -1
-    print (arbre)
-
-    # on parcourt l'arbre pour compter le nombre de ramifications
-
-    def compter_ramifications(branche):
-        if len(branche["liste"]) > 0:
-            return sum(compter_ramifications(tige) for tige in branche["liste"])
-        else:
-            return 1
-
-    ramifications = sum(compter_ramifications(branche) for branche in arbre)
-    if param.debug:
-        print("Nombre de ramifications: " + str(ramifications))
-
-    def formater_texte(texte):
-        if texte:
-            if texte.startswith("&"):
-                texte = r"\overline{" + texte[1:] + "}"
-            texte = texte.replace("&", r"\overline ")
-            # P(\overline A) -> P(\overline{A})
-            texte = re.sub("(\\\\overline)[ ]+(%s)" % VAR, lambda m:'%s{%s}' % (m.group(1), m.group(2)), texte)
-            texte = "$" + texte + "$" if texte[0] != '$' else texte
-            if param.latex:
-                texte = "$" + texte + "$" # passage en mode "display" de LaTeX
-            texte = texte.replace(" inter ", r"\  \cap \ ").replace(" union ", r"\  \cup \ ").replace("Omega", r"\Omega").replace("omega", r"\Omega")
-            if param.latex: # on remplace les fractions. Ex: "1/15" -> "\frac{1}{15}"
-                texte = re.sub("[0-9]+/[0-9]+",lambda s:"\\frac{" + s.group().replace("/", "}{") + "}", texte)
-        return texte
-
-
-    def creer_point(x, y, texte):
-        texte = formater_texte(texte)
-        M = Point(x, y, style = "o", couleur = "w", taille = 0)
-        M.label(texte)
-        M.etiquette.style(_rayon_=0, niveau=15, alignement_vertical="center",
-                          alignement_horizontal="center", fond=True,
-                          couleur_fond="w")
-        return M
-
-
-    def creer_segment(point1, point2, texte):
-        texte = formater_texte(texte)
-        s = Segment(point1, point2)
-        s.label(texte)
-        style = {'_rayon_': 0, 'niveau': 15}
-        placement = self.param('placement_probabilites')
-        if placement == 'dessus':
-            style.update(alignement_vertical='center', couleur_fond='w',
-                         fond=True, alignement_horizontal='center',
-                         angle=0)
-        elif placement == 'longe':
-            style.update(alignement_vertical='auto', fond=False,
-                         alignement_horizontal='center', angle='auto')
-        elif placement == 'decale':
-            style.update(alignement_vertical='auto', fond=False,
-                         alignement_horizontal='right', angle=0)
-        else:
-            print(u"Placement: mode '%s' non reconnu." % placement)
-        s.etiquette.style(**style)
-        return s
-
-    ramification = [0] # astuce pour avoir un "objet modifiable" (a mutable object)
-    def parcourir_branche(branche, n, ramification = ramification):
-        txt = branche["texte"].rsplit(":", 1)
-        if len(txt) == 2:
-            txt_pt, txt_segm = txt
-        else:
-            txt_pt = txt[0]
-            txt_segm = ""
-        if len(branche["liste"]) > 0:
-            l = []
-            for tige in branche["liste"]:
-                l.append(parcourir_branche(tige, n + 1))
-
-            M = creer_point(n/(nbr_colonnes - 1), .5*(l[0][0].ordonnee+l[-1][0].ordonnee), txt_pt)
-            self.feuille_actuelle.objets.add(M)
-            for point, txt_s in l:
-                s = creer_segment(M, point, txt_s)
-                self.feuille_actuelle.objets.add(s)
-            return M, txt_segm
+    lignes = iter(lignes)
+    premiere = next(lignes)
+    if premiere.startswith(">"):
+        lignes = chain([premiere], lignes)
+        premiere = ''
+    lignes = chain([premiere], lignes)
+
+    # derniers[n] : numéro du dernier sommet rencontré de niveau n.
+    derniers = []
+    for ligne in lignes:
+        niveau = _niveau(ligne)
+        if niveau > len(derniers):
+            raise ValueError("Ligne '%s' : niveau %s inattendu." % (ligne, niveau))
+        del derniers[niveau:]
+        texte = ligne[niveau:]
+        if ':' in texte:
+            nom, proba = texte.rsplit(':', 1)
         else:
-            if ramifications > 1:
-                y = 1 - ramification[0]/(ramifications - 1)
-            else:
-                y = .5
-            M = creer_point(n/(nbr_colonnes - 1), y, txt_pt)
-            ramification[0] += 1
-            self.feuille_actuelle.objets.add(M)
-            return M, txt_segm
-
-    for branche in arbre:
-        parcourir_branche(branche, 0)
-
-    if legende is not None:
-        decalage = -0.5
-        for i in legende:
-            if i != "|":
-                break
-            decalage += .5
-        legende = legende.strip("|").split("|")
-        for n in xrange(len(legende)):
-            t = Texte(legende[n], (n + decalage)/(nbr_colonnes - 1), 1.1)
-            self.feuille_actuelle.objets.add(t)
-
-    self.feuille_actuelle.interprete.commande_executee()
+            nom, proba = texte, ''
+        derniers.append(arbre.ajouter(nom.strip(), proba.strip(),
+                                      (derniers[-1] if derniers else -1)))
+    return arbre
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#        Calculs sur les arbres               #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Calcul des probabilités à partir d'un arbre de probabilités.
+
+Les probabilités des feuilles sont calculées en un seul parcours de l'arbre,
+de manière exacte (fractions, ou expressions sympy si les probabilités
+sont littérales, ex: "p" et "1-p"), ou approchée (`exact=False`).
+
+Un évènement peut être décrit par :
+- le nom d'un évènement figurant sur l'arbre (ex: "A_2"), ou une combinaison
+  de noms avec " inter " et " union " ;
+- une condition sur le nombre de réalisations d'un évènement le long
+  du chemin, sans tenir compte de la numérotation (ex: "A >= 2" compte
+  les sommets A_1, A_2, A_3...) ;
+- une fonction, appelée pour chaque feuille avec la liste des noms des
+  sommets du chemin (racine exclue), et qui retourne True ou False.
+
+Pour la répétition d'expériences indépendantes (code commençant par '>>'),
+les conditions portant sur le nombre de réalisations sont évaluées à l'aide
+des coefficients binomiaux (multinomiaux s'il y a plus de deux issues),
+sans construire les n^k feuilles de l'arbre.
+
+Exemple (dans un script) :
+>>> from wxgeometrie.modules.probabilites.calcul import probabilite
+>>> probabilite(">>A:1/3\\n>>&A:2/3\\n", "A = 1")
+4/9
+"""
+
+from fractions import Fraction
+import math
+import operator
+import re
+
+from sympy import S, binomial
+from sympy.core.sympify import SympifyError
+
+from .arbre import Arbre, parse_text, lire_repetition, _evaluer
+from .repetition import completer_evenements
+
+
+_comparaisons = {'=': operator.eq, '==': operator.eq, '!=': operator.ne,
+                 '<': operator.lt, '<=': operator.le, '>': operator.gt,
+                 '>=': operator.ge}
+
+_condition = re.compile(r'^\s*(&?[^<>=!\s]+)\s*(==|=|!=|<=|>=|<|>)\s*(\d+)\s*$')
+
+_numero = re.compile(r'_\d+$')
+
+
+def _coefficient(n, k):
+    "Coefficient binomial (entier python)."
+    return (math.comb(n, k) if hasattr(math, 'comb') else int(binomial(n, k)))
+
+
+def _valeur_exacte(texte):
+    """Valeur exacte d'une probabilité saisie (ex: "0,3", "1/6", "1-p").
+
+    Retourne une fraction, ou une expression sympy pour les probabilités littérales."""
+    texte = texte.strip().replace(',', '.')
+    try:
+        return Fraction(texte)
+    except (ValueError, ZeroDivisionError):
+        pass
+    try:
+        return S(texte)
+    except SympifyError:
+        raise ValueError("Probabilité incorrecte : '%s'." % texte)
+
+
+def _resultat(valeur, exact):
+    if exact:
+        # Conversion des fractions en rationnels sympy (affichage, calculs ultérieurs).
+        return S(valeur)
+    return float(valeur)
+
+
+def _arbre(arbre):
+    return (arbre if isinstance(arbre, Arbre) else parse_text(arbre))
+
+
+def _valeurs_aretes(arbre, exact):
+    """Probabilités des arêtes de l'arbre.
+
+    Si la probabilité d'une seule des branches issues d'un sommet n'est
+    pas précisée, elle est déduite des autres (leur somme vaut 1)."""
+    valeur = (_valeur_exacte if exact else _evaluer)
+    valeurs = len(arbre)*[None]
+    manquantes = {}
+    sommes = {}
+    for i, (proba, parent) in enumerate(zip(arbre.probas, arbre.parents)):
+        if parent < 0:
+            continue
+        if proba:
+            valeurs[i] = valeur(proba)
+            sommes[parent] = sommes.get(parent, 0) + valeurs[i]
+        else:
+            manquantes.setdefault(parent, []).append(i)
+    for parent, enfants in manquantes.items():
+        if len(enfants) > 1:
+            raise ValueError("Probabilités manquantes après '%s'." % arbre.noms[parent])
+        valeurs[enfants[0]] = 1 - sommes.get(parent, 0)
+    return valeurs
+
+
+def probabilites_feuilles(arbre, exact=True):
+    """Probabilités de toutes les feuilles de l'arbre.
+
+    `arbre` est un `Arbre`, ou le code décrivant l'arbre.
+    Retourne une liste de couples (chemin, probabilité), où le chemin
+    est le tuple des noms des sommets menant à la feuille (racine exclue)."""
+    return [(chemin, _resultat(p, exact)) for chemin, p in _parcourir(_arbre(arbre), exact)]
+
+
+def _parcourir(arbre, exact):
+    "Génère les couples (chemin, probabilité) des feuilles, en un seul parcours."
+    valeurs = _valeurs_aretes(arbre, exact)
+    poids = len(arbre)*[1]
+    # Noms des sommets du chemin en cours (le parcours est en profondeur).
+    chemin = []
+    for i, (nom, niveau, parent) in enumerate(zip(arbre.noms, arbre.niveaux, arbre.parents)):
+        del chemin[niveau:]
+        chemin.append(nom)
+        if parent >= 0:
+            poids[i] = poids[parent]*valeurs[i]
+        if not arbre.nbr_enfants[i]:
+            yield tuple(chemin[1:]), poids[i]
+
+
+def _nom_sans_numero(nom):
+    return _numero.sub('', nom)
+
+
+def _predicat(evenement):
+    "Convertit la description d'un évènement en une fonction du chemin."
+    if callable(evenement):
+        return evenement
+    m = _condition.match(evenement)
+    if m is not None:
+        nom, comparaison, k = m.groups()
+        comparaison = _comparaisons[comparaison]
+        k = int(k)
+        return lambda chemin: comparaison(sum(_nom_sans_numero(sommet) == nom
+                                              for sommet in chemin), k)
+    # " inter " est prioritaire sur " union ".
+    alternatives = [[nom.strip() for nom in alternative.split(' inter ')]
+                    for alternative in evenement.split(' union ')]
+    return lambda chemin: any(all(nom in chemin for nom in noms) for noms in alternatives)
+
+
+def _repetition(code):
+    "Voir `lire_repetition()`."
+    lignes = [ligne for ligne in code.split("\n") if ligne.strip()]
+    if lignes and lignes[0].startswith("|"):
+        lignes.pop(0)
+    return lire_repetition(lignes)
+
+
+def loi_repetition(n, evts, probas, exact=True):
+    """Loi du nombre de réalisations de chaque issue, lorsqu'on répète `n` fois
+    une expérience aléatoire dont les issues sont `evts`, de probabilités `probas`.
+
+    Les évènements et probabilités sont complétés comme pour
+    `repetition_experiences()` (ex: évènement contraire).
+    Retourne un dictionnaire {(k1, k2, ...): probabilité}, où ki est le nombre
+    de réalisations de l'issue n°i, calculé à l'aide des coefficients
+    multinomiaux (binomiaux s'il y a deux issues).
+
+    >>> loi_repetition(2, ['A'], ['1/3'])
+    {(0, 2): 4/9, (1, 1): 4/9, (2, 0): 1/9}
+    """
+    evts, probas = completer_evenements(evts, probas)
+    arbre = Arbre()
+    racine = arbre.ajouter('')
+    for evt, proba in zip(evts, probas):
+        arbre.ajouter(evt, proba, racine)
+    valeurs = _valeurs_aretes(arbre, exact)[1:]
+
+    loi = {}
+    def repartir(reste, i, nombres, poids):
+        # Répartition des `reste` répétitions restantes entre les issues i, i+1...
+        if i == len(valeurs) - 1:
+            loi[nombres + (reste,)] = _resultat(poids*valeurs[i]**reste, exact)
+            return
+        for k in range(reste + 1):
+            repartir(reste - k, i + 1, nombres + (k,),
+                     _coefficient(reste, k)*poids*valeurs[i]**k)
+    repartir(n, 0, (), 1)
+    return loi
+
+
+def probabilite(arbre, evenement, exact=True):
+    """Probabilité de l'évènement `evenement` (voir la documentation du module).
+
+    `arbre` est un `Arbre`, ou le code décrivant l'arbre.
+    Si `exact` vaut False, le résultat est un flottant."""
+    if not isinstance(arbre, Arbre) and not callable(evenement):
+        m = _condition.match(evenement)
+        repetition = _repetition(arbre)
+        if m is not None and repetition is not None:
+            # Schéma de Bernoulli (ou plus généralement, répétition d'expériences
+            # indépendantes) : inutile de construire l'arbre.
+            n, evts, probas = repetition
+            loi = loi_repetition(n, evts, probas, exact)
+            evts = completer_evenements(evts, probas)[0]
+            nom, comparaison, k = m.groups()
+            if nom not in evts:
+                return _resultat(0, exact)
+            j = evts.index(nom)
+            comparaison = _comparaisons[comparaison]
+            return _resultat(sum((p for nombres, p in loi.items()
+                                  if comparaison(nombres[j], int(k))), 0), exact)
+    predicat = _predicat(evenement)
+    return _resultat(sum((p for chemin, p in _parcourir(_arbre(arbre), exact)
+                          if predicat(chemin)), 0), exact)
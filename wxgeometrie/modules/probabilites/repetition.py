@@ -21,40 +21,20 @@
 #    along with this program; if not, write to the Free Software
 #    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
-from PyQt5.QtWidgets import QDialog
-
 from sympy import S
 from sympy.core.sympify import SympifyError
 
-from .repetition_ui import Ui_DialogRepetition
 from wxgeometrie.geolib.routines import nice_str
 
 
-def repetition_experiences(_profondeur=3, _numeroter=True, evts=[], probas=[]):
-    """Génère le code d'un arbre de probabilités correspondant à la répétition
-    d'expériences aléatoires identiques et indépendantes.
-    Typiquement, un schéma de Bernoulli.
+def completer_evenements(evts=(), probas=()):
+    """Complète la liste des issues d'une expérience aléatoire et celle
+    de leurs probabilités, pour qu'elles aient la même taille.
 
-    >>> from wxgeometrie.modules.probabilites import repetition_experiences
-    >>> print(repetition_experiences())
-    >A_1:0.5
-    >>A_2:0.5
-    >>>A_3:0.5
-    >>>&A_3:0.5
-    >>&A_2:0.5
-    >>>A_3:0.5
-    >>>&A_3:0.5
-    >&A_1:0.5
-    >>A_2:0.5
-    >>>A_3:0.5
-    >>>&A_3:0.5
-    >>&A_2:0.5
-    >>>A_3:0.5
-    >>>&A_3:0.5
-    """
-    #FIXME: rajouter des tests unitaires.
-    if not evts:
-        evts = ['A']
+    S'il n'y a qu'une issue, on ajoute l'évènement contraire ;
+    s'il manque une seule probabilité, elle est déduite des autres."""
+    evts = list(evts) or ['A']
+    probas = list(probas)
     if len(evts) == 1:
         # On rajoute automatiquement l'évènement contraire.
         evt = evts[0]
@@ -72,35 +52,58 @@ def repetition_experiences(_profondeur=3, _numeroter=True, evts=[], probas=[]):
                 pass
         if len(probas) < len(evts):
             probas += (len(evts) - len(probas))*['']
+    return evts, probas
 
-    # On génère le code.
-    lines = ['']
-    for niveau in range(1, _profondeur + 1):
-        prefixe = niveau*'>'
-        suffixe = ('_' + str(niveau) if _numeroter else '')
-        for i in range(len(lines), 0, -1):
-            if lines[i - 1].startswith((niveau - 1)*'>'):
-                for evt, proba in reversed(list(zip(evts, probas))):
-                    #~ proba = nice_str(proba) if proba != '' else ''
-                    lines.insert(i, prefixe + evt + suffixe + ':' + proba)
-            assert len(lines) < 10000
-    return '\n'.join(lines).strip()
 
+def lignes_repetition(profondeur=3, numeroter=True, evts=(), probas=()):
+    """Génère, ligne par ligne, le code de l'arbre correspondant à la répétition
+    d'expériences aléatoires identiques et indépendantes.
 
+    Les lignes sont produites dans l'ordre du parcours en profondeur de l'arbre,
+    en temps linéaire (voir `repetition_experiences()`)."""
+    evts, probas = completer_evenements(evts, probas)
 
-class DialogRepetition(QDialog, Ui_DialogRepetition):
-    def __init__(self, parent):
-        QDialog.__init__(self, parent)
+    # Les lignes possibles pour chaque niveau sont générées une fois pour toutes.
+    niveaux = []
+    for niveau in range(1, profondeur + 1):
+        prefixe = niveau*'>'
+        suffixe = ('_' + str(niveau) if numeroter else '')
+        niveaux.append([prefixe + evt + suffixe + ':' + proba
+                        for evt, proba in zip(evts, probas)])
+    if not niveaux:
+        return
+    # Parcours en profondeur : pile des branches en cours, une par niveau.
+    pile = [iter(niveaux[0])]
+    while pile:
+        ligne = next(pile[-1], None)
+        if ligne is None:
+            pile.pop()
+            continue
+        yield ligne
+        if len(pile) < profondeur:
+            pile.append(iter(niveaux[len(pile)]))
 
-        # Set up the user interface from Designer.
-        self.setupUi(self)
 
-    def accept(self):
-        n = self.niveaux.value()
-        num = self.numeroter.isChecked()
-        evts = [evt.strip() for evt in self.evenements.text().split(';')]
-        probas = [proba.strip() for proba in self.probas.text().split(';')]
+def repetition_experiences(_profondeur=3, _numeroter=True, evts=(), probas=()):
+    """Génère le code d'un arbre de probabilités correspondant à la répétition
+    d'expériences aléatoires identiques et indépendantes.
+    Typiquement, un schéma de Bernoulli.
 
-        code = repetition_experiences(n, num, evts, probas)
-        self.parent().instructions.setPlainText(code)
-        self.parent().appliquer.click()
+    >>> from wxgeometrie.modules.probabilites import repetition_experiences
+    >>> print(repetition_experiences())
+    >A_1:0.5
+    >>A_2:0.5
+    >>>A_3:0.5
+    >>>&A_3:0.5
+    >>&A_2:0.5
+    >>>A_3:0.5
+    >>>&A_3:0.5
+    >&A_1:0.5
+    >>A_2:0.5
+    >>>A_3:0.5
+    >>>&A_3:0.5
+    >>&A_2:0.5
+    >>>A_3:0.5
+    >>>&A_3:0.5
+    """
+    return '\n'.join(lignes_repetition(_profondeur, _numeroter, evts, probas)).strip()
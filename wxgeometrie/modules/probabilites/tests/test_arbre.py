@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+from wxgeometrie.modules.probabilites.arbre import parse_text
+from wxgeometrie.modules.probabilites.repetition import repetition_experiences as rep
+
+import tools.unittest
+
+class ModulesProbabilitesTest(tools.unittest.TestCase):
+    def test_parse_text(self):
+        arbre = parse_text("""||Tirage 1|Tirage 2
+omega
+>A:0,7
+>>B:0,2
+>>C:0,8
+>&A:0,3
+>>E:1/3
+>>>F
+>>&E:2/3""")
+        self.assertEqual(arbre.legende, "||Tirage 1|Tirage 2")
+        self.assertEqual(arbre.noms, ['omega', 'A', 'B', 'C', '&A', 'E', 'F', '&E'])
+        self.assertEqual(arbre.parents, [-1, 0, 1, 1, 0, 4, 5, 4])
+        self.assertEqual(arbre.niveaux, [0, 1, 2, 2, 1, 2, 3, 2])
+        self.assertEqual(arbre.feuilles(), [2, 3, 6, 7])
+        self.assertEqual(arbre.nbr_colonnes, 4)
+        self.assertAlmostEqual(arbre.poids[3], .56)
+        self.assertAlmostEqual(arbre.poids[7], .2)
+        xs, ys = arbre.disposition()
+        self.assertEqual(xs, [0, 1/3, 2/3, 2/3, 1/3, 2/3, 1, 2/3])
+        for i, y in zip(arbre.feuilles() + [1, 4, 0], [1, 2/3, 1/3, 0, 5/6, 1/6, .5]):
+            self.assertAlmostEqual(ys[i], y)
+        self.assertEqual(len(arbre.segments()), 7)
+        self.assertEqual(arbre.titres(), [('Tirage 1', .5/3), ('Tirage 2', 1.5/3)])
+        self.assertRaises(ValueError, parse_text, ">A\n>>>B")
+        self.assertEqual(len(parse_text("")), 0)
+
+    def test_repetition(self):
+        arbre = parse_text(">>A:1/4\n>>&A:3/4")
+        self.assertEqual(arbre.noms[:4], ['', 'A_1', 'A_2', '&A_2'])
+        self.assertEqual(len(arbre.feuilles()), 4)
+        self.assertAlmostEqual(arbre.probabilite_feuilles(), 1)
+        # Plus de 10000 lignes.
+        arbre = parse_text(rep(13, evts=['A'], probas=['0,4']))
+        self.assertEqual(len(arbre), 2**14 - 1)
+        self.assertAlmostEqual(arbre.probabilite_feuilles(), 1)
+        self.assertEqual(arbre.noms[-1], '&A_13')
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+from sympy import Rational, Symbol, binomial
+
+from wxgeometrie.modules.probabilites.calcul import probabilite, probabilites_feuilles, \
+                                                     loi_repetition
+from wxgeometrie.modules.probabilites.repetition import repetition_experiences as rep
+
+import tools.unittest
+
+class ModulesProbabilitesTest(tools.unittest.TestCase):
+    def test_probabilites_feuilles(self):
+        code = "omega\n>A:0,7\n>>B:0,2\n>>C\n>&A:0,3\n>>B:1/3\n>>&B"
+        feuilles = probabilites_feuilles(code)
+        self.assertEqual([chemin for chemin, p in feuilles],
+                         [('A', 'B'), ('A', 'C'), ('&A', 'B'), ('&A', '&B')])
+        self.assertEqual([p for chemin, p in feuilles],
+                         [Rational(7, 50), Rational(14, 25), Rational(1, 10), Rational(1, 5)])
+        self.assertAlmostEqual(probabilites_feuilles(code, exact=False)[1][1], .56)
+        self.assertRaises(ValueError, probabilites_feuilles, ">A\n>B")
+
+    def test_probabilite(self):
+        code = "omega\n>A:0,7\n>>B:0,2\n>>C\n>&A:0,3\n>>B:1/3\n>>&B"
+        self.assertEqual(probabilite(code, "B"), Rational(6, 25))
+        self.assertEqual(probabilite(code, "B", exact=False), .24)
+        self.assertEqual(probabilite(code, "A inter C union &B"), Rational(19, 25))
+        self.assertEqual(probabilite(code, lambda chemin: 'C' not in chemin), Rational(11, 25))
+        self.assertEqual(probabilite(code, "D"), 0)
+        p = Symbol('p')
+        self.assertEqual(probabilite(">A:p\n>&A", "&A"), 1 - p)
+
+    def test_repetition(self):
+        self.assertEqual(loi_repetition(2, ['A'], ['1/3']),
+                         {(0, 2): Rational(4, 9), (1, 1): Rational(4, 9), (2, 0): Rational(1, 9)})
+        loi = loi_repetition(3, ['A', 'B', 'C'], ['1/2', '1/3'])
+        self.assertEqual(sum(loi.values()), 1)
+        self.assertEqual(loi[(1, 1, 1)], 6*Rational(1, 36))
+        # Même résultat avec l'arbre complet, et avec le calcul direct.
+        code = rep(6, evts=['A'], probas=['0,3'])
+        for condition in ("A >= 2", "&A = 6", "A < 3", "A != 1"):
+            self.assertEqual(probabilite(code, condition),
+                             probabilite(">>>>>>A:0,3\n>>>>>>&A", condition))
+        # 2^60 feuilles : l'arbre ne doit pas être construit.
+        p = Symbol('p')
+        self.assertEqual(probabilite(60*">" + "A:p\n" + 60*">" + "&A", "A = 3"),
+                         binomial(60, 3)*p**3*(1 - p)**57)
+        self.assertAlmostEqual(probabilite(60*">" + "A:0,5\n" + 60*">" + "&A", "A <= 30", exact=False),
+                               .5 + float(binomial(60, 30))/2**61)
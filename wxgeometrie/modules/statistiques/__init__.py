@@ -22,15 +22,21 @@
 #    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
 import re
+import os
 from math import isnan, sqrt, ceil, floor
 
-from PyQt5.QtWidgets import QVBoxLayout, QLabel, QGroupBox, QHBoxLayout, QComboBox
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (QVBoxLayout, QLabel, QGroupBox, QHBoxLayout, QComboBox,
+                             QFileDialog, QMessageBox)
 
 from numpy import array
 
 from ...GUI.menu import MenuBar
 from ...GUI.panel import Panel_API_graphique
-from .experience import LancerDes, Sondage, ExperienceFrame, DIC
+from .experience import LancerDes, Sondage, ExperienceFrame
+from .simulation import Simulation
+from .serie import Serie
+from .importation import importer_donnees
 from .onglets_internes import OngletsStatistiques
 from ...geolib.routines import nice_display, arrondir_1_2_5 as arrondir
 from ...pylib import property2, regsub, advanced_split, print_error, eval_restricted
@@ -67,6 +73,8 @@ class Classe(tuple):
 
     def __str__(self):         return "[%s ; %s[" % (self[0], self[-1])
     def __repr__(self):        return str(self)
+    # Les classes servent de clés dans les dictionnaires des séries.
+    __hash__ = tuple.__hash__
     def __int__(self):         return int(self.milieu())
     def __add__(self, y):      return self.milieu() + y
     def __mul__(self, y):      return self.milieu()*y
@@ -116,7 +124,11 @@ class StatMenuBar(MenuBar):
                 ["Lancers de dés", "Simuler des lancers d'un ou de plusieurs dés.",
                  "Ctrl+Shift+D", self.panel.creer_lancer_des],
                 ["Sondage", "Simuler un sondage simple.", "Ctrl+Shift+S",
-                 self.panel.creer_sondage], None, ["options"])
+                 self.panel.creer_sondage], None,
+                ["Importer des données", "Importer des séries depuis un fichier (CSV, TSV, npy).",
+                 "Ctrl+Shift+I", self.panel.importer],
+                ["Oublier les données importées", "Ne conserver que les données saisies.",
+                 None, self.panel.oublier_importation], None, ["options"])
         self.ajouter("avance1")
         self.ajouter("?")
 
@@ -145,6 +157,11 @@ class Statistiques(Panel_API_graphique):
 
         self._donnees = []
         self._classes = []
+        # Index des différentes séries (cf. `serie()`).
+        self._series = {}
+        # Séries importées depuis un fichier (cf. `importer()`).
+        self._donnees_importees = []
+        self._fichier_importe = None
         # Numéro de la série actuellement sélectionnée
         self.index_serie = 0
         self.legende_x = '' # axe des abscisses
@@ -156,6 +173,10 @@ class Statistiques(Panel_API_graphique):
         self.origine_x = ''
         self.origine_y = ''
         self.intervalle_fluctuation = None
+        # Simulation en cours d'exécution (en arrière-plan).
+        self._simulation = None
+        self._minuteur = QTimer(self)
+        self._minuteur.timeout.connect(self._suivre_experience)
 
         self.entrees = QVBoxLayout()
 
@@ -279,7 +300,9 @@ class Statistiques(Panel_API_graphique):
         "Récupère le dictionnaire des valeurs et des effectifs associés depuis le champ de texte correspondant."
         # On peut saisir plusieurs séries (pour les comparer).
         # self._donnees est une liste de dictionnaire de valeurs (un par série).
-        self._donnees = []
+        # Les séries importées depuis un fichier viennent en premier.
+        self._donnees = [donnees.copy() for donnees in self._donnees_importees]
+        self._series.clear()
         valeurs = self.onglets_bas.tab_donnees.valeurs.text()
         # La chaine va être découpée au niveau des espaces.
         # On commence par la préparer : on supprime les espaces inutiles, et en
@@ -391,6 +414,7 @@ class Statistiques(Panel_API_graphique):
             valeur = Classe(valeur)
         donnees = self._donnees[serie]
         donnees[valeur] = donnees.get(valeur, 0) + effectif
+        self._series.clear()
 
     # TODO: renommer classes en classes_serie
     @property
@@ -432,14 +456,44 @@ class Statistiques(Panel_API_graphique):
             return None
         return self._donnees[self.index_serie]
 
+    def serie(self):
+        """Index de la série courante (valeurs triées et effectifs cumulés).
+
+        L'index est conservé tant que les données ne sont pas modifiées."""
+        index = self.index_serie
+        serie = self._series.get(index)
+        if serie is None:
+            serie = self._series[index] = Serie(self.donnees_brutes)
+        return serie
+
 
 
     def intervalle_classes(self):
         return min([classe[0] for classe in self.classes]), max([classe[1] for classe in self.classes])
 
+    def coefficient_effectifs(self):
+        "Coefficient permettant de passer des effectifs bruts à ceux de `donnees`."
+        mode = self.param('mode_effectifs')
+        if not mode:
+            return 1
+        return (100 if mode == 1 else 1)/self.serie().total
+
+    def effectifs_classes(self, classes=None):
+        """Effectifs (ou fréquences...) des classes, calculés en une seule passe.
+
+        Par défaut, on utilise les classes de la série courante."""
+        if classes is None:
+            classes = self.classes
+        return self.serie().effectifs_classes(classes)*self.coefficient_effectifs()
+
+    def densites_classes(self, classes=None):
+        if classes is None:
+            classes = self.classes
+        amplitudes = array([classe[1] - classe[0] for classe in classes], dtype=float)
+        return self.effectifs_classes(classes)/amplitudes
+
     def effectif_classe(self, classe):
-        a, b = classe
-        return sum(effectif for valeur, effectif in self.donnees.items() if a <= valeur < b)
+        return self.effectifs_classes([classe])[0].item()
 
     def densite_classe(self, classe):
         return self.effectif_classe(classe)/classe.amplitude()
@@ -447,11 +501,84 @@ class Statistiques(Panel_API_graphique):
 
     def experience(self, formule, n, val_possibles = ()):
         """Réalise 'n' fois l'expérience décrite par 'formule'.
-        Exemple: self.experience('int(6*rand())+1', 100) simule 100 lancers de dés."""
+        Exemple: self.experience('int(6*rand())+1', 100) simule 100 lancers de dés.
+
+        Au-delà d'un lot d'expériences (cf. `Simulation.taille_lot`),
+        la simulation se poursuit en arrière-plan."""
 
+        self.interrompre_experience()
         self.actualiser(False)
-        self.ajouter_valeurs(*[eval(formule, DIC) for i in range(n)])
-        for val in val_possibles:
+        simulation = Simulation(formule, n)
+        self._val_possibles = val_possibles
+        if n <= simulation.taille_lot:
+            simulation.executer()
+            self._terminer_experience(simulation)
+        else:
+            self._simulation = simulation
+            simulation.lancer()
+            self._minuteur.start(100)
+
+    def importer(self, chemin=None):
+        """Importe les séries contenues dans le fichier `chemin` (CSV, TSV, npy).
+
+        Les séries importées sont conservées (en plus des valeurs saisies)
+        jusqu'à l'appel de `oublier_importation()`."""
+        if not chemin:
+            repertoire = param.rep_open or param.repertoire
+            chemin, filtre = QFileDialog.getOpenFileName(self, "Importer des données",
+                        repertoire, "Données (*.csv *.tsv *.txt *.npy);;Tous les fichiers (*)")
+            if not chemin:
+                return
+            param.rep_open = os.path.dirname(chemin)
+        try:
+            series, erreurs = importer_donnees(chemin)
+        except (IOError, ValueError, UnicodeDecodeError) as e:
+            print_error()
+            series = []
+            erreurs = [(0, str(e))]
+        if erreurs:
+            messages = [message for numero, message in erreurs]
+            if len(messages) > 10:
+                messages = messages[:10] + ['(%s autres erreurs)' % (len(messages) - 10)]
+            QMessageBox.warning(self, "Importation de '%s'" % os.path.basename(chemin),
+                                '\n'.join(messages))
+        if series:
+            self._donnees_importees = [{(Classe(val) if isinstance(val, tuple) else val): eff
+                                        for val, eff in serie.items()} for serie in series]
+            self._fichier_importe = chemin
+            self.actualiser()
+
+    def oublier_importation(self, event=None):
+        self._donnees_importees = []
+        self._fichier_importe = None
+        self.actualiser()
+
+    def interrompre_experience(self, event=None):
+        "Interrompt la simulation en cours."
+        if self._simulation is not None:
+            self._simulation.annuler()
+            self._simulation = None
+            self._minuteur.stop()
+            self.canvas.message("Simulation interrompue.")
+
+    def _suivre_experience(self):
+        simulation = self._simulation
+        if simulation is None:
+            self._minuteur.stop()
+        elif simulation.terminee:
+            self._minuteur.stop()
+            self._simulation = None
+            if simulation.erreur is None:
+                self._terminer_experience(simulation)
+            else:
+                self.canvas.message("Erreur lors de la simulation.")
+        else:
+            self.canvas.message("Simulation en cours : %s %%" % int(100*simulation.progression))
+
+    def _terminer_experience(self, simulation):
+        for valeur, effectif in simulation.effectifs.items():
+            self.ajouter_valeur(valeur, effectif)
+        for val in self._val_possibles:
             self.ajouter_valeur(val, 0)
         self.calculer()
         self.affiche()
@@ -585,7 +712,10 @@ class Statistiques(Panel_API_graphique):
 
         m, M = self.intervalle_classes()
         l = min([classe[1] - classe[0] for classe in self.classes])
-        hmax = max([self.densite_classe(classe) for classe in self.classes])
+        classes = sorted(self.classes)
+        # Toutes les densités sont calculées en une seule passe.
+        densites = self.densites_classes(classes)
+        hmax = densites.max().item()
 
         if hmax == 0:
             return "Les classes choisies ne contiennent aucune valeur."
@@ -595,16 +725,9 @@ class Statistiques(Panel_API_graphique):
         self.origine(m, 0)
         self.graduations(l, 0)
 
-        i = 0
-        for classe in sorted(self.classes):
-            h = self.densite_classe(classe)
-            xx = [classe[0], classe[0], classe[1], classe[1]]
-            yy = [0, h, h, 0]
-            if self.param('hachures'):
-                self.canvas.dessiner_polygone(xx, yy, 'w', hatch = self.hachures[i%len(self.hachures)])
-            else:
-                self.canvas.dessiner_polygone(xx, yy, self.couleurs[i%len(self.couleurs)])
-            i += 1
+        rectangles = [[(a, 0), (a, h), (b, h), (b, 0)]
+                      for (a, b), h in zip(classes, densites.tolist())]
+        self._dessiner_barres(rectangles)
 
         self.canvas.dessiner_texte(M + 0.3*(M-m)-5*self.canvas._coeff(0),
                         -18*self.canvas._coeff(1), self.legende_x, ha = "right")
@@ -640,6 +763,24 @@ class Statistiques(Panel_API_graphique):
         self.canvas.dessiner_texte(x, .5*hmax - 15*self.canvas._coeff(1), legende, va = "top")
 
 
+    def _dessiner_barres(self, rectangles, decalage=0):
+        """Dessine les rectangles d'un histogramme ou d'un diagramme en barres.
+
+        Les rectangles sont regroupés en une seule collection par couleur
+        (ou par motif de hachures), au lieu d'un polygone par rectangle.
+        Le rectangle n°i a la couleur n°(i + decalage)."""
+        if self.param('hachures'):
+            k = len(self.hachures)
+            for j, motif in enumerate(self.hachures):
+                groupe = rectangles[(j - decalage)%k::k]
+                if groupe:
+                    self.canvas.dessiner_polygones(groupe, facecolors='w', hatch=motif)
+        else:
+            k = len(self.couleurs)
+            couleurs = [self.couleurs[(i + decalage)%k] for i in range(len(rectangles))]
+            self.canvas.dessiner_polygones(rectangles, facecolors=couleurs)
+
+
     def courbe_effectifs(self, mode=1):
         """
         Courbe des effectifs cumulés croissants si mode = 1, décroissants si mode = -1.
@@ -647,8 +788,6 @@ class Statistiques(Panel_API_graphique):
         if self.axes(x=True, y=True, classes=True):
             return "Définissez des classes.\nExemple : [0;10[ [10;20["
 
-        donnees_triees = sorted(self.donnees.items())
-
         l = min([classe[1] - classe[0] for classe in self.classes])
         m, M = self.intervalle_classes()
         hmax = self.total()
@@ -656,18 +795,17 @@ class Statistiques(Panel_API_graphique):
         self.graduations(l, arrondir(hmax/10))
         self.origine(m, 0)
 
+        # Effectifs cumulés aux bornes de chaque classe, calculés en une seule passe.
+        serie = self.serie()
+        bornes = serie.effectifs_avant(array(self.classes, dtype=float))
+        if mode != 1:
+            bornes = serie.total - bornes
+        bornes = (bornes*self.coefficient_effectifs()).tolist()
         # Classe with cumulatives eff or freq 2-uple list: y_cum
-        y_cum = []
+        y_cum = list(zip(self.classes, bornes))
         couleur = 'k' if self.param('hachures') else 'b'
-        for classe in self.classes:
-            if mode == 1:
-                y_value = [sum([effectif for valeur, effectif in donnees_triees
-                            if valeur < classe[i]]) for i in (0, 1)]
-            else:
-                y_value = [sum([effectif for valeur, effectif in donnees_triees
-                            if valeur >= classe[i]]) for i in (0, 1)]
-            self.canvas.dessiner_ligne(classe, y_value, color = couleur)
-            y_cum.append((classe, y_value))
+        self.canvas.dessiner_lignes([list(zip(classe, y_value)) for classe, y_value in y_cum],
+                                    colors=couleur)
         dx, dy = self.canvas.dpix2coo(-5, 18)
         self.canvas.dessiner_texte(M + 0.2*(M - m) + dx, -dy, self.legende_x, ha = "right")
         dx, dy = self.canvas.dpix2coo(15, -5)
@@ -781,17 +919,12 @@ class Statistiques(Panel_API_graphique):
         self.graduations(0, arrondir(hmax/10))
         self.origine(0, 0)
 
-        n = 0
-        for valeur, effectif in donnees_triees:
+        rectangles = []
+        for n, (valeur, effectif) in enumerate(donnees_triees):
             x0, x1 = (2*n + 1)*e + n*l, (2*n + 1)*e + (n+1)*l
-            xx = [x0, x0, x1, x1]
-            yy = [0, effectif, effectif, 0]
-            if self.param('hachures'):
-                self.canvas.dessiner_polygone(xx, yy, 'w', hatch=self.hachures[(n - 1)%len(self.hachures)])
-            else:
-                self.canvas.dessiner_polygone(xx, yy, self.couleurs[(n - 1)%len(self.couleurs)])
+            rectangles.append([(x0, 0), (x0, effectif), (x1, effectif), (x1, 0)])
             self.canvas.dessiner_texte((x0 + x1)/2., - 18*self.canvas._coeff(1), str(valeur), ha='center')
-            n += 1
+        self._dessiner_barres(rectangles, decalage=-1)
 
         self.canvas.dessiner_texte(110 - 5*self.canvas._coeff(0), -35*self.canvas._coeff(1), self.legende_x, ha='right')
         legende_y = self.legende_y
@@ -842,11 +975,13 @@ class Statistiques(Panel_API_graphique):
 
         e = largeur*self.canvas._coeff(0)
 
-        i = 0
-        for val, eff in self.donnees.items():
-            couleur = 'k' if self.param('hachures') else self.couleurs[(i - 1)%len(self.couleurs)]
-            self.canvas.dessiner_polygone([val - e, val - e, val + e, val + e], [0, eff, eff, 0], couleur)
-            i+=1
+        batons = [[(val - e, 0), (val - e, eff), (val + e, eff), (val + e, 0)]
+                  for val, eff in self.donnees.items()]
+        if self.param('hachures'):
+            couleurs = 'k'
+        else:
+            couleurs = [self.couleurs[(i - 1)%len(self.couleurs)] for i in range(len(batons))]
+        self.canvas.dessiner_polygones(batons, facecolors=couleurs)
 
 
         self.canvas.dessiner_texte(M + 0.1*(M - m) - 5*self.canvas._coeff(0),
@@ -1030,7 +1165,7 @@ class Statistiques(Panel_API_graphique):
     @catch_errors
     def effectif_total(self):
         # Effectifs bruts (non convertis en fréquences, quel que soit le mode).
-        return sum(self.donnees_brutes.values())
+        return self.serie().total
 
     def total(self):
         "Retourne soit l'effectif total, soit 100, soit 1, selon les paramètres en cours."
@@ -1052,15 +1187,15 @@ class Statistiques(Panel_API_graphique):
         est remplacée par son centre de classe, pour calculer une approximation
         de la moyenne.
         """
-        return sum(eff*val for val, eff in self.donnees.items())/self.total()
+        return self.serie().moyenne()
 
     @catch_errors
     def minimum(self):
-        return min(val for val, eff in self.donnees.items() if eff)
+        return self.serie().minimum
 
     @catch_errors
     def maximum(self):
-        return max(val for val, eff in self.donnees.items() if eff)
+        return self.serie().maximum
 
     @catch_errors
     def etendue(self):
@@ -1068,8 +1203,7 @@ class Statistiques(Panel_API_graphique):
 
     @catch_errors
     def variance(self):
-        moyenne_des_carres = sum(eff*val**2 for val, eff in self.donnees.items())/self.total()
-        return moyenne_des_carres - self.moyenne()**2
+        return self.serie().variance()
 
     @catch_errors
     def ecart_type(self):
@@ -1086,30 +1220,7 @@ class Statistiques(Panel_API_graphique):
 
         Une bonne manière de visualiser la médiane pour des effectifs non entiers
         est de tracer un diagramme en bande."""
-        somme = 0
-        old_val = None
-        objectif = self.effectif_total()/2
-        for val, effectif in sorted(self.donnees_brutes.items()):
-            somme += effectif
-            if somme > objectif:
-                if isinstance(val, Classe):
-                    # On estime la valeur de la médiane au sein de la classe,
-                    # en l'assimilant au 2e quartile, et en estimant sa
-                    # valeur au prorata de sa position dans la classe.
-                    a, b = val
-                    x = (somme - objectif)/effectif
-                    return x*a + (1 - x)*b
-                else:
-                    if somme - effectif == objectif:
-                        # la mediane est à cheval sur 2 valeurs
-                        try:
-                            return (old_val + val)/2
-                        except TypeError:
-                            print_error()
-                            return "Calcul impossible."
-                return val
-            old_val = val
-        return "Calcul impossible."
+        return self.serie().mediane()
 
     @catch_errors
     def tile(self, k = 4, i = 1):
@@ -1120,22 +1231,7 @@ class Statistiques(Panel_API_graphique):
         Exemple :   tile(4,1) -> premier quartile.
                     tile(10,2) -> deuxième décile.
         """
-
-        somme = 0
-        objectif = i/k*self.effectif_total()
-        # objectif : position du quartile au sein de la série.
-        for val, effectif in sorted(self.donnees_brutes.items()):
-            somme += effectif
-            if somme >= objectif:
-                if isinstance(val, Classe):
-                    assert effectif
-                    # On estime la valeur du quartile au sein de la classe,
-                    # au prorata de la position du quartile dans la classe.
-                    a, b = val
-                    x = (somme - objectif)/effectif
-                    return x*a + (1 - x)*b
-                else:
-                    return val
+        return self.serie().tile(k, i)
 
 
     def quartile(self, i = 1):
@@ -1181,7 +1277,8 @@ class Statistiques(Panel_API_graphique):
         fgeo.contenu["Diagramme"] = [{
             "serie" : [{
             "valeurs" : [self.onglets_bas.tab_donnees.valeurs.text()],
-            "classes" : [self.onglets_bas.tab_donnees.classes.text()]}],
+            "classes" : [self.onglets_bas.tab_donnees.classes.text()],
+            "fichier" : [self._fichier_importe or '']}],
             "legende" : [{"x" : [self.legende_x], "y" : [self.legende_y], "a" : [self.legende_a]}],
             "graduation": [{"x" : [self.gradu_x], "y" : [self.gradu_y], "a" : [self.gradu_a]}],
             "origine": [{"x" : [self.origine_x], "y": [self.origine_y]}],
@@ -1221,5 +1318,9 @@ class Statistiques(Panel_API_graphique):
             self.onglets_bas.tab_donnees.classes.setText(classes)
             print(('mode_graphique', mode_graphique))
             self.graph = mode_graphique
+            fichier = serie.get("fichier", [''])[0]
+            if fichier and os.path.isfile(fichier):
+                self.importer(fichier)
+                return
 
         self.actualiser()
@@ -23,33 +23,10 @@
 
 from PyQt5.QtWidgets import (QSpinBox, QCheckBox, QPushButton,
                          QVBoxLayout, QLabel, QHBoxLayout, QLineEdit)
-from numpy.random import rand
-import math
-from numpy import sum
-# NB: numpy.sum est 100 fois plus rapide que __builtin__.sum !
 
 from ...GUI.qtlib import MyMiniFrame
 from ...pylib import msplit
-
-ent = int
-
-def alea(n = None):
-    """Nombre entier aléatoire compris entre 0 et n-1.
-    Si n = None, nombre décimal entre 0 et 1."""
-    if n == None:
-        return rand()
-    return int(n*rand())
-
-def de(k = 1):
-    return sum(1+(6*rand(k)).astype(int))
-
-
-def sondage(pourcentage = 50, k = 1000):
-    pourcentage /= 100.
-    return 100.*sum(rand(k)<pourcentage)/k
-
-DIC = {'rand': rand, 'random': rand, 'ent': ent, 'alea': alea}
-DIC.update(math.__dict__)
+from .simulation import DIC, simuler
 
 
 
@@ -72,7 +49,7 @@ class ExperienceFrame(MyMiniFrame):
         nbr = QHBoxLayout()
         nbr.addWidget(QLabel("Nombre d'expériences:"))
         sc = self.sc = QSpinBox()
-        sc.setRange(1, 100000)
+        sc.setRange(1, 10**8)
         sc.setValue(5)
         sc.valueChanged.connect(self.actualiser)
         nbr.addWidget(sc)
@@ -93,9 +70,12 @@ class ExperienceFrame(MyMiniFrame):
         boutons = QHBoxLayout()
         fermer = QPushButton("Fermer")
         boutons.addWidget(fermer)
+        interrompre = QPushButton("Interrompre")
+        boutons.addWidget(interrompre)
         lancer = QPushButton("Lancer l'experience")
         boutons.addWidget(lancer)
         fermer.clicked.connect(self.close)
+        interrompre.clicked.connect(self.parent.interrompre_experience)
         lancer.clicked.connect(self.actualiser)
 
         sizer.addLayout(boutons)
@@ -106,7 +86,6 @@ class ExperienceFrame(MyMiniFrame):
         n = self.sc.value()
         exp = self.experience.text()
         vals = msplit(self.valeurs.text(), (" ", ",", ";"))
-        print(alea)
         if exp:
             self.parent.experience(exp, n, [eval(val, DIC) for val in vals if val])
 
@@ -165,7 +144,8 @@ class LancerDes(MyMiniFrame):
         des = self.experience.value()
         for val in range(des, 6*des + 1):
             self.parent.ajouter_valeur(val, 0)
-        self.parent.ajouter_valeurs(*[de(des) for i in range(n)])
+        for valeur, effectif in simuler('de(%s)' % des, n).items():
+            self.parent.ajouter_valeur(valeur, effectif)
         self.parent.calculer()
         self.parent.legende_x = "points obtenus"
         self.parent.legende_y = "nombre de lancers"
@@ -237,7 +217,9 @@ class Sondage(MyMiniFrame):
         self.parent.intervalle_fluctuation = (echantillon if self.cb.isChecked() else None)
         n = self.sc2.value()
         esperance = self.experience.value()
-        self.parent.ajouter_valeurs(*[sondage(esperance, echantillon) for i in range(n)])
+        formule = 'sondage(%s, %s)' % (esperance, echantillon)
+        for valeur, effectif in simuler(formule, n).items():
+            self.parent.ajouter_valeur(valeur, effectif)
         self.parent.calculer()
         self.parent.legende_x = "résultat des sondages (en %)"
         self.parent.legende_y = "nombre de sondages"
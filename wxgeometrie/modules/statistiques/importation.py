@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+##------------------------------------------#######
+#             Importation de données             #
+##------------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Importation de séries statistiques depuis un fichier.
+
+Formats acceptés :
+- fichiers texte (CSV, TSV...) : une ligne par valeur, sous la forme
+    valeur
+    valeur;effectif
+    borne_inf;borne_sup;effectif   (classe [borne_inf;borne_sup[)
+  Une classe peut aussi être notée "[0;10[" (entre guillemets si le séparateur
+  de colonnes est le point-virgule).
+  Les valeurs non numériques sont conservées telles quelles (séries qualitatives).
+  Une ligne vide sépare deux séries, et une éventuelle ligne d'en-tête est ignorée.
+- fichiers numpy (.npy) : tableau à une dimension (valeurs), ou à deux
+  colonnes (valeurs et effectifs). Le fichier est lu par blocs, sans être
+  chargé entièrement en mémoire.
+
+Chaque série est retournée sous forme d'un dictionnaire {valeur: effectif}.
+Les classes sont retournées sous forme de tuples.
+
+Ces fonctions ne dépendent pas de l'interface graphique, et peuvent
+être utilisées dans un script.
+"""
+
+import csv
+from itertools import chain
+import re
+
+import numpy
+
+from ... import param
+
+
+# Nombre de lignes d'un fichier .npy traitées à la fois.
+TAILLE_BLOC = 10**6
+
+_classe = re.compile(r'^\[\s*([^;,\[\]]+?)\s*[;,]\s*([^;,\[\]]+?)\s*[\[\]]$')
+
+
+def _nombre(chaine, separateur_decimal):
+    "Convertit `chaine` en entier ou en flottant, ou lève une `ValueError`."
+    chaine = chaine.strip()
+    if separateur_decimal != '.':
+        chaine = chaine.replace(separateur_decimal, '.')
+    try:
+        return int(chaine)
+    except ValueError:
+        return float(chaine)
+
+
+def _valeur(chaine, separateur_decimal):
+    "Convertit une cellule en nombre, en classe (tuple) ou en texte."
+    chaine = chaine.strip()
+    try:
+        return _nombre(chaine, separateur_decimal)
+    except ValueError:
+        pass
+    m = _classe.match(chaine)
+    if m is not None:
+        return tuple(_nombre(borne, separateur_decimal) for borne in m.groups())
+    return chaine
+
+
+def _detecter_separateur(ligne, separateur_decimal):
+    "Détecte le séparateur de colonnes utilisé dans `ligne`."
+    for separateur in ('\t', ';'):
+        if separateur in ligne:
+            return separateur
+    if ',' in ligne:
+        if separateur_decimal != ',' or ligne.count(',') > 1 or '.' in ligne:
+            return ','
+        # Virgule isolée : séparateur décimal (ex: "12,5"), sauf entre
+        # deux chaînes non numériques (ex: "note,effectif").
+        try:
+            _nombre(ligne, ',')
+        except ValueError:
+            return ','
+    return None
+
+
+def _lignes(lignes, separateur):
+    """Découpe les lignes en cellules.
+
+    Génère des couples (numéro de ligne, cellules) ; une ligne vide
+    correspond à une liste de cellules vide."""
+    for numero, ligne in enumerate(lignes, start=1):
+        if separateur:
+            cellules = next(csv.reader([ligne], delimiter=separateur)) if ligne.strip() else []
+        else:
+            cellules = [ligne]
+        cellules = [cellule.strip() for cellule in cellules]
+        while cellules and not cellules[-1]:
+            cellules.pop()
+        yield numero, cellules
+
+
+def importer_texte(lignes, separateur=None, separateur_decimal=None):
+    """Lit des séries statistiques au format CSV/TSV.
+
+    `lignes` est un itérable (par exemple, un fichier ouvert en lecture).
+    Si `separateur` n'est pas précisé, il est détecté sur la première ligne
+    non vide (tabulation, point-virgule ou virgule).
+    Si `separateur_decimal` n'est pas précisé, on utilise `param.separateur_decimal`,
+    sauf s'il est identique au séparateur de colonnes.
+
+    Retourne la liste des séries, et la liste des erreurs rencontrées,
+    sous la forme (numéro de ligne, message). Les lignes incorrectes sont ignorées.
+    """
+    lignes = iter(lignes)
+    # Recherche de la première ligne non vide, pour détecter le séparateur.
+    debut = []
+    for ligne in lignes:
+        debut.append(ligne)
+        if ligne.strip():
+            break
+    else:
+        return [], []
+    if separateur is None:
+        separateur = _detecter_separateur(debut[-1], param.separateur_decimal)
+    if separateur_decimal is None:
+        separateur_decimal = param.separateur_decimal
+        if separateur_decimal == separateur:
+            separateur_decimal = '.'
+
+    def est_numerique(cellule):
+        try:
+            _nombre(cellule, separateur_decimal)
+            return True
+        except ValueError:
+            return False
+
+    series = []
+    erreurs = []
+    # Série en cours de lecture.
+    serie = None
+
+    def ajouter(numero, cellules):
+        nonlocal serie
+        try:
+            if len(cellules) == 1:
+                valeur = _valeur(cellules[0], separateur_decimal)
+                effectif = 1
+            elif len(cellules) == 2:
+                valeur = _valeur(cellules[0], separateur_decimal)
+                effectif = _nombre(cellules[1], separateur_decimal)
+            elif len(cellules) == 3:
+                valeur = (_nombre(cellules[0], separateur_decimal),
+                          _nombre(cellules[1], separateur_decimal))
+                effectif = _nombre(cellules[2], separateur_decimal)
+            else:
+                raise ValueError("%s colonnes au lieu de 1 à 3" % len(cellules))
+            if effectif < 0:
+                raise ValueError("effectif négatif")
+        except ValueError as e:
+            erreurs.append((numero, "Ligne %s incorrecte (%s)." % (numero, e)))
+            return
+        if serie is None:
+            serie = {}
+            series.append(serie)
+        serie[valeur] = serie.get(valeur, 0) + effectif
+
+    # Première ligne, tant qu'on ne sait pas s'il s'agit d'un en-tête.
+    en_attente = None
+    premiere = True
+    for numero, cellules in _lignes(chain(debut, lignes), separateur):
+        if en_attente is not None:
+            # Une première ligne non numérique à une seule colonne est un
+            # en-tête si la ligne suivante est numérique (sinon, il s'agit
+            # d'une série qualitative).
+            if not cellules or not est_numerique(cellules[0]):
+                ajouter(*en_attente)
+            en_attente = None
+        if not cellules:
+            # Une ligne vide termine la série en cours.
+            serie = None
+            continue
+        if premiere:
+            premiere = False
+            if not any(est_numerique(cellule) for cellule in cellules):
+                if len(cellules) == 1:
+                    en_attente = (numero, cellules)
+                # Sinon, en-tête (ex: "valeur;effectif").
+                continue
+        ajouter(numero, cellules)
+    if en_attente is not None:
+        ajouter(*en_attente)
+    return series, erreurs
+
+
+def importer_npy(chemin):
+    """Lit une série statistique enregistrée au format numpy (.npy).
+
+    Le tableau est soit à une dimension (valeurs), soit à deux colonnes
+    (valeurs et effectifs). Il est projeté en mémoire (`mmap_mode`),
+    puis traité par blocs de `TAILLE_BLOC` lignes.
+
+    Retourne la liste des séries (une seule), et la liste des erreurs."""
+    tableau = numpy.load(chemin, mmap_mode='r')
+    if tableau.ndim == 1:
+        effectifs = None
+    elif tableau.ndim == 2 and tableau.shape[1] == 2:
+        tableau, effectifs = tableau[:, 0], tableau[:, 1]
+    else:
+        return [], [(0, "Le tableau doit être à une dimension, ou à deux colonnes "
+                        "(valeurs et effectifs) ; dimensions : %s." % (tableau.shape,))]
+    serie = {}
+    for debut in range(0, len(tableau), TAILLE_BLOC):
+        bloc = numpy.asarray(tableau[debut:debut + TAILLE_BLOC])
+        valeurs, inverse, nombres = numpy.unique(bloc, return_inverse=True, return_counts=True)
+        if effectifs is not None:
+            poids = numpy.asarray(effectifs[debut:debut + TAILLE_BLOC])
+            nombres = numpy.bincount(inverse, weights=poids, minlength=len(valeurs))
+            if numpy.issubdtype(poids.dtype, numpy.integer):
+                nombres = nombres.astype(poids.dtype)
+        for valeur, nombre in zip(valeurs.tolist(), nombres.tolist()):
+            serie[valeur] = serie.get(valeur, 0) + nombre
+    return ([serie] if serie else []), []
+
+
+def importer_donnees(chemin, separateur=None, separateur_decimal=None, encodage='utf-8'):
+    """Lit les séries statistiques contenues dans le fichier `chemin`.
+
+    Le format est déduit de l'extension : .npy pour les fichiers numpy,
+    texte (CSV, TSV...) sinon.
+
+    Retourne la liste des séries (dictionnaires {valeur: effectif}),
+    et la liste des erreurs rencontrées sous la forme (numéro de ligne, message).
+
+    Exemple (dans un script) :
+    >>> series, erreurs = importer_donnees('notes.csv')
+    """
+    if chemin.lower().endswith('.npy'):
+        return importer_npy(chemin)
+    with open(chemin, encoding=encodage, newline='') as f:
+        return importer_texte(f, separateur, separateur_decimal)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+##------------------------------------------#######
+#               Série statistique                #
+##------------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Index d'une série statistique.
+
+Les valeurs de la série sont triées une fois pour toutes, et les effectifs
+cumulés sont calculés en même temps : les quantiles s'obtiennent alors
+par recherche dichotomique, et les moments en un seul passage.
+"""
+
+import numpy
+
+
+class Serie(object):
+    """Série statistique indexée.
+
+    `donnees` est un dictionnaire {valeur: effectif}.
+    Les valeurs d'effectif nul sont ignorées.
+
+    Les classes (de type `Classe`, c-à-d. des tuples) sont assimilées
+    à leur centre pour les calculs de moments, et les quantiles sont
+    estimés au sein de la classe au prorata de leur position.
+    """
+
+    def __init__(self, donnees):
+        self.total = sum(donnees.values())
+        cles = list(donnees)
+        # Séries numériques : tri effectué par numpy.
+        self.numerique = set(map(type, cles)) <= {int, float, bool}
+        if self.numerique:
+            effectifs = numpy.array(list(donnees.values()))
+            non_nuls = (effectifs != 0)
+            nombres = numpy.fromiter(cles, dtype=float, count=len(cles))[non_nuls]
+            ordre = numpy.argsort(nombres, kind='stable')
+            self.nombres = nombres[ordre]
+            self.effectifs = effectifs[non_nuls][ordre]
+            # On conserve les valeurs d'origine (entiers, booléens...).
+            self.valeurs = numpy.array(cles, dtype=object)[non_nuls][ordre]
+        else:
+            donnees = sorted((val, eff) for val, eff in donnees.items() if eff)
+            self.valeurs = [val for val, eff in donnees]
+            self.effectifs = numpy.array([eff for val, eff in donnees])
+            try:
+                # Les classes sont assimilées à leur centre.
+                self.nombres = numpy.array([float(val) for val in self.valeurs])
+                if numpy.any(numpy.diff(self.nombres) < 0):
+                    raise ValueError
+            except (TypeError, ValueError):
+                # Série qualitative
+                self.nombres = None
+        # cumul[i] : somme des effectifs des i + 1 plus petites valeurs.
+        self.cumul = numpy.cumsum(self.effectifs)
+        # Idem, précédé d'un 0 : _cumul[i] est la somme des effectifs des i plus petites valeurs.
+        self._cumul = numpy.concatenate(([0], self.cumul))
+
+    def __len__(self):
+        return len(self.valeurs)
+
+    @property
+    def minimum(self):
+        return self.valeurs[0]
+
+    @property
+    def maximum(self):
+        return self.valeurs[-1]
+
+    def moments(self):
+        "Retourne la somme des effectifs, puis les sommes des eff*val et eff*val²."
+        if self.nombres is not None and len(self.nombres):
+            effectifs = self.effectifs
+            nombres = self.nombres
+            return (float(effectifs.sum()), float(numpy.dot(effectifs, nombres)),
+                    float(numpy.dot(effectifs, nombres*nombres)))
+        total = somme = somme_carres = 0
+        for val, eff in zip(self.valeurs, self.effectifs.tolist()):
+            total += eff
+            somme += eff*val
+            somme_carres += eff*val**2
+        return total, somme, somme_carres
+
+    def effectifs_avant(self, x):
+        """Somme des effectifs des valeurs strictement inférieures à `x`.
+
+        `x` peut être un nombre ou un tableau de nombres."""
+        if self.nombres is None:
+            raise TypeError("La série doit être à valeurs numériques.")
+        return self._cumul[numpy.searchsorted(self.nombres, x, 'left')]
+
+    def effectifs_classes(self, classes):
+        """Effectifs des classes [a;b[ de la liste `classes`.
+
+        Tous les effectifs sont calculés en une seule passe (tableau numpy)."""
+        if not len(classes):
+            return numpy.zeros(0)
+        avant = self.effectifs_avant(numpy.array(classes, dtype=float))
+        return avant[:, 1] - avant[:, 0]
+
+    def moyenne(self):
+        total, somme, somme_carres = self.moments()
+        return somme/total
+
+    def variance(self):
+        total, somme, somme_carres = self.moments()
+        return somme_carres/total - (somme/total)**2
+
+    def _interpoler(self, i, objectif):
+        "Estime la position du quantile au sein de la classe n°i."
+        a, b = self.valeurs[i]
+        effectif = self.effectifs[i].item()
+        x = (self.cumul[i].item() - objectif)/effectif
+        return x*a + (1 - x)*b
+
+    def tile(self, k = 4, i = 1):
+        """Plus petite valeur x de la série telle qu'au moins i/k des données
+        de la série soient inférieures ou égales à x.
+
+        Retourne None si la série est vide."""
+        objectif = i/k*self.total
+        j = int(numpy.searchsorted(self.cumul, objectif, 'left'))
+        if j == len(self.valeurs):
+            return None
+        val = self.valeurs[j]
+        if isinstance(val, tuple):
+            return self._interpoler(j, objectif)
+        return val
+
+    def mediane(self):
+        """Valeur centrale de la série (ou demi-somme des deux valeurs centrales).
+
+        Lève une `ValueError` si le calcul est impossible."""
+        objectif = self.total/2
+        j = int(numpy.searchsorted(self.cumul, objectif, 'right'))
+        if j == len(self.valeurs):
+            raise ValueError("Série vide.")
+        val = self.valeurs[j]
+        if isinstance(val, tuple):
+            return self._interpoler(j, objectif)
+        if j and self.cumul[j - 1] == objectif:
+            # la médiane est à cheval sur 2 valeurs
+            return (self.valeurs[j - 1] + val)/2
+        return val
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+import tempfile
+
+import numpy
+
+from wxgeometrie.modules.statistiques.importation import (importer_texte,
+                                                          importer_donnees)
+from wxgeometrie.modules.statistiques import importation
+
+import tools.unittest
+
+class ModulesStatistiquesTest(tools.unittest.TestCase):
+    def test_importer_texte(self):
+        series, erreurs = importer_texte(['taille\n', '12\n', '15\n', '12\n'])
+        self.assertEqual(series, [{12: 2, 15: 1}])
+        self.assertEqual(erreurs, [])
+        # Effectifs, en-tête, séparateur décimal, plusieurs séries.
+        lignes = ['valeur;effectif', '1,5;3', '2;4', '', '7;1', '8;x', '1;2;3;4']
+        series, erreurs = importer_texte(lignes)
+        self.assertEqual(series, [{1.5: 3, 2: 4}, {7: 1}])
+        self.assertEqual([numero for numero, message in erreurs], [6, 7])
+        # Classes
+        series, erreurs = importer_texte(['0,10,4', '10,20,6', '"[20;30[",2'])
+        self.assertEqual(series, [{(0, 10): 4, (10, 20): 6, (20, 30): 2}])
+        # Séries qualitatives
+        series, erreurs = importer_texte(['rouge', 'vert', 'rouge'])
+        self.assertEqual(series, [{'rouge': 2, 'vert': 1}])
+        series, erreurs = importer_texte(['bleu\t3', 'vert\t1'])
+        self.assertEqual(series, [{'bleu': 3, 'vert': 1}])
+        self.assertEqual(importer_texte([]), ([], []))
+
+    def test_importer_fichiers(self):
+        with tempfile.TemporaryDirectory() as repertoire:
+            chemin = os.path.join(repertoire, 'notes.csv')
+            with open(chemin, 'w') as f:
+                f.write('note,effectif\n12,3\n8.5,2\n12,1\n')
+            self.assertEqual(importer_donnees(chemin), ([{12: 4, 8.5: 2}], []))
+            chemin = os.path.join(repertoire, 'valeurs.npy')
+            numpy.save(chemin, numpy.array([3, 1, 3, 2, 3]))
+            taille_bloc = importation.TAILLE_BLOC
+            try:
+                importation.TAILLE_BLOC = 2
+                self.assertEqual(importer_donnees(chemin), ([{1: 1, 2: 1, 3: 3}], []))
+                numpy.save(chemin, numpy.array([[1.5, 2], [3, 4], [1.5, 1]]))
+                self.assertEqual(importer_donnees(chemin), ([{1.5: 3., 3: 4.}], []))
+            finally:
+                importation.TAILLE_BLOC = taille_bloc
+            numpy.save(chemin, numpy.zeros((2, 2, 2)))
+            series, erreurs = importer_donnees(chemin)
+            self.assertEqual(series, [])
+            self.assertEqual(len(erreurs), 1)
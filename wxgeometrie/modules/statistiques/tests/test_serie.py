@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+import random
+
+from wxgeometrie.modules.statistiques.serie import Serie
+
+import tools.unittest
+
+
+def tile(donnees, k, i):
+    "Ancien algorithme (parcours des valeurs triées)."
+    somme = 0
+    objectif = i/k*sum(donnees.values())
+    for val, effectif in sorted(donnees.items()):
+        somme += effectif
+        if somme >= objectif:
+            return val
+
+
+class ModulesStatistiquesTest(tools.unittest.TestCase):
+    def test_quantiles(self):
+        serie = Serie({3: 2, 1: 1, 7: 0, 5: 1})
+        self.assertEqual(list(serie.valeurs), [1, 3, 5])
+        self.assertEqual(serie.total, 4)
+        self.assertEqual((serie.minimum, serie.maximum), (1, 5))
+        self.assertEqual(serie.mediane(), 3)
+        self.assertEqual(Serie({1: 1, 2: 1, 6: 0, 8: 2}).mediane(), 5)
+        self.assertEqual(Serie({1: 1, 2: 1}).mediane(), 1.5)
+        self.assertEqual(serie.tile(4, 1), 1)
+        self.assertEqual(serie.tile(4, 3), 3)
+        self.assertRaises(ValueError, Serie({}).mediane)
+        self.assertIs(Serie({}).tile(4, 1), None)
+        random.seed(1)
+        donnees = {}
+        for j in range(2000):
+            valeur = random.choice([random.randint(0, 500), random.random()*500])
+            donnees[valeur] = donnees.get(valeur, 0) + random.randint(1, 5)
+        serie = Serie(donnees)
+        for k, i in ((4, 1), (4, 3), (10, 1), (10, 9), (100, 37), (2, 1)):
+            self.assertEqual(serie.tile(k, i), tile(donnees, k, i))
+
+    def test_series_qualitatives(self):
+        serie = Serie({'vert': 3, 'bleu': 1, 'rouge': 2})
+        self.assertFalse(serie.numerique)
+        self.assertEqual(serie.tile(2, 1), 'rouge')
+        self.assertEqual(serie.minimum, 'bleu')
+
+    def test_moments(self):
+        serie = Serie({2: 3, 5: 1, 6.5: 2})
+        self.assertAlmostEqual(serie.moyenne(), 24/6)
+        self.assertAlmostEqual(serie.variance(), (12 + 25 + 84.5)/6 - 16)
+        self.assertEqual(serie.moments(), (6, 24, 121.5))
+
+    def test_effectifs_classes(self):
+        random.seed(2)
+        donnees = {}
+        for j in range(1000):
+            valeur = random.choice([random.randint(0, 100), random.random()*100])
+            donnees[valeur] = donnees.get(valeur, 0) + random.randint(0, 3)
+        serie = Serie(donnees)
+        classes = [(0, 10), (10, 25), (25, 25.5), (25.5, 100), (100, 101), (-5, 0)]
+        attendus = [sum(eff for val, eff in donnees.items() if a <= val < b)
+                    for a, b in classes]
+        self.assertEqual(serie.effectifs_classes(classes).tolist(), attendus)
+        self.assertEqual(serie.effectifs_avant([0, 50, 200]).tolist(),
+                         [0, sum(eff for val, eff in donnees.items() if val < 50), serie.total])
+        self.assertEqual(len(serie.effectifs_classes([])), 0)
+        self.assertRaises(TypeError, Serie({'vert': 3}).effectifs_classes, [(0, 1)])
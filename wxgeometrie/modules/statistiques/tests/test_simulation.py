@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+from wxgeometrie.modules.statistiques.simulation import Simulation, simuler
+
+import tools.unittest
+
+class ModulesStatistiquesTest(tools.unittest.TestCase):
+    def test_simulation_vectorisee(self):
+        simulation = Simulation('int(6*rand())+1', 250000, taille_lot=10**5)
+        effectifs = simulation.executer()
+        self.assertTrue(simulation.vectorisee)
+        self.assertEqual(sorted(effectifs), [1, 2, 3, 4, 5, 6])
+        self.assertTrue(all(type(valeur) is int for valeur in effectifs))
+        self.assertEqual(sum(effectifs.values()), 250000)
+        self.assertEqual(simulation.progression, 1)
+        effectifs = simuler('de(3)', 10000)
+        self.assertTrue(set(effectifs) <= set(range(3, 19)))
+        effectifs = simuler('sondage(30, 100)', 1000)
+        self.assertTrue(all(0 <= valeur <= 100 for valeur in effectifs))
+        self.assertEqual(simuler('rand() < .5', 1000).keys(), {True, False})
+        self.assertEqual(simuler('2*3', 10), {6: 10})
+
+    def test_simulation_non_vectorisable(self):
+        simulation = Simulation('max(alea(6), alea(6))', 1000)
+        effectifs = simulation.executer()
+        self.assertFalse(simulation.vectorisee)
+        self.assertEqual(sum(effectifs.values()), 1000)
+        self.assertTrue(set(effectifs) <= set(range(6)))
+        self.assertEqual(simuler('str(alea(1))', 10), {'0': 10})
+        self.assertEqual(simuler('[1, 2]', 10), {(1, 2): 10})
+        self.assertRaises(NameError, simuler, 'inconnue()', 10)
+
+    def test_simulation_arriere_plan(self):
+        simulation = Simulation('alea(10)', 10**6, taille_lot=10**4)
+        simulation.lancer().join()
+        self.assertTrue(simulation.terminee)
+        self.assertEqual(sum(simulation.effectifs.values()), 10**6)
+        simulation = Simulation('alea(10)', 10**6)
+        simulation.annuler()
+        simulation.executer()
+        self.assertEqual(simulation.effectifs, {})
+        # En cas d'erreur, celle-ci est renseignée avant que la simulation
+        # ne soit signalée comme terminée.
+        simulation = Simulation('inconnue()', 10)
+        self.assertRaises(NameError, simulation.executer)
+        self.assertIsInstance(simulation.erreur, NameError)
+        self.assertTrue(simulation.terminee)
+        simulation = Simulation('inconnue()', 10)
+        simulation.lancer().join()
+        self.assertIsInstance(simulation.erreur, NameError)
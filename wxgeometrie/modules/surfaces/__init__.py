@@ -21,6 +21,9 @@
 #    along with this program; if not, write to the Free Software
 #    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
+import time
+
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
                          QGroupBox)
 
@@ -28,15 +31,14 @@ from mpl_toolkits.mplot3d import Axes3D
 from matplotlib import cm
 from matplotlib.axes import Axes
 from matplotlib.colors import LinearSegmentedColormap
-from numpy import max as nmax, min as nmin, meshgrid
+from numpy import max as nmax, min as nmin
 
 from ...GUI.qtlib import BusyCursor
 from ...GUI.menu import MenuBar
 from ...GUI.panel import Panel_API_graphique
 from ...pylib import fullrange, eval_safe
-from ...pylib.securite import dictionnaire_builtins
-from ...mathlib import end_user_functions
-from ...mathlib.parsers import traduire_formule
+from ... import param
+from .maillage import CalculSurface, pas_decimation
 
 
 class SurfacesMenuBar(MenuBar):
@@ -126,6 +128,17 @@ class Surfaces(Panel_API_graphique):
 [0.5, 0, 0],
 ]
         self._Z = None
+        # Surface affichée, et version allégée affichée pendant les rotations.
+        self.polyc = self.polyc_allegee = None
+        # Calcul de la surface en arrière-plan (cf. `_affiche()`).
+        self._calcul = None
+        # Paramètres de la surface affichée (ou en cours de calcul).
+        self._cle = None
+        self._grilles_affichees = 0
+        # Durées des calculs et des affichages successifs (grossier, puis complet).
+        self.durees = {}
+        self._minuteur = QTimer(self)
+        self._minuteur.timeout.connect(self._suivre_calcul)
 
         self.entrees = QVBoxLayout()
 
@@ -137,6 +150,8 @@ class Surfaces(Panel_API_graphique):
         self.equation = QLineEdit(self)
         self.equation.setMinimumWidth(160)
         self.equation.returnPressed.connect(self.affiche)
+        # Le calcul en cours devient inutile si l'équation est modifiée.
+        self.equation.textEdited.connect(self.interrompre_calcul)
         ligne.addWidget(self.equation)
         self.entrees.addWidget(box)
 
@@ -229,6 +244,8 @@ class Surfaces(Panel_API_graphique):
         self.adjustSize()
         self.ax3d = MyAxes3D(self.canvas.figure)
         self.plt = self.canvas.figure.axes.append(self.ax3d)
+        self.canvas.mpl_connect('button_press_event', self._debut_rotation)
+        self.canvas.mpl_connect('button_release_event', self._fin_rotation)
         self.initialisation_terminee = True
 
 
@@ -283,17 +300,75 @@ class Surfaces(Panel_API_graphique):
         if pasY < self._param_.resolution_minimale*max(xmax - xmin, ymax - ymin):
             pasY = self._param_.resolution_minimale*max(xmax - xmin, ymax - ymin)
             self.canvas.message("Attention, le pas est trop petit !")
+        seuils_txt = self.seuils.text().strip()
+        cle = (self.equation.text().strip(), xmin, xmax, pasX, ymin, ymax, pasY, seuils_txt)
+        if cle == self._cle:
+            # Surface déjà affichée, ou en cours de calcul.
+            return
+        self.interrompre_calcul()
+        self._cle = cle
+        # Une grille grossière est calculée et affichée en premier.
+        lignes = self._param_.lignes_apercu
+        apercu = (max(pasX, (xmax - xmin)/lignes), max(pasY, (ymax - ymin)/lignes))
+        calcul = CalculSurface(self.equation.text(), xmin, xmax, pasX, ymin, ymax, pasY, apercu)
+        self._calcul = calcul
+        self._grilles_affichees = 0
+        self.durees = {'calcul': calcul.durees, 'affichage': []}
+        if calcul.en_cache:
+            # Inutile de passer par un thread, la grille est déjà calculée.
+            calcul.executer()
+            self._suivre_calcul(rafraichir=False)
+        else:
+            calcul.lancer()
+            self._minuteur.start(50)
+
+
+    def interrompre_calcul(self, event=None):
+        "Interrompt le calcul de la surface en cours éventuel."
+        if self._calcul is not None:
+            self._calcul.annuler()
+            self._calcul = None
+            self._minuteur.stop()
+            self._cle = None
+
+
+    def _suivre_calcul(self, rafraichir=True):
+        "Affiche les grilles calculées en arrière-plan, au fur et à mesure."
+        calcul = self._calcul
+        if calcul is None:
+            self._minuteur.stop()
+            return
+        if calcul.erreur is not None:
+            self._minuteur.stop()
+            self._calcul = None
+            self._cle = None
+            self.canvas.message("Erreur : %s" % calcul.erreur)
+            return
+        if len(calcul.resultats) > self._grilles_affichees:
+            # Seule la grille la plus fine disponible est affichée.
+            self._grilles_affichees = len(calcul.resultats)
+            X, Y, Z = calcul.resultats[-1]
+            debut = time.time()
+            self._tracer(X, Y, Z, self._cle[-1])
+            self.durees['affichage'].append(time.time() - debut)
+            if rafraichir:
+                self.canvas.rafraichir_affichage(rafraichir_axes=True)
+        if calcul.terminee:
+            self._minuteur.stop()
+            self._calcul = None
+            if param.debug:
+                print("Surface : calcul %s s, affichage %s s."
+                      % (', '.join('%.3f' % t for t in self.durees['calcul']),
+                         ', '.join('%.3f' % t for t in self.durees['affichage'])))
+        else:
+            self.canvas.message("Calcul de la surface : %s %%" % int(100*calcul.progression))
+
+
+    def _tracer(self, X, Y, Z, seuils_txt):
+        "Crée les objets matplotlib représentant la surface (thread principal uniquement)."
         with BusyCursor():
-            X = fullrange(xmin, xmax, pasX)
-            Y = fullrange(ymin, ymax, pasY)
-            X, Y = meshgrid(X, Y)
-            dico = vars(end_user_functions).copy()
-            dico.update({'x': X, 'X': X, 'Y': Y, 'y': Y})
-            dico.update(dictionnaire_builtins)
-            formule = traduire_formule(self.equation.text(), dico)
-            self._Z = Z = eval(formule, dico) + 0*X # conversion des constantes en numpy.ndarray
-
-            seuils_txt = self.seuils.text().strip()
+            self._Z = Z
+
             if seuils_txt:
                 # On récupère et on classe les valeurs
                 seuils = sorted(float(seuil) for seuil in seuils_txt.split(' '))
@@ -304,6 +379,16 @@ class Surfaces(Panel_API_graphique):
             self.ax3d.clear()
             self.polyc = self.ax3d.plot_surface(X, Y, Z, rstride = 1, cstride = 1, cmap = cmap)
             self.polyc.set_linewidth(self._param_.epaisseur_grillage)
+            # Maillage allégé, affiché à la place du maillage complet pendant
+            # les rotations (l'affichage complet est trop lent pour les grilles fines).
+            rstride, cstride = pas_decimation(Z.shape, self._param_.polygones_rotation)
+            if rstride == cstride == 1:
+                self.polyc_allegee = None
+            else:
+                self.polyc_allegee = self.ax3d.plot_surface(X, Y, Z, rstride=rstride,
+                                                            cstride=cstride, cmap=cmap)
+                self.polyc_allegee.set_linewidth(self._param_.epaisseur_grillage)
+                self.polyc_allegee.set_visible(False)
             return
             if seuils_txt:
                 # linestyles = 'dotted'
@@ -312,6 +397,19 @@ class Surfaces(Panel_API_graphique):
                     collection._force_zorder = 100
 
 
+    def _debut_rotation(self, event):
+        if self.polyc_allegee is not None and event.inaxes is self.ax3d:
+            self.polyc.set_visible(False)
+            self.polyc_allegee.set_visible(True)
+
+    def _fin_rotation(self, event):
+        # Le maillage complet est réaffiché dès que la rotation est terminée
+        # (en particulier, c'est lui qui est exporté).
+        if self.polyc_allegee is not None and self.polyc_allegee.get_visible():
+            self.polyc_allegee.set_visible(False)
+            self.polyc.set_visible(True)
+            self.canvas.draw_idle()
+
     def _creer_cmap(self, seuils):
         zmax = nmax(self._Z)
         zmin = nmin(self._Z)
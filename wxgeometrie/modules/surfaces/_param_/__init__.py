@@ -4,3 +4,7 @@ resolution = .025
 resolution_minimale = .002 # une valeur trop faible peut faire planter l'ordinateur (à adapter selon la puissance de la machine) !
 mode = ("plot_surface", "plot_wireframe", "contour3D", "contourf3D")[0] # cf axes3d.py de matplotlib
 epaisseur_grillage = .5
+# Nombre maximal de polygones affichés pendant la rotation de la surface.
+polygones_rotation = 2500
+# Nombre de lignes et de colonnes de la grille affichée en attendant la fin du calcul.
+lignes_apercu = 40
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#             Maillage des surfaces           #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Calcul des surfaces Z = f(X, Y).
+
+La formule est compilée une seule fois, puis évaluée par blocs de lignes
+de la grille, ce qui limite la mémoire utilisée pour les calculs
+intermédiaires. Les grilles calculées sont conservées en cache (formule,
+bornes et pas identiques : pas de nouveau calcul).
+
+`pas_decimation()` permet d'alléger le maillage affiché (lors de la rotation
+de la surface par exemple).
+
+`CalculSurface` effectue le calcul en arrière-plan (thread), en commençant
+éventuellement par une grille grossière (aperçu).
+"""
+
+from math import ceil, sqrt
+import time
+
+import numpy
+
+from ...pylib import fullrange
+from ...pylib.calcul import CalculArrierePlan
+from ...pylib.securite import dictionnaire_builtins
+from ...mathlib import end_user_functions
+from ...mathlib.memoisation import Cache
+from ...mathlib.parsers import traduire_formule
+
+
+# Nombre (approximatif) de points de la grille évalués à la fois.
+TAILLE_BLOC = 2**18
+
+# Nombre de grilles conservées en cache.
+TAILLE_CACHE = 4
+
+_cache = Cache('surfaces', TAILLE_CACHE)
+
+
+def grille(xmin, xmax, pas):
+    "Valeurs de xmin à xmax (inclus) avec un pas de `pas`."
+    return fullrange(xmin, xmax, pas)
+
+
+def compiler(equation):
+    """Compile l'expression de Z en fonction de X et Y.
+
+    Retourne le code compilé, et le dictionnaire à utiliser pour l'évaluer."""
+    dico = vars(end_user_functions).copy()
+    dico.update(dictionnaire_builtins)
+    formule = traduire_formule(equation, dico)
+    return compile(formule, '<surface>', 'eval'), dico
+
+
+def evaluer_par_blocs(equation, xs, ys, Z, taille_bloc=None):
+    """Calcule Z = f(X, Y) sur la grille définie par `xs` et `ys`.
+
+    Le tableau `Z` (de dimensions (len(ys), len(xs))) est rempli par blocs
+    de lignes ; après chaque bloc, la proportion de lignes déjà calculées
+    est générée (ce qui permet de suivre, voire d'interrompre, le calcul)."""
+    code, dico = compiler(equation)
+    if taille_bloc is None:
+        taille_bloc = TAILLE_BLOC
+    lignes = max(1, taille_bloc//max(len(xs), 1))
+    for debut in range(0, len(ys), lignes):
+        X, Y = numpy.meshgrid(xs, ys[debut:debut + lignes])
+        dico.update({'x': X, 'X': X, 'Y': Y, 'y': Y})
+        # NB: les constantes sont converties en tableaux.
+        Z[debut:debut + lignes] = numpy.broadcast_to(eval(code, dico), X.shape)
+        yield min(debut + lignes, len(ys))/len(ys)
+
+
+def _cle(equation, xmin, xmax, pasX, ymin, ymax, pasY):
+    return (equation.strip(), xmin, xmax, pasX, ymin, ymax, pasY)
+
+
+def surface(equation, xmin, xmax, pasX, ymin, ymax, pasY, taille_bloc=None, suivi=None):
+    """Calcule la surface Z = f(X, Y), pour X de xmin à xmax et Y de ymin à ymax.
+
+    Retourne les tableaux X, Y et Z (de même dimension).
+    Le résultat est conservé en cache : un tableau retourné ne doit donc
+    pas être modifié.
+
+    `suivi` est une fonction éventuelle, appelée après chaque bloc de lignes
+    avec la proportion déjà calculée. Si elle retourne True, le calcul
+    est interrompu, et la fonction retourne None."""
+    cle = _cle(equation, xmin, xmax, pasX, ymin, ymax, pasY)
+    try:
+        return _cache.lire(cle)
+    except KeyError:
+        pass
+    xs = grille(xmin, xmax, pasX)
+    ys = grille(ymin, ymax, pasY)
+    Z = numpy.empty((len(ys), len(xs)))
+    for progression in evaluer_par_blocs(equation, xs, ys, Z, taille_bloc):
+        if suivi is not None and suivi(progression):
+            return None
+    X, Y = numpy.meshgrid(xs, ys)
+    resultat = (X, Y, Z)
+    _cache.ecrire(cle, resultat)
+    return resultat
+
+
+def pas_decimation(dimensions, nbr_max):
+    """Pas à utiliser selon les lignes et les colonnes de la grille, pour que
+    le nombre de polygones affichés ne dépasse pas (environ) `nbr_max`.
+
+    `dimensions` est le couple (nombre de lignes, nombre de colonnes).
+    Retourne le couple (rstride, cstride) à transmettre à `plot_surface()`."""
+    lignes = max(dimensions[0] - 1, 1)
+    colonnes = max(dimensions[1] - 1, 1)
+    if lignes*colonnes <= nbr_max:
+        return 1, 1
+    # Même pas dans les deux directions, sauf si la grille est très allongée.
+    rstride = min(int(ceil(sqrt(lignes*colonnes/nbr_max))), lignes)
+    rangees = int(ceil(lignes/rstride))
+    cstride = min(int(ceil(colonnes*rangees/nbr_max)), colonnes)
+    return rstride, cstride
+
+
+class CalculSurface(CalculArrierePlan):
+    """Calcule en arrière-plan la surface Z = f(X, Y).
+
+    Si `apercu` est précisé (couple de pas (pasX, pasY)), une grille grossière
+    est d'abord calculée, ce qui permet un premier affichage rapide.
+    Les grilles sont ajoutées à la liste `resultats` dès qu'elles sont
+    disponibles, et la durée de chaque calcul à la liste `durees`.
+    """
+
+    def __init__(self, equation, xmin, xmax, pasX, ymin, ymax, pasY, apercu=None):
+        CalculArrierePlan.__init__(self)
+        self.equation = equation
+        self.bornes = (xmin, xmax, ymin, ymax)
+        self.etapes = [(pasX, pasY)]
+        # Pas d'aperçu si la grille complète a déjà été calculée.
+        self.en_cache = _cle(equation, xmin, xmax, pasX, ymin, ymax, pasY) in _cache
+        if apercu is not None and tuple(apercu) != (pasX, pasY) and not self.en_cache:
+            self.etapes.insert(0, tuple(apercu))
+        self.resultats = []
+        self.durees = []
+
+    def calculer(self):
+        "Calcule les grilles, et retourne la plus fine (ou None si le calcul a été annulé)."
+        xmin, xmax, ymin, ymax = self.bornes
+        for i, (pasX, pasY) in enumerate(self.etapes):
+            if self.annulee:
+                break
+            def suivi(progression):
+                self.progression = (i + progression)/len(self.etapes)
+                return self.annulee
+            debut = time.time()
+            resultat = surface(self.equation, xmin, xmax, pasX, ymin, ymax, pasY,
+                               suivi=suivi)
+            if resultat is None:
+                break
+            self.durees.append(time.time() - debut)
+            self.resultats.append(resultat)
+        return (self.resultats[-1] if len(self.resultats) == len(self.etapes) else None)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+import numpy
+
+from wxgeometrie.modules.surfaces.maillage import (surface, pas_decimation, _cache,
+                                                   CalculSurface)
+
+import tools.unittest
+
+class ModulesSurfacesTest(tools.unittest.TestCase):
+    def test_surface(self):
+        X, Y, Z = surface('x^2 - 3y', -2, 2, .5, -1, 3, .25, taille_bloc=20)
+        self.assertEqual(Z.shape, (17, 9))
+        self.assertEqual(X.shape, Z.shape)
+        self.assertTrue(numpy.allclose(Z, X**2 - 3*Y))
+        # Pas de nouveau calcul.
+        self.assertIs(surface('x^2 - 3y', -2, 2, .5, -1, 3, .25)[2], Z)
+        succes = _cache.succes
+        surface('x^2 - 3y', -2, 2, .5, -1, 3, .2)
+        self.assertEqual(_cache.succes, succes)
+        # Constantes
+        X, Y, Z = surface('2', 0, 1, .5, 0, 1, .5)
+        self.assertEqual(Z.tolist(), 3*[3*[2]])
+
+    def test_pas_decimation(self):
+        self.assertEqual(pas_decimation((11, 11), 100), (1, 1))
+        self.assertEqual(pas_decimation((1001, 1001), 2500), (20, 20))
+        rstride, cstride = pas_decimation((3, 10**6 + 1), 2500)
+        self.assertEqual(rstride, 2)
+        self.assertLessEqual((10**6//cstride), 2500)
+
+    def test_CalculSurface(self):
+        calcul = CalculSurface('x*y', -1, 1, .01, -1, 1, .01, apercu=(.5, .5))
+        self.assertFalse(calcul.en_cache)
+        X, Y, Z = calcul.executer()
+        self.assertTrue(calcul.terminee)
+        self.assertEqual(calcul.progression, 1)
+        self.assertEqual([z.shape for x, y, z in calcul.resultats], [(5, 5), (201, 201)])
+        self.assertEqual(len(calcul.durees), 2)
+        self.assertTrue(numpy.allclose(Z, X*Y))
+        # Grille déjà calculée : pas d'aperçu.
+        calcul = CalculSurface('x*y', -1, 1, .01, -1, 1, .01, apercu=(.5, .5))
+        self.assertTrue(calcul.en_cache)
+        self.assertEqual(len(calcul.etapes), 1)
+        # Calcul annulé
+        calcul = CalculSurface('x + y', -1, 1, .01, -1, 1, .01, apercu=(.5, .5))
+        calcul.annuler()
+        self.assertIsNone(calcul.executer())
+        self.assertEqual(calcul.resultats, [])
+        # Erreur lors du calcul en arrière-plan
+        calcul = CalculSurface('x +* y', -1, 1, .5, -1, 1, .5)
+        calcul.lancer().join()
+        self.assertIsNotNone(calcul.erreur)
+        self.assertTrue(calcul.terminee)
+        # L'erreur est renseignée avant que le calcul ne soit signalé comme terminé.
+        calcul = CalculSurface('x +* y', -1, 1, .5, -1, 1, .5)
+        self.assertRaises(Exception, calcul.executer)
+        self.assertIsNotNone(calcul.erreur)
+        self.assertTrue(calcul.terminee)
@@ -31,11 +31,12 @@ from wxgeometrie.GUI.ligne_commande import LigneCommande
 from wxgeometrie.GUI.menu import MenuBar
 from wxgeometrie.GUI.panel import Panel_simple
 from wxgeometrie import param
-from wxgeometrie.pylib import warning, print_error
+from wxgeometrie.pylib import print_error
 from wxgeometrie.pylib.erreurs import message
 from .tabsign import tabsign
 from .tabval import tabval
 from .tabvar import tabvar
+from .lot import generer
 
 
 
@@ -234,23 +235,8 @@ class TabLaTeX(Panel_simple):
 
         self.modifie = True
         try:
-            if self._param_.mode == 0:
-                code_latex = tabvar(commande, derivee=self._param_.derivee,
-                                    limites=self._param_.limites,
-                                    decimales=self._param_.decimales_tabvar_tabsign,
-                                    approche=(self._param_.decimales_tabvar_tabsign != -1))
-            elif self._param_.mode == 1:
-                code_latex = tabsign(commande, cellspace=self._param_.utiliser_cellspace,
-                                    decimales=self._param_.decimales_tabvar_tabsign,
-                                    approche=(self._param_.decimales_tabvar_tabsign != -1))
-            elif self._param_.mode == 2:
-                code_latex = tabval(commande,
-                    formatage_antecedents=self._param_.formatage_antecedents,
-                    formatage_images=self._param_.formatage_images,
-                    precision=10**-self._param_.decimales_tabval)
-            else:
-                warning("Type de tableau non reconnu.")
-
+            type_tableau, code, options = self.specification(commande)
+            code_latex = generer(type_tableau, code, **options)
             self.code_tableau.setText(code_latex)
             if self._param_.copie_automatique:
                 self.vers_presse_papier(texte = code_latex)
@@ -264,6 +250,28 @@ class TabLaTeX(Panel_simple):
                 raise
 
 
+    def specification(self, commande):
+        """Type de tableau, code et options correspondant aux réglages actuels.
+
+        Le résultat peut être transmis à `lot.generer()` ou `lot.generer_lot()`."""
+        if self._param_.mode == 0:
+            return ('tabvar', commande, dict(derivee=self._param_.derivee,
+                        limites=self._param_.limites,
+                        decimales=self._param_.decimales_tabvar_tabsign,
+                        approche=(self._param_.decimales_tabvar_tabsign != -1)))
+        elif self._param_.mode == 1:
+            return ('tabsign', commande, dict(cellspace=self._param_.utiliser_cellspace,
+                        decimales=self._param_.decimales_tabvar_tabsign,
+                        approche=(self._param_.decimales_tabvar_tabsign != -1)))
+        elif self._param_.mode == 2:
+            return ('tabval', commande, dict(
+                        formatage_antecedents=self._param_.formatage_antecedents,
+                        formatage_images=self._param_.formatage_images,
+                        precision=10**-self._param_.decimales_tabval,
+                        colonnes_max=self._param_.colonnes_max_tabval))
+        raise ValueError("Type de tableau non reconnu.")
+
+
     def EvtChoix(self, event = None):
         self._param_.mode = self.type_tableau.currentIndex()
         # Tableaux de variations
@@ -15,3 +15,5 @@ formatage_images = r"\nombre{VAL}"
 # Nombre de décimales, ou None pour les valeurs exactes
 decimales_tabvar_tabsign = -1
 decimales_tabval = 2
+# Nombre maximal de valeurs par tableau de valeurs (0 : pas de limite)
+colonnes_max_tabval = 0
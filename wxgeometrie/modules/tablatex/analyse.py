@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#           Étude d'une fonction              #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Étude d'une fonction d'une variable réelle, partagée par tabvar et tabsign.
+
+Un objet `Analyse` calcule à la demande, et une seule fois, l'ensemble
+de définition, la dérivée, les zéros, les images et les limites.
+La dérivée est elle-même étudiée par une `Analyse` : le tableau de signes
+de f' réutilise ainsi les calculs effectués pour le tableau de variations de f.
+
+Les analyses récentes sont conservées en cache (voir `analyser()`) :
+modifier une option d'affichage (décimales, limites...) ne relance
+pas les calculs.
+"""
+
+from sympy import limit
+
+from .racines import trier, signe, entre, encadrement
+from wxgeometrie.mathlib.memoisation import Cache
+from wxgeometrie.mathlib.solvers import ensemble_definition
+from wxgeometrie.mathlib.sympy_functions import solve
+from wxgeometrie.mathlib.intervalles import R
+
+
+_cache = Cache('analyses', 50)
+
+
+class Analyse(object):
+    """Étude de l'expression `expr` de variable `var`, sur `ens_def`
+    (intersecté avec l'ensemble de définition de l'expression).
+
+    Chaque résultat est calculé lors de la première demande, puis mémorisé.
+    """
+
+    def __init__(self, expr, var, ens_def=R):
+        self.expr = expr
+        self.var = var
+        self._ens_def = ens_def
+        self._resultats = {}
+
+    def _memoriser(self, cle, calcul, *args):
+        try:
+            return self._resultats[cle]
+        except KeyError:
+            resultat = self._resultats[cle] = calcul(*args)
+            return resultat
+
+    def ens_def(self):
+        "Ensemble de définition."
+        return self._memoriser('ens_def', lambda: self._ens_def & ensemble_definition(self.expr, self.var))
+
+    def racines(self):
+        "Zéros de l'expression, triés par ordre croissant."
+        return self._memoriser('racines', lambda: trier(solve(self.expr, self.var)))
+
+    def derivee(self):
+        "Analyse de la dérivée, sur l'ensemble de définition de l'expression."
+        def calcul():
+            df = self.expr.diff(self.var)
+            return Analyse(df, self.var, ensemble_definition(df, self.var) & self.ens_def())
+        return self._memoriser('derivee', calcul)
+
+    def points_critiques(self):
+        "Zéros de la dérivée, triés par ordre croissant."
+        return self.derivee().racines()
+
+    def image(self, x):
+        "Valeur exacte de l'expression en `x`."
+        return self._memoriser(('image', x), self.expr.subs, self.var, x)
+
+    def limite(self, x, direction):
+        "Limite en `x`, à gauche (`direction='-'`) ou à droite (`direction='+'`)."
+        return self._memoriser(('limite', x, direction), limit, self.expr, self.var, x, direction)
+
+    def approximation(self, x):
+        "Valeur approchée (flottant) de l'image de `x`."
+        def calcul():
+            inf, sup = encadrement(self.image(x))
+            return float((inf + sup)/2)
+        return self._memoriser(('approximation', x), calcul)
+
+    def signe_entre(self, a, b):
+        """Signe (-1, 0 ou 1) de l'expression entre `a` et `b`.
+
+        L'expression est supposée continue et non nulle sur ]a;b[."""
+        return self._memoriser(('signe', a, b), lambda: signe(self.image(entre(a, b))))
+
+
+def analyser(expr, var, ens_def=R):
+    "Retourne l'`Analyse` de `expr` sur `ens_def`, éventuellement déjà effectuée."
+    cle = (expr, var, str(ens_def))
+    try:
+        return _cache.lire(cle)
+    except KeyError:
+        analyse = Analyse(expr, var, ens_def)
+        _cache.ecrire(cle, analyse)
+        return analyse
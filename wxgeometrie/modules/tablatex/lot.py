@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#         Génération de tableaux par lots     #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Génération d'un grand nombre de tableaux (variations, signes, valeurs).
+
+Chaque tableau est décrit par un tuple (type, code) ou (type, code, options),
+où type vaut 'tabvar', 'tabsign' ou 'tabval', et options est un dictionnaire
+transmis à la fonction correspondante (ex: {'derivee': False}).
+
+Les tableaux identiques ne sont générés qu'une fois, et le code LaTeX obtenu
+est conservé dans un cache sur le disque (la clé tient compte du type,
+du code, des options et de la version du logiciel).
+Les tableaux restants sont répartis entre plusieurs processus, avec
+éventuellement une durée maximale par tableau.
+
+Exemple (dans un script) :
+>>> codes, erreurs = generer_lot([('tabvar', 'f(x)=x^2'), ('tabsign', '(x-1)(x+2)')])
+
+En ligne de commande (un tableau par ligne, sous la forme "type: code") :
+$ python -m wxgeometrie.modules.tablatex.lot tableaux.txt -o tableaux.tex
+"""
+
+from contextlib import contextmanager
+import hashlib
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+
+from .tabsign import tabsign
+from .tabval import tabval
+from .tabvar import tabvar
+from wxgeometrie.pylib import path2
+from wxgeometrie.pylib.erreurs import message
+from wxgeometrie import param
+
+
+TYPES = {'tabvar': tabvar, 'tabsign': tabsign, 'tabval': tabval}
+
+
+class DelaiDepasse(Exception):
+    pass
+
+
+def generer(type_tableau, code, **options):
+    "Génère le code LaTeX d'un tableau ('tabvar', 'tabsign' ou 'tabval')."
+    if type_tableau not in TYPES:
+        raise ValueError("Type de tableau inconnu : '%s'." % type_tableau)
+    return TYPES[type_tableau](code, **options)
+
+
+def _normaliser(specification):
+    "Retourne la clé (type, code, options triées) décrivant le tableau."
+    if len(specification) == 2:
+        type_tableau, code = specification
+        options = {}
+    else:
+        type_tableau, code, options = specification
+    return (type_tableau.strip(), code.strip(), tuple(sorted(options.items())))
+
+
+class CacheDisque(object):
+    """Codes LaTeX déjà générés, enregistrés dans le dossier `dossier`.
+
+    Par défaut, le dossier 'tablatex' de `param.emplacements['cache']` est utilisé.
+    Comme pour `mathlib.memoisation.Cache`, `lire()` lève une `KeyError`
+    si la clé est absente du cache."""
+
+    def __init__(self, dossier=None):
+        if dossier is None:
+            dossier = path2(param.emplacements['cache'] + '/tablatex')
+        self.dossier = dossier
+        self.succes = self.echecs = 0
+
+    def _chemin(self, cle):
+        # Les paramètres globaux qui modifient le code généré font partie de la clé.
+        cle += (param.version, param.separateur_decimal, param.tolerance)
+        empreinte = hashlib.sha1(repr(cle).encode('utf-8')).hexdigest()
+        return os.path.join(self.dossier, empreinte + '.tex')
+
+    def lire(self, cle):
+        try:
+            with open(self._chemin(cle), encoding='utf-8') as f:
+                code = f.read()
+        except OSError:
+            self.echecs += 1
+            raise KeyError(cle)
+        self.succes += 1
+        return code
+
+    def ecrire(self, cle, code):
+        os.makedirs(self.dossier, exist_ok=True)
+        chemin = self._chemin(cle)
+        # Écriture dans un fichier temporaire, puis renommage : un autre
+        # processus ne peut ainsi jamais lire un fichier incomplet.
+        temporaire = '%s.%s' % (chemin, os.getpid())
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            f.write(code)
+        os.replace(temporaire, chemin)
+
+
+@contextmanager
+def _delai_maximal(delai):
+    """Interrompt le calcul (`DelaiDepasse`) au bout de `delai` secondes.
+
+    Sans effet si `delai` vaut None, ou si le système ne le permet pas
+    (pas de `signal.setitimer()` sous Windows, ou thread secondaire)."""
+    if (not delai or not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+    def interrompre(signum, frame):
+        raise DelaiDepasse("Délai de %s s dépassé." % delai)
+    precedent = signal.signal(signal.SIGALRM, interrompre)
+    signal.setitimer(signal.ITIMER_REAL, delai)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, precedent)
+
+
+def _executer(cle, delai=None):
+    """Génère le tableau correspondant à `cle` (voir `_normaliser()`).
+
+    Retourne (True, code LaTeX), ou (False, message d'erreur) : seuls
+    des objets simples transitent ainsi entre les processus."""
+    type_tableau, code, options = cle
+    try:
+        with _delai_maximal(delai):
+            return True, generer(type_tableau, code, **dict(options))
+    except Exception as erreur:
+        return False, (str(erreur) or message(erreur))
+
+
+def generer_lot(specifications, processus=None, delai=None, cache=True):
+    """Génère les tableaux décrits par `specifications` (voir la documentation du module).
+
+    `processus` est le nombre de processus utilisés (par défaut, le nombre
+    de processeurs) ; avec `processus=1`, tout est calculé dans le processus courant.
+    `delai` est la durée maximale (en secondes) de génération d'un tableau.
+    `cache` vaut True (cache par défaut), False (pas de cache), ou est
+    un objet ayant des méthodes `lire()` et `ecrire()` (ex: `CacheDisque`).
+
+    Retourne la liste des codes LaTeX (None pour les tableaux en erreur),
+    et la liste des erreurs rencontrées sous la forme (numéro du tableau, message).
+    """
+    if cache is True:
+        cache = CacheDisque()
+    # Tableaux distincts : {clé: numéros des tableaux correspondants}.
+    tableaux = {}
+    erreurs = []
+    for i, specification in enumerate(specifications):
+        try:
+            cle = _normaliser(specification)
+        except (TypeError, ValueError, AttributeError):
+            erreurs.append((i, "Tableau n°%s incorrect : %r." % (i + 1, specification)))
+            continue
+        tableaux.setdefault(cle, []).append(i)
+    codes = len(specifications)*[None]
+
+    a_generer = []
+    for cle, numeros in tableaux.items():
+        try:
+            code = cache.lire(cle) if cache else None
+        except KeyError:
+            code = None
+        if code is None:
+            a_generer.append(cle)
+        else:
+            for i in numeros:
+                codes[i] = code
+
+    def enregistrer(cle, resultat):
+        reussite, texte = resultat
+        if reussite:
+            if cache:
+                cache.ecrire(cle, texte)
+            for i in tableaux[cle]:
+                codes[i] = texte
+        else:
+            erreurs.extend((i, "Tableau n°%s (%s) : %s" % (i + 1, cle[1], texte))
+                           for i in tableaux[cle])
+
+    if processus is None:
+        processus = os.cpu_count() or 1
+    processus = min(processus, len(a_generer))
+    if processus <= 1:
+        for cle in a_generer:
+            enregistrer(cle, _executer(cle, delai))
+    else:
+        with multiprocessing.Pool(processus) as pool:
+            resultats = [(cle, pool.apply_async(_executer, (cle, delai)))
+                         for cle in a_generer]
+            for cle, resultat in resultats:
+                try:
+                    # Le délai est normalement géré par le processus lui-même ;
+                    # ceci évite de rester bloqué lorsque ce n'est pas possible.
+                    enregistrer(cle, resultat.get(None if delai is None else 2*delai + 1))
+                except multiprocessing.TimeoutError:
+                    enregistrer(cle, (False, "Délai de %s s dépassé." % delai))
+        # En quittant le bloc `with`, les processus encore actifs sont arrêtés.
+    erreurs.sort()
+    return codes, erreurs
+
+
+def lire_specifications(lignes):
+    """Lit la liste des tableaux à générer, à raison d'un tableau par ligne,
+    sous la forme "type: code" (ex: "tabvar: f(x)=x^2").
+
+    Les lignes vides et celles commençant par '#' sont ignorées."""
+    specifications = []
+    for ligne in lignes:
+        ligne = ligne.strip()
+        if not ligne or ligne.startswith('#'):
+            continue
+        type_tableau, _, code = ligne.partition(':')
+        specifications.append((type_tableau.strip(), code.strip()))
+    return specifications
+
+
+def main(arguments=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Génère le code LaTeX d'une série de tableaux.")
+    parser.add_argument('fichier', help="fichier contenant un tableau par ligne (ex: 'tabvar: f(x)=x^2')")
+    parser.add_argument('-o', '--sortie', help="fichier LaTeX généré (par défaut, sortie standard)")
+    parser.add_argument('-j', '--processus', type=int, help="nombre de processus")
+    parser.add_argument('-t', '--delai', type=float, help="durée maximale par tableau (en secondes)")
+    parser.add_argument('--sans-cache', action='store_true', help="ne pas utiliser le cache")
+    args = parser.parse_args(arguments)
+
+    with open(args.fichier, encoding='utf-8') as f:
+        specifications = lire_specifications(f)
+    codes, erreurs = generer_lot(specifications, processus=args.processus,
+                                 delai=args.delai, cache=not args.sans_cache)
+    texte = '\n'.join(code for code in codes if code is not None)
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as f:
+            f.write(texte)
+    else:
+        sys.stdout.write(texte)
+    for i, erreur in erreurs:
+        print(erreur, file=sys.stderr)
+    print("%s tableau(x) généré(s), %s erreur(s)." % (len(codes) - len(erreurs), len(erreurs)),
+          file=sys.stderr)
+    return (1 if erreurs else 0)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
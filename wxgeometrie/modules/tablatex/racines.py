@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+##--------------------------------------#######
+#         Comparaison des valeurs exactes     #
+##--------------------------------------#######
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Comparaison et tri de valeurs réelles exactes (racines, valeurs interdites...).
+
+sympy ne sait pas toujours comparer directement des expressions compliquées
+(racines de polynômes de degré 3 par exemple). Chaque valeur est donc
+encadrée par deux rationnels, à partir d'une valeur approchée avec
+`PRECISION_INITIALE` chiffres significatifs. Si les encadrements de deux
+valeurs se chevauchent, la précision est doublée (jusqu'à `PRECISION_MAXIMALE`) ;
+au-delà, les valeurs sont considérées comme égales, sauf si sympy
+parvient à prouver le contraire.
+
+Les encadrements sont conservés en cache : une racine déjà comparée
+n'est pas réévaluée lors du calcul d'un signe, ou d'un autre tableau.
+"""
+
+from fractions import Fraction
+from functools import cmp_to_key
+from math import floor, ceil
+
+from sympy import S, oo, Integer, Rational
+from mpmath.libmp import to_rational
+
+from wxgeometrie.mathlib.memoisation import Cache
+
+
+# Nombre de chiffres significatifs des premières valeurs approchées.
+PRECISION_INITIALE = 15
+
+# Précision au-delà de laquelle deux valeurs sont considérées comme égales.
+PRECISION_MAXIMALE = 960
+
+_cache = Cache('encadrements', 5000)
+
+
+def encadrement(x, chiffres=None):
+    """Encadrement (inf, sup) de la valeur réelle `x` par deux fractions,
+    obtenu avec (au moins) `chiffres` chiffres significatifs.
+
+    Lève une `ValueError` si `x` n'est pas un nombre réel."""
+    if chiffres is None:
+        chiffres = PRECISION_INITIALE
+    x = S(x)
+    if x.is_Rational:
+        valeur = _fraction(x)
+        return valeur, valeur
+    try:
+        precision, inf, sup = _cache.lire(x)
+        if precision >= chiffres:
+            return inf, sup
+    except KeyError:
+        pass
+    approximation = x.evalf(chiffres)
+    reel, imaginaire = approximation.as_real_imag()
+    if not (reel.is_Float or reel.is_Rational) or reel.is_infinite:
+        raise ValueError("%s n'est pas un nombre réel." % x)
+    centre = _fraction(reel)
+    rayon = abs(centre)/10**(chiffres - 1) + Fraction(1, 10**chiffres)
+    if imaginaire and abs(_fraction(imaginaire)) > rayon:
+        raise ValueError("%s n'est pas un nombre réel." % x)
+    inf, sup = centre - rayon, centre + rayon
+    _cache.ecrire(x, (chiffres, inf, sup))
+    return inf, sup
+
+
+def _fraction(nombre):
+    if nombre.is_Float:
+        return Fraction(*to_rational(nombre._mpf_))
+    return Fraction(int(nombre.p), int(nombre.q))
+
+
+def _infini(x):
+    return (1 if x == oo else (-1 if x == -oo else 0))
+
+
+def comparer(a, b):
+    """Retourne -1 si a < b, 0 si a = b, et 1 si a > b.
+
+    `a` et `b` sont des réels, ou +oo ou -oo."""
+    a, b = S(a), S(b)
+    if a == b:
+        return 0
+    infini_a, infini_b = _infini(a), _infini(b)
+    if infini_a or infini_b:
+        return (infini_a > infini_b) - (infini_a < infini_b)
+    return _comparer(a, b)[0]
+
+
+def _comparer(a, b):
+    """Compare les réels `a` et `b`, en affinant leurs encadrements si nécessaire.
+
+    Retourne le résultat de la comparaison, et les encadrements obtenus."""
+    chiffres = PRECISION_INITIALE
+    while True:
+        inf_a, sup_a = encadrement(a, chiffres)
+        inf_b, sup_b = encadrement(b, chiffres)
+        if sup_a < inf_b:
+            return -1, (inf_a, sup_a), (inf_b, sup_b)
+        if sup_b < inf_a:
+            return 1, (inf_a, sup_a), (inf_b, sup_b)
+        if chiffres >= PRECISION_MAXIMALE:
+            break
+        chiffres = min(2*chiffres, PRECISION_MAXIMALE)
+    # Les encadrements se chevauchent toujours : a et b sont très probablement égaux.
+    if (a - b).equals(0) is not False:
+        resultat = 0
+    else:
+        centre_a, centre_b = inf_a + sup_a, inf_b + sup_b
+        resultat = (centre_a > centre_b) - (centre_a < centre_b)
+    return resultat, (inf_a, sup_a), (inf_b, sup_b)
+
+
+def signe(x):
+    "Signe (-1, 0 ou 1) de la valeur réelle `x`."
+    return comparer(x, 0)
+
+
+def trier(valeurs):
+    "Trie les valeurs réelles (ou infinies) par ordre croissant."
+    return sorted(valeurs, key=cmp_to_key(comparer))
+
+
+def _plus_simple(inf, sup):
+    "Fraction de plus petit dénominateur appartenant à l'intervalle ]inf;sup[."
+    entier = floor(inf)
+    if entier + 1 < sup:
+        return Fraction(entier + 1)
+    if inf == entier:
+        return entier + Fraction(1, floor(1/(sup - entier)) + 1)
+    return entier + 1/_plus_simple(1/(sup - entier), 1/(inf - entier))
+
+
+def entre(a, b):
+    """Retourne un rationnel (sympy) strictement compris entre a et b, où a < b.
+
+    Le rationnel retourné est proche du milieu de l'intervalle, tout en étant
+    aussi simple que possible, ce qui accélère le calcul des images
+    (pour obtenir le signe d'une fonction entre a et b).
+    Si a et b sont rationnels, il s'agit simplement de leur moyenne."""
+    a, b = S(a), S(b)
+    if a == -oo and b == oo:
+        return Integer(0)
+    if a == -oo:
+        return Integer(floor(encadrement(b)[0])) - 1
+    if b == oo:
+        return Integer(ceil(encadrement(a)[1])) + 1
+    if a.is_Rational and b.is_Rational:
+        return (a + b)/2
+    resultat, (inf_a, sup_a), (inf_b, sup_b) = _comparer(a, b)
+    if resultat != -1:
+        raise ValueError("%s n'est pas strictement inférieur à %s." % (a, b))
+    if sup_a >= inf_b:
+        # Valeurs extrêmement proches, séparées uniquement par sympy.
+        return (a + b)/2
+    # On cherche un rationnel simple proche du milieu de l'intervalle.
+    quart = (inf_b - sup_a)/4
+    fraction = _plus_simple(sup_a + quart, inf_b - quart)
+    return Rational(fraction.numerator, fraction.denominator)
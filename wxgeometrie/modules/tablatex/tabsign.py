@@ -28,9 +28,9 @@ from sympy import oo, nan, Symbol, Float, Rational
 
 from .tablatexlib import convertir_en_latex, traduire_latex, test_parentheses,\
                          maths, extraire_facteurs, nice_str
-from wxgeometrie.mathlib.sympy_functions import solve
+from .racines import trier, comparer
+from .analyse import analyser
 from wxgeometrie.mathlib.intervalles import R, conversion_chaine_ensemble
-from wxgeometrie.mathlib.solvers import ensemble_definition
 from wxgeometrie.mathlib.interprete import Interprete
 from wxgeometrie.mathlib.parsers import VAR
 from wxgeometrie.mathlib.custom_functions import round_afz
@@ -47,12 +47,6 @@ def _auto_tabsign(chaine, cellspace=False, decimales=3, approche=False):
     En mettant `decimales=2`, on peut par exemple afficher seulement 2 chiffres
     après la virgule, etc.
     """
-    def nice_str2(x):
-        if (isinstance(x, (float, Float)) and not isinstance(x, Rational)
-                or approche and x not in (-oo, oo)):
-            x = round_afz(float(x), decimales)
-        return nice_str(x)
-
     chaine_initiale = chaine
 
     # Ensemble de définition
@@ -91,10 +85,45 @@ def _auto_tabsign(chaine, cellspace=False, decimales=3, approche=False):
         variables = [Symbol('x')]
     var = variables.pop()
     # Récupération de l'ensemble de définition
-    ens_def *= ensemble_definition(expr, var)
+    ens_def = analyser(expr, var, ens_def).ens_def()
     if param.debug and param.verbose:
         print('-> Ensemble de definition:', ens_def)
 
+    # Étude du signe de chaque facteur
+    lignes = []
+    for facteur in facteurs:
+        interprete.evaluer(facteur)
+        lignes.append((facteur, analyser(interprete.ans(), var)))
+
+    code = _code_tabsign(var, ens_def, lignes, legende, decimales, approche)
+    return tabsign(code, cellspace = cellspace) + '% ' + chaine_initiale + '\n'
+
+
+
+def tabsign_analyse(analyse, legende, cellspace=False, decimales=3, approche=False):
+    """Génère le tableau de signe d'une expression déjà étudiée (voir `analyse.Analyse`).
+
+    Exemple, pour le signe de la dérivée d'une fonction f :
+    >>> tabsign_analyse(analyser(expr, x).derivee(), "f'(x)")
+    Les zéros et les signes déjà calculés (par exemple, pour le tableau
+    de variations de f) ne sont pas recalculés."""
+    code = _code_tabsign(analyse.var, analyse.ens_def(), [(str(analyse.expr), analyse)],
+                         legende, decimales, approche)
+    return tabsign(code, cellspace=cellspace) + '% ' + legende + ' = ' + str(analyse.expr) + '\n'
+
+
+
+def _code_tabsign(var, ens_def, lignes, legende, decimales=3, approche=False):
+    """Génère le code (respectant la syntaxe de tabsign()) du tableau de signe
+    sur `ens_def` du produit des facteurs de la liste `lignes`.
+
+    `lignes` est une liste de couples (texte, analyse du facteur)."""
+    def nice_str2(x):
+        if (isinstance(x, (float, Float)) and not isinstance(x, Rational)
+                or approche and x not in (-oo, oo)):
+            x = round_afz(float(x), decimales)
+        return nice_str(x)
+
     code = str(var) # chaîne retournée, respectant la syntaxe de tabsign()
     valeurs_interdites = []
     xmin = ens_def.intervalles[0].inf
@@ -115,19 +144,17 @@ def _auto_tabsign(chaine, cellspace=False, decimales=3, approche=False):
 
 
     # Étude du signe de chaque facteur
-    for facteur in facteurs:
-        interprete.evaluer(facteur)
-        f_expr = interprete.ans()
-        f_ens_def = ensemble_definition(f_expr, var)
+    for facteur, analyse in lignes:
+        f_ens_def = analyse.ens_def()
         valeurs = {xmin: None, xmax: None}
-        solutions = [sol for sol in solve(f_expr, var)
-                        if xmin.evalf(200) <= sol.evalf(200) <= xmax.evalf(200)]
+        solutions = [sol for sol in analyse.racines()
+                        if comparer(xmin, sol) <= 0 <= comparer(xmax, sol)]
         for sol in solutions:
             valeurs[sol] = 0
         for val in valeurs_interdites:
             if val not in f_ens_def and val not in (-oo, oo):
                 valeurs[val] = nan
-        liste_valeurs = sorted(valeurs)
+        liste_valeurs = trier(valeurs)
         # On génère le code de la ligne
         code += '// '
         #print solutions, valeurs_interdites
@@ -141,18 +168,8 @@ def _auto_tabsign(chaine, cellspace=False, decimales=3, approche=False):
                 code += '!' + nice_str2(valeur)
 
             if i != len(liste_valeurs) - 1:
-                valeur_suivante = liste_valeurs[i + 1]
-                if valeur == -oo:
-                    if valeur_suivante == +oo:
-                        val_intermediaire = 0
-                    else:
-                        val_intermediaire = valeur_suivante - 1
-                elif valeur_suivante == +oo:
-                    val_intermediaire = valeur + 1
-                else:
-                    val_intermediaire = (valeur + valeur_suivante)/2
                 # On suppose la fonction continue sur tout intervalle de son ensemble de définition.
-                if f_expr.subs(var, val_intermediaire) > 0:
+                if analyse.signe_entre(valeur, liste_valeurs[i + 1]) > 0:
                     code += ' ++ '
                 else:
                     code += ' -- '
@@ -160,7 +177,7 @@ def _auto_tabsign(chaine, cellspace=False, decimales=3, approche=False):
     code += '// ' + legende
     if param.debug and param.verbose:
         print('Code TABSign:', code)
-    return tabsign(code, cellspace = cellspace) + '% ' + chaine_initiale + '\n'
+    return code
 
 
 
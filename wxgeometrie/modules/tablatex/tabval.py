@@ -23,6 +23,9 @@
 #    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
 import re
+from math import isfinite, nan
+
+import numpy
 from numpy import arange
 
 from .tablatexlib import traduire_latex, maths
@@ -73,7 +76,8 @@ def _auto_tabval(chaine='', formatage_antecedents='VAL', formatage_images='VAL',
 
 
 
-def tabval(chaine='', formatage_antecedents='VAL', formatage_images='VAL', precision=0.01):
+def tabval(chaine='', formatage_antecedents='VAL', formatage_images='VAL', precision=0.01,
+           colonnes_max=None):
     r"""Syntaxe:
 fonction: [precision d'arrondi]: 1ere valeur,2e valeur..valeur finale
 
@@ -83,6 +87,8 @@ h(x)=sin(x)+1: [0.01]: -5,-4.5..0 ; 0,1..3
 
 Utilisez ; pour séparer plusieurs bloc de valeurs, et // pour indiquer
 un retour à la ligne (si le tableau est trop long).
+Avec `colonnes_max`, les lignes trop longues sont découpées automatiquement
+(au plus `colonnes_max` valeurs par tableau).
 
 `formatage_images` contient éventuellement une formule pour formater
 les valeurs, par exemple '\nombre{VAL}'. La variable VAL correspond à la
@@ -127,79 +133,131 @@ valeur du résultat.
 
     lignes = [txt.strip() for txt in sequence[-1].split('\n') if txt.strip()]
 
-    # On génère le code LaTeX
-    code = "\\begin{center}"
-
-    # On commence par créer la liste des valeurs
-    for ligne in lignes:
-        ensemble_valeurs = set()
-        for intervalle in ligne.split(';'):
-            if '..' in intervalle:
-                premier, dernier = intervalle.split('..')
-                if ',' in premier:
-                    premier, suivant = premier.split(',')
-                else:
-                    suivant = None
-                first_val = float(eval(premier, maths.__dict__))
-                last_val = float(eval(dernier, maths.__dict__))
-                if suivant is None:
-                    pas = 1
-                else:
-                    next_val = float(eval(suivant, maths.__dict__))
-                    pas = next_val - first_val
-                ensemble_valeurs.update(arange(first_val, last_val, pas))
-                ensemble_valeurs.add(last_val)
+    # L'expression n'est traduite et compilée qu'une fois.
+    code_expression = compile(traduire_latex(expression), '<tabval>', 'eval')
+
+    def blocs():
+        yield "\\begin{center}"
+        for ligne in lignes:
+            valeurs = _valeurs(ligne)
+            images = _evaluer(code_expression, variable, valeurs)
+            antecedents = [_formater(val, formatage_antecedents) for val in valeurs]
+            resultats = [_cellule_image(code_expression, variable, val, image,
+                                        precision, formatage_images)
+                         for val, image in zip(valeurs, images)]
+            pas = colonnes_max or len(valeurs) or 1
+            for debut in range(0, max(len(valeurs), 1), pas):
+                yield _tabular(variable, fonction, antecedents[debut:debut + pas],
+                               resultats[debut:debut + pas])
+        yield "\\end{center}\n% " + chaine_originale + "\n"
+
+    return ''.join(blocs())
+
+
+
+def _valeurs(ligne):
+    """Liste triée des valeurs de la variable décrites par `ligne`
+    (ex: "-5,-4..0 ; 0.5 ; 1,2..6")."""
+    ensemble_valeurs = set()
+    for intervalle in ligne.split(';'):
+        if '..' in intervalle:
+            premier, dernier = intervalle.split('..')
+            if ',' in premier:
+                premier, suivant = premier.split(',')
+            else:
+                suivant = None
+            first_val = float(eval(premier, maths.__dict__))
+            last_val = float(eval(dernier, maths.__dict__))
+            if suivant is None:
+                pas = 1
             else:
-                ensemble_valeurs.add(float(eval(intervalle, maths.__dict__)))
-
-        valeurs = sorted(ensemble_valeurs)
-
-        nbr_colonnes = len(valeurs) + 1
-
-        code_variable = "$" + variable + "$ "
-        code_expression = "$" + fonction + "$ "
-
-        expression = traduire_latex(expression)
-
-        def formater(expr, formatage='VAL'):
-            assert isinstance(expr, float)
-            s = str(expr).rstrip('0')
-            if s[-1] == '.':
-                s = s[:-1]
-            if param.separateur_decimal != '.':
-                s = s.replace(".", param.separateur_decimal)
-            return ' $' + formatage.replace('VAL', s) + '$ '
-
-
-        for val in valeurs: # on construit le tableau colonne par colonne
-            n = max(len(code_variable), len(code_expression))
-            # on justifie avant chaque nouvelle colonne (le code LaTeX sera plus agréable à lire !)
-            code_variable = code_variable.ljust(n)
-            code_expression = code_expression.ljust(n)
-            code_variable += '&' + formater(val, formatage_antecedents)
-            try:
-                dict = maths.__dict__.copy()
-                dict.update({variable: val})
-                evaluation = eval(expression, dict)
-                if evaluation in (maths.num_oo, maths.num_nan, -maths.num_oo, maths.oo, maths.nan, -maths.oo):
-                    code_expression += "& $\\times$ "
-                else:
-                    # Workaround for a strange Python behaviour:
-                    # In [1]: 0.01*113
-                    # Out[1]: 1.1300000000000001
-                    # In [2]: 113/100.0
-                    # Out[2]: 1.13
-                    inv = (1/precision)
-                    val = round_afz(inv*evaluation)/inv
-                    code_expression += '&' + formater(val, formatage_images)
-            except:
-                print_error()
-                code_expression += "& $\\times$ "
-
-        code += "\n\\begin{tabular}{|" + nbr_colonnes*"c|" + "}\n\\hline\n"
-        code += code_variable + "\\\\\n"
-        code += "\\hline\n"
-        code += code_expression + "\\\\\n"
-        code += "\\hline\n\\end{tabular}\n"
-
-    return code + "\\end{center}\n% " + chaine_originale + "\n"
+                next_val = float(eval(suivant, maths.__dict__))
+                pas = next_val - first_val
+            ensemble_valeurs.update(arange(first_val, last_val, pas))
+            ensemble_valeurs.add(last_val)
+        else:
+            ensemble_valeurs.add(float(eval(intervalle, maths.__dict__)))
+    return sorted(ensemble_valeurs)
+
+
+def _image(code_expression, variable, val):
+    "Image de `val` (flottant), ou `nan` si elle n'est pas définie."
+    try:
+        dico = maths.__dict__.copy()
+        dico.update({variable: val})
+        evaluation = eval(code_expression, dico)
+        if evaluation in (maths.num_oo, maths.num_nan, -maths.num_oo, maths.oo, maths.nan, -maths.oo):
+            return nan
+        return float(evaluation)
+    except Exception:
+        print_error()
+        return nan
+
+
+def _evaluer(code_expression, variable, valeurs):
+    """Images de toutes les valeurs, calculées en une seule fois par numpy.
+
+    Si l'expression ne peut pas être évaluée sur un tableau numpy,
+    les images sont calculées une par une."""
+    dico = maths.__dict__.copy()
+    tableau = numpy.array(valeurs, dtype=float)
+    dico.update({variable: tableau})
+    try:
+        with numpy.errstate(all='ignore'):
+            images = numpy.asarray(eval(code_expression, dico))
+        if images.dtype.kind in 'iuf':
+            # NB: une fonction constante retourne un nombre, et non un tableau.
+            return numpy.broadcast_to(images.astype(float), tableau.shape)
+    except Exception:
+        pass
+    return [_image(code_expression, variable, val) for val in valeurs]
+
+
+def _cellule_image(code_expression, variable, val, image, precision, formatage):
+    "Code LaTeX de la cellule contenant l'image `image` de `val`, arrondie à `precision`."
+    if not isfinite(image):
+        return " $\\times$ "
+    # Workaround for a strange Python behaviour:
+    # In [1]: 0.01*113
+    # Out[1]: 1.1300000000000001
+    # In [2]: 113/100.0
+    # Out[2]: 1.13
+    inv = (1/precision)
+    if abs(abs(inv*image) % 1 - .5) < 1e-6:
+        # Arrondi délicat : l'image est recalculée sans numpy (les deux
+        # calculs peuvent différer sur le dernier chiffre binaire).
+        image = _image(code_expression, variable, val)
+        if not isfinite(image):
+            return " $\\times$ "
+    return _formater(round_afz(inv*image)/inv, formatage)
+
+
+def _formater(expr, formatage='VAL'):
+    assert isinstance(expr, float)
+    s = str(expr).rstrip('0')
+    if s[-1] == '.':
+        s = s[:-1]
+    if param.separateur_decimal != '.':
+        s = s.replace(".", param.separateur_decimal)
+    return ' $' + formatage.replace('VAL', s) + '$ '
+
+
+def _ligne(cellules):
+    """Code LaTeX des lignes du tableau (ex: [["$x$ ", " $1$ "], ["$f(x)$ ", " $2$ "]]).
+
+    Les colonnes sont alignées, ce qui rend le code LaTeX plus lisible."""
+    largeurs = [max(len(cellule) for cellule in colonne) for colonne in zip(*cellules)]
+    largeurs[-1] = 0
+    return ["&".join(cellule.ljust(largeur) for cellule, largeur in zip(ligne, largeurs))
+            for ligne in cellules]
+
+
+def _tabular(variable, fonction, antecedents, images):
+    "Génère un environnement tabular (1 ligne pour la variable, 1 pour les images)."
+    ligne_variable, ligne_images = _ligne([["$" + variable + "$ "] + antecedents,
+                                           ["$" + fonction + "$ "] + images])
+    return ("\n\\begin{tabular}{|" + (len(antecedents) + 1)*"c|" + "}\n\\hline\n"
+            + ligne_variable + "\\\\\n"
+            + "\\hline\n"
+            + ligne_images + "\\\\\n"
+            + "\\hline\n\\end{tabular}\n")
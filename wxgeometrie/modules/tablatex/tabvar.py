@@ -25,11 +25,11 @@
 
 import re
 
-from sympy import oo, limit, Symbol, Float, Rational, Wild, sqrt, S
+from sympy import oo, Symbol, Float, Rational, Wild, sqrt, S
 
 from .tablatexlib import convertir_en_latex, test_parentheses, nice_str
-from wxgeometrie.mathlib.solvers import ensemble_definition
-from wxgeometrie.mathlib.sympy_functions import solve
+from .racines import comparer
+from .analyse import analyser
 from wxgeometrie.mathlib.intervalles import R, conversion_chaine_ensemble
 from wxgeometrie.mathlib.interprete import Interprete
 from wxgeometrie.mathlib.parsers import VAR
@@ -104,20 +104,20 @@ def _auto_tabvar(chaine='', derivee=True, limites=True, decimales=3, approche=Fa
         variables = [Symbol('x')]
     var = variables.pop()
 
-    # Récupération de l'ensemble de définition (-> ens_def).
-    ens_def &= ensemble_definition(expr, var)
+    # Étude de la fonction et de sa dérivée (cf. module `analyse`).
+    # Chaque calcul (dérivée, limites, images...) n'est effectué qu'une fois.
+    analyse = analyser(expr, var, ens_def)
+    analyse_df = analyse.derivee()
 
-    # --------------------
-    # Calcul de la dérivée
-    # --------------------
-    df = expr.diff(var)
-    ens_def_df = ensemble_definition(df, var) & ens_def
+    # Récupération de l'ensemble de définition (-> ens_def).
+    ens_def = analyse.ens_def()
+    ens_def_df = analyse_df.ens_def()
 
     # Liste des zéros de la dérivée triés par ordre croissant.
     # Nota: sympy n'arrive pas à ordonner certaines expressions compliquées,
     # commme les racines de certains polynômes de degré 3 par exemple.
-    # On calcule donc des valeurs approchées ('.evalf(200)') pour les comparer.
-    racines_df = sorted(solve(df, var), key=(lambda x: x.evalf(200)))
+    # On compare donc des encadrements numériques (cf. module `racines`).
+    racines_df = analyse.points_critiques()
 
     # ------------------------------------------
     # Étude des variations et génération du code
@@ -130,7 +130,7 @@ def _auto_tabvar(chaine='', derivee=True, limites=True, decimales=3, approche=Fa
         "Génère le code correspondant à une valeur `x` remarquable."
         if x in ens_def:
             # On calcule simplement f(x).
-            fx = nice_str2(expr.subs(var, x))
+            fx = nice_str2(analyse.image(x))
         else:
             # x est une valeur interdite ou -oo ou +oo.
             symb = ('|' if x not in (-oo, oo) else '')
@@ -138,16 +138,16 @@ def _auto_tabvar(chaine='', derivee=True, limites=True, decimales=3, approche=Fa
             if limites:
                 # On calcule la limite à gauche et/ou à droite.
                 if x in sups:
-                    gauche = nice_str2(limit(expr, var, x, dir = '-'))
+                    gauche = nice_str2(analyse.limite(x, '-'))
                 if x in infs:
-                    droite = nice_str2(limit(expr, var, x, dir = '+'))
+                    droite = nice_str2(analyse.limite(x, '+'))
             fx = '%s%s%s' % (gauche, symb, droite)
 
         # Affichage de f'(x) (seulement si f'(x)=0 ou f'(x) non défini).
         if x in (-oo, oo):
             dfx = ''
         elif x in ens_def_df: # `oo in ens_def_df` plante actuellement (05/2014)
-            dfx = ('0' if abs(df.subs(var, x).evalf()) < param.tolerance else '')
+            dfx = ('0' if abs(analyse_df.image(x).evalf()) < param.tolerance else '')
         else:
             dfx = '|'
         if dfx and derivee:
@@ -157,13 +157,7 @@ def _auto_tabvar(chaine='', derivee=True, limites=True, decimales=3, approche=Fa
 
     def _code_inter(a, b):
         "Retourne les variations entre a et b."
-        if a == -oo and b == +oo:
-            a = b = 0
-        elif a == -oo:
-            a = b - 1
-        elif b == +oo:
-            b = a + 1
-        signe_df = df.subs(var, (a + b)/2).evalf(200)
+        signe_df = analyse_df.signe_entre(a, b)
         if signe_df > 0:
             symb = '<<'
         elif signe_df < 0:
@@ -188,24 +182,22 @@ def _auto_tabvar(chaine='', derivee=True, limites=True, decimales=3, approche=Fa
     for intervalle in ens_def_df.intervalles:
         # On convertit les bornes en expressions sympy.
         inf = S(intervalle.inf)
-        inf_approx = inf.evalf(200)
         if inf != sup:
             if sup is not None:
                 code += ' XX '
             code += _code_val(inf)
         sup = S(intervalle.sup)
-        sup_approx = sup.evalf(200)
         # On élimine toutes les racines situées avant l'intervalle considéré.
         while pos < len(racines_df):
             racine = racines_df[pos]
-            if racine.evalf(200) > inf_approx:
+            if comparer(racine, inf) > 0:
                 break
             pos += 1
         # On découpe l'intervalle suivant les racines, et on regarde le signe
         # de la dérivée sur chaque tronçon.
         while pos < len(racines_df):
             racine = racines_df[pos]
-            if racine.evalf(200) >= sup_approx:
+            if comparer(racine, sup) >= 0:
                 break
             pos += 1
             code += _code_inter(inf, racine)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+from sympy import Symbol, oo, exp
+
+from wxgeometrie.modules.tablatex.analyse import Analyse, analyser
+from wxgeometrie.modules.tablatex.tabvar import tabvar
+from wxgeometrie.modules.tablatex.tabsign import tabsign, tabsign_analyse
+
+import tools.unittest
+
+x = Symbol('x')
+
+class ModuleTablatexTest(tools.unittest.TestCase):
+
+    def test_analyse(self):
+        analyse = Analyse(x**3 - 3*x, x)
+        self.assertEqual(analyse.points_critiques(), [-1, 1])
+        self.assertEqual(analyse.image(-1), 2)
+        self.assertEqual(analyse.limite(oo, '-'), oo)
+        self.assertEqual(analyse.signe_entre(0, 1), -1)
+        self.assertEqual(analyse.derivee().signe_entre(-1, 1), -1)
+        self.assertEqual(analyse.derivee().signe_entre(1, oo), 1)
+        self.assertAlmostEqual(analyse.approximation(2**.5), -2**.5)
+        # Les résultats sont mémorisés.
+        self.assertIs(analyse.derivee(), analyse.derivee())
+        self.assertIs(analyse.points_critiques(), analyse.points_critiques())
+        analyse = Analyse(1/x + exp(x), x)
+        self.assertNotIn(0, analyse.ens_def())
+        self.assertEqual(analyse.limite(0, '+'), oo)
+
+    def test_reutilisation(self):
+        tabvar('f(x)=x^3-12x+1')
+        analyse = analyser(x**3 - 12*x + 1, x)
+        derivee = analyse.derivee()
+        # Tout a déjà été calculé lors de la génération du tableau de variations.
+        self.assertIn('racines', derivee._resultats)
+        self.assertEqual(analyse.points_critiques(), [-2, 2])
+        code = tabsign_analyse(derivee, "f'(x)")
+        self.assertEqual(code.split('%')[0], tabsign("f'(x)=3*x**2 - 12").split('%')[0])
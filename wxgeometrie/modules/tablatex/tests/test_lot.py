@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+import tempfile
+
+from wxgeometrie.modules.tablatex.lot import (generer_lot, generer, CacheDisque,
+                                              lire_specifications, _normaliser)
+from wxgeometrie.modules.tablatex.tabvar import tabvar
+from wxgeometrie.modules.tablatex.tabsign import tabsign
+from wxgeometrie.modules.tablatex.tabval import tabval
+from wxgeometrie import param
+
+import tools.unittest
+
+class ModuleTablatexTest(tools.unittest.TestCase):
+
+    def test_generer_lot(self):
+        specifications = [('tabvar', 'f(x)=x^2'),
+                          ('tabsign', '(x-1)(x+2)'),
+                          ('tabvar', ' f(x)=x^2 '),
+                          ('tabvar', 'f(x)=x^2', {'derivee': False}),
+                          ('tabsign', 'x+y'),
+                          ('tabgraphe', 'x')]
+        with tempfile.TemporaryDirectory() as dossier:
+            cache = CacheDisque(dossier)
+            codes, erreurs = generer_lot(specifications, processus=1, cache=cache)
+            self.assertEqual(codes[0], tabvar('f(x)=x^2'))
+            self.assertEqual(codes[1], tabsign('(x-1)(x+2)'))
+            # Tableaux identiques : un seul calcul.
+            self.assertIs(codes[2], codes[0])
+            self.assertEqual(codes[3], tabvar('f(x)=x^2', derivee=False))
+            self.assertEqual(codes[4:], [None, None])
+            self.assertEqual([i for i, erreur in erreurs], [4, 5])
+            self.assertEqual(len(os.listdir(dossier)), 3)
+            # Seconde génération : tout est lu dans le cache.
+            codes2, erreurs2 = generer_lot(specifications[:4], processus=1, cache=cache)
+            self.assertEqual(codes2, codes[:4])
+            self.assertEqual(erreurs2, [])
+            self.assertEqual(cache.succes, 3)
+            # Le cache est bien utilisé.
+            with open(cache._chemin(_normaliser(specifications[1])), 'w') as f:
+                f.write('%')
+            self.assertEqual(generer_lot(specifications[1:2], cache=cache)[0], ['%'])
+
+    def test_generer_lot_separateur_decimal(self):
+        specifications = [('tabval', 'f(x)=x/2: 0,1..3')]
+        separateur_decimal = param.separateur_decimal
+        try:
+            with tempfile.TemporaryDirectory() as dossier:
+                cache = CacheDisque(dossier)
+                for separateur in (',', '.'):
+                    param.separateur_decimal = separateur
+                    codes, erreurs = generer_lot(specifications, processus=1, cache=cache)
+                    self.assertEqual(codes, [tabval('f(x)=x/2: 0,1..3')])
+                self.assertEqual(cache.succes, 0)
+                self.assertEqual(len(os.listdir(dossier)), 2)
+        finally:
+            param.separateur_decimal = separateur_decimal
+
+    def test_generer_lot_processus(self):
+        specifications = [('tabvar', 'f(x)=x^3-3x'), ('tabsign', 'x(x-3)'),
+                          ('tabvar', 'f(x)=1/x'), ('tabvar', 'f(x)=x+y')]
+        codes, erreurs = generer_lot(specifications, processus=2, cache=False)
+        self.assertEqual(codes[:3], [generer(*specification) for specification in specifications[:3]])
+        self.assertEqual([i for i, erreur in erreurs], [3])
+
+    def test_lire_specifications(self):
+        lignes = ['# Feuille 1', 'tabvar: f(x)=x^2', '', 'tabval: f(x)=2x+1: -1,0..2']
+        self.assertEqual(lire_specifications(lignes),
+                         [('tabvar', 'f(x)=x^2'), ('tabval', 'f(x)=2x+1: -1,0..2')])
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import os, sys
+TOPDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),"../../.."))
+sys.path.insert(0, TOPDIR)
+
+from sympy import Symbol, sqrt, pi, oo, S, Rational, Float, cos
+
+from wxgeometrie.mathlib.sympy_functions import solve
+from wxgeometrie.modules.tablatex.racines import (trier, comparer, signe, entre,
+                                                  encadrement, _cache)
+
+import tools.unittest
+
+x = Symbol('x')
+
+class ModuleTablatexTest(tools.unittest.TestCase):
+
+    def test_trier(self):
+        # Racines d'un polynôme de degré 3 (écrites à l'aide de nombres complexes).
+        racines = trier(solve(x**3 - 3*x + 1, x))
+        valeurs = [float(r.evalf().as_real_imag()[0]) for r in racines]
+        self.assertEqual(valeurs, sorted(valeurs))
+        self.assertEqual(trier([oo, 2, -oo, sqrt(3), Rational(3, 2)]),
+                         [-oo, Rational(3, 2), sqrt(3), 2, oo])
+
+    def test_comparer(self):
+        self.assertEqual(comparer(sqrt(2), Float('1.4142135623730951')), -1)
+        self.assertEqual(comparer(pi, S(355)/113), -1)
+        self.assertEqual(comparer(sqrt(8), 2*sqrt(2)), 0)
+        self.assertEqual(comparer(-oo, sqrt(2)), -1)
+        # Valeur nulle, mais pas sous forme simplifiée.
+        self.assertEqual(signe((sqrt(2) + sqrt(3))**2 - 5 - 2*sqrt(6)), 0)
+        self.assertEqual(signe(S(10)**-40), 1)
+        self.assertRaises(ValueError, comparer, 1 + S.ImaginaryUnit, 0)
+
+    def test_encadrement(self):
+        inf, sup = encadrement(sqrt(2), 30)
+        self.assertTrue(inf < sqrt(2) < sup)
+        self.assertLess(sup - inf, 1e-28)
+        # Encadrement plus fin que nécessaire, conservé en cache.
+        self.assertEqual(encadrement(sqrt(2)), (inf, sup))
+        self.assertIn(sqrt(2), _cache)
+
+    def test_entre(self):
+        self.assertEqual(entre(-oo, oo), 0)
+        self.assertEqual(entre(-oo, 3), 2)
+        self.assertEqual(entre(Rational(1, 3), 1), Rational(2, 3))
+        for a, b in [(sqrt(2), sqrt(3)), (-pi, pi/2), (pi, pi + S(10)**-20)]:
+            c = entre(a, b)
+            self.assertTrue(c.is_Rational)
+            self.assertEqual((comparer(a, c), comparer(c, b)), (-1, -1))
+        self.assertEqual(entre(sqrt(2), sqrt(3)), Rational(3, 2))
+        self.assertGreater(cos(entre(-pi, pi/2)), 0)
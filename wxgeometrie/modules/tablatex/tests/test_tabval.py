@@ -143,3 +143,43 @@ $x^2$ & $\color{gray}4$ & $\color{gray}1$ & $\color{gray}0$ & $\color{gray}1$ &
 """
         self.assert_tabval(s, tab, formatage_antecedents=r'\textbf{VAL}',
                               formatage_images=r'\color{gray}VAL')
+
+
+    def test_colonnes_max(self):
+        s = "f(x)=1/x: [0.01]: -2,-1..3"
+        tab = \
+r"""\begin{center}
+\begin{tabular}{|c|c|c|c|}
+\hline
+$x$    & $-2$   & $-1$ & $0$ \\
+\hline
+$f(x)$ & $-0,5$ & $-1$ & $\times$ \\
+\hline
+\end{tabular}
+
+\begin{tabular}{|c|c|c|c|}
+\hline
+$x$    & $1$ & $2$   & $3$ \\
+\hline
+$f(x)$ & $1$ & $0,5$ & $0,33$ \\
+\hline
+\end{tabular}
+\end{center}
+% f(x)=1/x: [0.01]: -2,-1..3
+"""
+        self.assert_tabval(s, tab, colonnes_max=3)
+
+
+    def test_evaluation_numpy(self):
+        # Les images calculées par numpy doivent être identiques à celles
+        # calculées valeur par valeur.
+        from math import isfinite
+        from wxgeometrie.modules.tablatex.tabval import _evaluer, _image
+        from wxgeometrie.modules.tablatex.tablatexlib import traduire_latex
+        code = compile(traduire_latex("sqrt(x)+ln(x)/x"), '<tabval>', 'eval')
+        valeurs = [-1., 0., .5, 1., 2.5, 100.]
+        images = list(_evaluer(code, 'x', valeurs))
+        # Valeurs interdites
+        self.assertFalse(any(isfinite(image) for image in images[:2]))
+        for val, image in zip(valeurs[2:], images[2:]):
+            self.assertAlmostEqual(image, _image(code, 'x', val))
@@ -96,6 +96,25 @@ multi_threading = False
 # C'est assez instable...
 # En particulier, en l'état, ça ne marche pas avec le serveur X (sous Linux par ex.)
 
+# Calcul formel
+# -------------
+
+# Nombre de processus utilisés pour étudier en parallèle le signe des différents
+# facteurs lors de la résolution d'une inéquation (0 ou 1 pour désactiver).
+processus_solveurs = 0
+# Conserver en mémoire les résultats intermédiaires des solveurs
+# (ensembles de définition, périodes...). À désactiver pour le débogage.
+memoisation = True
+# Nombre maximal de résultats conservés par chaque cache des solveurs.
+taille_cache_solveurs = 1000
+
+# Nombre d'exercices générés à l'avance (et conservés sur le disque)
+# pour chaque niveau des modules d'exercices.
+taille_reserve_exercices = 5
+# Les exercices sont générés en arrière-plan, dans un processus distinct
+# (0 pour désactiver : chaque exercice est alors généré à la demande).
+processus_exercices = 1
+
 
 # Paramètres généraux
 # --------------------
@@ -634,6 +653,7 @@ if install:
     emplacements.setdefault("preferences", "~/.local/share/geophar/preferences")
     emplacements.setdefault("macros", "~/.local/share/geophar/macros")
     emplacements.setdefault("session", "~/.local/share/geophar/session")
+    emplacements.setdefault("cache", "~/.local/share/geophar/cache")
 else:
     # Utilisation sans installation. Tout est stocké directement dans le dossier wxgeometrie/.
     # % se réfère au dossier contenant WxGeometrie (indiqué par param.EMPLACEMENT)
@@ -641,5 +661,6 @@ else:
     emplacements.setdefault("preferences", "%/config/preferences") # dans config/preferences/ par défaut
     emplacements.setdefault("macros", "%/config/macros") # dans config/macros/ par défaut
     emplacements.setdefault("session", "%/config/session") # dans config/session/ par défaut
+    emplacements.setdefault("cache", "%/config/cache") # dans config/cache/ par défaut
 
 ##print(u'Import des paramètres terminé.')
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#
+#                     Calculs en arrière-plan
+#
+##########################################################################
+#    WxGeometrie
+#    Dynamic geometry, graph plotter, and more for french mathematic teachers.
+#    Copyright (C) 2005-2013  Nicolas Pourcelot
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+import threading
+
+from .fonctions import print_error
+
+
+class CalculArrierePlan(object):
+    """Calcul pouvant être effectué en arrière-plan (thread).
+
+    Utiliser `executer()` pour un calcul immédiat, ou `lancer()` pour
+    un calcul en arrière-plan (suivi via `progression` et `terminee`,
+    interruption via `annuler()`). En cas d'échec, l'exception est
+    conservée dans l'attribut `erreur`.
+
+    Les classes dérivées implémentent le calcul dans la méthode `calculer()`,
+    qui doit consulter régulièrement l'attribut `annulee`.
+    """
+
+    progression = 0.
+
+    def __init__(self):
+        self.annulee = False
+        self.terminee = False
+        self.erreur = None
+
+    def annuler(self):
+        self.annulee = True
+
+    def calculer(self):
+        raise NotImplementedError
+
+    def executer(self):
+        "Effectue le calcul, et retourne le résultat de `calculer()`."
+        try:
+            return self.calculer()
+        except Exception as e:
+            # L'erreur doit être connue avant que le calcul ne soit signalé
+            # comme terminé (le thread principal peut consulter `terminee` à tout moment).
+            self.erreur = e
+            raise
+        finally:
+            self.terminee = True
+
+    def lancer(self):
+        "Effectue le calcul en arrière-plan, et retourne le thread correspondant."
+        thread = threading.Thread(target=self._executer)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _executer(self):
+        try:
+            self.executer()
+        except Exception:
+            # `self.erreur` a déjà été renseigné par `executer()`.
+            print_error()